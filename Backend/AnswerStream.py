@@ -0,0 +1,202 @@
+"""
+Streaming Answers
+Tokens from a streaming LLM reply go to the GUI as they arrive, and each
+complete sentence goes to the speaker while the rest is still generating
+"""
+
+import re
+import time
+import queue
+import threading
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets) and
+# whitespace, or a line break. "3.14" and "example.com" have no space after
+# the dot, so they never split.
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+|\n+")
+
+# Words whose trailing dot doesn't end a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "no", "jr", "sr", "approx", "fig"}
+
+class SentenceSplitter:
+    """
+    Incremental sentence boundary detection over streamed text.
+
+    feed(text) returns the sentences completed by text; the unfinished
+    remainder is kept until more text arrives or flush() is called.
+    Sentences shorter than min_chars are joined to the next one, so a
+    bare "Sure." doesn't cost a synthesis round trip of its own.
+    """
+
+    def __init__(self, min_chars=20):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text):
+        self._buffer += text
+        sentences, start = [], 0
+        for match in SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[start:match.end()].strip()
+            if self._ends_with_abbreviation(self._buffer[:match.start()]) or len(sentence) < self.min_chars:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    @staticmethod
+    def _ends_with_abbreviation(text):
+        word = re.search(r"(\S+)$", text)
+        if not word:
+            return False
+        word = word.group(1).lower().rstrip(".")
+        # Initials like "J. K." as well as known abbreviations
+        return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+    def flush(self):
+        """Whatever is left, as the last sentence"""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest
+
+class AnswerStream:
+    """
+    One streamed answer.
+
+    feed(token) is given each token as the LLM produces it. on_text(text)
+    is called with the answer so far, at most every min_interval seconds
+    (and once more at the end). Complete sentences are passed in order to
+    speak(sentence) on a worker thread, so speech starts after the first
+    sentence instead of after the whole answer.
+
+    With speak_first set, only that many sentences are spoken straight
+    away and the rest are held back: if the answer turns out long (more
+    than long_sentences sentences and at least long_chars characters)
+    notice() is spoken instead of them, otherwise they are spoken at the
+    end. This matches how TextToSpeech shortens long answers.
+
+    prepare(sentence), if given, is called as each sentence is queued for
+    speaking, so its audio can be synthesized while earlier ones play.
+    """
+
+    def __init__(self, on_text=None, speak=None, min_interval=0.05, splitter=None,
+                 speak_first=None, long_sentences=4, long_chars=250, notice=None, prepare=None):
+        self.on_text = on_text
+        self.speak = speak
+        self.prepare = prepare
+        self.min_interval = min_interval
+        self.splitter = splitter or SentenceSplitter()
+        self.speak_first = speak_first
+        self.long_sentences = long_sentences
+        self.long_chars = long_chars
+        self.notice = notice
+
+        self._parts = []
+        self._sentences = []
+        self._held = []
+        self._queue = queue.Queue()
+        self._worker = None
+        self._last_text_at = None
+        self._finished = False
+
+        self.started_at = time.perf_counter()
+        self.metrics = {"tokens": 0, "sentences": 0, "spoken": 0, "gui_updates": 0,
+                        "first_token_ms": None, "first_sentence_ms": None, "first_speak_ms": None}
+
+    def _elapsed_ms(self):
+        return (time.perf_counter() - self.started_at) * 1000
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+    def feed(self, token):
+        # Some models stream their end-of-sequence marker as text
+        token = token.replace("</s>", "") if token else token
+        if not token or self._finished:
+            return
+        if self.metrics["first_token_ms"] is None:
+            self.metrics["first_token_ms"] = self._elapsed_ms()
+        self._parts.append(token)
+        self.metrics["tokens"] += 1
+
+        for sentence in self.splitter.feed(token):
+            self._add_sentence(sentence)
+
+        now = time.perf_counter()
+        if self._last_text_at is None or now - self._last_text_at >= self.min_interval:
+            self._last_text_at = now
+            self._show()
+
+    def _show(self):
+        if self.on_text is None:
+            return
+        try:
+            self.on_text(self.text)
+            self.metrics["gui_updates"] += 1
+        except Exception as e:
+            print(f"Warning: Streaming display failed: {e}")
+
+    def _add_sentence(self, sentence):
+        self._sentences.append(sentence)
+        self.metrics["sentences"] += 1
+        if self.metrics["first_sentence_ms"] is None:
+            self.metrics["first_sentence_ms"] = self._elapsed_ms()
+        if self.speak_first is not None and len(self._sentences) > self.speak_first:
+            self._held.append(sentence)
+        else:
+            self._say(sentence)
+
+    def _say(self, sentence):
+        if self.speak is None:
+            return
+        if self.prepare is not None:
+            try:
+                self.prepare(sentence)
+            except Exception as e:
+                print(f"Warning: Could not prepare streamed sentence: {e}")
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+        self._queue.put(sentence)
+
+    def _run(self):
+        while True:
+            sentence = self._queue.get()
+            if sentence is None:
+                break
+            if self.metrics["first_speak_ms"] is None:
+                self.metrics["first_speak_ms"] = self._elapsed_ms()
+            try:
+                self.speak(sentence)
+                self.metrics["spoken"] += 1
+            except Exception as e:
+                print(f"Warning: Could not speak streamed sentence: {e}")
+
+    def finish(self, wait=True, timeout=None):
+        """End of the stream: show the full text, speak what's left; returns the answer"""
+        if not self._finished:
+            self._finished = True
+            rest = self.splitter.flush()
+            if rest:
+                self._add_sentence(rest)
+            self._show()
+
+            text = self.text
+            if self._held:
+                if (self.notice is not None and len(self._sentences) > self.long_sentences
+                        and len(text) >= self.long_chars):
+                    self._say(self.notice())
+                else:
+                    for sentence in self._held:
+                        self._say(sentence)
+                self._held = []
+            if self._worker is not None:
+                self._queue.put(None)
+
+        if wait and self._worker is not None:
+            self._worker.join(timeout)
+        return self.text
+
+    def get_stats(self):
+        stats = dict(self.metrics)
+        stats["chars"] = len(self.text)
+        return stats
@@ -24,6 +24,7 @@ import pyautogui
 import asyncio
 import os
 import datetime
+from Backend.ConversationBuffer import ConversationBuffer
 # Audio control imports - fallback to keyboard shortcuts if admin access not available
 try:
     from ctypes import cast, POINTER
@@ -66,7 +67,8 @@ professional_responses = [
     "I am in your hands, please let me know how I can assist you further",
 ]
 
-messages = []
+# Each exchange carries a whole generated document; keep only the most recent ones
+messages = ConversationBuffer(max_messages=6, max_tokens=6000)
 
 SystemChatBot = [{"role": "system", "content": f"Hello, I am {os.environ['Username']}, You are a content writer. You have to write content like letters, paragraphs, reports, essays, etc."}]
 
@@ -85,7 +87,7 @@ def Content(Topic):
 
         completion = client.chat.completions.create(
             model='qwen/qwen3-32b',
-            messages=messages,
+            messages=messages.to_list(),
             max_tokens=2048,
             temperature=0.7,
             top_p=1,
@@ -203,12 +205,14 @@ def System(command):
         
 def GenerateImage(Topic):
     Topic = Topic.replace("generate image ", "").replace("of this", "")
-    # Use relative path instead of hardcoded path
-    image_data_file = os.path.join("Data", "ImageGeneration.data")
-    os.makedirs("Data", exist_ok=True)  # Ensure Data directory exists
-    with open(image_data_file, "w") as f:
-        f.write(f"{Topic},true")
-    return True
+    # Hand the job to the image generation process (started on first use)
+    from Backend.IPC import GetImageJobClient
+    try:
+        GetImageJobClient().submit(Topic.strip())
+        return True
+    except Exception as e:
+        print(f"[Automation] Image generation unavailable: {e}")
+        return False
 
 def Screenshot(_):
     """Capture a full-screen screenshot and save it under Data/ with timestamp."""
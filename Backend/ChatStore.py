@@ -0,0 +1,231 @@
+"""
+Chat Log Store
+Append-only JSONL chat history (Data/ChatLog.jsonl) with an in-memory tail,
+replacing the whole-file json.dump of Data/ChatLog.json on every turn
+"""
+
+import os
+import json
+import threading
+from collections import deque
+
+CHAT_LOG_PATH = os.path.join("Data", "ChatLog.jsonl")
+LEGACY_CHAT_LOG_PATH = os.path.join("Data", "ChatLog.json")
+
+class ChatStore:
+    """
+    One {"role", "content"} message per line, oldest first.
+
+    Appends write whole lines in a single write and fsync, so a crash can
+    only tear the last line, which is dropped the next time the store is
+    opened. The newest tail_size messages are kept in memory for the
+    model context and the GUI. Once the log passes max_messages by half,
+    it is compacted down to the newest max_messages; the older messages
+    are appended to the archive (ChatLog.jsonl.1 by default), never
+    deleted. max_messages=None turns compaction off. Positions (offset,
+    len()) count archived messages too, so compaction never moves them
+    back; only clear() starts them over.
+
+    An existing Data/ChatLog.json is migrated on first open and kept as
+    ChatLog.json.migrated.
+    """
+
+    def __init__(self, path=CHAT_LOG_PATH, legacy_path=LEGACY_CHAT_LOG_PATH, tail_size=200,
+                 max_messages=10000, archive_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.archive_path = archive_path or path + ".1"
+        self.tail_size = tail_size
+        self.max_messages = max_messages
+
+        self._lock = threading.Lock()
+        self._tail = deque(maxlen=tail_size)
+        self._count = 0
+        self._archived = 0
+        self.stats = {"appended": 0, "migrated": 0, "dropped_lines": 0, "compactions": 0, "archived": 0}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._migrate()
+        self._load()
+
+    def _migrate(self):
+        if os.path.exists(self.path) or not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as file:
+                messages = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not migrate {self.legacy_path}: {e}")
+            messages = []
+
+        messages = [m for m in messages if isinstance(m, dict) and "role" in m]
+        self._write_all(messages)
+        os.replace(self.legacy_path, self.legacy_path + ".migrated")
+        self.stats["migrated"] = len(messages)
+
+    def _load(self):
+        self._archived = self._count_lines(self.archive_path)
+        if not os.path.exists(self.path):
+            open(self.path, 'a', encoding='utf-8').close()
+            return
+
+        valid_end, dropped = 0, 0
+        with open(self.path, 'rb') as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # Torn write from a crash mid-append
+                    dropped += 1
+                    break
+                valid_end += len(line)
+                message = self._parse(line)
+                if message is None:
+                    dropped += 1
+                    continue
+                self._tail.append(message)
+                self._count += 1
+
+        if dropped:
+            self.stats["dropped_lines"] += dropped
+            print(f"Warning: Dropped {dropped} unreadable chat log line(s)")
+            with open(self.path, 'r+b') as file:
+                file.truncate(valid_end)
+
+    @staticmethod
+    def _count_lines(path):
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                count += chunk.count(b"\n")
+        return count
+
+    @staticmethod
+    def _parse(line):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return None
+        return message if isinstance(message, dict) and "role" in message else None
+
+    @staticmethod
+    def _encode(message):
+        message = {"role": message["role"], "content": message.get("content") or ""}
+        return message, json.dumps(message, ensure_ascii=False) + "\n"
+
+    def _write_all(self, messages):
+        # Write a temp file and swap it in, so readers never see a half-written log
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write("".join(self._encode(message)[1] for message in messages))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+    def append(self, message):
+        self.extend([message])
+
+    def extend(self, messages):
+        """Append messages as one write"""
+        encoded = [self._encode(message) for message in messages]
+        if not encoded:
+            return
+        data = "".join(line for _, line in encoded).encode('utf-8')
+
+        with self._lock:
+            with open(self.path, 'ab') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            for message, _ in encoded:
+                self._tail.append(message)
+            self._count += len(encoded)
+            self.stats["appended"] += len(encoded)
+
+            if self.max_messages and self._count > self.max_messages * 1.5:
+                self._compact(self.max_messages)
+
+    def tail(self, n=None):
+        """Copies of the newest n messages (all cached ones by default), oldest first"""
+        with self._lock:
+            messages = list(self._tail)
+        if n is not None:
+            messages = messages[-n:] if n > 0 else []
+        return [dict(message) for message in messages]
+
+    @property
+    def offset(self):
+        """Position in the whole log, archive included, of the first cached message"""
+        with self._lock:
+            return self._archived + self._count - len(self._tail)
+
+    def snapshot(self):
+        """(tail(), offset) read together, so a concurrent append can't shift one but not the other"""
+        with self._lock:
+            messages = [dict(message) for message in self._tail]
+            return messages, self._archived + self._count - len(messages)
+
+    def __len__(self):
+        """Messages ever kept, archived ones included"""
+        return self._archived + self._count
+
+    def read_all(self):
+        """Every message in the log (not the archive); reads the file, so not for the per-turn path"""
+        with self._lock:
+            with open(self.path, 'rb') as file:
+                return [m for m in (self._parse(line) for line in file) if m is not None]
+
+    def compact(self, keep_last=None):
+        """Rewrite the log with only its valid lines, or move all but the newest keep_last to the archive"""
+        with self._lock:
+            self._compact(keep_last)
+
+    def _compact(self, keep_last):
+        with open(self.path, 'rb') as file:
+            messages = [m for m in (self._parse(line) for line in file) if m is not None]
+        if keep_last is not None:
+            cut = max(len(messages) - keep_last, 0)
+            if cut:
+                # Archive first: a crash before the swap below can only duplicate lines there
+                self._archive(messages[:cut])
+                self._archived += cut
+                messages = messages[cut:]
+        self._write_all(messages)
+        self._tail = deque(messages[-self.tail_size:], maxlen=self.tail_size)
+        self._count = len(messages)
+        self.stats["compactions"] += 1
+
+    def _archive(self, messages):
+        with open(self.archive_path, 'ab') as file:
+            file.write("".join(self._encode(message)[1] for message in messages).encode('utf-8'))
+            file.flush()
+            os.fsync(file.fileno())
+        self.stats["archived"] += len(messages)
+
+    def clear(self):
+        with self._lock:
+            self._write_all([])
+            self._tail.clear()
+            self._count = 0
+            self._archived = 0
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["messages"] = self._count
+            stats["cached"] = len(self._tail)
+        stats["bytes"] = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return stats
+
+_chat_store = None
+_chat_store_lock = threading.Lock()
+
+def GetChatStore():
+    """The chat log shared by ChatBot, RealtimeSearchEngine and the GUI"""
+    global _chat_store
+    with _chat_store_lock:
+        if _chat_store is None:
+            _chat_store = ChatStore()
+    return _chat_store
@@ -1,7 +1,8 @@
 from groq import Groq
-from json import dump, load
 import datetime
 from dotenv import dotenv_values
+from Backend.ContextWindow import GetContextWindow
+from Backend.ChatStore import GetChatStore
 
 env_vars = dotenv_values(".env")  # Load environment variables from .env file
 
@@ -12,8 +13,6 @@ GroqAPIKey = env_vars.get("GroqAPIKey")
 # Init the Groq
 client = Groq(api_key = GroqAPIKey)
 
-messages = [] # to store chat messages
-
 
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which also has real-time up-to-date information from the internet.
 *** Do not tell time until I ask, be brief and specific to the topic and commands.***
@@ -26,14 +25,8 @@ SystemChatBot = [
     {"role": "system", "content": System}
 ]
 
-try:
-    with open(r"Data/ChatLog.json", 'r') as file:
-        messages = load(file) # Load existing chat messages
-
-except FileNotFoundError:
-    # If the file doesn't exist, create it with an empty list
-    with open(r"Data/ChatLog.json", 'w') as file:
-        dump([], file)
+# Open the chat log (migrating an old ChatLog.json if there is one)
+chat_store = GetChatStore()
 
 def RealtimeInformation():
     current_datetime = datetime.datetime.now()
@@ -57,47 +50,51 @@ def AnswerModifier(answer):
     modified_answer = '\n'.join(non_empty_lines) # Remove empty lines
     return modified_answer # Modified Answer.
 
-def ChatBot(Query):  # sourcery skip: extract-method, use-join
+def ChatBot(Query, on_token=None, retries=1):  # sourcery skip: extract-method, use-join
     '''This func sends the user's query to the chatbot and returns the AI's Response.
+    on_token(text), if given, receives each piece of the reply as it streams in.
+    A failed request is retried up to retries times; the chat log is kept.
+    Once part of the reply was passed to on_token it is not retried, so what
+    was streamed stays the answer.
     This is the View part of the proj.'''
 
+    Answer = ''
     try:
-        #Loading the existing chat messages
-        with open(r"Data/ChatLog.json", 'r') as file:
-            messages = load(file)
+        #Recent chat messages from the in-memory tail of the log
+        messages = chat_store.tail()
         messages.append({"role": "user", "content": f"{Query}"})
 
         # Make a request to the Groq API for a response
         completion = client.chat.completions.create(
             model = "llama-3.3-70b-versatile",
-            messages = SystemChatBot + [{"role":"system", "content": RealtimeInformation()}] + messages,
+            # Recent turns within the token budget, older ones summarized
+            messages = SystemChatBot + [{"role":"system", "content": RealtimeInformation()}] + GetContextWindow().build(messages, offset=chat_store.offset),
             max_tokens = 1024, # limit the max tokens in the response.
             temperature=0.7, # Response Randomness (higeher means more random)
             top_p=1,
             stream=True, # Stream the response
             stop=None 
         )
-        Answer = ''
-        
         for chunk in completion:
             if chunk.choices[0].delta.content:
                 Answer += chunk.choices[0].delta.content # Check if there's content in the current chunk
-                # print(chunk.choices[0].delta.content, end='', flush=True)
+                if on_token is not None:
+                    on_token(chunk.choices[0].delta.content)
         Answer = Answer.replace("</s>","") # remove the unwanted
 
-        # Append the AI's response to the chat messages
-        messages.append({"role": "assistant", "content": Answer})
-
-        with open(r"Data/ChatLog.json", 'w') as file:
-            dump(messages, file, indent=4) # Save the updated chat messages
+        # Append the query and the AI's response to the chat log
+        chat_store.extend([{"role": "user", "content": f"{Query}"}, {"role": "assistant", "content": Answer}])
 
         return AnswerModifier(Answer) # Return the modified answer
     
     except Exception as e:
         print(f"Error: {e}")
-        with open(r"Data\ChatLog.json", 'w') as file:
-            dump([], file, indent=4) # Reset the chat log on error
-        return ChatBot(Query) # Retry the query if an error occurs
+        if Answer and on_token is not None:
+            # Already shown and spoken; a retry would be a different answer
+            return AnswerModifier(Answer.replace("</s>",""))
+        if retries > 0:
+            return ChatBot(Query, on_token=on_token, retries=retries - 1) # Retry the query if an error occurs
+        return "Sorry, I couldn't get an answer right now. Please try again."
     
 if __name__ == "__main__":
     while True:
@@ -0,0 +1,187 @@
+"""
+Chat Context Window
+Builds the history sent to Groq from the chat log: the most recent turns up
+to a token budget, a rolling summary of everything older, and optionally the
+older turns most relevant to the new query
+"""
+
+import re
+import math
+import threading
+from dotenv import dotenv_values
+from Backend.ConversationBuffer import CHARS_PER_TOKEN, estimate_tokens, message_tokens
+
+env_vars = dotenv_values(".env")
+
+# Words too common to say which older turn a query is about
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "to", "of", "in", "on", "for", "and", "or",
+    "what", "who", "how", "why", "when", "where", "which", "do", "does", "did", "can", "could", "you",
+    "me", "my", "i", "it", "its", "this", "that", "about", "tell", "please", "with", "from", "your",
+}
+
+# Only the newest postings per word are scored, so retrieval cost doesn't grow with the log
+RECENT_POSTINGS = 64
+
+def keywords(text):
+    return [word for word in re.findall(r"[a-z0-9']+", text.lower()) if len(word) > 2 and word not in STOPWORDS]
+
+def summarize_topics(messages, summary):
+    """Default summarizer: a running list of what the user asked about, no LLM call"""
+    topics = [m["content"].strip().replace("\n", " ")[:80] for m in messages
+              if m.get("role") == "user" and m.get("content", "").strip()]
+    if not topics:
+        return summary
+    earlier = f"{summary}; " if summary else ""
+    return earlier + "; ".join(topics)
+
+class ContextWindowBuilder:
+    """
+    Picks what part of a long chat history goes to the model.
+
+    build(history) keeps the newest messages that fit in max_tokens, always
+    including the last one. Older messages are folded, once each, into a
+    rolling summary via summarizer(new_messages, summary) -> str, capped at
+    summary_tokens and keeping the newest topics. With retrieval on, folded
+    user turns are also indexed by keyword and the best matches for the
+    query are sent back with their replies. Work per call depends on the
+    window, not the history length.
+
+    history may be just the newest part of the log (e.g. ChatStore.tail())
+    with offset giving the position of its first message in the whole log.
+    """
+
+    def __init__(self, max_tokens=3000, summary_tokens=300, summarizer=summarize_topics,
+                 retrieval=False, retrieved_turns=2, retrieval_tokens=600):
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+        self.retrieval = retrieval
+        self.retrieved_turns = retrieved_turns
+        self.retrieval_tokens = retrieval_tokens
+
+        self._lock = threading.Lock()
+        self.stats = {"builds": 0, "folded": 0, "retrieved": 0, "resets": 0, "last_tokens": 0}
+        self.reset()
+
+    def reset(self):
+        """Forget the summary and index, e.g. after the chat log was cleared"""
+        self.summary = None
+        self._folded = 0
+        self._postings = {}
+        self._turns = {}
+
+    def build(self, history, query=None, offset=0):
+        """Messages to send: summary, retrieved turns, then the recent window"""
+        with self._lock:
+            if offset + len(history) < self._folded:
+                # The log was reset or replaced
+                self.reset()
+                self.stats["resets"] += 1
+
+            start = self._window_start(history)
+            if offset + start > self._folded:
+                # Messages older than the given history can't be folded any more
+                self._fold(history[max(self._folded - offset, 0):start], max(self._folded, offset))
+                self._folded = offset + start
+
+            context = []
+            if self.summary:
+                context.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+
+            if self.retrieval:
+                if query is None and history and history[-1].get("role") == "user":
+                    query = history[-1].get("content", "")
+                retrieved = self._retrieve(query or "")
+                if retrieved:
+                    context.append({"role": "system", "content": "Relevant earlier conversation:\n" + retrieved})
+
+            context.extend(history[start:])
+            self.stats["builds"] += 1
+            self.stats["last_tokens"] = sum(message_tokens(message) for message in context)
+            return context
+
+    def _window_start(self, history):
+        start, used = len(history), 0
+        while start > 0:
+            cost = message_tokens(history[start - 1])
+            if used + cost > self.max_tokens and start < len(history):
+                break
+            used += cost
+            start -= 1
+        # Don't open the window on a reply whose question was cut off
+        while start < len(history) - 1 and history[start].get("role") != "user":
+            start += 1
+        return start
+
+    def _fold(self, new_messages, position):
+        if self.retrieval:
+            limit = self.retrieval_tokens * CHARS_PER_TOKEN
+            for i, message in enumerate(new_messages):
+                if message.get("role") != "user":
+                    continue
+                for word in set(keywords(message.get("content", ""))):
+                    self._postings.setdefault(word, []).append(position + i)
+                # Keep the exchange's text; the messages themselves may leave the history
+                turn = new_messages[i:i + 2]
+                self._turns[position + i] = "\n".join(
+                    f"{m.get('role')}: {m.get('content', '')}" for m in turn)[:limit]
+
+        if self.summarizer is not None:
+            try:
+                summary = self.summarizer(new_messages, self.summary)
+            except Exception as e:
+                print(f"Warning: Chat summarizer failed: {e}")
+                summary = self.summary
+            limit = self.summary_tokens * CHARS_PER_TOKEN
+            if summary and len(summary) > limit:
+                # Keep the newest topics, starting on a word boundary
+                summary = summary[-limit:]
+                summary = summary[summary.find(" ") + 1:]
+            self.summary = summary
+        self.stats["folded"] += len(new_messages)
+
+    def _retrieve(self, query):
+        words = set(keywords(query))
+        if not words or not self._turns:
+            return ""
+
+        scores = {}
+        for word in words:
+            postings = self._postings.get(word)
+            if not postings:
+                continue
+            weight = math.log(1 + len(self._turns) / len(postings))
+            for i in postings[-RECENT_POSTINGS:]:
+                scores[i] = scores.get(i, 0.0) + weight
+
+        best = sorted(scores, key=lambda i: (-scores[i], -i))[:self.retrieved_turns]
+        lines, budget = [], self.retrieval_tokens * CHARS_PER_TOKEN
+        for i in sorted(best):
+            text = self._turns[i][:budget]
+            if not text:
+                break
+            lines.append(text)
+            budget -= len(text)
+        self.stats["retrieved"] += len(best)
+        return "\n".join(lines)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["summary_tokens"] = estimate_tokens(self.summary)
+            stats["indexed_words"] = len(self._postings)
+        return stats
+
+_context_window = None
+_context_window_lock = threading.Lock()
+
+def GetContextWindow():
+    """Builder shared by ChatBot and RealtimeSearchEngine, which use the same chat log"""
+    global _context_window
+    with _context_window_lock:
+        if _context_window is None:
+            _context_window = ContextWindowBuilder(
+                max_tokens=int(env_vars.get("ChatContextTokens") or 3000),
+                retrieval=(env_vars.get("ChatContextRetrieval") or "False").lower() == "true")
+    return _context_window
@@ -0,0 +1,118 @@
+"""
+Conversation Buffer
+Bounded message history for the LLM callers: a ring buffer of recent messages
+under a token budget, with an optional hook to summarize what falls out
+"""
+
+import threading
+from collections import deque
+
+# Rough tokens-per-character for English text; close enough for budgeting
+# without shipping a tokenizer for every model the assistant talks to
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text):
+    """Approximate token count of text"""
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def message_tokens(message):
+    # A few tokens of overhead per message for the role and separators
+    return estimate_tokens(message.get("content", "")) + 4
+
+class ConversationBuffer:
+    """
+    Recent {"role", "content"} messages, oldest first.
+
+    Holds at most max_messages messages and max_tokens estimated tokens;
+    the oldest messages are evicted first when either limit is passed. The
+    newest message is always kept, even on its own over budget.
+
+    summarizer(evicted, summary) -> str, if given, is called with the
+    evicted messages and the current summary, and its result is offered
+    to the model as a system message ahead of the buffered ones (capped
+    at max_summary_tokens). Without a summarizer evicted messages are
+    simply dropped.
+    """
+
+    def __init__(self, max_messages=20, max_tokens=4000, summarizer=None, max_summary_tokens=300):
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer
+        self.max_summary_tokens = max_summary_tokens
+
+        self._messages = deque()
+        self._tokens = 0
+        self.summary = None
+        self._lock = threading.Lock()
+        self.stats = {"appended": 0, "evicted": 0, "summarized": 0, "summarizer_errors": 0}
+
+    def append(self, message):
+        """Add a message dict, evicting the oldest ones past either limit"""
+        message = {"role": message["role"], "content": message.get("content") or ""}
+        with self._lock:
+            self._messages.append(message)
+            self._tokens += message_tokens(message)
+            self.stats["appended"] += 1
+
+            evicted = []
+            while len(self._messages) > 1 and (len(self._messages) > self.max_messages
+                                               or self._tokens > self.max_tokens):
+                old = self._messages.popleft()
+                self._tokens -= message_tokens(old)
+                evicted.append(old)
+            self.stats["evicted"] += len(evicted)
+
+        if evicted and self.summarizer is not None:
+            self._summarize(evicted)
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+    def _summarize(self, evicted):
+        try:
+            summary = self.summarizer(evicted, self.summary)
+        except Exception as e:
+            print(f"Warning: Conversation summarizer failed: {e}")
+            self.stats["summarizer_errors"] += 1
+            return
+        if summary:
+            limit = self.max_summary_tokens * CHARS_PER_TOKEN
+            with self._lock:
+                self.summary = summary[-limit:]
+                self.stats["summarized"] += len(evicted)
+
+    def to_list(self):
+        """Messages to send to the model: the summary, if any, then the buffered ones"""
+        with self._lock:
+            messages = [dict(message) for message in self._messages]
+            if self.summary:
+                messages.insert(0, {"role": "system",
+                                    "content": f"Summary of the earlier conversation: {self.summary}"})
+        return messages
+
+    def clear(self):
+        with self._lock:
+            self._messages.clear()
+            self._tokens = 0
+            self.summary = None
+
+    @property
+    def token_count(self):
+        return self._tokens
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["messages"] = len(self._messages)
+            stats["tokens"] = self._tokens
+        stats["has_summary"] = bool(self.summary)
+        return stats
@@ -0,0 +1,165 @@
+"""
+Decision Cache
+Persistent LRU/TTL cache of FirstLayerDMM decisions keyed by normalized query,
+so repeated commands skip the Cohere round trip
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+# Words that don't change what a command means ("please open the chrome" == "open chrome")
+STOPWORDS = {
+    "a", "an", "the", "please", "kindly", "can", "could", "would", "will", "you", "hey", "ok", "okay",
+    "just", "for", "me", "now", "jarvis",
+}
+
+class DecisionCache:
+    """
+    Query -> decision list, stored in SQLite.
+
+    Keys are normalized queries (lowercase, punctuation stripped, stopwords
+    removed). Every entry carries the fingerprint of the decision prompt
+    (model, preamble, funcs, few-shot history); entries from another
+    fingerprint are purged on open, so editing the prompt invalidates the
+    cache. Entries expire after ttl_seconds and the least recently used are
+    evicted beyond max_entries.
+    """
+
+    def __init__(self, fingerprint, db_path=os.path.join("Data", "decision_cache.db"),
+                 ttl_seconds=7 * 24 * 3600, max_entries=500):
+        self.fingerprint = fingerprint
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidated": 0,
+                        "llm_calls": 0, "llm_ms": 0.0, "saved_ms": 0.0}
+
+        self._ensure_cache_exists()
+
+    @staticmethod
+    def make_fingerprint(*parts):
+        """Hash of everything that shapes a decision"""
+        material = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def normalize_query(query):
+        words = re.findall(r"[a-z0-9']+", query.lower())
+        words = [word.strip("'") for word in words]
+        return " ".join(word for word in words if word and word not in STOPWORDS)
+
+    def _ensure_cache_exists(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS decision_cache (
+                    query_key TEXT PRIMARY KEY,
+                    fingerprint TEXT,
+                    decision TEXT,
+                    created_at REAL,
+                    last_access REAL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_decision_cache_access
+                ON decision_cache (last_access)
+            ''')
+            # Decisions made under a different prompt are no longer valid
+            cursor.execute('DELETE FROM decision_cache WHERE fingerprint != ?', (self.fingerprint,))
+            self.metrics["invalidated"] = cursor.rowcount
+            conn.commit()
+
+    def get(self, query):
+        """Cached decision list for query, or None"""
+        key = self.normalize_query(query)
+        if not key:
+            return None
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT decision, created_at FROM decision_cache WHERE query_key = ? AND fingerprint = ?',
+                           (key, self.fingerprint))
+            row = cursor.fetchone()
+
+            if row and now - row[1] > self.ttl_seconds:
+                cursor.execute('DELETE FROM decision_cache WHERE query_key = ?', (key,))
+                conn.commit()
+                with self._lock:
+                    self.metrics["expired"] += 1
+                row = None
+
+            if not row:
+                with self._lock:
+                    self.metrics["misses"] += 1
+                return None
+
+            cursor.execute('UPDATE decision_cache SET last_access = ? WHERE query_key = ?', (now, key))
+            conn.commit()
+
+        with self._lock:
+            self.metrics["hits"] += 1
+            # Each hit saves one LLM call of average duration
+            if self.metrics["llm_calls"]:
+                self.metrics["saved_ms"] += self.metrics["llm_ms"] / self.metrics["llm_calls"]
+        return json.loads(row[0])
+
+    def put(self, query, decision, llm_ms=None):
+        """Store the decision the LLM made for query; llm_ms is how long that took"""
+        key = self.normalize_query(query)
+        if llm_ms is not None:
+            with self._lock:
+                self.metrics["llm_calls"] += 1
+                self.metrics["llm_ms"] += llm_ms
+        if not key or not decision:
+            return
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO decision_cache (query_key, fingerprint, decision, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (key, self.fingerprint, json.dumps(decision), now, now))
+
+            cursor.execute('SELECT COUNT(*) FROM decision_cache')
+            overflow = cursor.fetchone()[0] - self.max_entries
+            if overflow > 0:
+                cursor.execute('''
+                    DELETE FROM decision_cache WHERE query_key IN (
+                        SELECT query_key FROM decision_cache ORDER BY last_access ASC LIMIT ?
+                    )
+                ''', (overflow,))
+                with self._lock:
+                    self.metrics["evictions"] += overflow
+
+            conn.commit()
+
+    def clear(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM decision_cache')
+            conn.commit()
+
+    def get_stats(self):
+        """Hit rate, and LLM time saved by hits (estimated from the average miss)"""
+        with self._lock:
+            stats = dict(self.metrics)
+
+        with sqlite3.connect(self.db_path) as conn:
+            stats["entries"] = conn.execute('SELECT COUNT(*) FROM decision_cache').fetchone()[0]
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["avg_llm_ms"] = stats["llm_ms"] / stats["llm_calls"] if stats["llm_calls"] else 0.0
+        return stats
@@ -0,0 +1,311 @@
+"""
+Local IPC Channel
+Typed messages between the assistant and the image generation process over an
+authenticated multiprocessing.connection channel (a named pipe on Windows, a Unix
+domain socket elsewhere), replacing the ImageGeneration.data file that both sides polled.
+Messages travel as JSON, so nothing received is ever unpickled
+"""
+
+import os
+import sys
+import time
+import uuid
+import json
+import queue
+import secrets
+import tempfile
+import threading
+import subprocess
+from multiprocessing.connection import Listener, Client, AuthenticationError
+from typing import Dict, List, Any, Optional, Callable
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+if sys.platform == "win32":
+    IPC_ADDRESS = r"\\.\pipe\jarvis-image-generation"
+else:
+    IPC_ADDRESS = os.path.join(tempfile.gettempdir(), "jarvis-image-generation.sock")
+
+# The assistant makes a new key each session and hands it to the image process
+# it launches through this environment variable
+IPC_AUTHKEY_ENV = "JARVIS_IPC_AUTHKEY"
+if os.environ.get(IPC_AUTHKEY_ENV):
+    IPC_AUTHKEY = bytes.fromhex(os.environ[IPC_AUTHKEY_ENV])
+elif env_vars.get("IPCAuthKey"):
+    IPC_AUTHKEY = env_vars["IPCAuthKey"].encode()
+else:
+    IPC_AUTHKEY = secrets.token_bytes(32)
+
+# Message kinds and the fields each one must carry
+MESSAGE_FIELDS = {
+    "image_job": ("job_id", "prompt"),
+    "status": ("job_id", "status"),
+    "completed": ("job_id", "ok", "paths"),
+}
+
+# Only used once, to wait for a freshly launched image process to listen
+LAUNCH_TIMEOUT = 15.0
+
+# Raised when nothing is listening at the address
+NOT_LISTENING = (ConnectionRefusedError, FileNotFoundError)
+
+def _remove_stale_socket(address):
+    # A Unix socket file left by a crashed image process blocks the next bind
+    if isinstance(address, str) and os.path.exists(address) and sys.platform != "win32":
+        try:
+            Client(address).close()
+        except NOT_LISTENING:
+            os.unlink(address)
+        except Exception:
+            pass
+
+def send_message(conn, message: Dict[str, Any]):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+def recv_message(conn) -> Any:
+    """Next message on conn, or None if it is not valid JSON"""
+    data = conn.recv_bytes()
+    try:
+        return json.loads(data.decode("utf-8"))
+    except ValueError:
+        return None
+
+def make_message(kind: str, **fields) -> Dict[str, Any]:
+    """Build a message, checking the fields its kind requires"""
+    if kind not in MESSAGE_FIELDS:
+        raise ValueError(f"Unknown message kind: {kind}")
+    missing = [name for name in MESSAGE_FIELDS[kind] if name not in fields]
+    if missing:
+        raise ValueError(f"{kind} message missing {', '.join(missing)}")
+    return {"kind": kind, "sent_at": time.time(), **fields}
+
+def is_valid_message(message: Any) -> bool:
+    return (isinstance(message, dict) and message.get("kind") in MESSAGE_FIELDS
+            and all(name in message for name in MESSAGE_FIELDS[message["kind"]]))
+
+class ImageJobServer:
+    """
+    Runs in the image generation process.
+
+    Accepts connections, queues image_job messages and runs them one at a
+    time through handler(prompt) -> list of saved paths, reporting status
+    and completion back on the connection that sent the job.
+    """
+
+    def __init__(self, handler: Callable[[str], List[str]], address=None, authkey: bytes = None):
+        self.handler = handler
+        self.authkey = authkey or IPC_AUTHKEY
+        _remove_stale_socket(address or IPC_ADDRESS)
+        self.listener = Listener(address or IPC_ADDRESS, authkey=self.authkey)
+        self.address = self.listener.address
+        if isinstance(self.address, str) and sys.platform != "win32":
+            # Other local users can't even attempt the handshake
+            os.chmod(self.address, 0o600)
+        self.jobs = queue.Queue()
+        self.running = True
+        self.stats = {"jobs": 0, "failed": 0, "rejected": 0}
+        self._send_locks = {}
+
+    def serve_forever(self):
+        threading.Thread(target=self._work, daemon=True).start()
+        while self.running:
+            try:
+                conn = self.listener.accept()
+            except (AuthenticationError, EOFError, OSError) as e:
+                if not self.running:
+                    break
+                # A client that failed the handshake or hung up during it
+                print(f"[IPC] Rejected connection: {e!r}")
+                continue
+            if not self.running:
+                conn.close()
+                break
+            self._send_locks[id(conn)] = threading.Lock()
+            threading.Thread(target=self._read, args=(conn,), daemon=True).start()
+
+    def start(self):
+        """Serve on a background thread"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def _read(self, conn):
+        while self.running:
+            try:
+                message = recv_message(conn)
+            except (EOFError, OSError):
+                break
+            if not is_valid_message(message) or message["kind"] != "image_job":
+                self.stats["rejected"] += 1
+                print(f"[IPC] Ignoring invalid message: {message!r}")
+                continue
+            self._send(conn, make_message("status", job_id=message["job_id"], status="queued"))
+            self.jobs.put((conn, message))
+        self._send_locks.pop(id(conn), None)
+
+    def _work(self):
+        while self.running:
+            conn, job = self.jobs.get()
+            if job is None:
+                break
+            self._send(conn, make_message("status", job_id=job["job_id"], status="started"))
+            try:
+                paths = self.handler(job["prompt"]) or []
+                result = make_message("completed", job_id=job["job_id"], ok=bool(paths), paths=paths)
+            except Exception as e:
+                self.stats["failed"] += 1
+                result = make_message("completed", job_id=job["job_id"], ok=False, paths=[], error=str(e))
+            self.stats["jobs"] += 1
+            self._send(conn, result)
+
+    def _send(self, conn, message):
+        lock = self._send_locks.get(id(conn))
+        if lock is None:
+            return
+        try:
+            with lock:
+                send_message(conn, message)
+        except (OSError, EOFError, ValueError):
+            pass  # The client went away; the job still ran
+
+    def close(self):
+        self.running = False
+        self.jobs.put((None, None))
+        # Unblock accept(). If the accept loop never started, nobody answers the
+        # handshake, so wake it from a thread that closing the listener releases
+        waker = threading.Thread(target=self._wake_accept, daemon=True)
+        waker.start()
+        waker.join(1.0)
+        self.listener.close()
+
+    def _wake_accept(self):
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except Exception:
+            pass
+
+class ImageJobClient:
+    """
+    Submits image jobs from the assistant process and tracks their progress.
+
+    Connects on first submit, launching the image process if nothing is
+    listening. Replies arrive on a reader thread; on_message(message) is
+    called for each status and completion.
+    """
+
+    def __init__(self, address=None, authkey: bytes = None,
+                 on_message: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 launch: Optional[Callable[[], Any]] = None):
+        self.address = address or IPC_ADDRESS
+        self.authkey = authkey or IPC_AUTHKEY
+        self.on_message = on_message
+        self.launch = launch
+        self.jobs = {}
+        self._conn = None
+        self._lock = threading.Lock()
+        self._done = {}
+
+    def _connect(self):
+        if self._conn is not None:
+            return self._conn
+        try:
+            self._conn = Client(self.address, authkey=self.authkey)
+        except AuthenticationError:
+            raise AuthenticationError(f"An image process from an earlier session is listening on "
+                                      f"{self.address}; close it so a new one can start")
+        except NOT_LISTENING:
+            if self.launch is None:
+                raise
+            self.launch()
+            deadline = time.monotonic() + LAUNCH_TIMEOUT
+            while True:
+                try:
+                    self._conn = Client(self.address, authkey=self.authkey)
+                    break
+                except NOT_LISTENING:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.1)
+        threading.Thread(target=self._read, args=(self._conn,), daemon=True).start()
+        return self._conn
+
+    def submit(self, prompt: str) -> str:
+        """Send an image job; returns its job id without waiting"""
+        job_id = uuid.uuid4().hex[:12]
+        message = make_message("image_job", job_id=job_id, prompt=prompt)
+        with self._lock:
+            conn = self._connect()
+            self.jobs[job_id] = {"prompt": prompt, "status": "submitted",
+                                 "submitted_at": time.perf_counter()}
+            self._done[job_id] = threading.Event()
+            try:
+                send_message(conn, message)
+            except (OSError, EOFError):
+                # The image process exited; reconnect once
+                self._conn = None
+                send_message(self._connect(), message)
+        return job_id
+
+    def _read(self, conn):
+        while True:
+            try:
+                message = recv_message(conn)
+            except (EOFError, OSError, TypeError):
+                # TypeError: close() dropped the handle while recv() was waiting
+                break
+            if not is_valid_message(message):
+                continue
+            job = self.jobs.get(message.get("job_id"))
+            if job is not None:
+                now = time.perf_counter()
+                if message["kind"] == "status":
+                    job["status"] = message["status"]
+                    job[f"{message['status']}_ms"] = (now - job["submitted_at"]) * 1000
+                elif message["kind"] == "completed":
+                    job.update(status="completed" if message["ok"] else "failed",
+                               paths=message["paths"], error=message.get("error"),
+                               completed_ms=(now - job["submitted_at"]) * 1000)
+                    self._done[message["job_id"]].set()
+            if self.on_message is not None:
+                try:
+                    self.on_message(message)
+                except Exception as e:
+                    print(f"[IPC] Message handler failed: {e}")
+        with self._lock:
+            if self._conn is conn:
+                self._conn = None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until the job completes; returns its record, or None on timeout"""
+        done = self._done.get(job_id)
+        if done is None or not done.wait(timeout):
+            return None
+        return self.jobs[job_id]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+def LaunchImageGenerator():
+    """Start Backend/ImageGeneration.py as its own process, sharing this session's key"""
+    env = dict(os.environ, **{IPC_AUTHKEY_ENV: IPC_AUTHKEY.hex()})
+    return subprocess.Popen([sys.executable, "-m", "Backend.ImageGeneration"], cwd=os.getcwd(), env=env)
+
+def _PrintImageMessage(message):
+    if message["kind"] == "completed":
+        if message["ok"]:
+            print(f"[ImageGen] Job {message['job_id']} done: {', '.join(message['paths'])}")
+        else:
+            print(f"[ImageGen] Job {message['job_id']} failed: {message.get('error') or 'no images'}")
+    else:
+        print(f"[ImageGen] Job {message['job_id']} {message['status']}")
+
+_image_job_client = None
+
+def GetImageJobClient():
+    global _image_job_client
+    if _image_job_client is None:
+        _image_job_client = ImageJobClient(on_message=_PrintImageMessage, launch=LaunchImageGenerator)
+    return _image_job_client
@@ -38,6 +38,7 @@ def generate_gemini_images(prompt: str, num_images: int = 3):
     safe = prompt.replace(' ', '_')
     generated = 0
     attempt = 0
+    saved = []
     while generated < num_images and attempt < num_images * 3:
         attempt += 1
         try:
@@ -53,6 +54,7 @@ def generate_gemini_images(prompt: str, num_images: int = 3):
                     filename = f"{safe}{generated}.png"
                     path = os.path.join(folder_path, filename)
                     Image.open(BytesIO(part.inline_data.data)).save(path)
+                    saved.append(path)
                     print(f"[ImageGen] Saved {path}")
                     if generated >= num_images:
                         break
@@ -61,30 +63,16 @@ def generate_gemini_images(prompt: str, num_images: int = 3):
             sleep(1)
     if generated == 0:
         print("[ImageGen] No images generated.")
+    return saved
 
 def GenerateImage(prompt: str):
-    generate_gemini_images(prompt, num_images=3)
+    saved = generate_gemini_images(prompt, num_images=3)
     open_image(prompt)
+    return saved
 
-while True:
-    try:
-        print("Checking ImageGeneration.data...")
-        with open(r"Frontend/Files/ImageGeneration.data", "r") as file:
-            Data: str = file.read().strip()
-        if "," not in Data:
-            sleep(1)
-            continue
-        prompt, Status = Data.split(",", 1)
-        if Status.strip() == "True":
-            print(f"Generating images ...")
-            GenerateImage(prompt=prompt.strip())
-            with open(r"Frontend/Files/ImageGeneration.data", "w") as file:
-                file.write("False,False")
-            break
-        else:
-            sleep(1)
-    
-    except Exception as e:
-        print("Error:", e)
-        sleep(1)
-
+if __name__ == "__main__":
+    # Jobs arrive over the IPC channel from Automation.GenerateImage
+    from Backend.IPC import ImageJobServer
+    server = ImageJobServer(handler=GenerateImage)
+    print(f"[ImageGen] Waiting for jobs on {server.address}")
+    server.serve_forever()
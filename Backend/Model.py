@@ -3,6 +3,10 @@ from rich import print #Nothing else than termina outputs
 from dotenv import dotenv_values #to load environment variables from .env file
 import ssl
 import urllib3
+from Backend.IntentClassifier import GetIntentClassifier
+from Backend.DecisionCache import DecisionCache
+from Backend.ConversationBuffer import ConversationBuffer
+from time import perf_counter
 
 # Disable SSL warnings and verification for corporate networks
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -38,8 +42,8 @@ funcs = [
     "location of", "cricket score", "cricket", "send email", "email", "current temperature"
 ]
 
-#Empty list to store messages
-messages = []
+#Recent user queries, bounded so a long-running assistant doesn't grow without limit
+messages = ConversationBuffer(max_messages=20, max_tokens=1000)
 
 # Preamble for the Guiding the model
 preamble = \
@@ -106,10 +110,40 @@ ChatHistory = [
     {"role":"Chatbot", "message":"general chat with me."}
 ]
 
+DecisionModel = "command-r-plus"
+
+# Cached decisions are tied to the prompt; editing the model, preamble,
+# funcs or history invalidates them
+_decision_cache = None
+
+def GetDecisionCache():
+    global _decision_cache
+    if _decision_cache is None:
+        _decision_cache = DecisionCache(DecisionCache.make_fingerprint(DecisionModel, preamble, funcs, ChatHistory))
+    return _decision_cache
+
+def _CachedDecision(prompt):
+    try:
+        return GetDecisionCache().get(prompt)
+    except Exception as e:
+        print(f"Warning: Decision cache unavailable: {e}")
+        return None
+
+def _CacheDecision(prompt, decision, llm_ms):
+    try:
+        GetDecisionCache().put(prompt, decision, llm_ms)
+    except Exception as e:
+        print(f"Warning: Could not cache decision: {e}")
+
 def FirstLayerDMM(prompt: str = "test"):  # sourcery skip: use-join
     #Add The user's query to the messages list.
     messages.append({"role":"user", "content": f"{prompt}"})
     
+    # Clear-cut queries are decided on-device; only ambiguous ones reach Cohere
+    decision = GetIntentClassifier().classify(prompt)
+    if decision is not None:
+        return decision
+    
     if co is None:
         print("Warning: Cohere client not available, using fallback decision making")
         # Simple fallback decision making
@@ -125,10 +159,16 @@ def FirstLayerDMM(prompt: str = "test"):  # sourcery skip: use-join
         else:
             return ["general " + prompt]
 
+    # Repeated commands reuse the decision Cohere made last time
+    cached = _CachedDecision(prompt)
+    if cached is not None:
+        return cached
+
     try:
+        started = perf_counter()
         #create a streaming chat session.
         stream = co.chat_stream(
-            model="command-r-plus",
+            model=DecisionModel,
             message=prompt,
             temperature=0.7,
             chat_history=ChatHistory,
@@ -164,6 +204,7 @@ def FirstLayerDMM(prompt: str = "test"):  # sourcery skip: use-join
             newresponse = FirstLayerDMM(prompt=prompt)
             return newresponse
         else:
+            _CacheDecision(prompt, response, (perf_counter() - started) * 1000)
             return response
     
     except Exception as e:
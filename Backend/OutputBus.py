@@ -0,0 +1,171 @@
+"""
+Priority Output Bus
+Serializes spoken output so urgent messages preempt and interrupt lower-priority speech
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+PRIORITY_EMERGENCY = 0
+PRIORITY_REMINDER = 1
+PRIORITY_ANSWER = 2
+
+PRIORITY_NAMES = {PRIORITY_EMERGENCY: "emergency", PRIORITY_REMINDER: "reminder", PRIORITY_ANSWER: "answer"}
+
+class OutputRequest:
+    """One message waiting for, or going through, the speaker"""
+
+    def __init__(self, text, priority, seq, func=None):
+        self.text = text
+        self.priority = priority
+        self.seq = seq
+        self.func = func
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self.interruptions = 0
+        self.preempted = False
+        self.result = None
+        self.done = threading.Event()
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+class PriorityOutputBus:
+    """
+    Single speaker shared by every part of the assistant.
+
+    speak(text, func) plays one message and polls func() while playing,
+    stopping when it returns False (the contract of Backend.TextToSpeech.TTS).
+    The bus hands each message a func that returns False as soon as a more
+    urgent message is queued, so an emergency cuts off a chat answer or a
+    reminder within one poll of speak(). Interrupted messages go back on
+    the queue and are replayed once the urgent ones are done.
+
+    speak_urgent, if given, is used instead of speak for messages more
+    urgent than an answer, e.g. to synthesize them on a separate worker.
+    on_interrupt() is called when a message is cut off, so speech prepared
+    for the rest of it can be dropped.
+    """
+
+    def __init__(self, speak, replay_interrupted=True, history=200, speak_urgent=None, on_interrupt=None):
+        self._speak = speak
+        self._speak_urgent = speak_urgent
+        self.on_interrupt = on_interrupt
+        self.replay_interrupted = replay_interrupted
+        self._queue = []
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._worker = None
+        self._running = True
+        self.current = None
+        self.stats = {"spoken": 0, "interrupted": 0, "failed": 0}
+        # Submit-to-start latency per priority, seconds
+        self.start_latency = {priority: deque(maxlen=history) for priority in PRIORITY_NAMES}
+
+    def submit(self, text, priority=PRIORITY_ANSWER, func=None):
+        """Queue text for speaking and return its request without waiting"""
+        request = OutputRequest(text, priority, next(self._seq), func)
+        with self._condition:
+            heapq.heappush(self._queue, request)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+            self._condition.notify()
+        return request
+
+    def say(self, text, priority=PRIORITY_ANSWER, func=None, wait=True, timeout=None):
+        """Queue text; by default block until it has been spoken"""
+        request = self.submit(text, priority, func)
+        if wait:
+            request.wait(timeout)
+        return request
+
+    def _should_continue(self, request):
+        def check(r=None):
+            # TTS calls func(False) once playback ends; pass that through
+            if r is not None:
+                return request.func(r) if request.func else True
+            with self._condition:
+                preempted = bool(self._queue) and self._queue[0].priority < request.priority
+                if preempted:
+                    request.preempted = True
+            if preempted or (request.func is not None and request.func() == False):
+                self._interrupted()
+                return False
+            return True
+        return check
+
+    def _interrupted(self):
+        if self.on_interrupt is None:
+            return
+        try:
+            self.on_interrupt()
+        except Exception as e:
+            print(f"Output bus interrupt handler failed: {e}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                request = heapq.heappop(self._queue)
+                self.current = request
+
+            request.preempted = False
+            if request.started_at is None:
+                request.started_at = time.perf_counter()
+                self.start_latency.setdefault(request.priority, deque(maxlen=200)).append(
+                    request.started_at - request.submitted_at)
+
+            try:
+                speak = self._speak
+                if self._speak_urgent is not None and request.priority < PRIORITY_ANSWER:
+                    speak = self._speak_urgent
+                request.result = speak(request.text, self._should_continue(request))
+            except Exception as e:
+                print(f"Output bus speaker failed: {e}")
+                self.stats["failed"] += 1
+
+            with self._condition:
+                self.current = None
+                if request.preempted:
+                    request.interruptions += 1
+                    self.stats["interrupted"] += 1
+                    if self.replay_interrupted:
+                        # Same seq, so it goes back ahead of later messages of its priority
+                        heapq.heappush(self._queue, request)
+                        continue
+                self.stats["spoken"] += 1
+
+            request.finished_at = time.perf_counter()
+            request.done.set()
+
+    def pending(self):
+        """Number of queued messages, not counting the one playing"""
+        with self._condition:
+            return len(self._queue)
+
+    def get_stats(self):
+        """Counts and worst submit-to-start latency per priority"""
+        with self._condition:
+            stats = dict(self.stats)
+            stats["pending"] = len(self._queue)
+        for priority, samples in self.start_latency.items():
+            if samples:
+                stats[f"{PRIORITY_NAMES.get(priority, priority)}_max_start_ms"] = max(samples) * 1000
+        return stats
+
+    def shutdown(self):
+        """Stop the worker once the current message finishes"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
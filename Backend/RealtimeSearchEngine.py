@@ -5,12 +5,14 @@ Here we are searching the realtime data, and giving it to chatbot to summarise
 """
 from googlesearch import search
 from groq import Groq
-from json import dump, load
 import datetime
+import threading
 from dotenv import dotenv_values
 import requests
-from bs4 import BeautifulSoup
-import re
+from Backend.ContextWindow import GetContextWindow
+from Backend.ChatStore import GetChatStore
+from Backend.WebFetcher import GetWebFetcher
+from Backend.SearchCache import GetSearchCache
 
 env_vars = dotenv_values(".env")  # Load environment variables from .env file
 Username = env_vars.get("Username")
@@ -19,57 +21,40 @@ GroqAPIKey = env_vars.get("GroqAPIKey")
 GOOGLE_API_KEY = env_vars.get("GOOGLE_API_KEY")
 SEARCH_ENGINE_ID = env_vars.get("SEARCH_ENGINE_ID")
 
-# Init the Groq
-client = Groq(api_key=GroqAPIKey)
+# The Groq client is created on first use, so importing this module needs no API key
+_client = None
+_client_lock = threading.Lock()
+
+def GetClient():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = Groq(api_key=GroqAPIKey)
+    return _client
 
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which has real-time up-to-date information from the internet.
 *** Provide Answers In a Professional Way, make sure to add full stops, commas, question marks, and use proper grammar.***
 *** Just answer the question from the provided data in a professional way. ***"""
 
-try:
-    with open(r'Data\ChatLog.json', 'r') as file:
-        messages = load(file)
-except FileNotFoundError:
-    with open(r'Data\ChatLog.json', 'w') as file:
-        dump([], file)
-
-def _clean_text(text: str) -> str:
-    if not text:
-        return ""
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
 def _fallback_scrape(query: str, max_results: int = 5):
-    results = []
+    # A few spare URLs, so slow or empty pages don't leave us short
     try:
-        for url in search(query, num_results=max_results):  # googlesearch-python
-            try:
-                r = requests.get(url, timeout=6, headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-                })
-                if r.status_code != 200:
-                    continue
-                soup = BeautifulSoup(r.text, 'html.parser')
-                title = soup.title.string if soup.title else url
-                # Grab first meaningful paragraph/text chunk
-                para = ''
-                for p in soup.find_all(['p']):
-                    txt = _clean_text(p.get_text())
-                    if len(txt.split()) > 5:
-                        para = txt
-                        break
-                if not para:
-                    para = "No snippet available."
-                results.append({"title": _clean_text(title), "snippet": para})
-            except Exception:
-                continue
-            if len(results) >= max_results:
-                break
+        urls = list(search(query, num_results=max_results + 3))  # googlesearch-python
     except Exception:
-        pass
-    return results
+        return []
+    # Fetched in parallel under one deadline; the first good pages win
+    return GetWebFetcher().fetch(urls, max_results)
 
 def GoogleSearch(query):
+    """Search results for query, from the local cache when they are fresh enough for its kind."""
+    try:
+        return GetSearchCache().get_or_fetch(query, SearchWeb,
+                                             should_cache=lambda answer: "No results found" not in answer)
+    except Exception as e:
+        print(f"[RealtimeSearch] Search cache unavailable: {e}")
+        return SearchWeb(query)
+
+def SearchWeb(query):
     """Primary: Google Custom Search API. Fallback: lightweight scraping via googlesearch-python."""
     Answer = f"'{query}' are:\n[start]\n"
 
@@ -152,21 +137,29 @@ def Info():
     data += f"Time: {hour} hours, {minute} minutes\n"
     return data
 
-def RealtimeSearchEngine(prompt):  # sourcery skip: use-join
-    global SystemChatBot, messages
-    with open(r'Data/ChatLog.json', 'r') as file:
-        messages = load(file)
+def BuildPrompt(search_result, history, offset=0):
+    """
+    Messages for one realtime query. Built fresh on every call and never
+    stored, so concurrent queries each see only their own search results.
+    """
+    return (SystemChatBot
+            + [{"role": "system", "content": search_result}, {"role": "system", "content": Info()}]
+            + GetContextWindow().build(history, offset=offset))
+
+def RealtimeSearchEngine(prompt, on_token=None):  # sourcery skip: use-join
+    # on_token(text), if given, receives each piece of the answer as it streams in.
+    # Safe to call from several threads at once: all per-query state is local.
+    chat_store = GetChatStore()
+    messages, offset = chat_store.snapshot()
     messages.append({"role": "user", "content": f"{prompt}"})
 
     search_result = GoogleSearch(prompt)
     if "No results found" in search_result:
         return "I couldn't find reliable web results for that query right now. Try rephrasing or a more specific topic."
 
-    SystemChatBot.append({"role": "system", "content": search_result})
-
-    completion = client.chat.completions.create(
+    completion = GetClient().chat.completions.create(
         model="llama-3.3-70b-versatile",
-        messages=SystemChatBot + [{"role" : "system", "content" : Info()}] + messages,
+        messages=BuildPrompt(search_result, messages, offset),
         temperature=0.7,
         max_tokens= 2048,
         top_p=1,
@@ -179,17 +172,13 @@ def RealtimeSearchEngine(prompt):  # sourcery skip: use-join
     for chunk in completion:
         if chunk.choices[0].delta.content:
             Answer += chunk.choices[0].delta.content
+            if on_token is not None:
+                on_token(chunk.choices[0].delta.content)
         
     Answer = Answer.strip().replace("</s>", "")
-    messages.append({"role": "assistant" , "content":Answer})
-
-    with open(r"Data/ChatLog.json", 'w') as file:
-        dump(messages, file, indent=4)
-
-    SystemChatBot.pop()
+    chat_store.extend([messages[-1], {"role": "assistant" , "content":Answer}])
     return AnswerModifier(answer=Answer)
 
-
 if __name__ == "__main__":
     while True:
         prompt = input("\nEnter your Query: ")
@@ -0,0 +1,232 @@
+"""
+Search Result Cache
+Persistent cache of realtime search results keyed by normalized query, with
+freshness tiers per kind of question and stale-while-revalidate refresh
+"""
+
+import os
+import re
+import time
+import sqlite3
+import threading
+from Backend.DecisionCache import DecisionCache
+
+# How long results stay fresh, and how much longer a stale copy may still be
+# served while a refresh runs in the background (seconds)
+FRESHNESS_TIERS = {
+    "live": {"fresh": 60, "stale": 5 * 60},
+    "news": {"fresh": 15 * 60, "stale": 2 * 3600},
+    "general": {"fresh": 6 * 3600, "stale": 24 * 3600},
+    "encyclopedic": {"fresh": 7 * 24 * 3600, "stale": 30 * 24 * 3600},
+}
+
+# Checked in this order; the first tier with a matching pattern wins
+TIER_PATTERNS = [
+    ("live", r"\b(score|scores|live|stock|stocks|prices?|rates?|cost of|weather|temperature|"
+             r"forecast|right now|currently|traffic)\b"),
+    # Office holders change with elections, so they go out of date like news
+    ("news", r"\b(news|headlines?|latest|recent|recently|update|updates|today|tonight|yesterday|"
+             r"this week|breaking|election|announced|current|president|prime minister|chief minister|"
+             r"governor|mayor)\b"),
+    ("encyclopedic", r"\b(who was|history of|biography|born|invented|founded|discovered|meaning of|"
+                     r"definition|capital of|what is an?|what are|how does|how do|why do|why does)\b"),
+]
+
+def classify_query(query):
+    """Freshness tier for a search query"""
+    text = query.lower()
+    for tier, pattern in TIER_PATTERNS:
+        if re.search(pattern, text):
+            return tier
+    return "general"
+
+class SearchCache:
+    """
+    Query -> search result text, stored in SQLite.
+
+    Each entry gets the freshness tier of its query. Fresh entries are
+    returned as is; stale ones are returned too, but trigger one
+    background refresh; past the stale window they are dropped and the
+    caller fetches. The least recently used entries are evicted beyond
+    max_entries.
+    """
+
+    def __init__(self, db_path=os.path.join("Data", "search_cache.db"), max_entries=300, tiers=None):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.tiers = tiers or FRESHNESS_TIERS
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.metrics = {"hits": 0, "stale_hits": 0, "misses": 0, "expired": 0, "evictions": 0,
+                        "refreshes": 0, "refresh_failed": 0, "not_cached": 0}
+
+        self._ensure_cache_exists()
+
+    def _ensure_cache_exists(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    query_key TEXT PRIMARY KEY,
+                    tier TEXT,
+                    result TEXT,
+                    fetched_at REAL,
+                    last_access REAL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_search_cache_access
+                ON search_cache (last_access)
+            ''')
+            conn.commit()
+
+    @staticmethod
+    def make_key(query):
+        return DecisionCache.normalize_query(query)
+
+    def lookup(self, query):
+        """(result, "fresh" | "stale") for query, or (None, None)"""
+        key = self.make_key(query)
+        if not key:
+            return None, None
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT result, tier, fetched_at FROM search_cache WHERE query_key = ?', (key,))
+            row = cursor.fetchone()
+            if not row:
+                return None, None
+
+            result, tier, fetched_at = row
+            limits = self.tiers.get(tier, self.tiers["general"])
+            age = now - fetched_at
+            if age > limits["fresh"] + limits["stale"]:
+                cursor.execute('DELETE FROM search_cache WHERE query_key = ?', (key,))
+                conn.commit()
+                self.record("expired")
+                return None, None
+
+            cursor.execute('UPDATE search_cache SET last_access = ? WHERE query_key = ?', (now, key))
+            conn.commit()
+        return result, "fresh" if age <= limits["fresh"] else "stale"
+
+    def put(self, query, result):
+        key = self.make_key(query)
+        if not key:
+            return
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO search_cache (query_key, tier, result, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (key, classify_query(query), result, now, now))
+
+            cursor.execute('SELECT COUNT(*) FROM search_cache')
+            overflow = cursor.fetchone()[0] - self.max_entries
+            if overflow > 0:
+                cursor.execute('''
+                    DELETE FROM search_cache WHERE query_key IN (
+                        SELECT query_key FROM search_cache ORDER BY last_access ASC LIMIT ?
+                    )
+                ''', (overflow,))
+                self.record("evictions", overflow)
+
+            conn.commit()
+
+    def get_or_fetch(self, query, fetch, should_cache=bool):
+        """
+        Cached result for query, calling fetch(query) on a miss.
+
+        should_cache(result) decides whether a fetched result is worth
+        keeping (e.g. not an error or an empty search).
+        """
+        result, state = self.lookup(query)
+        if state == "fresh":
+            self.record("hits")
+            return result
+        if state == "stale":
+            self.record("stale_hits")
+            self._refresh_in_background(query, fetch, should_cache)
+            return result
+
+        self.record("misses")
+        result = fetch(query)
+        self._store(query, result, should_cache)
+        return result
+
+    def _store(self, query, result, should_cache):
+        if should_cache(result):
+            self.put(query, result)
+        else:
+            self.record("not_cached")
+
+    def _refresh_in_background(self, query, fetch, should_cache):
+        key = self.make_key(query)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._store(query, fetch(query), should_cache)
+                self.record("refreshes")
+            except Exception as e:
+                print(f"Warning: Background search refresh failed: {e}")
+                self.record("refresh_failed")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def wait_for_refreshes(self, timeout=5.0):
+        """Block until background refreshes finish; True if none are left"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._refreshing:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def record(self, metric, count=1):
+        with self._lock:
+            self.metrics[metric] += count
+
+    def clear(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM search_cache')
+            conn.commit()
+
+    def get_stats(self):
+        """Hit counts and hit rate, stale hits counting as hits"""
+        with self._lock:
+            stats = dict(self.metrics)
+
+        with sqlite3.connect(self.db_path) as conn:
+            stats["entries"] = conn.execute('SELECT COUNT(*) FROM search_cache').fetchone()[0]
+            stats["entries_by_tier"] = dict(conn.execute('SELECT tier, COUNT(*) FROM search_cache GROUP BY tier'))
+
+        served = stats["hits"] + stats["stale_hits"]
+        lookups = served + stats["misses"]
+        stats["hit_rate"] = served / lookups if lookups else 0.0
+        return stats
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+def GetSearchCache():
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache()
+    return _search_cache
@@ -8,9 +8,12 @@ Provides basic speech recognition functionality for Jarvis
 import speech_recognition as sr
 import time
 
-def SpeechRecognition():
+def SpeechRecognition(on_partial=None):
     """
     Simple speech recognition function using PyAudio and Google Speech Recognition
+    
+    Google's recognizer only returns whole utterances, so on_partial is
+    accepted for compatibility with Backend.SpeechToText but never called.
     """
     try:
         # Initialize recognizer
@@ -0,0 +1,177 @@
+"""
+Speech Pipeline
+Speaks text sentence by sentence, synthesizing the next sentence while the
+current one plays, with audio kept in memory and time to first audio and
+the gaps between sentences measured
+"""
+
+import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from Backend.AnswerStream import SentenceSplitter
+
+def split_sentences(text, min_chars=20):
+    splitter = SentenceSplitter(min_chars=min_chars)
+    sentences = splitter.feed(str(text))
+    rest = splitter.flush()
+    return sentences + ([rest] if rest else [])
+
+class SpeechPipeline:
+    """
+    Sentence-level text to speech.
+
+    synthesize(sentence) returns the audio for one sentence as bytes;
+    player plays it with play(audio), busy() and stop(). speak(text, func)
+    keeps prefetch sentences synthesizing ahead of the one playing, on a
+    single background worker so they come out in order.
+
+    speak() follows the contract of Backend.TextToSpeech.TTS: func() is
+    polled while waiting and playing and stops speech when it returns
+    False, func(False) is called at the end, and the result is True if
+    everything was spoken.
+
+    prepare(text) starts synthesis before the text is spoken, e.g. for the
+    next sentence of a streamed answer while the output bus is still
+    playing the previous one; up to cache_size prepared sentences are kept.
+    cancel_prepared() drops them, e.g. when the answer is cut off.
+
+    speak(text, func, urgent=True) synthesizes on a worker of its own, so
+    an emergency never waits behind prepared or prefetched sentences.
+    """
+
+    def __init__(self, synthesize, player, prefetch=1, poll_interval=0.1, cache_size=8,
+                 min_chars=20, history=100):
+        self.synthesize = synthesize
+        self.player = player
+        self.prefetch = prefetch
+        self.poll_interval = poll_interval
+        self.cache_size = cache_size
+        self.min_chars = min_chars
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-synth")
+        self._urgent_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-urgent")
+        self._lock = threading.Lock()
+        self._prepared = OrderedDict()
+        self.stats = {"utterances": 0, "sentences": 0, "interrupted": 0, "failed": 0, "prepared_hits": 0,
+                      "prepared_cancelled": 0}
+        # Seconds from speak() to the first sound, between sentences, and per synthesis
+        self.first_audio = deque(maxlen=history)
+        self.gaps = deque(maxlen=history)
+        self.synthesis_times = deque(maxlen=history)
+
+    def _synthesize_timed(self, sentence):
+        started = time.perf_counter()
+        audio = self.synthesize(sentence)
+        with self._lock:
+            self.synthesis_times.append(time.perf_counter() - started)
+        return audio
+
+    def prepare(self, text):
+        """Start synthesizing text now, ahead of a later speak(text)"""
+        for sentence in split_sentences(text, self.min_chars):
+            with self._lock:
+                if sentence in self._prepared:
+                    continue
+                self._prepared[sentence] = self._executor.submit(self._synthesize_timed, sentence)
+                while len(self._prepared) > self.cache_size:
+                    _, stale = self._prepared.popitem(last=False)
+                    stale.cancel()
+
+    def cancel_prepared(self):
+        """Drop every prepared sentence, cancelling the ones not yet synthesizing"""
+        with self._lock:
+            prepared, self._prepared = self._prepared, OrderedDict()
+            for future in prepared.values():
+                if future.cancel():
+                    self.stats["prepared_cancelled"] += 1
+
+    def _synthesis(self, sentence, urgent=False):
+        if urgent:
+            return self._urgent_executor.submit(self._synthesize_timed, sentence)
+        with self._lock:
+            future = self._prepared.pop(sentence, None)
+            if future is not None and not future.cancelled():
+                self.stats["prepared_hits"] += 1
+                return future
+        return self._executor.submit(self._synthesize_timed, sentence)
+
+    def _wait_for_audio(self, future, func):
+        while True:
+            if func() == False:
+                return None
+            try:
+                return future.result(timeout=self.poll_interval)
+            except FutureTimeout:
+                continue
+
+    def speak(self, text, func=lambda r=None: True, urgent=False):
+        started = time.perf_counter()
+        sentences = split_sentences(text, self.min_chars)
+        pending = deque()
+        queued, last_end = 0, None
+        interrupted = False
+
+        try:
+            for _ in sentences:
+                # The sentence about to play plus `prefetch` more stay in synthesis
+                while queued < len(sentences) and len(pending) <= self.prefetch:
+                    pending.append(self._synthesis(sentences[queued], urgent))
+                    queued += 1
+
+                audio = self._wait_for_audio(pending.popleft(), func)
+                if audio is None:
+                    interrupted = True
+                    return False
+
+                now = time.perf_counter()
+                with self._lock:
+                    if last_end is None:
+                        self.first_audio.append(now - started)
+                    else:
+                        self.gaps.append(now - last_end)
+                self.player.play(audio)
+
+                while self.player.busy():
+                    if func() == False:
+                        self.player.stop()
+                        interrupted = True
+                        return False
+                    time.sleep(self.poll_interval)
+                last_end = time.perf_counter()
+                self._count("sentences")
+            return True
+
+        except Exception as e:
+            print(f"Warning: Speech failed: {e}")
+            self._count("failed")
+            return False
+
+        finally:
+            for future in pending:
+                future.cancel()
+            self._count("utterances")
+            if interrupted:
+                self._count("interrupted")
+            func(False)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get_stats(self):
+        """Counts, plus time to first audio, sentence gaps and synthesis time in ms"""
+        with self._lock:
+            stats = dict(self.stats)
+            samples = {"first_audio": list(self.first_audio), "gap": list(self.gaps),
+                       "synthesis": list(self.synthesis_times)}
+        for name, values in samples.items():
+            if values:
+                stats[f"last_{name}_ms"] = values[-1] * 1000
+                stats[f"avg_{name}_ms"] = sum(values) / len(values) * 1000
+                stats[f"max_{name}_ms"] = max(values) * 1000
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._urgent_executor.shutdown(wait=False, cancel_futures=True)
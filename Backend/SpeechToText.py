@@ -1,10 +1,6 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import dotenv_values
 import os
+import threading
 import mtranslate as mt
 import speech_recognition as sr
 
@@ -24,18 +20,29 @@ HtmlCode = \
     <button id="start" onclick="startRecognition()">Start Recognition</button>
     <button id="end" onclick="stopRecognition()">Stop Recognition</button>
     <p id="output"></p>
+    <p id="partial"></p>
     <script>
         const output = document.getElementById('output');
+        const partial = document.getElementById('partial');
         let recognition;
 
         function startRecognition() {
             recognition = new webkitSpeechRecognition() || new SpeechRecognition();
             recognition.lang = '';
             recognition.continuous = true;
+            recognition.interimResults = true;
 
             recognition.onresult = function(event) {
-                const transcript = event.results[event.results.length - 1][0].transcript;
-                output.textContent += transcript;
+                let interim = '';
+                for (let i = event.resultIndex; i < event.results.length; i++) {
+                    const transcript = event.results[i][0].transcript;
+                    if (event.results[i].isFinal) {
+                        output.textContent += transcript;
+                    } else {
+                        interim += transcript;
+                    }
+                }
+                partial.textContent = interim;
             };
 
             recognition.onend = function() {
@@ -47,6 +54,7 @@ HtmlCode = \
         function stopRecognition() {
             recognition.stop();
             output.innerHTML = "";
+            partial.innerHTML = "";
         }
     </script>
 </body>
@@ -54,33 +62,56 @@ HtmlCode = \
 '''
 
 HtmlCode = str(HtmlCode).replace("recognition.lang = '';", f"recognition.lang = '{InputLang}'")
-with open(r"Data/Voice.html", 'w') as file:
-    file.write(HtmlCode)
 
 current_dir = os.getcwd()
 Link = f"{current_dir}\Data\Voice.html"
 
-chrome_options = Options()
-user_agents = "Edg/137.0.3296.83 Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/89.0.142.86"
-chrome_options.add_argument(f'user-agent={user_agents}')
-chrome_options.add_argument("--use-fake-ui-for-media-stream")
-chrome_options.add_argument("--use-fake-device-for-media-stream")
-chrome_options.add_argument("--headless=new")
-
-# Handle SSL issues with WebDriver manager
-try:
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Edge(service=service, options=chrome_options)
-except Exception as e:
-    print(f"Warning: WebDriver manager failed due to SSL issue: {e}")
-    print("Falling back to speech_recognition library...")
-    # Use speech_recognition as fallback
-    import speech_recognition as sr
-    driver = None
+# The headless browser is started on first use (or by Main.py's warm-up),
+# not at import; it takes seconds and may have to download a driver
+driver = None
+_driver_started = False
+_driver_lock = threading.Lock()
+
+def _StartDriver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    with open(r"Data/Voice.html", 'w') as file:
+        file.write(HtmlCode)
+
+    chrome_options = Options()
+    user_agents = "Edg/137.0.3296.83 Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/89.0.142.86"
+    chrome_options.add_argument(f'user-agent={user_agents}')
+    chrome_options.add_argument("--use-fake-ui-for-media-stream")
+    chrome_options.add_argument("--use-fake-device-for-media-stream")
+    chrome_options.add_argument("--headless=new")
+
+    # Handle SSL issues with WebDriver manager
+    try:
+        service = Service(ChromeDriverManager().install())
+        return webdriver.Edge(service=service, options=chrome_options)
+    except Exception as e:
+        print(f"Warning: WebDriver manager failed due to SSL issue: {e}")
+        print("Falling back to speech_recognition library...")
+        return None
+
+def GetDriver():
+    # Returns None when the browser could not be started
+    global driver, _driver_started
+    with _driver_lock:
+        if not _driver_started:
+            _driver_started = True
+            driver = _StartDriver()
+    return driver
 
 TempDirPath = rf"{current_dir}\Frontend\Files"
 
 def SetAssistantStatus(Status):
+    # Publish to the GUI's event bus; the file is kept for outside readers
+    from Frontend.EventBus import GetEventBus, TOPIC_STATUS
+    GetEventBus().publish(TOPIC_STATUS, Status)
     with open(rf"{TempDirPath}\Status.data", 'w', encoding='utf-8') as file:
         file.write(Status)
 def QueryModifier(Query):
@@ -108,18 +139,34 @@ def UniversalTranslator(Text):
       english_trans = mt.translate(Text, 'en-IN', 'auto')
       return english_trans.capitalize()
 
-def SpeechRecognition():
+def SpeechRecognition(on_partial=None):
+    # on_partial(text) receives the running transcript (final + interim words)
+    # while the user is still speaking; only English text is streamed
+    if on_partial is not None and "en" not in InputLang.lower():
+        on_partial = None
+
+    driver = GetDriver()
     if driver is not None:
         # Use web-based speech recognition
+        from selenium.webdriver.common.by import By
         try:
             driver.get(f"file:///{Link}")
             driver.find_element(by=By.ID, value="start").click()
             timeout = 30
             import time
             start = time.time()
+            LastHeard = ""
             while True:
                 try:
                     Text = driver.find_element(by=By.ID, value='output').text
+                    if on_partial is not None:
+                        Heard = f"{Text} {driver.find_element(by=By.ID, value='partial').text}".strip()
+                        if Heard and Heard != LastHeard:
+                            LastHeard = Heard
+                            try:
+                                on_partial(Heard)
+                            except Exception as e:
+                                print(f"Partial transcript handler failed: {e}")
                     if Text:
                         driver.find_element(by=By.ID, value="end").click()
                         if( (InputLang.lower() == "en") or ("en" in InputLang.lower())):
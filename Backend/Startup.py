@@ -0,0 +1,131 @@
+"""
+Startup Warm-up
+Runs slow initialization (STT driver, LLM clients, healthcare DB, TTS engine)
+in background threads while the GUI comes up, with readiness flags and a
+per-phase timing profile
+"""
+
+import threading
+import traceback
+from contextlib import contextmanager
+from time import perf_counter
+
+class StartupProfiler:
+    """Records when each startup phase ran, on which thread and for how long"""
+
+    def __init__(self):
+        self.started_at = perf_counter()
+        self.phases = []
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return perf_counter() - self.started_at
+
+    @contextmanager
+    def phase(self, name):
+        start = self.elapsed()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            self._record(name, start, self.elapsed() - start, status)
+
+    def mark(self, name):
+        """Record an instant, e.g. the moment the GUI is launched"""
+        self._record(name, self.elapsed(), 0.0, "mark")
+
+    def _record(self, name, start, duration, status):
+        with self._lock:
+            self.phases.append({
+                "name": name, "start": start, "duration": duration,
+                "thread": threading.current_thread().name, "status": status
+            })
+
+    def report(self):
+        """Per-phase timing breakdown, in start order"""
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p["start"])
+        wall = max((p["start"] + p["duration"] for p in phases), default=0.0)
+        busy = sum(p["duration"] for p in phases)
+
+        lines = [f"Startup profile: {wall:.3f}s wall clock, {busy:.3f}s of work",
+                 f"{'phase':<22}{'start':>9}{'duration':>10}  {'thread':<18}status"]
+        for p in phases:
+            lines.append(f"{p['name']:<22}{p['start']:>8.3f}s{p['duration']:>9.3f}s  "
+                         f"{p['thread']:<18}{p['status']}")
+        return "\n".join(lines)
+
+class WarmUp:
+    """
+    Starts named initialization tasks on their own threads.
+
+    Each task gets a readiness flag; callers check is_ready(name) to use a
+    feature only once it is up, or wait(name) to block until it is. A task
+    that raises is reported and marked done but not ready, so waiting on it
+    never hangs.
+    """
+
+    def __init__(self, profiler=None):
+        self.profiler = profiler or StartupProfiler()
+        self._done = {}
+        self._results = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def start(self, name, func):
+        with self._lock:
+            if name in self._done:
+                return self._done[name]
+            done = self._done[name] = threading.Event()
+
+        def run():
+            try:
+                with self.profiler.phase(name):
+                    self._results[name] = func()
+            except Exception as e:
+                self._errors[name] = e
+                print(f"Warm-up '{name}' failed: {e}")
+                traceback.print_exc()
+            finally:
+                done.set()
+
+        threading.Thread(target=run, name=f"warmup-{name}", daemon=True).start()
+        return done
+
+    def is_ready(self, name):
+        """True once the task has finished without raising"""
+        done = self._done.get(name)
+        return done is not None and done.is_set() and name not in self._errors
+
+    def wait(self, name, timeout=None):
+        """Block until the task finishes; True if it succeeded"""
+        done = self._done.get(name)
+        if done is None or not done.wait(timeout):
+            return False
+        return name not in self._errors
+
+    def wait_all(self, timeout=None):
+        """Block until every task has finished; True if all succeeded"""
+        deadline = None if timeout is None else perf_counter() + timeout
+        for name in list(self._done):
+            remaining = None if deadline is None else max(0.0, deadline - perf_counter())
+            self.wait(name, remaining)
+        return not self.pending() and not self._errors
+
+    def pending(self):
+        """Names of tasks still running"""
+        return [name for name, done in self._done.items() if not done.is_set()]
+
+    def result(self, name):
+        return self._results.get(name)
+
+    def error(self, name):
+        return self._errors.get(name)
+
+    def status(self):
+        return {name: ("running" if not done.is_set() else
+                       "failed" if name in self._errors else "ready")
+                for name, done in self._done.items()}
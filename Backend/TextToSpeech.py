@@ -2,82 +2,132 @@ import pygame
 import random
 import asyncio
 import edge_tts
-import os
+import io
+import threading
 from dotenv import dotenv_values
+from Backend.OutputBus import PriorityOutputBus, PRIORITY_ANSWER
+from Backend.SpeechPipeline import SpeechPipeline
 
 env_vars = dotenv_values('.env')
 AssistantVoice = env_vars.get("AssistantVoice")
 
 
-async def SaveAudioFile(text):
-    voice_sound_path = r"Data\speech.mp3"
-    if os.path.exists(path=voice_sound_path): os.remove(voice_sound_path)
+class EdgeSynthesizer:
+    """Text -> mp3 bytes from edge_tts, collected in memory instead of written to Data\\speech.mp3"""
 
-    communicate = edge_tts.Communicate(text, AssistantVoice, pitch="+5Hz", rate="+13%")
-    await communicate.save(r'Data\\speech.mp3')
+    def __init__(self, voice=None, pitch="+5Hz", rate="+13%"):
+        self.voice = voice or AssistantVoice
+        self.pitch = pitch
+        self.rate = rate
+
+    async def _synthesize(self, text):
+        audio = bytearray()
+        communicate = edge_tts.Communicate(text, self.voice, pitch=self.pitch, rate=self.rate)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+        return bytes(audio)
+
+    def __call__(self, text):
+        return asyncio.run(self._synthesize(text))
+
+class PygamePlayer:
+    """Plays mp3 bytes through pygame.mixer.music; the mixer is initialized once and left open"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def open(self):
+        with self._lock:
+            if not self._ready:
+                pygame.mixer.init()
+                self._ready = True
+
+    def play(self, audio):
+        self.open()
+        pygame.mixer.music.load(io.BytesIO(audio), "mp3")
+        pygame.mixer.music.play()
+
+    def busy(self):
+        return pygame.mixer.music.get_busy()
+
+    def stop(self):
+        pygame.mixer.music.stop()
+
+_speech_pipeline = None
+_speech_pipeline_lock = threading.Lock()
+
+def GetSpeechPipeline():
+    global _speech_pipeline
+    with _speech_pipeline_lock:
+        if _speech_pipeline is None:
+            _speech_pipeline = SpeechPipeline(synthesize=EdgeSynthesizer(), player=PygamePlayer())
+    return _speech_pipeline
 
 def TTS(Text, func= lambda r=None: True):
-    while True:
-        try:
-            asyncio.run(SaveAudioFile(Text))
-            
-            #Init the speaker.
-            pygame.mixer.init()
-
-            pygame.mixer.music.load("Data\\speech.mp3")
-            pygame.mixer.music.play()
-
-            while pygame.mixer.music.get_busy():
-                if func() == False:
-                    break
-                pygame.time.Clock().tick(10)
-            return True
-        
-        except Exception as e:
-            print("{:-^30}".format("Error"))
-            print(e)
-            print("{:-^30}".format("Error"))
-            break
-        finally:
-            try:
-                func(False)
-                pygame.mixer.music.stop()
-                pygame.mixer.quit()
-
-            except Exception as e:
-                print("{:-^30}".format("Error"))
-                print(e)
-                print("{:-^30}".format("Error"))
-                break
-def TextToSpeech(Text, func=lambda r=None: True):
+    # Sentence by sentence, the next one synthesizing while the current one plays
+    return GetSpeechPipeline().speak(Text, func)
+
+def UrgentTTS(Text, func= lambda r=None: True):
+    # Emergencies and reminders: synthesized on their own worker, ahead of prepared answer speech
+    return GetSpeechPipeline().speak(Text, func, urgent=True)
+
+def CancelPreparedSpeech():
+    GetSpeechPipeline().cancel_prepared()
+
+def PrepareSpeech(Text):
+    # Start synthesizing a sentence that will be spoken shortly
+    try:
+        GetSpeechPipeline().prepare(Text)
+    except Exception as e:
+        print(f"Warning: Could not prepare speech: {e}")
+
+# Every spoken message goes through one bus so emergencies can interrupt other speech
+_output_bus = None
+
+def GetOutputBus():
+    global _output_bus
+    if _output_bus is None:
+        _output_bus = PriorityOutputBus(speak=TTS, speak_urgent=UrgentTTS, on_interrupt=CancelPreparedSpeech)
+    return _output_bus
+
+# Said instead of the rest of a long answer, which stays on the chat screen
+SCREEN_NOTICES = [
+    "The rest of the result has been printed to the chat screen, kindly check it out sir.",
+    "The rest of the text is now on the chat screen, sir, please check it.",
+    "You can see the rest of the text on the chat screen, sir.",
+    "The remaining part of the text is now on the chat screen, sir.",
+    "Sir, you'll find more text on the chat screen for you to see.",
+    "The rest of the answer is now on the chat screen, sir.",
+    "Sir, please look at the chat screen, the rest of the answer is there.",
+    "You'll find the complete answer on the chat screen, sir.",
+    "The next part of the text is on the chat screen, sir.",
+    "Sir, please check the chat screen for more information.",
+    "There's more text on the chat screen for you, sir.",
+    "Sir, take a look at the chat screen for additional text.",
+    "You'll find more to read on the chat screen, sir.",
+    "Sir, check the chat screen for the rest of the text.",
+    "The chat screen has the rest of the text, sir.",
+    "There's more to see on the chat screen, sir, please look.",
+    "Sir, the chat screen holds the continuation of the text.",
+    "You'll find the complete answer on the chat screen, kindly check it out sir.",
+    "Please review the chat screen for the rest of the text, sir.",
+    "Sir, look at the chat screen for the complete answer."
+]
+
+def ScreenNotice():
+    return random.choice(SCREEN_NOTICES)
+
+def TextToSpeech(Text, func=lambda r=None: True, priority=PRIORITY_ANSWER, wait=True):
     Data = str(Text).split('.')
-    pygame.mixer.quit()
     if len(Data) > 4 and len(Text) >= 250:
-        responses = [
-        "The rest of the result has been printed to the chat screen, kindly check it out sir.",
-        "The rest of the text is now on the chat screen, sir, please check it.",
-        "You can see the rest of the text on the chat screen, sir.",
-        "The remaining part of the text is now on the chat screen, sir.",
-        "Sir, you'll find more text on the chat screen for you to see.",
-        "The rest of the answer is now on the chat screen, sir.",
-        "Sir, please look at the chat screen, the rest of the answer is there.",
-        "You'll find the complete answer on the chat screen, sir.",
-        "The next part of the text is on the chat screen, sir.",
-        "Sir, please check the chat screen for more information.",
-        "There's more text on the chat screen for you, sir.",
-        "Sir, take a look at the chat screen for additional text.",
-        "You'll find more to read on the chat screen, sir.",
-        "Sir, check the chat screen for the rest of the text.",
-        "The chat screen has the rest of the text, sir.",
-        "There's more to see on the chat screen, sir, please look.",
-        "Sir, the chat screen holds the continuation of the text.",
-        "You'll find the complete answer on the chat screen, kindly check it out sir.",
-        "Please review the chat screen for the rest of the text, sir.",
-        "Sir, look at the chat screen for the complete answer."
-    ]
-        TTS(" ".join(Text.split('.')[0:2]) + '. ' + random.choice(responses), func)
-    else:
-        TTS(Text, func)
+        Text = " ".join(Text.split('.')[0:2]) + '. ' + ScreenNotice()
+    return GetOutputBus().say(Text, priority, func, wait)
+
+def SpeakSentence(Text, func=lambda r=None: True, priority=PRIORITY_ANSWER, wait=True):
+    # One sentence of a streamed answer; AnswerStream decides how much of it to say
+    return GetOutputBus().say(Text, priority, func, wait)
 
 if __name__ == "__main__":
     while True:
@@ -0,0 +1,192 @@
+"""
+Concurrent Web Fetcher
+Fetches search result pages in parallel over one pooled session, under a
+single deadline, and pulls the title and first meaningful paragraph out of
+each page while it downloads, without reading the rest of it
+"""
+
+import time
+import codecs
+import threading
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+
+# Text inside these is never shown on the page
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+class ParagraphExtractor(HTMLParser):
+    """
+    Incremental <title> and <p> extraction.
+
+    feed() the page as it arrives; done becomes True once max_paragraphs
+    paragraphs of at least min_words words have been seen, and the caller
+    can stop downloading.
+    """
+
+    def __init__(self, max_paragraphs=1, min_words=6):
+        super().__init__(convert_charrefs=True)
+        self.max_paragraphs = max_paragraphs
+        self.min_words = min_words
+        self.title = ""
+        self.paragraphs = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._paragraph = None
+
+    @property
+    def done(self):
+        return len(self.paragraphs) >= self.max_paragraphs
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "p":
+            self._end_paragraph()
+            self._paragraph = []
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "p":
+            self._end_paragraph()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self.title += data
+        elif self._paragraph is not None:
+            self._paragraph.append(data)
+
+    def finish(self):
+        """Flush what was fed so far, keeping a paragraph cut off by the end of input"""
+        self.close()
+        self._end_paragraph()
+
+    def _end_paragraph(self):
+        if self._paragraph is None:
+            return
+        text = " ".join("".join(self._paragraph).split())
+        self._paragraph = None
+        if len(text.split()) >= self.min_words and not self.done:
+            self.paragraphs.append(text)
+
+class ConcurrentFetcher:
+    """
+    Pages fetched on a shared thread pool and requests session.
+
+    fetch(urls, max_results) starts every URL at once and returns as soon
+    as max_results pages have yielded a paragraph, or when deadline seconds
+    have passed, with whatever was found by then (in the order of urls).
+    Downloads still running are abandoned at their next chunk.
+    """
+
+    def __init__(self, max_workers=8, deadline=4.0, max_bytes=512 * 1024, chunk_size=16 * 1024,
+                 max_paragraphs=1):
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.max_paragraphs = max_paragraphs
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-fetch")
+        self._lock = threading.Lock()
+        self.stats = {"fetches": 0, "pages": 0, "snippets": 0, "failed": 0, "abandoned": 0, "bytes": 0,
+                      "last_ms": 0.0}
+
+    def fetch(self, urls, max_results=5, deadline=None):
+        """[{"url", "title", "snippet"}] for up to max_results pages"""
+        started = time.monotonic()
+        ends_at = started + (deadline if deadline is not None else self.deadline)
+        stop = threading.Event()
+
+        pending = {self._executor.submit(self._fetch_page, url, ends_at, stop): i for i, url in enumerate(urls)}
+        found = {}
+        while pending and len(found) < max_results:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                result = future.result()
+                if result is not None:
+                    found[index] = result
+
+        # Anything still running gives up at its next chunk
+        stop.set()
+        for future in pending:
+            future.cancel()
+
+        with self._lock:
+            self.stats["fetches"] += 1
+            self.stats["abandoned"] += len(pending)
+            self.stats["last_ms"] = (time.monotonic() - started) * 1000
+        return [found[index] for index in sorted(found)][:max_results]
+
+    def _fetch_page(self, url, ends_at, stop):
+        received = 0
+        try:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0 or stop.is_set():
+                return None
+            with self.session.get(url, stream=True, timeout=(min(remaining, 3.0), remaining)) as response:
+                if response.status_code != 200 or "html" not in response.headers.get("Content-Type", "html"):
+                    self._count("failed")
+                    return None
+
+                extractor = ParagraphExtractor(max_paragraphs=self.max_paragraphs)
+                decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+                for chunk in response.iter_content(self.chunk_size):
+                    received += len(chunk)
+                    extractor.feed(decoder.decode(chunk))
+                    if (extractor.done or received >= self.max_bytes or stop.is_set()
+                            or time.monotonic() >= ends_at):
+                        break
+                extractor.finish()
+        except Exception:
+            self._count("failed")
+            return None
+        finally:
+            self._count("bytes", received)
+
+        self._count("pages")
+        if not extractor.paragraphs:
+            return None
+        self._count("snippets")
+        title = " ".join(extractor.title.split()) or url
+        return {"url": url, "title": title, "snippet": " ".join(extractor.paragraphs)}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+_web_fetcher = None
+
+def GetWebFetcher():
+    global _web_fetcher
+    if _web_fetcher is None:
+        _web_fetcher = ConcurrentFetcher()
+    return _web_fetcher
@@ -0,0 +1,84 @@
+"""
+Assistant Event Bus
+In-process publish/subscribe channel for assistant status, microphone state,
+chat responses and the answer still being streamed, replacing the GUI's polling of Status.data, Mic.data and Responses.data
+"""
+
+import threading
+
+TOPIC_STATUS = "status"
+TOPIC_MIC = "mic"
+TOPIC_RESPONSE = "response"
+# The answer so far while it streams in; the next response replaces it
+TOPIC_STREAM = "stream"
+
+class EventBus:
+    """
+    Thread-safe latest-value channel per topic.
+
+    publish() stores a value and calls the topic's subscribers, but only when
+    the value changed, so a status set on every loop iteration costs nothing
+    downstream. Readers either get() the current value, subscribe() for
+    changes, or block in wait_for() until a value arrives.
+    Subscribers run on the publishing thread; the GUI forwards them to Qt
+    signals so widgets are updated on the GUI thread.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._subscribers = {}
+        self._condition = threading.Condition()
+        self.stats = {"published": 0, "delivered": 0, "unchanged": 0}
+
+    def publish(self, topic, value):
+        """Set a topic's value; returns False if it was already that value"""
+        with self._condition:
+            if topic in self._values and self._values[topic] == value:
+                self.stats["unchanged"] += 1
+                return False
+            self._values[topic] = value
+            self.stats["published"] += 1
+            subscribers = list(self._subscribers.get(topic, ()))
+            self._condition.notify_all()
+
+        for callback in subscribers:
+            try:
+                callback(value)
+                self.stats["delivered"] += 1
+            except Exception as e:
+                print(f"Event bus subscriber for '{topic}' failed: {e}")
+        return True
+
+    def get(self, topic, default=None):
+        with self._condition:
+            return self._values.get(topic, default)
+
+    def has(self, topic):
+        with self._condition:
+            return topic in self._values
+
+    def subscribe(self, topic, callback):
+        """Call callback(value) on every change; returns an unsubscribe function"""
+        with self._condition:
+            self._subscribers.setdefault(topic, []).append(callback)
+
+        def unsubscribe():
+            with self._condition:
+                if callback in self._subscribers.get(topic, []):
+                    self._subscribers[topic].remove(callback)
+        return unsubscribe
+
+    def wait_for(self, topic, value, timeout=None):
+        """Block until the topic holds value; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._values.get(topic) == value, timeout)
+
+_event_bus = None
+_event_bus_lock = threading.Lock()
+
+def GetEventBus():
+    global _event_bus
+    with _event_bus_lock:
+        if _event_bus is None:
+            _event_bus = EventBus()
+    return _event_bus
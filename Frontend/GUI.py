@@ -1,9 +1,11 @@
 from typing import overload
 from PyQt5.QtWidgets import QApplication, QMainWindow, QTextEdit, QStackedWidget, QWidget,QLineEdit, QGridLayout,\
    QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QSizePolicy
-from PyQt5.QtGui import QIcon, QMovie, QColor, QTextCharFormat, QFont, QPixmap, QTextBlockFormat
-from PyQt5.QtCore import Qt, QSize, QTimer
+from PyQt5.QtGui import QIcon, QMovie, QColor, QTextCharFormat, QFont, QPixmap, QTextBlockFormat, QTextCursor
+from PyQt5.QtCore import Qt, QSize, QTimer, QObject, pyqtSignal
 from dotenv import dotenv_values
+from Frontend.EventBus import GetEventBus, TOPIC_STATUS, TOPIC_MIC, TOPIC_RESPONSE, TOPIC_STREAM
+import threading
 import sys
 import os
 
@@ -48,23 +50,41 @@ def QueryModifier(Query):
 
     return new_query.capitalize()
 
+# Status, mic and responses live on the in-process event bus; the widgets get
+# them as Qt signals instead of polling files. The .data files are still
+# written on change, and read once to seed the bus, for anything outside
+# this process that looks at them.
+_state_file_lock = threading.Lock()
+
+def _WriteState(topic, Filename, Value):
+    if GetEventBus().publish(topic, Value):
+        with _state_file_lock:
+            with open(rf"{TempDirPath}\{Filename}", 'w', encoding='utf-8') as file:
+                file.write(Value)
+
+def _ReadState(topic, Filename):
+    bus = GetEventBus()
+    if not bus.has(topic):
+        with open(rf"{TempDirPath}\{Filename}", 'r', encoding='utf-8') as file:
+            bus.publish(topic, file.read().strip())
+    return str(bus.get(topic)).strip()
+
 def SetMicrophoneStatus(Status):
-    with open(rf"{TempDirPath}\Mic.data", 'w', encoding='utf-8') as file:
-        file.write(Status)
+    _WriteState(TOPIC_MIC, "Mic.data", Status)
 
 def GetMicrophoneStatus():
-    with open(rf"{TempDirPath}\Mic.data", 'r', encoding='utf-8') as file:
-        status = file.read().strip()
-    return status
+    return _ReadState(TOPIC_MIC, "Mic.data")
+
+def WaitForMicrophoneStatus(Status, timeout=None):
+    # Blocks until SetMicrophoneStatus(Status); False on timeout
+    GetMicrophoneStatus()
+    return GetEventBus().wait_for(TOPIC_MIC, Status, timeout)
 
 def SetAssistantStatus(Status):
-    with open(rf"{TempDirPath}\Status.data", 'w', encoding='utf-8') as file:
-        file.write(Status)
+    _WriteState(TOPIC_STATUS, "Status.data", Status)
 
 def GetAssistantStatus():
-    with open(rf"{TempDirPath}\Status.data", 'r', encoding='utf-8') as file:
-        status = file.read().strip()
-    return status
+    return _ReadState(TOPIC_STATUS, "Status.data")
 
 def MicButtonInit(): SetMicrophoneStatus("False")
 def MicButtonClosed(): SetMicrophoneStatus("True")
@@ -75,8 +95,39 @@ def GraphicsDirectoryPath(Filename):
 def TempDirectoryPath(Filename):
     return rf"{TempDirPath}\{Filename}"
 def ShowTextToScreen(Text):
-     with open(rf"{TempDirPath}\Responses.data", 'w', encoding='utf-8') as file:
-        file.write(Text)
+    # A complete message replaces the one streaming in, if any, and ends it
+    _WriteState(TOPIC_RESPONSE, "Responses.data", Text)
+    GetEventBus().publish(TOPIC_STREAM, "")
+
+def ShowStreamingText(Text):
+    # The answer so far; the chat shows it as one message that grows in place.
+    # Not written to Responses.data, which only gets complete messages.
+    # An empty Text ends the streamed message where it is.
+    GetEventBus().publish(TOPIC_STREAM, Text)
+
+class AssistantSignals(QObject):
+    # Bus changes re-emitted as Qt signals; queued onto the GUI thread
+    # when published from the backend thread
+    statusChanged = pyqtSignal(str)
+    micChanged = pyqtSignal(str)
+    responseChanged = pyqtSignal(str)
+    streamChanged = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        bus = GetEventBus()
+        bus.subscribe(TOPIC_STATUS, self.statusChanged.emit)
+        bus.subscribe(TOPIC_MIC, self.micChanged.emit)
+        bus.subscribe(TOPIC_RESPONSE, self.responseChanged.emit)
+        bus.subscribe(TOPIC_STREAM, self.streamChanged.emit)
+
+_assistant_signals = None
+
+def GetAssistantSignals():
+    global _assistant_signals
+    if _assistant_signals is None:
+        _assistant_signals = AssistantSignals()
+    return _assistant_signals
 
 class ChatSection(QWidget):
     def __init__(self):
@@ -117,10 +168,14 @@ class ChatSection(QWidget):
         font = QFont()
         font.setPointSize(13)
         self.chat_text_edit.setFont(font)
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.loadMessages)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(5)
+        # Document position where the message being streamed starts, if any
+        self.streaming_from = None
+        signals = GetAssistantSignals()
+        signals.responseChanged.connect(self.loadMessages)
+        signals.streamChanged.connect(self.loadStreamingMessage)
+        signals.statusChanged.connect(self.SpeechRecogText)
+        self.loadMessages()
+        self.SpeechRecogText()
         self.chat_text_edit.viewport().installEventFilter(self)
         self.setStyleSheet("""
             QScrollBar:vertical {
@@ -157,25 +212,38 @@ class ChatSection(QWidget):
             }
         """)
     
-    def loadMessages(self):
+    def loadMessages(self, chat_message=None):
         global old_chat_message
 
-        with open(TempDirectoryPath('Responses.data'), 'r', encoding='utf-8') as file:
-            chat_message = file.read().strip()
-            if chat_message is None:
-                pass
-            elif len(chat_message) <= 1:
-                pass
-            elif str(old_chat_message) == str(chat_message):
-                pass
-            else:
-                self.addMessage(message=chat_message, color='Green')
-                old_chat_message = chat_message
+        if chat_message is None:
+            chat_message = GetEventBus().get(TOPIC_RESPONSE)
+        if chat_message is None:
+            pass
+        elif len(chat_message.strip()) <= 1:
+            pass
+        elif str(old_chat_message) == str(chat_message.strip()):
+            pass
+        else:
+            chat_message = chat_message.strip()
+            # The finished answer takes the place of its streamed version
+            self.addMessage(message=chat_message, color='Green', replace_from=self.streaming_from)
+            old_chat_message = chat_message
+        self.streaming_from = None
+
+    def loadStreamingMessage(self, chat_message):
+        chat_message = chat_message.strip()
+        if not chat_message:
+            self.streaming_from = None
+            return
+        if len(chat_message) <= 1:
+            return
+        self.streaming_from = self.addMessage(message=chat_message, color='Green',
+                                              replace_from=self.streaming_from)
                 
-    def SpeechRecogText(self):
-         with open(TempDirectoryPath('Status.data'), 'r', encoding='utf-8') as file:
-            msgs = file.read().strip()
-            self.label.setText(msgs)
+    def SpeechRecogText(self, msgs=None):
+        if msgs is None:
+            msgs = GetEventBus().get(TOPIC_STATUS, "")
+        self.label.setText(msgs.strip())
     
     def load_icon(self, path, width=60, height=60):
         pixmap = QPixmap(path)
@@ -192,8 +260,17 @@ class ChatSection(QWidget):
             MicButtonClosed()
         self.toggled = not self.toggled
     
-    def addMessage(self, message, color='black'):
+    def addMessage(self, message, color='black', replace_from=None):
+        # Returns where the message starts; replace_from removes everything from
+        # that position first, i.e. the last message added
         cursor = self.chat_text_edit.textCursor()
+        if replace_from is not None:
+            cursor.setPosition(replace_from)
+            cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        else:
+            cursor.movePosition(QTextCursor.End)
+        start = cursor.position()
         format1 = QTextCharFormat()
         formatm = QTextBlockFormat()
         formatm.setTopMargin(10); formatm.setLeftMargin(10)
@@ -202,6 +279,7 @@ class ChatSection(QWidget):
         cursor.setBlockFormat(formatm)
         cursor.insertText(message + '\n')
         self.chat_text_edit.setTextCursor(cursor)
+        return start
 
 class InitialScreen(QWidget):
      
@@ -243,14 +321,13 @@ class InitialScreen(QWidget):
         self.setFixedWidth(screen_width)
         self.setStyleSheet("background-color: black;")
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(5)
+        GetAssistantSignals().statusChanged.connect(self.SpeechRecogText)
+        self.SpeechRecogText()
 
-    def SpeechRecogText(self):
-        with open(TempDirectoryPath('Status.data'), 'r', encoding='utf-8') as file:
-            msgs = file.read().strip()
-            self.label.setText(msgs)
+    def SpeechRecogText(self, msgs=None):
+        if msgs is None:
+            msgs = GetEventBus().get(TOPIC_STATUS, "")
+        self.label.setText(msgs.strip())
     
     def load_icon(self, path, width=60, height=60):
         pixmap = QPixmap(path)
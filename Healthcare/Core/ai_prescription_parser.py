@@ -7,25 +7,31 @@ import os
 import sys
 import json
 import re
+import asyncio
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
-import requests
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 # Import existing healthcare components
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from Healthcare.Core.medical_ocr import MedicalOCR
+from Healthcare.Core.drug_lexicon import get_drug_lexicon
+from Healthcare.Core.llm_cache import LLMParseCache, cached_result_copy
+from Healthcare.Core.async_llm_client import AsyncLLMClient, HTTPX_AVAILABLE
 from Healthcare.Database.models import HealthcareDatabase
 
+# Lexicon confidence needed to replace a whole medication name returned by the LLM
+NAME_SNAP_MIN_CONFIDENCE = 0.85
+
 # OpenAI Integration
 try:
-    import openai
     from dotenv import dotenv_values
     
     env_vars = dotenv_values('.env')
     openai_api_key = env_vars.get('OPENAI_API_KEY')
+    openai_base_url = env_vars.get('OPENAI_BASE_URL') or "https://api.openai.com/v1"
     
     if openai_api_key:
-        openai.api_key = openai_api_key
         OPENAI_AVAILABLE = True
         print("✅ OpenAI API key configured")
     else:
@@ -33,8 +39,10 @@ try:
         print("⚠️ OpenAI API key not found in .env file")
         
 except ImportError:
+    openai_api_key = None
+    openai_base_url = "https://api.openai.com/v1"
     OPENAI_AVAILABLE = False
-    print("⚠️ OpenAI library not available. Install with: pip install openai")
+    print("⚠️ python-dotenv not available. Install with: pip install python-dotenv")
 
 class AIPrescriptionParser:
     """
@@ -71,6 +79,53 @@ class AIPrescriptionParser:
         If information is missing, use "Not specified" for that field.
         Focus on pregnancy-safe medications and flag any potentially concerning drugs."""
         
+        # Several prescriptions per request, answered with one entry per document ID
+        self.batch_system_prompt = """You are a medical prescription parsing assistant.
+        You will receive several prescriptions, each between "### DOCUMENT <id>" and "### END <id>".
+        Parse every document independently.
+        
+        Always respond with valid JSON in this exact format:
+        {
+            "documents": [
+                {
+                    "id": "the document id exactly as given",
+                    "medications": [
+                        {
+                            "name": "medication name",
+                            "strength": "dosage strength (e.g., 500mg)",
+                            "form": "tablet/capsule/liquid/etc",
+                            "frequency": "how often (e.g., twice daily)",
+                            "duration": "how long (e.g., 7 days)",
+                            "instructions": "special instructions",
+                            "quantity": "number prescribed",
+                            "refills": "number of refills"
+                        }
+                    ],
+                    "prescriber": "doctor name if found",
+                    "date": "prescription date if found",
+                    "patient": "patient name if found"
+                }
+            ]
+        }
+        
+        If information is missing, use "Not specified" for that field.
+        Focus on pregnancy-safe medications and flag any potentially concerning drugs."""
+        
+        # LLM endpoint (any OpenAI-compatible chat completions server)
+        self.llm_model = "gpt-3.5-turbo"
+        self.llm_base_url = openai_base_url
+        self.llm_timeout = 30
+        # Bump whenever either prompt changes so stale cached parses are not reused
+        self.prompt_version = "rx-parse-v1"
+        
+        # Encrypted cache of LLM parses, keyed by normalized OCR text
+        self.parse_cache = LLMParseCache(encryption=self.healthcare_db.encryption)
+        
+        # Async client for the non-blocking parse path, created on first use
+        self.async_llm_client = None
+        # Async parses in flight by cache key, so identical concurrent parses share one LLM call
+        self._async_parses: Dict[str, asyncio.Task] = {}
+        
         # Pregnancy medication safety database
         self.pregnancy_categories = {
             'safe': [
@@ -97,7 +152,7 @@ class AIPrescriptionParser:
             # First, extract text using OCR
             ocr_text = self.medical_ocr.extract_text_from_image(image_path)
             
-            if "Error" in ocr_text or len(ocr_text.strip()) < 10:
+            if not self._is_readable_ocr_text(ocr_text):
                 return {
                     'success': False,
                     'error': 'Could not extract readable text from prescription',
@@ -111,86 +166,466 @@ class AIPrescriptionParser:
                 # Fallback to rule-based parsing
                 ai_parsed_data = self._parse_with_rules(ocr_text)
             
-            if not ai_parsed_data.get('medications'):
-                return {
-                    'success': False,
-                    'error': 'No medications found in prescription',
-                    'raw_ocr_text': ocr_text,
-                    'ai_response': ai_parsed_data
-                }
+            return self._finalize_parsed_prescription(image_path, ocr_text, ai_parsed_data)
             
-            # Enhance with pregnancy safety analysis
-            enhanced_data = self._add_pregnancy_safety_analysis(ai_parsed_data)
+        except Exception as e:
+            print(f"Error in AI prescription parsing: {e}")
+            return {
+                'success': False,
+                'error': f'AI parsing failed: {str(e)}',
+                'raw_ocr_text': ocr_text if 'ocr_text' in locals() else 'N/A'
+            }
+    
+    def parse_prescriptions_batch(self, image_paths: List[str], max_concurrency: int = 4,
+                                  token_budget: int = 3000) -> List[Dict[str, Any]]:
+        """
+        Parse a stack of prescriptions, packing several into each LLM request.
+        
+        Results are returned in the same order as image_paths, each shaped like
+        the result of parse_prescription_with_ai.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(image_paths)
+        
+        try:
+            # OCR every image first (tesseract runs out of process, so threads overlap well)
+            with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+                ocr_texts = list(executor.map(self.medical_ocr.extract_text_from_image, image_paths))
             
-            # Store in database
-            prescription_id = self.healthcare_db.add_prescription(
-                patient_id=1,  # Default patient
-                image_path=image_path,
-                ocr_text=ocr_text,
-                parsed_medications=enhanced_data
-            )
+            readable = {}
+            for index, ocr_text in enumerate(ocr_texts):
+                if self._is_readable_ocr_text(ocr_text):
+                    readable[f"rx-{index + 1}"] = ocr_text
+                else:
+                    results[index] = {
+                        'success': False,
+                        'error': 'Could not extract readable text from prescription',
+                        'raw_ocr_text': ocr_text
+                    }
             
-            # Generate medication reminders
-            reminder_ids = self._create_medication_reminders(enhanced_data, prescription_id)
+            if OPENAI_AVAILABLE:
+                parsed_by_id = self._parse_batch_with_openai(readable, max_concurrency, token_budget)
+            else:
+                parsed_by_id = {doc_id: self._parse_with_rules(text) for doc_id, text in readable.items()}
             
-            return {
-                'success': True,
-                'prescription_id': prescription_id,
-                'raw_ocr_text': ocr_text,
-                'parsed_data': enhanced_data,
-                'medication_count': len(enhanced_data['medications']),
-                'reminder_ids': reminder_ids,
-                'safety_alerts': enhanced_data.get('safety_alerts', [])
-            }
+            for doc_id, ocr_text in readable.items():
+                index = int(doc_id.split('-')[1]) - 1
+                try:
+                    results[index] = self._finalize_parsed_prescription(
+                        image_paths[index], ocr_text, parsed_by_id[doc_id]
+                    )
+                except Exception as e:
+                    print(f"Error finalizing batch prescription {doc_id}: {e}")
+                    results[index] = {
+                        'success': False,
+                        'error': f'AI parsing failed: {str(e)}',
+                        'raw_ocr_text': ocr_text
+                    }
+            
+            return results
             
         except Exception as e:
-            print(f"Error in AI prescription parsing: {e}")
+            print(f"Error in batch prescription parsing: {e}")
+            return [result or {'success': False, 'error': f'Batch parsing failed: {str(e)}'}
+                    for result in results]
+    
+    def _is_readable_ocr_text(self, ocr_text: str) -> bool:
+        """Check OCR output looks like real prescription text"""
+        return bool(ocr_text) and "Error" not in ocr_text and len(ocr_text.strip()) >= 10
+    
+    def _finalize_parsed_prescription(self, image_path: str, ocr_text: str,
+                                      ai_parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add safety analysis, store the prescription and create its reminders
+        """
+        if not ai_parsed_data.get('medications'):
             return {
                 'success': False,
-                'error': f'AI parsing failed: {str(e)}',
-                'raw_ocr_text': ocr_text if 'ocr_text' in locals() else 'N/A'
+                'error': 'No medications found in prescription',
+                'raw_ocr_text': ocr_text,
+                'ai_response': ai_parsed_data
             }
+        
+        # Snap OCR'd names to known drugs before the safety lookup
+        ai_parsed_data = self._snap_medication_names(ai_parsed_data)
+        
+        # Enhance with pregnancy safety analysis
+        enhanced_data = self._add_pregnancy_safety_analysis(ai_parsed_data)
+        
+        # Store in database
+        prescription_id = self.healthcare_db.add_prescription(
+            patient_id=1,  # Default patient
+            image_path=image_path,
+            ocr_text=ocr_text,
+            parsed_medications=enhanced_data
+        )
+        
+        # Generate medication reminders
+        reminder_ids = self._create_medication_reminders(enhanced_data, prescription_id)
+        
+        return {
+            'success': True,
+            'prescription_id': prescription_id,
+            'raw_ocr_text': ocr_text,
+            'parsed_data': enhanced_data,
+            'medication_count': len(enhanced_data['medications']),
+            'reminder_ids': reminder_ids,
+            'safety_alerts': enhanced_data.get('safety_alerts', [])
+        }
     
     def _parse_with_openai(self, ocr_text: str) -> Dict[str, Any]:
         """
-        Parse prescription text using OpenAI GPT
+        Parse prescription text using OpenAI GPT, served from the parse cache when possible
         """
         try:
-            user_prompt = f"""Parse this prescription text and extract medication information:
+            cache_key = self.parse_cache.make_key(ocr_text, self.llm_model, self.prompt_version)
+            parsed_data = self.parse_cache.get_or_compute(
+                cache_key, lambda: self._request_openai_parse(ocr_text)
+            )
+            return cached_result_copy(parsed_data)
+                    
+        except Exception as e:
+            print(f"OpenAI parsing error: {e}")
+            # Fallback to rule-based parsing
+            return self._parse_with_rules(ocr_text)
+    
+    def _request_openai_parse(self, ocr_text: str) -> Dict[str, Any]:
+        """
+        Send one prescription to the LLM and decode its JSON answer
+        """
+        ai_response = self._request_chat_completion(self._build_parse_messages(ocr_text))
+        
+        return self._decode_json_response(ai_response)
+    
+    def _build_parse_messages(self, ocr_text: str) -> List[Dict[str, str]]:
+        """Chat messages asking the LLM to parse one prescription"""
+        user_prompt = f"""Parse this prescription text and extract medication information:
 
 {ocr_text}
 
 Focus on pregnancy-related medications. If any medications seem inappropriate for pregnancy, note this in the response."""
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,  # Low temperature for consistency
-                max_tokens=1000
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def _request_chat_completion(self, messages: List[Dict[str, str]], max_tokens: int = 1000) -> str:
+        """
+        Call the chat completions endpoint and return the message content
+        """
+        import requests
+        
+        response = requests.post(
+            f"{self.llm_base_url.rstrip('/')}/chat/completions",
+            headers={"Authorization": f"Bearer {openai_api_key}"},
+            json={
+                "model": self.llm_model,
+                "messages": messages,
+                "temperature": 0.1,  # Low temperature for consistency
+                "max_tokens": max_tokens
+            },
+            timeout=self.llm_timeout
+        )
+        response.raise_for_status()
+        
+        return response.json()['choices'][0]['message']['content'].strip()
+    
+    def _decode_json_response(self, ai_response: str) -> Dict[str, Any]:
+        """
+        Parse JSON from an LLM response, tolerating surrounding text
+        """
+        try:
+            return json.loads(ai_response)
+        except json.JSONDecodeError:
+            # Try to extract JSON from response if it's wrapped in text
+            json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
+            if json_match:
+                return json.loads(json_match.group())
+            else:
+                raise ValueError("Could not parse JSON from AI response")
+    
+    async def parse_prescription_with_ai_async(self, image_path: str) -> Dict[str, Any]:
+        """
+        Parse prescription using AI enhancement without blocking the event loop
+        """
+        try:
+            # OCR and database work are blocking, so they run in worker threads
+            ocr_text = await asyncio.to_thread(self.medical_ocr.extract_text_from_image, image_path)
+            
+            if not self._is_readable_ocr_text(ocr_text):
+                return {
+                    'success': False,
+                    'error': 'Could not extract readable text from prescription',
+                    'raw_ocr_text': ocr_text
+                }
+            
+            if OPENAI_AVAILABLE:
+                ai_parsed_data = await self._parse_with_openai_async(ocr_text)
+            else:
+                ai_parsed_data = self._parse_with_rules(ocr_text)
+            
+            return await asyncio.to_thread(
+                self._finalize_parsed_prescription, image_path, ocr_text, ai_parsed_data
             )
             
-            ai_response = response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"Error in async AI prescription parsing: {e}")
+            return {
+                'success': False,
+                'error': f'AI parsing failed: {str(e)}',
+                'raw_ocr_text': ocr_text if 'ocr_text' in locals() else 'N/A'
+            }
+    
+    def get_async_llm_client(self) -> AsyncLLMClient:
+        """Return the shared async LLM client, creating it on first use"""
+        if self.async_llm_client is None:
+            self.async_llm_client = AsyncLLMClient(
+                self.llm_base_url, openai_api_key, model=self.llm_model, deadline=self.llm_timeout
+            )
+        return self.async_llm_client
+    
+    async def _parse_with_openai_async(self, ocr_text: str) -> Dict[str, Any]:
+        """
+        Async counterpart of _parse_with_openai.
+        
+        Falls back to rule-based parsing when the call misses its deadline,
+        exhausts its retries or the latency circuit breaker is open.
+        """
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self._parse_with_openai, ocr_text)
+        
+        try:
+            cache_key = self.parse_cache.make_key(ocr_text, self.llm_model, self.prompt_version)
+            cached = await asyncio.to_thread(self.parse_cache.get, cache_key)
+            if cached is not None:
+                self.parse_cache.record('hits')
+                return cached_result_copy(cached)
+            
+            loop = asyncio.get_running_loop()
+            task = self._async_parses.get(cache_key)
+            if task is not None and task.get_loop() is loop and not task.done():
+                self.parse_cache.record('coalesced')
+            else:
+                task = loop.create_task(self._request_openai_parse_async(cache_key, ocr_text))
+                self._async_parses[cache_key] = task
+                task.add_done_callback(lambda done: self._async_parses.pop(cache_key, None)
+                                       if self._async_parses.get(cache_key) is done else None)
+            
+            # Shielded so one cancelled caller doesn't cancel the parse for the others
+            parsed_data = await asyncio.shield(task)
+            return cached_result_copy(parsed_data)
             
-            # Parse JSON response
-            try:
-                parsed_data = json.loads(ai_response)
-                return parsed_data
-            except json.JSONDecodeError:
-                # Try to extract JSON from response if it's wrapped in text
-                json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-                else:
-                    raise ValueError("Could not parse JSON from AI response")
-                    
         except Exception as e:
-            print(f"OpenAI parsing error: {e}")
+            print(f"Async OpenAI parsing error: {e}")
             # Fallback to rule-based parsing
             return self._parse_with_rules(ocr_text)
     
+    async def _request_openai_parse_async(self, cache_key: str, ocr_text: str) -> Dict[str, Any]:
+        """
+        One async LLM parse, registered in the parse cache's in-flight map so
+        threads parsing the same text wait for it (and it waits for theirs)
+        """
+        inflight, leader = self.parse_cache.claim(cache_key)
+        if not leader:
+            return await asyncio.to_thread(self.parse_cache.wait, inflight, self.llm_timeout)
+        
+        try:
+            ai_response = await self.get_async_llm_client().chat(self._build_parse_messages(ocr_text))
+            parsed_data = self._decode_json_response(ai_response)
+        except BaseException as e:
+            self.parse_cache.resolve(cache_key, inflight, error=e)
+            raise
+        
+        await asyncio.to_thread(self.parse_cache.resolve, cache_key, inflight, parsed_data)
+        return parsed_data
+    
+    def _parse_batch_with_openai(self, documents: Dict[str, str], max_concurrency: int = 4,
+                                 token_budget: int = 3000) -> Dict[str, Dict[str, Any]]:
+        """
+        Parse many OCR texts with as few LLM round-trips as the token budget allows.
+        
+        Cached documents skip the LLM entirely and documents already being
+        parsed elsewhere wait for that parse. The rest are claimed in the
+        parse cache's in-flight map and packed into batches that run
+        concurrently; any document the model dropped (or whose batch failed)
+        falls back to rule-based parsing.
+        """
+        parsed_by_id: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, str] = {}
+        claimed: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        waiting: Dict[str, Dict[str, Any]] = {}
+        
+        for doc_id, ocr_text in documents.items():
+            cache_key = self.parse_cache.make_key(ocr_text, self.llm_model, self.prompt_version)
+            cached = self.parse_cache.get(cache_key)
+            if cached is not None:
+                self.parse_cache.record('hits')
+                parsed_by_id[doc_id] = cached_result_copy(cached)
+                continue
+            
+            inflight, leader = self.parse_cache.claim(cache_key)
+            if leader:
+                pending[doc_id] = ocr_text
+                claimed[doc_id] = (cache_key, inflight)
+            else:
+                waiting[doc_id] = inflight
+        
+        batches = self._pack_batches(pending, token_budget)
+        try:
+            batch_results = self._run_batches(batches, max_concurrency)
+        except Exception as e:
+            print(f"OpenAI batch parsing error: {e}")
+            batch_results = [{} for _ in batches]
+        
+        for batch, batch_result in zip(batches, batch_results):
+            for doc_id, ocr_text in batch.items():
+                cache_key, inflight = claimed.pop(doc_id)
+                parsed = batch_result.get(doc_id)
+                if parsed is not None and isinstance(parsed.get('medications'), list):
+                    self.parse_cache.resolve(cache_key, inflight, result=parsed)
+                    parsed_by_id[doc_id] = cached_result_copy(parsed)
+                else:
+                    # Dropped or malformed by the model; anyone waiting parses it their own way
+                    self.parse_cache.resolve(cache_key, inflight,
+                                             error=ValueError("document missing from batch response"))
+                    parsed_by_id[doc_id] = self._parse_with_rules(ocr_text)
+        
+        # Never leave a claim unresolved, or later parses of the same text would hang
+        for doc_id, (cache_key, inflight) in claimed.items():
+            self.parse_cache.resolve(cache_key, inflight, error=ValueError("batch was not sent"))
+            parsed_by_id[doc_id] = self._parse_with_rules(documents[doc_id])
+        
+        for doc_id, inflight in waiting.items():
+            try:
+                parsed_by_id[doc_id] = cached_result_copy(self.parse_cache.wait(inflight, timeout=self.llm_timeout))
+            except Exception:
+                parsed_by_id[doc_id] = self._parse_with_rules(documents[doc_id])
+        
+        return parsed_by_id
+    
+    def _run_batches(self, batches: List[Dict[str, str]], max_concurrency: int) -> List[Dict[str, Dict[str, Any]]]:
+        """
+        Send the batches at most max_concurrency at a time, one result per batch (empty if it failed).
+        
+        With httpx they go through an async client sharing the single-parse
+        circuit breaker, so they get the same deadlines and retries. Called
+        from inside a running event loop, where asyncio.run() can't start
+        another one, they go through the thread pool instead.
+        """
+        if not batches:
+            return []
+        
+        if HTTPX_AVAILABLE and not self._in_event_loop():
+            return asyncio.run(self._run_batches_async(batches, max_concurrency))
+        
+        def run_batch(batch: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+            try:
+                return self._request_batch_parse(batch)
+            except Exception as e:
+                print(f"OpenAI batch parsing error: {e}")
+                return {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            return list(executor.map(run_batch, batches))
+    
+    @staticmethod
+    def _in_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    
+    async def _run_batches_async(self, batches: List[Dict[str, str]],
+                                 max_concurrency: int) -> List[Dict[str, Dict[str, Any]]]:
+        # A client of its own for this event loop, closed when the batches are done
+        shared = self.get_async_llm_client()
+        client = AsyncLLMClient(self.llm_base_url, openai_api_key, model=self.llm_model,
+                                deadline=self.llm_timeout, max_concurrency=max(1, max_concurrency),
+                                breaker=shared.breaker)
+        limit = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def run_batch(batch: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+            try:
+                async with limit:
+                    return await self._request_batch_parse_async(client, batch)
+            except Exception as e:
+                print(f"OpenAI batch parsing error: {e}")
+                return {}
+        
+        try:
+            return await asyncio.gather(*(run_batch(batch) for batch in batches))
+        finally:
+            await client.aclose()
+    
+    def _estimate_tokens(self, text: str) -> int:
+        """Cheap token estimate (about four characters per token)"""
+        return len(text) // 4 + 1
+    
+    def _pack_batches(self, documents: Dict[str, str], token_budget: int) -> List[Dict[str, str]]:
+        """
+        Greedily pack documents into batches whose prompt stays within token_budget
+        """
+        batches: List[Dict[str, str]] = []
+        current: Dict[str, str] = {}
+        current_tokens = self._estimate_tokens(self.batch_system_prompt)
+        
+        for doc_id, ocr_text in documents.items():
+            doc_tokens = self._estimate_tokens(ocr_text) + 10  # Document delimiters
+            if current and current_tokens + doc_tokens > token_budget:
+                batches.append(current)
+                current = {}
+                current_tokens = self._estimate_tokens(self.batch_system_prompt)
+            
+            # A single oversized document still goes out, alone
+            current[doc_id] = ocr_text
+            current_tokens += doc_tokens
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    def _build_batch_messages(self, batch: Dict[str, str]) -> List[Dict[str, str]]:
+        """Chat messages asking the LLM to parse several prescriptions"""
+        sections = [f"### DOCUMENT {doc_id}\n{ocr_text}\n### END {doc_id}"
+                    for doc_id, ocr_text in batch.items()]
+        user_prompt = ("Parse each of these prescriptions separately and extract medication information:\n\n"
+                       + "\n\n".join(sections))
+        
+        return [
+            {"role": "system", "content": self.batch_system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def _request_batch_parse(self, batch: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Send several prescriptions in one request and split the answer by document ID
+        """
+        ai_response = self._request_chat_completion(self._build_batch_messages(batch),
+                                                    max_tokens=min(4000, 600 * len(batch)))
+        return self._split_batch_response(batch, ai_response)
+    
+    async def _request_batch_parse_async(self, client: AsyncLLMClient,
+                                         batch: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Async counterpart of _request_batch_parse"""
+        ai_response = await client.chat(self._build_batch_messages(batch), max_tokens=min(4000, 600 * len(batch)))
+        return self._split_batch_response(batch, ai_response)
+    
+    def _split_batch_response(self, batch: Dict[str, str], ai_response: str) -> Dict[str, Dict[str, Any]]:
+        """Parsed documents from a batch answer, keyed by document ID"""
+        response_data = self._decode_json_response(ai_response)
+        
+        parsed_by_id = {}
+        for document in response_data.get('documents', []):
+            if not isinstance(document, dict):
+                continue
+            doc_id = str(document.pop('id', ''))
+            if doc_id in batch:
+                parsed_by_id[doc_id] = document
+        
+        return parsed_by_id
+    
     def _parse_with_rules(self, ocr_text: str) -> Dict[str, Any]:
         """
         Fallback rule-based parsing when AI is not available
@@ -213,8 +648,12 @@ Focus on pregnancy-related medications. If any medications seem inappropriate fo
                         medications.append(current_medication.copy())
                     
                     # Start new medication
+                    name_match = self._match_medication_name(line)
                     current_medication = {
-                        'name': self._extract_medication_name(line),
+                        'name': name_match['name'],
+                        'ocr_name': name_match['ocr_name'],
+                        'name_confidence': name_match['confidence'],
+                        'name_candidates': name_match['candidates'],
                         'strength': self._extract_strength(line),
                         'form': self._extract_form(line),
                         'frequency': self._extract_frequency(line),
@@ -250,6 +689,21 @@ Focus on pregnancy-related medications. If any medications seem inappropriate fo
     
     def _extract_medication_name(self, text: str) -> str:
         """Extract medication name from text"""
+        return self._match_medication_name(text)['name']
+    
+    def _match_medication_name(self, text: str) -> Dict[str, Any]:
+        """
+        Extract medication name snapped to the bundled drug lexicon, with confidence
+        """
+        lexicon_match = get_drug_lexicon().find_in_text(text)
+        if lexicon_match:
+            return {
+                'name': lexicon_match['name'],
+                'ocr_name': lexicon_match['ocr_text'],
+                'confidence': lexicon_match['confidence'],
+                'candidates': lexicon_match['candidates']
+            }
+        
         # Look for capitalized words that could be medication names
         words = text.split()
         for word in words:
@@ -257,8 +711,41 @@ Focus on pregnancy-related medications. If any medications seem inappropriate fo
                 # Clean the word
                 clean_word = re.sub(r'[^a-zA-Z]', '', word)
                 if len(clean_word) > 3:
-                    return clean_word
-        return "Unknown Medication"
+                    return {'name': clean_word, 'ocr_name': clean_word, 'confidence': 0.0, 'candidates': []}
+        return {'name': "Unknown Medication", 'ocr_name': text.strip(), 'confidence': 0.0, 'candidates': []}
+    
+    def _snap_medication_names(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Correct medication names against the drug lexicon and record match confidence.
+
+        The LLM's name is only replaced by a close misspelling of a whole
+        known name; partial matches inside a longer name are attached as
+        candidates and the name is left as the LLM returned it.
+        """
+        lexicon = get_drug_lexicon()
+        for medication in parsed_data.get('medications', []):
+            # Rule-based results are already matched line by line
+            if 'name_confidence' in medication:
+                continue
+            
+            name = str(medication.get('name') or '')
+            medication['ocr_name'] = name
+            candidates = lexicon.lookup(name) if name else []
+            best = candidates[0] if candidates else None
+            
+            if best and best['distance'] == 0:
+                medication['name_confidence'] = 1.0
+            elif best and best['confidence'] >= NAME_SNAP_MIN_CONFIDENCE:
+                medication['name'] = best['name']
+                medication['name_confidence'] = best['confidence']
+            else:
+                if not candidates:
+                    partial_match = lexicon.find_in_text(name) if name else None
+                    candidates = partial_match['candidates'] if partial_match else []
+                medication['name_confidence'] = 0.0
+            medication['name_candidates'] = candidates
+        
+        return parsed_data
     
     def _extract_strength(self, text: str) -> Optional[str]:
         """Extract medication strength"""
@@ -492,13 +979,34 @@ Focus on pregnancy-related medications. If any medications seem inappropriate fo
             end_date = datetime.now() + timedelta(days=30)
             return end_date.strftime('%Y-%m-%d')
 
-# Global instance for integration
-ai_prescription_parser = AIPrescriptionParser()
+# Shared instance for integration, created on first use
+_ai_prescription_parser = None
+
+def get_ai_prescription_parser() -> AIPrescriptionParser:
+    """Return the shared AI prescription parser"""
+    global _ai_prescription_parser
+    if _ai_prescription_parser is None:
+        _ai_prescription_parser = AIPrescriptionParser()
+    return _ai_prescription_parser
+
+def __getattr__(name):
+    # The old module-level instance, built only when someone asks for it
+    if name == 'ai_prescription_parser':
+        return get_ai_prescription_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Utility functions
 def parse_prescription_with_ai(image_path: str) -> Dict[str, Any]:
     """Parse prescription using AI enhancement"""
-    return ai_prescription_parser.parse_prescription_with_ai(image_path)
+    return get_ai_prescription_parser().parse_prescription_with_ai(image_path)
+
+async def parse_prescription_with_ai_async(image_path: str) -> Dict[str, Any]:
+    """Parse prescription using AI enhancement without blocking the event loop"""
+    return await get_ai_prescription_parser().parse_prescription_with_ai_async(image_path)
+
+def parse_prescriptions_batch(image_paths: List[str], max_concurrency: int = 4) -> List[Dict[str, Any]]:
+    """Parse a stack of prescriptions with batched AI requests"""
+    return get_ai_prescription_parser().parse_prescriptions_batch(image_paths, max_concurrency)
 
 def analyze_medication_safety(medication_name: str) -> Dict[str, Any]:
     """Analyze medication safety for pregnancy"""
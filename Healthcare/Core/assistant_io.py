@@ -0,0 +1,20 @@
+"""
+J.A.R.V.I.S. Assistant Output Bridge
+Speech and GUI entry points for Healthcare modules, imported on first use
+
+Backend.TextToSpeech pulls in pygame and edge_tts and Frontend.GUI pulls in
+PyQt5; importing them lazily keeps `import Healthcare...` cheap for tests,
+background jobs and startup. Call signatures match the J.A.R.V.I.S. originals.
+"""
+
+def TextToSpeech(*args, **kwargs):
+    from Backend.TextToSpeech import TextToSpeech as speak
+    return speak(*args, **kwargs)
+
+def ShowTextToScreen(*args, **kwargs):
+    from Frontend.GUI import ShowTextToScreen as show
+    return show(*args, **kwargs)
+
+def SetAssistantStatus(*args, **kwargs):
+    from Frontend.GUI import SetAssistantStatus as set_status
+    return set_status(*args, **kwargs)
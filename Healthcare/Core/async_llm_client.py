@@ -0,0 +1,230 @@
+"""
+J.A.R.V.I.S. Async LLM Client
+Non-blocking chat completions client with deadlines, jittered retries,
+a concurrency limit and a latency circuit breaker
+"""
+
+import time
+import random
+import asyncio
+import importlib.util
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+# httpx is imported when the first client connects; it is slow to import
+HTTPX_AVAILABLE = importlib.util.find_spec('httpx') is not None
+if not HTTPX_AVAILABLE:
+    print("⚠️ httpx not available - async LLM parsing will run the blocking client in a thread")
+
+class LLMUnavailableError(Exception):
+    """Raised when the LLM cannot answer in time (breaker open, deadline hit or retries exhausted)"""
+
+class LatencyCircuitBreaker:
+    """
+    Trips when the p95 of recent call latencies crosses a threshold.
+
+    While open, callers should skip the LLM entirely. After ``cooldown``
+    seconds one probe call is let through (half-open); a fast probe closes
+    the breaker again and clears the latency window.
+    """
+
+    def __init__(self, p95_threshold: float = 8.0, window: int = 50,
+                 min_samples: int = 10, cooldown: float = 30.0):
+        self.p95_threshold = p95_threshold
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.latencies = deque(maxlen=window)
+        self.state = 'closed'
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def p95(self) -> float:
+        """95th percentile of the recorded latencies (0.0 when empty)"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    def allow(self) -> bool:
+        """Return True if a call may go to the LLM now"""
+        if self.state == 'open':
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = 'half_open'
+            return True
+        # Only one probe at a time while half-open
+        return self.state == 'closed'
+
+    def record(self, latency: float):
+        """Record the latency of a finished call (failed calls included)"""
+        if self.state == 'half_open':
+            if latency <= self.p95_threshold:
+                self.state = 'closed'
+                self.latencies.clear()
+                self.latencies.append(latency)
+            else:
+                self._trip()
+            return
+
+        self.latencies.append(latency)
+        if len(self.latencies) >= self.min_samples and self.p95() > self.p95_threshold:
+            self._trip()
+
+    def _trip(self):
+        self.state = 'open'
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        print(f"⚠️ LLM circuit breaker open (p95 {self.p95():.2f}s > {self.p95_threshold:.2f}s)")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'p95_latency': round(self.p95(), 3),
+            'samples': len(self.latencies),
+            'trips': self.trips
+        }
+
+class AsyncLLMClient:
+    """
+    Async OpenAI-compatible chat completions client.
+
+    One ``httpx.AsyncClient`` is kept per event loop so connections are
+    reused across calls. Every call has an overall deadline; attempts that
+    time out or get a retryable status are retried with full-jitter
+    exponential backoff while time remains. At most ``max_concurrency``
+    requests are in flight at once.
+    """
+
+    RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+    def __init__(self, base_url: str, api_key: Optional[str], model: str = "gpt-3.5-turbo",
+                 timeout: float = 15.0, deadline: float = 30.0, max_retries: int = 2,
+                 backoff_base: float = 0.5, max_concurrency: int = 4,
+                 breaker: Optional[LatencyCircuitBreaker] = None):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker or LatencyCircuitBreaker()
+
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+        self.metrics = {'calls': 0, 'retries': 0, 'failures': 0, 'rejected': 0, 'clients_closed': 0}
+
+    async def _ensure_client(self):
+        """Create the HTTP client and semaphore for the running event loop"""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Clients and semaphores cannot be shared across event loops;
+            # the previous loop's client is closed rather than left open
+            await self._close_stale_client(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+
+    async def _close_stale_client(self, client, loop):
+        if client is None:
+            return
+        try:
+            if loop is not None and loop.is_running():
+                # Still running in another thread; close it there
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                await client.aclose()
+            self.metrics['clients_closed'] += 1
+        except Exception as e:
+            print(f"Warning: Could not close stale LLM client: {e}")
+
+    async def chat(self, messages: List[Dict[str, str]], max_tokens: int = 1000,
+                   deadline: Optional[float] = None) -> str:
+        """
+        Return the assistant message content, or raise LLMUnavailableError
+        """
+        if not HTTPX_AVAILABLE:
+            raise LLMUnavailableError("httpx is not installed")
+        import httpx
+
+        if not self.breaker.allow():
+            self.metrics['rejected'] += 1
+            raise LLMUnavailableError("circuit breaker open")
+
+        # allow() just moved the breaker to half-open if this call is its probe
+        probe = self.breaker.state == 'half_open'
+        try:
+            await self._ensure_client()
+            self.metrics['calls'] += 1
+            expires = time.monotonic() + (deadline if deadline is not None else self.deadline)
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": 0.1,  # Low temperature for consistency
+                "max_tokens": max_tokens
+            }
+
+            last_error = None
+            for attempt in range(self.max_retries + 1):
+                remaining = expires - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                started = time.monotonic()
+                try:
+                    async with self._semaphore:
+                        # Queueing for the semaphore counts against the deadline,
+                        # but only the request itself counts as LLM latency
+                        started = time.monotonic()
+                        remaining = expires - started
+                        if remaining <= 0:
+                            break
+                        response = await self._client.post(
+                            f"{self.base_url}/chat/completions", json=payload,
+                            timeout=min(self.timeout, remaining)
+                        )
+                    self.breaker.record(time.monotonic() - started)
+
+                    if response.status_code in self.RETRYABLE_STATUS:
+                        last_error = LLMUnavailableError(f"HTTP {response.status_code}")
+                    else:
+                        response.raise_for_status()
+                        return response.json()['choices'][0]['message']['content'].strip()
+
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    self.breaker.record(time.monotonic() - started)
+                    last_error = e
+
+                if attempt < self.max_retries:
+                    self.metrics['retries'] += 1
+                    # Full jitter keeps concurrent retries from arriving together
+                    backoff = random.uniform(0, self.backoff_base * (2 ** attempt))
+                    await asyncio.sleep(min(backoff, max(0.0, expires - time.monotonic())))
+
+            self.metrics['failures'] += 1
+            raise LLMUnavailableError(f"LLM call failed: {last_error or 'deadline exceeded'}")
+        finally:
+            if probe and self.breaker.state == 'half_open':
+                # The probe failed, was cancelled or hit its deadline before
+                # recording a latency; stay open for another cooldown
+                self.breaker.record(float('inf'))
+
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.metrics)
+        stats['breaker'] = self.breaker.get_status()
+        return stats
@@ -0,0 +1,217 @@
+"""
+J.A.R.V.I.S. Drug Name Lexicon
+Bundled medication dictionary with a SymSpell-style deletion index for OCR correction
+"""
+
+import os
+import re
+from typing import Dict, List, Any, Optional, Set
+
+DEFAULT_LEXICON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Data', 'drug_lexicon.txt'
+)
+
+# Characters Tesseract commonly reads in place of letters inside drug names
+OCR_LETTER_CONFUSIONS = str.maketrans({'0': 'o', '1': 'l', '5': 's', '8': 'b', '|': 'l'})
+
+class DrugLexicon:
+    """
+    Known medication names indexed for fast fuzzy lookup.
+
+    Every name is expanded into all variants with up to ``max_edit_distance``
+    characters deleted. A noisy token is expanded the same way, so any name
+    within edit distance k shares at least one variant with it and the
+    candidate set is found with plain dict lookups instead of a full scan.
+    """
+
+    def __init__(self, names: Optional[List[str]] = None, max_edit_distance: int = 2,
+                 lexicon_path: str = DEFAULT_LEXICON_PATH):
+        self.max_edit_distance = max_edit_distance
+        self.display_names: Dict[str, str] = {}
+        self._deletes: Dict[str, Set[str]] = {}
+        self._key_lengths: Set[int] = set()
+        self.max_words = 1
+
+        if names is None:
+            names = self._load_names(lexicon_path)
+
+        for name in names:
+            self.add_name(name)
+
+    def _load_names(self, lexicon_path: str) -> List[str]:
+        """Read display names from the bundled lexicon file"""
+        try:
+            with open(lexicon_path, 'r', encoding='utf-8') as file:
+                return [line.strip() for line in file
+                        if line.strip() and not line.lstrip().startswith('#')]
+        except Exception as e:
+            print(f"Warning: Could not load drug lexicon: {e}")
+            return []
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase, undo OCR digit/letter swaps and drop punctuation"""
+        text = text.lower().translate(OCR_LETTER_CONFUSIONS)
+        text = re.sub(r'[^a-z0-9 ]', '', text)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def add_name(self, name: str):
+        """Add a display name to the lexicon and its deletion index"""
+        key = self.normalize(name)
+        if not key or key in self.display_names:
+            return
+
+        self.display_names[key] = name
+        self._key_lengths.add(len(key))
+        self.max_words = max(self.max_words, len(key.split()))
+        for variant in self._deletion_variants(key, self.max_edit_distance):
+            self._deletes.setdefault(variant, set()).add(key)
+
+    def __len__(self) -> int:
+        return len(self.display_names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.normalize(name) in self.display_names
+
+    @staticmethod
+    def _deletion_variants(word: str, distance: int) -> Set[str]:
+        """All strings obtainable from word by deleting up to distance characters"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            next_frontier = set()
+            for item in frontier:
+                if len(item) <= 1:
+                    continue
+                for i in range(len(item)):
+                    next_frontier.add(item[:i] + item[i + 1:])
+            next_frontier -= variants
+            variants |= next_frontier
+            frontier = next_frontier
+        return variants
+
+    @staticmethod
+    def edit_distance(a: str, b: str, max_distance: int) -> int:
+        """Optimal string alignment distance, or max_distance + 1 when exceeded"""
+        if abs(len(a) - len(b)) > max_distance:
+            return max_distance + 1
+
+        previous_previous = None
+        previous = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            current = [i] + [0] * len(b)
+            row_min = current[0]
+            for j in range(1, len(b) + 1):
+                cost = 0 if a[i - 1] == b[j - 1] else 1
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if (previous_previous is not None and i > 1 and j > 1
+                        and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                    current[j] = min(current[j], previous_previous[j - 2] + 1)
+                row_min = min(row_min, current[j])
+            if row_min > max_distance:
+                return max_distance + 1
+            previous_previous, previous = previous, current
+
+        return previous[len(b)]
+
+    def allowed_distance(self, key: str) -> int:
+        """Shorter tokens get a tighter edit budget to avoid false snaps"""
+        if len(key) <= 4:
+            return 0
+        if len(key) <= 6:
+            return min(1, self.max_edit_distance)
+        return self.max_edit_distance
+
+    def lookup(self, token: str, max_edit_distance: Optional[int] = None,
+               max_candidates: int = 3) -> List[Dict[str, Any]]:
+        """
+        Find known drug names within edit distance of token, best first
+        """
+        key = self.normalize(token)
+        if not key:
+            return []
+
+        if max_edit_distance is None:
+            max_edit_distance = self.allowed_distance(key)
+        max_edit_distance = min(max_edit_distance, self.max_edit_distance)
+
+        if key in self.display_names and max_edit_distance == 0:
+            return [self._candidate(key, key, 0)]
+
+        # No known name is close enough in length to be within reach
+        if not any(abs(len(key) - length) <= max_edit_distance for length in self._key_lengths):
+            return []
+
+        candidate_keys = set()
+        for variant in self._deletion_variants(key, max_edit_distance):
+            candidate_keys |= self._deletes.get(variant, set())
+
+        candidates = []
+        for candidate_key in candidate_keys:
+            distance = self.edit_distance(key, candidate_key, max_edit_distance)
+            if distance <= max_edit_distance:
+                candidates.append(self._candidate(key, candidate_key, distance))
+
+        candidates.sort(key=lambda c: (c['distance'], -c['confidence'], c['name']))
+        return candidates[:max_candidates]
+
+    def _candidate(self, key: str, candidate_key: str, distance: int) -> Dict[str, Any]:
+        """Build a scored candidate entry"""
+        longest = max(len(key), len(candidate_key), 1)
+        return {
+            'name': self.display_names[candidate_key],
+            'distance': distance,
+            'confidence': round(1.0 - distance / longest, 3)
+        }
+
+    def correct(self, token: str, min_confidence: float = 0.75) -> Optional[Dict[str, Any]]:
+        """Snap a single OCR token to the best known drug name, if any"""
+        candidates = self.lookup(token)
+        if candidates and candidates[0]['confidence'] >= min_confidence:
+            best = dict(candidates[0])
+            best['ocr_text'] = token
+            best['candidates'] = candidates
+            return best
+        return None
+
+    def find_in_text(self, text: str, max_words: Optional[int] = None,
+                     min_confidence: float = 0.75) -> Optional[Dict[str, Any]]:
+        """
+        Find the best drug name in a line of OCR text.
+
+        Tries every window of up to max_words tokens so multi-word names
+        such as "Folic Acid" win over their first word alone.
+        """
+        if max_words is None:
+            max_words = self.max_words
+        tokens = re.findall(r'[A-Za-z0-9|][A-Za-z0-9|\-]*', text)
+        best = None
+
+        for start in range(len(tokens)):
+            for size in range(max_words, 0, -1):
+                if start + size > len(tokens):
+                    continue
+                window = ' '.join(tokens[start:start + size])
+                # Pure numbers and dosages are never drug names
+                if not re.search(r'[A-Za-z]{2,}', window) or re.fullmatch(r'[\d.]+\s*[a-zA-Z]{0,5}', window):
+                    continue
+
+                match = self.correct(window, min_confidence)
+                if not match:
+                    continue
+
+                rank = (match['distance'], -size, start)
+                if best is None or rank < best[0]:
+                    best = (rank, match)
+
+        return best[1] if best else None
+
+# Shared lexicon, built on first use
+_default_lexicon = None
+
+def get_drug_lexicon() -> DrugLexicon:
+    """Return the shared bundled drug lexicon"""
+    global _default_lexicon
+    if _default_lexicon is None:
+        _default_lexicon = DrugLexicon()
+    return _default_lexicon
@@ -0,0 +1,376 @@
+"""
+J.A.R.V.I.S. Emergency Phrase Matcher
+Compiled Aho-Corasick automaton with fuzzy token-window matching for spoken emergency reports
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from Healthcare.Core.drug_lexicon import DrugLexicon
+
+DEFAULT_PHRASES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Data', 'emergency_phrases.json'
+)
+
+URGENCY_PRIORITY = {'immediate': 2, 'urgent': 1}
+
+# Contracted and plain negations collapse to one token so "hasn't moved",
+# "has not moved" and "isn't moving" all read as "not mov"
+NEGATIONS = {
+    'not', 'no', 'never', 'cant', 'cannot', 'hasnt', 'havent', 'isnt', 'doesnt', 'didnt',
+    'dont', 'wont', 'arent', 'wasnt', 'werent', 'aint', 'couldnt', 'wouldnt'
+}
+
+# Punctuation and words that start a new clause become a boundary token, so
+# a negation in one clause ("No, I'm having heavy bleeding") can't cancel a
+# phrase in the next, and no phrase or window spans two clauses
+BOUNDARY = '|'
+CLAUSE_STARTERS = {'i', 'im', 'ive', 'id', 'we', 'my'}
+
+# Filler words STT keeps or drops unpredictably; removed from phrases and input alike
+STOPWORDS = {
+    'me', 'a', 'an', 'the', 'is', 'am', 'are', 'was', 'were',
+    'be', 'been', 'has', 'have', 'had', 'having', 'just', 'really', 'very', 'so', 'of', 'it', 'its',
+    'this', 'that', 'um', 'uh', 'like', 'kind', 'sort', 'bit', 'quite', 'pretty'
+}
+
+STEM_SUFFIXES = (
+    ('ingly', ''), ('edly', ''), ('ily', 'i'), ('ies', 'i'), ('ing', ''), ('ed', ''),
+    ('en', ''), ('ly', ''), ('es', ''), ('s', ''), ('e', '')
+)
+
+class EmergencyPhraseMatcher:
+    """
+    Emergency phrase lexicon compiled for per-utterance matching.
+
+    Text is normalized to stemmed tokens (negations unified, filler words
+    dropped, misspelled words snapped to the lexicon vocabulary, clause
+    boundaries kept). A
+    token-level Aho-Corasick automaton then finds every contiguous phrase
+    in one pass, and a window pass catches longer phrases with one extra
+    word inside, in phrase order ("bleeding and it won't stop").
+
+    A match is dropped when a negation the phrase itself does not contain
+    sits inside it or directly before it in the same clause ("not bleeding
+    heavily", "no longer bleeding heavily").
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, Any]] = None,
+                 phrases_path: str = DEFAULT_PHRASES_PATH,
+                 max_tokens: int = 64, budget_ms: float = 1.0):
+        if lexicon is None:
+            lexicon = self._load_lexicon(phrases_path)
+
+        self.version = lexicon.get('version', 'unversioned')
+        # Fuzzy and window passes only look at the first max_tokens tokens,
+        # which bounds per-utterance cost regardless of input length
+        self.max_tokens = max_tokens
+        self.budget_ms = budget_ms
+
+        self.emergencies: Dict[str, Dict[str, Any]] = {}
+        self.phrases: List[Dict[str, Any]] = []
+        self._vocabulary: Set[str] = set()
+        self._deletes: Dict[str, Set[str]] = {}
+        self._corrections: Dict[str, Optional[str]] = {}
+
+        for emergency_type, info in lexicon.get('emergencies', {}).items():
+            self.emergencies[emergency_type] = {
+                'urgency': info.get('urgency', 'urgent'),
+                'action': info.get('action', 'call_healthcare_provider'),
+                'keywords': list(info.get('phrases', []))
+            }
+            for phrase in info.get('phrases', []):
+                self._add_phrase(emergency_type, phrase)
+
+        self._build_automaton()
+        self._build_window_index()
+        self._build_fuzzy_index()
+
+        self._stats_lock = threading.Lock()
+        self.stats = {'utterances': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'over_budget': 0}
+
+    def _load_lexicon(self, phrases_path: str) -> Dict[str, Any]:
+        """Read the bundled emergency phrase lexicon"""
+        try:
+            with open(phrases_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except Exception as e:
+            print(f"Warning: Could not load emergency phrases: {e}")
+            return {}
+
+    @staticmethod
+    def normalize_words(text: str) -> List[str]:
+        """Lowercase words with apostrophes joined, negations unified, filler removed and clause breaks marked"""
+        text = text.lower().replace('’', "'").replace("'", '')
+        words = []
+        for word in re.findall(r'[a-z0-9]+|[,.;:!?]', text):
+            if word in CLAUSE_STARTERS or not word[0].isalnum():
+                if words and words[-1] != BOUNDARY:
+                    words.append(BOUNDARY)
+            elif word in NEGATIONS:
+                words.append('not')
+            elif word not in STOPWORDS:
+                words.append(word)
+        return words
+
+    @staticmethod
+    def stem(word: str) -> str:
+        """Light suffix stripping so inflections of a word share one token"""
+        if len(word) <= 3 or word == 'not':
+            return word
+        for suffix, replacement in STEM_SUFFIXES:
+            if not word.endswith(suffix) or len(word) - len(suffix) < 3:
+                continue
+            # "bleed" and "pass" are already stems
+            if (suffix == 'ed' and word[-3] == 'e') or (suffix == 's' and word.endswith('ss')):
+                continue
+            word = word[:-len(suffix)] + replacement
+            break
+        if word.endswith('y'):
+            word = word[:-1] + 'i'
+        # "stopped" -> "stopp" -> "stop", "blurred" -> "blur"
+        if len(word) >= 4 and word[-1] == word[-2] and word[-1] not in 'aeioulsz':
+            word = word[:-1]
+        return word
+
+    def _add_phrase(self, emergency_type: str, phrase: str):
+        words = [word for word in self.normalize_words(phrase) if word != BOUNDARY]
+        if not words:
+            return
+        self._vocabulary.update(word for word in words if word != 'not')
+        self.phrases.append({
+            'type': emergency_type,
+            'phrase': phrase,
+            'tokens': tuple(self.stem(word) for word in words)
+        })
+
+    def _build_automaton(self):
+        """Token-level Aho-Corasick: goto transitions, failure links and outputs"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for phrase_id, phrase in enumerate(self.phrases):
+            state = 0
+            for token in phrase['tokens']:
+                if token not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][token] = len(self._goto) - 1
+                state = self._goto[state][token]
+            self._output[state].append(phrase_id)
+
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _build_window_index(self):
+        """Last token -> phrases of three or more words ending in it, for the window pass"""
+        self._postings: Dict[str, List[int]] = {}
+        self._window_sizes: Dict[int, int] = {}
+        for phrase_id, phrase in enumerate(self.phrases):
+            # Two-word phrases stay exact: one word between them is already
+            # a different statement ("water bottle broke")
+            if len(phrase['tokens']) < 3:
+                continue
+            self._window_sizes[phrase_id] = len(phrase['tokens']) + 1
+            self._postings.setdefault(phrase['tokens'][-1], []).append(phrase_id)
+
+    def _build_fuzzy_index(self):
+        """Deletion index over the lexicon vocabulary for misspelled words"""
+        for word in self._vocabulary:
+            for variant in self._deletion_variants(word, self._allowed_distance(word)):
+                self._deletes.setdefault(variant, set()).add(word)
+
+    @staticmethod
+    def _allowed_distance(word: str) -> int:
+        if len(word) <= 4:
+            return 0
+        if len(word) <= 7:
+            return 1
+        return 2
+
+    @staticmethod
+    def _deletion_variants(word: str, distance: int) -> Set[str]:
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))} - variants
+            variants |= frontier
+        return variants
+
+    def _correct(self, word: str) -> Optional[str]:
+        """Nearest vocabulary word to a misspelled token (cached), or None"""
+        if word in self._corrections:
+            return self._corrections[word]
+
+        distance = self._allowed_distance(word)
+        best = None
+        if distance:
+            candidates = set()
+            for variant in self._deletion_variants(word, distance):
+                candidates |= self._deletes.get(variant, set())
+            scored = []
+            for candidate in candidates:
+                # First letters are rarely misheard or mistyped, and keeping
+                # them stops real words like "breeding" becoming "bleeding"
+                if candidate[:2] != word[:2]:
+                    continue
+                candidate_distance = DrugLexicon.edit_distance(word, candidate, distance)
+                if candidate_distance <= min(distance, self._allowed_distance(candidate)):
+                    scored.append((candidate_distance, candidate))
+            if scored:
+                best = min(scored)[1]
+
+        # Bounded so a long session of unknown words can't grow it forever
+        if len(self._corrections) < 10000:
+            self._corrections[word] = best
+        return best
+
+    def token_for(self, word: str, correct: bool = True) -> Tuple[str, bool]:
+        """Stemmed token for one normalized word and whether it was spelling-corrected"""
+        if word == BOUNDARY:
+            return word, False
+        if correct and word not in self._vocabulary and word != 'not':
+            replacement = self._correct(word)
+            if replacement:
+                return self.stem(replacement), True
+        return self.stem(word), False
+
+    def tokenize(self, text: str) -> Tuple[List[str], List[bool]]:
+        """Stemmed tokens for matching and, per token, whether it was spelling-corrected"""
+        tokens, corrected = [], []
+        for index, word in enumerate(self.normalize_words(text)):
+            token, fixed = self.token_for(word, correct=index < self.max_tokens)
+            tokens.append(token)
+            corrected.append(fixed)
+        return tokens, corrected
+
+    @property
+    def lookback(self) -> int:
+        """Tokens before a change that can still be part of a new match"""
+        return max((self._window_sizes.get(i, len(p['tokens'])) for i, p in enumerate(self.phrases)), default=0)
+
+    def match(self, text: str) -> List[Dict[str, Any]]:
+        """
+        All emergencies mentioned in text, highest urgency and confidence first.
+
+        Each match carries the lexicon phrase, the span of input words that
+        matched it and a confidence: 1.0 for an exact phrase, lower for
+        reordered words or spelling corrections.
+        """
+        start_time = time.perf_counter()
+        tokens, corrected = self.tokenize(text)
+        matches = self.match_tokens(tokens, corrected)
+        self._record_latency((time.perf_counter() - start_time) * 1000)
+        return matches
+
+    def match_tokens(self, tokens: List[str], corrected: List[bool], start: int = 0) -> List[Dict[str, Any]]:
+        """
+        Match already tokenized input, scanning only from token `start` on.
+
+        Streaming callers pass the first changed position minus `lookback`
+        so each partial transcript only costs its new words.
+        """
+        best: Dict[str, Dict[str, Any]] = {}
+
+        def consider(phrase_id: int, first: int, last: int, confidence: float):
+            if self._negated(tokens, phrase_id, first, last):
+                return
+            if any(corrected[first:last + 1]):
+                confidence = min(confidence, 0.85)
+            phrase = self.phrases[phrase_id]
+            current = best.get(phrase['type'])
+            if current is None or confidence > current['confidence']:
+                best[phrase['type']] = {
+                    'type': phrase['type'],
+                    'urgency': self.emergencies[phrase['type']]['urgency'],
+                    'action': self.emergencies[phrase['type']]['action'],
+                    'phrase': phrase['phrase'],
+                    'confidence': confidence,
+                    'span': (first, last)
+                }
+
+        # Exact pass: contiguous phrases, one automaton step per token
+        state = 0
+        for position in range(start, len(tokens)):
+            token = tokens[position]
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for phrase_id in self._output[state]:
+                consider(phrase_id, position - len(self.phrases[phrase_id]['tokens']) + 1, position, 1.0)
+
+        # Window pass: the phrase words in order with one extra word inside
+        for position in range(start, min(len(tokens), start + self.max_tokens)):
+            for phrase_id in self._postings.get(tokens[position], ()):
+                first = self._window_start(tokens, phrase_id, position)
+                if first is not None and position - first + 1 > len(self.phrases[phrase_id]['tokens']):
+                    consider(phrase_id, first, position, 0.9)
+
+        return sorted(best.values(), key=lambda m: (-URGENCY_PRIORITY.get(m['urgency'], 0), -m['confidence']))
+
+    def _window_start(self, tokens: List[str], phrase_id: int, last: int) -> Optional[int]:
+        """Start of the phrase read backwards in order from token `last`, within its window and clause"""
+        phrase_tokens = self.phrases[phrase_id]['tokens']
+        lowest = max(0, last - self._window_sizes[phrase_id] + 1)
+        remaining = len(phrase_tokens) - 1
+        position = last
+        while remaining >= 0 and position >= lowest and tokens[position] != BOUNDARY:
+            if tokens[position] == phrase_tokens[remaining]:
+                remaining -= 1
+            position -= 1
+        return position + 1 if remaining < 0 else None
+
+    def _negated(self, tokens: List[str], phrase_id: int, first: int, last: int) -> bool:
+        """Whether a negation the phrase doesn't contain falls inside the span or directly before it"""
+        own = self.phrases[phrase_id]['tokens'].count('not')
+        if tokens[first:last + 1].count('not') > own:
+            return True
+        before = tokens[max(0, first - 2):first]
+        # "not bleeding heavily", "no longer bleeding heavily"
+        return before[-1:] == ['not'] or before == ['not', 'longer']
+
+    def detect(self, text: str) -> Optional[Dict[str, Any]]:
+        """Highest-priority emergency in text, or None"""
+        matches = self.match(text)
+        return matches[0] if matches else None
+
+    def _record_latency(self, elapsed_ms: float):
+        with self._stats_lock:
+            self.stats['utterances'] += 1
+            self.stats['total_ms'] += elapsed_ms
+            self.stats['max_ms'] = max(self.stats['max_ms'], elapsed_ms)
+            if elapsed_ms > self.budget_ms:
+                self.stats['over_budget'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Latency counters since start"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['mean_ms'] = stats['total_ms'] / stats['utterances'] if stats['utterances'] else 0.0
+        stats['budget_ms'] = self.budget_ms
+        stats['phrases'] = len(self.phrases)
+        stats['version'] = self.version
+        return stats
+
+# Shared matcher, compiled on first use
+_default_matcher = None
+
+def get_emergency_matcher() -> EmergencyPhraseMatcher:
+    """Return the shared bundled emergency phrase matcher"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = EmergencyPhraseMatcher()
+    return _default_matcher
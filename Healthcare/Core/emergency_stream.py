@@ -0,0 +1,150 @@
+"""
+J.A.R.V.I.S. Streaming Emergency Monitor
+Scans partial speech transcripts as they arrive so emergencies alert before the utterance is routed
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable
+
+from Healthcare.Core.emergency_matcher import EmergencyPhraseMatcher, get_emergency_matcher
+
+class EmergencyStreamMonitor:
+    """
+    Incremental emergency scanner for one speech utterance at a time.
+
+    feed() takes every partial transcript from speech-to-text. Only words
+    that changed since the previous partial (plus the matcher's lookback)
+    are rescanned, so a long utterance costs the same per partial as a
+    short one. Each emergency type alerts at most once per utterance, and
+    the first alert calls on_alert(match, transcript) on a background
+    thread.
+
+    end_of_speech() closes the utterance: it scans the final text once
+    (for STT backends without partials) and records time-to-alert, i.e.
+    alert time minus end-of-speech time. Negative values mean the alert
+    fired while the user was still talking. The alert is 'confirmed' when
+    the final text still holds a match of at least confirm_confidence (an
+    exact phrase by default); only then should the caller skip its normal
+    query handling.
+    """
+
+    def __init__(self, on_alert: Optional[Callable[[Dict[str, Any], str], Any]] = None,
+                 matcher: Optional[EmergencyPhraseMatcher] = None, history: int = 100,
+                 confirm_confidence: float = 1.0):
+        self.on_alert = on_alert
+        self.matcher = matcher or get_emergency_matcher()
+        self.confirm_confidence = confirm_confidence
+        self._lock = threading.Lock()
+        self.time_to_alert_ms = deque(maxlen=history)
+        self.stats = {'utterances': 0, 'partials': 0, 'alerts': 0, 'alerts_from_partials': 0}
+        self._reset()
+
+    def _reset(self):
+        self._words: List[str] = []
+        self._tokens: List[str] = []
+        self._corrected: List[bool] = []
+        self._alerts: List[Dict[str, Any]] = []
+
+    def begin_utterance(self):
+        """Forget the previous utterance; called when the microphone opens"""
+        with self._lock:
+            self._reset()
+
+    def feed(self, transcript: str) -> List[Dict[str, Any]]:
+        """Scan a partial transcript; returns alerts raised by this partial"""
+        with self._lock:
+            self.stats['partials'] += 1
+            return self._scan(transcript, from_partial=True)
+
+    def end_of_speech(self, final_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Close the utterance and return its most urgent alert, if any.
+
+        The returned dict is the alert's match plus 'detected_on'
+        ('partial' or 'final'), 'time_to_alert_ms' and 'confirmed'.
+        """
+        with self._lock:
+            speech_end = time.perf_counter()
+            if final_text:
+                self._scan(final_text, from_partial=False)
+
+            self.stats['utterances'] += 1
+            alerts = sorted(self._alerts, key=lambda a: a['raised_at'])
+            result = None
+            if alerts:
+                first = alerts[0]
+                time_to_alert = (first['raised_at'] - speech_end) * 1000
+                self.time_to_alert_ms.append(time_to_alert)
+                result = dict(first['match'])
+                result['detected_on'] = first['detected_on']
+                result['time_to_alert_ms'] = round(time_to_alert, 2)
+                # Partials can be revised away; confirm against the final words
+                final_matches = self.matcher.match_tokens(self._tokens, self._corrected)
+                result['confirmed'] = any(match['confidence'] >= self.confirm_confidence
+                                          for match in final_matches)
+                print(f"⏱️ Emergency alert {result['type']} on {result['detected_on']} transcript, "
+                      f"{result['time_to_alert_ms']:+.0f}ms from end of speech")
+
+            self._reset()
+            return result
+
+    def _scan(self, transcript: str, from_partial: bool) -> List[Dict[str, Any]]:
+        words = self.matcher.normalize_words(transcript)
+
+        # Partials are usually the previous text plus a few words, sometimes
+        # with the last words revised; keep tokens up to the first change
+        unchanged = 0
+        for old, new in zip(self._words, words):
+            if old != new:
+                break
+            unchanged += 1
+
+        tokens, corrected = self._tokens[:unchanged], self._corrected[:unchanged]
+        for index in range(unchanged, len(words)):
+            token, fixed = self.matcher.token_for(words[index], correct=index < self.matcher.max_tokens)
+            tokens.append(token)
+            corrected.append(fixed)
+        self._words, self._tokens, self._corrected = words, tokens, corrected
+
+        if unchanged == len(words) and from_partial:
+            return []
+
+        start = max(0, unchanged - self.matcher.lookback) if from_partial else 0
+        raised = []
+        alerted_types = {alert['match']['type'] for alert in self._alerts}
+        for match in self.matcher.match_tokens(tokens, corrected, start):
+            if match['type'] in alerted_types:
+                continue
+            alert = {'match': match, 'raised_at': time.perf_counter(),
+                     'detected_on': 'partial' if from_partial else 'final'}
+            self._alerts.append(alert)
+            alerted_types.add(match['type'])
+            raised.append(match)
+
+        if raised:
+            self.stats['alerts'] += len(raised)
+            if from_partial:
+                self.stats['alerts_from_partials'] += len(raised)
+            # One emergency response per utterance, for its first (most urgent) alert
+            first_in_utterance = len(self._alerts) == len(raised)
+            if self.on_alert and first_in_utterance:
+                threading.Thread(target=self.on_alert, args=(raised[0], transcript), daemon=True).start()
+
+        return raised
+
+    def has_alerted(self) -> bool:
+        """Whether the current utterance has already raised an alert"""
+        with self._lock:
+            return bool(self._alerts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Alert counts and time-to-alert percentiles over recent utterances"""
+        with self._lock:
+            stats = dict(self.stats)
+            samples = sorted(self.time_to_alert_ms)
+        if samples:
+            stats['time_to_alert_p50_ms'] = samples[len(samples) // 2]
+            stats['time_to_alert_max_ms'] = samples[-1]
+        return stats
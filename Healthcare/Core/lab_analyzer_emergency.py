@@ -7,16 +7,20 @@ import os
 import sys
 import json
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime, timedelta
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Import existing healthcare components
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from Healthcare.Database.models import HealthcareDatabase
 from Healthcare.Core.medical_ocr import MedicalOCR
-from Backend.TextToSpeech import TextToSpeech
-from Frontend.GUI import ShowTextToScreen, SetAssistantStatus
+from Healthcare.Core.lab_rules import get_lab_rule_engine, RISK_LEVELS
+from Healthcare.Core.emergency_matcher import get_emergency_matcher
+from Healthcare.Core.emergency_stream import EmergencyStreamMonitor
+from Healthcare.Core.assistant_io import TextToSpeech, ShowTextToScreen, SetAssistantStatus
+from Backend.OutputBus import PRIORITY_EMERGENCY
 
 class LabResultsAnalyzer:
     """Advanced lab results analyzer with pregnancy-specific analysis"""
@@ -25,38 +29,23 @@ class LabResultsAnalyzer:
         self.healthcare_db = HealthcareDatabase()
         self.medical_ocr = MedicalOCR()
         
-        # Pregnancy normal ranges
-        self.normal_ranges = {
-            'hemoglobin': {'min': 11.0, 'max': 14.0, 'unit': 'g/dL', 'critical_low': 9.0},
-            'glucose_fasting': {'min': 70, 'max': 95, 'unit': 'mg/dL', 'critical_high': 125},
-            'protein_urine': {'min': 0, 'max': 150, 'unit': 'mg/24hr', 'critical_high': 300},
-            'blood_pressure_systolic': {'min': 90, 'max': 120, 'unit': 'mmHg', 'critical_high': 140},
-            'blood_pressure_diastolic': {'min': 60, 'max': 80, 'unit': 'mmHg', 'critical_high': 90},
-        }
+        # Ranges (per trimester/week) and critical conditions come from Data/lab_rules.json
+        self.rule_engine = get_lab_rule_engine()
+        
+        # Mid-pregnancy ranges, kept for callers that read them directly
+        self.normal_ranges = self.rule_engine.ranges_for_week(20)
         
         # Critical conditions
-        self.critical_conditions = {
-            'preeclampsia': {
-                'indicators': ['bp_systolic > 140', 'bp_diastolic > 90', 'protein > 300'],
-                'message': 'Possible preeclampsia detected. Seek immediate medical attention.'
-            },
-            'severe_anemia': {
-                'indicators': ['hemoglobin < 9.0'],
-                'message': 'Severe anemia detected. Contact healthcare provider immediately.'
-            },
-            'gestational_diabetes': {
-                'indicators': ['glucose_fasting > 92'],
-                'message': 'Possible gestational diabetes. Schedule appointment with healthcare provider.'
-            }
-        }
+        self.critical_conditions = self.rule_engine.conditions
         
         print("✅ Lab Results Analyzer initialized")
     
     def analyze_lab_results(self, image_path: str, gestational_week: int = 20) -> Dict[str, Any]:
         """Comprehensive lab results analysis"""
         try:
-            # Extract lab data using OCR
-            ocr_result = self.medical_ocr.parse_lab_results(image_path)
+            # Extract lab data using OCR; the panel is stored once, below, with
+            # this analysis (a second copy would double its trend points)
+            ocr_result = self.medical_ocr.parse_lab_results(image_path, store=False)
             
             if not ocr_result.get('success'):
                 return {'success': False, 'error': ocr_result.get('error', 'Failed to process')}
@@ -64,20 +53,25 @@ class LabResultsAnalyzer:
             lab_values = ocr_result.get('results', {})
             
             # Perform analysis
-            analysis = self._analyze_values(lab_values)
-            critical_alerts = self._check_critical_conditions(lab_values)
+            analysis = self._analyze_values(lab_values, gestational_week)
+            critical_alerts = analysis.pop('critical_alerts')
             
             # Store results
             result_id = self.healthcare_db.add_lab_result(
                 patient_id=1, test_date=datetime.now().strftime('%Y-%m-%d'),
                 test_type='Lab Analysis', results=lab_values,
                 flagged_values=analysis.get('flagged_values', {}),
-                urgency_level='critical' if critical_alerts else 'normal'
+                urgency_level='critical' if critical_alerts else 'normal',
+                gestational_week=gestational_week, rule_version=self.rule_engine.version
             )
             
+            # Compare against earlier results now that this panel is stored
+            trajectory_alerts = self.check_lab_trajectories(patient_id=1)
+            
             return {
                 'success': True, 'result_id': result_id, 'gestational_week': gestational_week,
                 'lab_values': lab_values, 'analysis': analysis, 'critical_alerts': critical_alerts,
+                'trajectory_alerts': trajectory_alerts,
                 'recommendations': self._generate_recommendations(analysis, critical_alerts),
                 'requires_immediate_attention': len(critical_alerts) > 0
             }
@@ -85,64 +79,71 @@ class LabResultsAnalyzer:
         except Exception as e:
             return {'success': False, 'error': f'Analysis failed: {str(e)}'}
     
-    def _analyze_values(self, lab_values: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze lab values against normal ranges"""
-        analysis = {'normal_values': {}, 'flagged_values': {}}
-        
-        for test_name, value in lab_values.items():
-            if test_name in self.normal_ranges and isinstance(value, (int, float)):
-                range_info = self.normal_ranges[test_name]
-                
-                test_analysis = {
-                    'value': value, 'unit': range_info['unit'],
-                    'normal_range': f"{range_info['min']}-{range_info['max']} {range_info['unit']}",
-                    'status': 'normal'
-                }
-                
-                if value < range_info['min']:
-                    test_analysis['status'] = 'low'
-                    test_analysis['severity'] = 'severe' if value < range_info.get('critical_low', 0) else 'mild'
-                    analysis['flagged_values'][test_name] = test_analysis
-                elif value > range_info['max']:
-                    test_analysis['status'] = 'high'
-                    test_analysis['severity'] = 'severe' if value > range_info.get('critical_high', 999) else 'mild'
-                    analysis['flagged_values'][test_name] = test_analysis
-                else:
-                    analysis['normal_values'][test_name] = test_analysis
-        
-        return analysis
+    def _analyze_values(self, lab_values: Dict[str, Any], gestational_week: int = 20) -> Dict[str, Any]:
+        """Analyze lab values against the ranges for this gestational week"""
+        return self.rule_engine.evaluate_batch([lab_values], gestational_week)[0]
     
-    def _check_critical_conditions(self, lab_values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _check_critical_conditions(self, lab_values: Dict[str, Any], gestational_week: int = 20) -> List[Dict[str, Any]]:
         """Check for critical pregnancy conditions"""
-        critical_alerts = []
+        return self._analyze_values(lab_values, gestational_week)['critical_alerts']
+    
+    def check_lab_trajectories(self, patient_id: int = 1, as_of: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Flag worrying trends such as "systolic up 15 mmHg in 3 weeks".
         
-        # Check preeclampsia
-        if (lab_values.get('blood_pressure_systolic', 0) > 140 and 
-            lab_values.get('blood_pressure_diastolic', 0) > 90 and 
-            lab_values.get('protein_urine', 0) > 300):
-            critical_alerts.append({
-                'condition': 'preeclampsia',
-                'message': self.critical_conditions['preeclampsia']['message'],
-                'urgency': 'immediate'
-            })
+        Each trajectory rule reads only its own window of one test from the
+        trend store's index.
+        """
+        trajectory_alerts = []
         
-        # Check severe anemia
-        if lab_values.get('hemoglobin', 15) < 9.0:
-            critical_alerts.append({
-                'condition': 'severe_anemia',
-                'message': self.critical_conditions['severe_anemia']['message'],
-                'urgency': 'immediate'
-            })
+        try:
+            for name, rule in self.rule_engine.trajectories.items():
+                window = self.healthcare_db.lab_trends.get_window(
+                    patient_id, rule['test'], rule['within_days'], end=as_of
+                )
+                if len(window) < 2:
+                    continue
+                
+                latest = window.latest()
+                reference = window.minimum() if rule['direction'] == 'rise' else window.maximum()
+                change = abs(latest['value'] - reference['value'])
+                moved_the_right_way = (latest['value'] > reference['value']) == (rule['direction'] == 'rise')
+                if not moved_the_right_way or change < rule['change']:
+                    continue
+                
+                days = (latest['measured_at'] - reference['measured_at']).days
+                slope = window.slope_per_day()
+                unit = self.rule_engine.units.get(rule['test'], '')
+                trajectory_alerts.append({
+                    'condition': name,
+                    'message': rule['message'],
+                    'urgency': rule['urgency'],
+                    'explanation': (
+                        f"{rule['test']} {'up' if rule['direction'] == 'rise' else 'down'} "
+                        f"{change:g} {unit} in {days} days ({reference['value']:g} -> {latest['value']:g})"
+                    ),
+                    'slope_per_week': round(slope * 7, 3) if slope is not None else None
+                })
         
-        # Check gestational diabetes
-        if lab_values.get('glucose_fasting', 70) > 92:
-            critical_alerts.append({
-                'condition': 'gestational_diabetes',
-                'message': self.critical_conditions['gestational_diabetes']['message'],
-                'urgency': 'urgent'
-            })
+        except Exception as e:
+            print(f"Error checking lab trajectories: {e}")
         
-        return critical_alerts
+        return trajectory_alerts
+    
+    def analyze_lab_panels(self, panels: List[Dict[str, Any]],
+                           gestational_weeks: Union[int, List[int]] = 20) -> List[Dict[str, Any]]:
+        """
+        Analyze many lab panels in one vectorized pass (nothing is stored)
+        """
+        results = []
+        for analysis in self.rule_engine.evaluate_batch(panels, gestational_weeks):
+            critical_alerts = analysis.pop('critical_alerts')
+            results.append({
+                'analysis': analysis, 'critical_alerts': critical_alerts,
+                'recommendations': self._generate_recommendations(analysis, critical_alerts),
+                'requires_immediate_attention': len(critical_alerts) > 0
+            })
+        return results
     
     def _generate_recommendations(self, analysis: Dict[str, Any], critical_alerts: List[Dict[str, Any]]) -> List[str]:
         """Generate personalized recommendations"""
@@ -175,53 +176,32 @@ class EmergencyDetectionSystem:
     
     def __init__(self):
         self.healthcare_db = HealthcareDatabase()
-        self.lab_analyzer = LabResultsAnalyzer()
+        
+        # Single writer so emergency logs keep their order without blocking alerts
+        self._log_executor = ThreadPoolExecutor(max_workers=1)
+        
+        # Emergency phrases come from Data/emergency_phrases.json, compiled once
+        self.emergency_matcher = get_emergency_matcher()
         
         # Emergency symptoms patterns
-        self.emergency_symptoms = {
-            'severe_bleeding': {
-                'keywords': ['heavy bleeding', 'severe bleeding', 'hemorrhage'],
-                'urgency': 'immediate', 'action': 'call_emergency_services'
-            },
-            'severe_contractions': {
-                'keywords': ['severe contractions', 'labor pain', 'water broke'],
-                'urgency': 'immediate', 'action': 'call_healthcare_provider'
-            },
-            'severe_headache': {
-                'keywords': ['severe headache', 'blurred vision', 'seeing spots'],
-                'urgency': 'urgent', 'action': 'call_healthcare_provider'
-            },
-            'decreased_movement': {
-                'keywords': ['baby not moving', 'decreased movement', 'no kicks'],
-                'urgency': 'urgent', 'action': 'call_healthcare_provider'
-            }
-        }
+        self.emergency_symptoms = self.emergency_matcher.emergencies
         
         print("✅ Emergency Detection System initialized")
-    
+
+    @property
+    def lab_analyzer(self) -> LabResultsAnalyzer:
+        """Shared lab analyzer, built on first use instead of once per detector"""
+        return get_lab_analyzer()
+
     def analyze_emergency_situation(self, user_input: str) -> Dict[str, Any]:
         """Analyze user input for emergency situations"""
         try:
-            user_input_lower = user_input.lower()
-            detected_emergencies = []
-            
-            # Check for emergency symptoms
-            for emergency_type, emergency_info in self.emergency_symptoms.items():
-                for keyword in emergency_info['keywords']:
-                    if keyword in user_input_lower:
-                        detected_emergencies.append({
-                            'type': emergency_type,
-                            'urgency': emergency_info['urgency'],
-                            'action': emergency_info['action']
-                        })
-                        break
+            # Exact, reordered and misspelled phrases, best match first
+            detected_emergencies = self.emergency_matcher.match(user_input)
             
             if detected_emergencies:
-                # Select highest priority emergency
-                highest_priority = max(detected_emergencies, 
-                                     key=lambda x: 1 if x['urgency'] == 'immediate' else 0)
-                
-                return self._handle_emergency(highest_priority, user_input)
+                # Matches are sorted by urgency, then confidence
+                return self._handle_emergency(detected_emergencies[0], user_input)
             else:
                 return {
                     'emergency_detected': False,
@@ -242,26 +222,28 @@ class EmergencyDetectionSystem:
             emergency_type = emergency['type']
             urgency = emergency['urgency']
             
-            # Log emergency
-            self.healthcare_db.log_voice_command(
-                patient_id=1, command_text=user_input,
-                intent_classification='EMERGENCY',
-                response_generated=f"Emergency detected: {emergency_type}"
-            )
-            
-            # Generate response
+            # Generate response; the alert interrupts any other speech and doesn't wait for playback
             if urgency == 'immediate':
                 message = f"MEDICAL EMERGENCY: {emergency_type}. Call 911 immediately!"
-                TextToSpeech(message)
+                TextToSpeech(message, priority=PRIORITY_EMERGENCY, wait=False)
                 ShowTextToScreen(f"🚨 EMERGENCY: {message}")
             else:
                 message = f"Urgent situation: {emergency_type}. Contact healthcare provider."
-                TextToSpeech(message)
+                TextToSpeech(message, priority=PRIORITY_EMERGENCY, wait=False)
                 ShowTextToScreen(f"⚠️ URGENT: {message}")
             
+            # Log emergency off the alert path
+            self._log_executor.submit(
+                self.healthcare_db.log_voice_command,
+                patient_id=1, command_text=user_input,
+                intent_classification='EMERGENCY',
+                response_generated=f"Emergency detected: {emergency_type}"
+            )
+            
             return {
                 'emergency_detected': True, 'emergency_type': emergency_type,
                 'urgency': urgency, 'message': message,
+                'matched_phrase': emergency.get('phrase'), 'confidence': emergency.get('confidence', 1.0),
                 'recommendations': self._get_emergency_recommendations(emergency_type),
                 'timestamp': datetime.now().isoformat()
             }
@@ -285,23 +267,50 @@ class EmergencyDetectionSystem:
         
         return base_recommendations + specific_recommendations.get(emergency_type, [])
 
-# Global instances
-lab_analyzer = LabResultsAnalyzer()
-emergency_detector = EmergencyDetectionSystem()
+# Shared instances, created on first use
+_lab_analyzer = None
+_emergency_detector = None
+
+def get_lab_analyzer() -> LabResultsAnalyzer:
+    """Return the shared lab results analyzer"""
+    global _lab_analyzer
+    if _lab_analyzer is None:
+        _lab_analyzer = LabResultsAnalyzer()
+    return _lab_analyzer
+
+def get_emergency_detector() -> EmergencyDetectionSystem:
+    """Return the shared emergency detection system"""
+    global _emergency_detector
+    if _emergency_detector is None:
+        _emergency_detector = EmergencyDetectionSystem()
+    return _emergency_detector
+
+def __getattr__(name):
+    # The old module-level instances, built only when someone asks for them
+    if name == 'lab_analyzer':
+        return get_lab_analyzer()
+    if name == 'emergency_detector':
+        return get_emergency_detector()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Utility functions
 def analyze_lab_results_from_image(image_path: str, gestational_week: int = 20) -> Dict[str, Any]:
     """Analyze lab results from image"""
-    return lab_analyzer.analyze_lab_results(image_path, gestational_week)
+    return get_lab_analyzer().analyze_lab_results(image_path, gestational_week)
 
 def detect_emergency_from_text(user_input: str) -> Dict[str, Any]:
     """Detect emergency from user input"""
-    return emergency_detector.analyze_emergency_situation(user_input)
+    return get_emergency_detector().analyze_emergency_situation(user_input)
+
+def create_emergency_stream_monitor() -> EmergencyStreamMonitor:
+    """Monitor for partial speech transcripts that triggers the emergency protocol directly"""
+    return EmergencyStreamMonitor(on_alert=get_emergency_detector()._handle_emergency)
 
-def get_health_risk_assessment(lab_values: Dict[str, Any]) -> Dict[str, Any]:
+def get_health_risk_assessment(lab_values: Dict[str, Any], gestational_week: int = 20) -> Dict[str, Any]:
     """Get health risk assessment from lab values"""
-    analysis = lab_analyzer._analyze_values(lab_values)
-    critical_alerts = lab_analyzer._check_critical_conditions(lab_values)
+    lab_analyzer = get_lab_analyzer()
+    analysis = lab_analyzer._analyze_values(lab_values, gestational_week)
+    critical_alerts = analysis.pop('critical_alerts')
     
     flagged_count = len(analysis.get('flagged_values', {}))
     
@@ -322,4 +331,15 @@ def get_health_risk_assessment(lab_values: Dict[str, Any]) -> Dict[str, Any]:
         'risk_level': risk_level, 'risk_message': risk_message,
         'flagged_count': flagged_count, 'critical_alerts': critical_alerts,
         'recommendations': lab_analyzer._generate_recommendations(analysis, critical_alerts)
-    }
\ No newline at end of file
+    }
+
+def assess_population_risk(patient_ids, tests, values, gestational_weeks) -> Dict[str, Any]:
+    """
+    Vectorized risk assessment for many patients from long-format lab rows.
+    
+    Same risk levels as get_health_risk_assessment, returned as arrays
+    aligned with the unique patient ids.
+    """
+    result = get_lab_analyzer().rule_engine.evaluate_population(patient_ids, tests, values, gestational_weeks)
+    result['risk_levels'] = RISK_LEVELS
+    return result
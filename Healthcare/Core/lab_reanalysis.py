@@ -0,0 +1,259 @@
+"""
+J.A.R.V.I.S. Lab Re-analysis Job
+Re-evaluates stored lab results whose rule version is outdated, in resumable chunks
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Healthcare.Database.models import HealthcareDatabase
+from Healthcare.Database.encryption import HealthcareEncryption
+from Healthcare.Core.lab_rules import LabRuleEngine, DEFAULT_LAB_RULES_PATH, summarize_flags, lab_urgency
+
+# Rows written by MedicalOCR.parse_lab_results keep its flag format and urgency rule
+OCR_TEST_TYPE = "General Lab Work"
+
+# Rule engine and cipher for the current worker process, built once by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+def _init_worker(rules_path: str, password: Optional[str]):
+    """Process-pool initializer: load rules and derive the key once per worker"""
+    _worker_state['engine'] = LabRuleEngine(rules_path=rules_path)
+    _worker_state['encryption'] = HealthcareEncryption(password)
+
+def reanalyze_rows(rows: List[Tuple[int, str, Optional[int], str]]) -> Tuple[List[Tuple], List[int]]:
+    """
+    Decrypt, re-evaluate and re-encrypt one chunk of lab_results rows.
+
+    Returns (updates, failed_ids) where each update is
+    (flagged_values, urgency_level, rule_version, id) ready for executemany.
+    """
+    engine = _worker_state['engine']
+    encryption = _worker_state['encryption']
+
+    decoded, failed = [], []
+    for row_id, results, gestational_week, test_type in rows:
+        try:
+            decoded.append((row_id, encryption.decrypt_json(results),
+                            gestational_week if gestational_week is not None else 20, test_type))
+        except Exception:
+            failed.append(row_id)
+
+    if not decoded:
+        return [], failed
+
+    # The whole chunk goes through the vectorized engine in one call
+    analyses = engine.evaluate_batch([item[1] for item in decoded], [item[2] for item in decoded])
+
+    updates = []
+    for (row_id, _, _, test_type), analysis in zip(decoded, analyses):
+        if test_type == OCR_TEST_TYPE:
+            flagged = summarize_flags(analysis['flagged_values'])
+            urgency = lab_urgency(analysis)
+        else:
+            flagged = analysis['flagged_values']
+            urgency = 'critical' if analysis['critical_alerts'] else 'normal'
+        updates.append((encryption.encrypt_json(flagged) if flagged else "", urgency, engine.version, row_id))
+
+    return updates, failed
+
+class LabReanalysisJob:
+    """
+    Brings stored lab_results up to the current rule version.
+
+    Only rows whose ``rule_version`` differs from the rules file are read,
+    in id order and ``chunk_size`` rows at a time. Chunks are analyzed in a
+    process pool while the next ones are read; results are written back in
+    order, each chunk in one transaction together with a checkpoint, so an
+    interrupted job resumes after the last committed chunk.
+    """
+
+    def __init__(self, db_path: str = "Healthcare/Database/healthcare.db",
+                 rules_path: str = DEFAULT_LAB_RULES_PATH, password: Optional[str] = None,
+                 chunk_size: int = 500, max_workers: Optional[int] = None):
+        self.db_path = db_path
+        self.rules_path = rules_path
+        self.password = password
+        self.chunk_size = chunk_size
+        # None = one worker per CPU, 0 = analyze in this process
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.rule_version = LabRuleEngine(rules_path=rules_path).version
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.last_run: Dict[str, Any] = {}
+
+        # Make sure lab_results has the rule_version column before querying it
+        HealthcareDatabase(db_path)
+        self._ensure_progress_table()
+
+    def _ensure_progress_table(self):
+        """Create checkpoint table if it doesn't exist"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS lab_reanalysis_progress (
+                    rule_version TEXT PRIMARY KEY,
+                    last_id INTEGER DEFAULT 0,
+                    processed INTEGER DEFAULT 0,
+                    updated INTEGER DEFAULT 0,
+                    failed INTEGER DEFAULT 0,
+                    started_at TEXT,
+                    completed_at TEXT
+                )
+            ''')
+            conn.commit()
+
+    def get_progress(self) -> Dict[str, Any]:
+        """Checkpoint for the current rule version"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''
+                SELECT last_id, processed, updated, failed, started_at, completed_at
+                FROM lab_reanalysis_progress WHERE rule_version = ?
+            ''', (self.rule_version,)).fetchone()
+
+        progress = {'rule_version': self.rule_version, 'last_id': 0, 'processed': 0, 'updated': 0,
+                    'failed': 0, 'started_at': None, 'completed_at': None}
+        if row:
+            progress.update(zip(('last_id', 'processed', 'updated', 'failed', 'started_at', 'completed_at'), row))
+        progress['pending'] = self.pending_count(progress['last_id'])
+        return progress
+
+    def pending_count(self, after_id: int = 0) -> int:
+        """Number of stale rows after the checkpoint"""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('''
+                SELECT COUNT(*) FROM lab_results
+                WHERE id > ? AND (rule_version IS NULL OR rule_version != ?)
+            ''', (after_id, self.rule_version)).fetchone()[0]
+
+    def _read_chunk(self, after_id: int) -> List[Tuple]:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('''
+                SELECT id, results, gestational_week, test_type FROM lab_results
+                WHERE id > ? AND (rule_version IS NULL OR rule_version != ?)
+                ORDER BY id LIMIT ?
+            ''', (after_id, self.rule_version, self.chunk_size)).fetchall()
+
+    def _commit_chunk(self, updates: List[Tuple], failed: List[int], last_id: int, row_count: int):
+        """Write one chunk's results and advance the checkpoint atomically"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE lab_results SET flagged_values = ?, urgency_level = ?, rule_version = ?
+                WHERE id = ?
+            ''', updates)
+            cursor.execute('''
+                INSERT INTO lab_reanalysis_progress (rule_version, last_id, processed, updated, failed, started_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(rule_version) DO UPDATE SET
+                    last_id = excluded.last_id,
+                    processed = processed + excluded.processed,
+                    updated = updated + excluded.updated,
+                    failed = failed + excluded.failed
+            ''', (self.rule_version, last_id, row_count, len(updates), len(failed), datetime.now().isoformat()))
+            conn.commit()
+
+    def run(self, max_chunks: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Re-analyze stale rows until none are left, max_chunks have been
+        written or stop() is called; returns counts for this run
+        """
+        self._stop_event.clear()
+        read_after = self.get_progress()['last_id']
+        stats = {'rule_version': self.rule_version, 'chunks': 0, 'processed': 0, 'updated': 0,
+                 'failed': 0, 'completed': False}
+
+        executor = None
+        if self.max_workers > 0:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                           initargs=(self.rules_path, self.password))
+        else:
+            _init_worker(self.rules_path, self.password)
+
+        in_flight = deque()
+        submitted = 0
+        exhausted = False
+
+        try:
+            while True:
+                # Keep a couple of chunks per worker queued while results are written
+                while (not exhausted and not self._stop_event.is_set()
+                       and len(in_flight) < max(1, self.max_workers) * 2
+                       and (max_chunks is None or submitted < max_chunks)):
+                    rows = self._read_chunk(read_after)
+                    if not rows:
+                        exhausted = True
+                        break
+                    read_after = rows[-1][0]
+                    if executor:
+                        future = executor.submit(reanalyze_rows, rows)
+                    else:
+                        future = Future()
+                        future.set_result(reanalyze_rows(rows))
+                    in_flight.append((rows[-1][0], len(rows), future))
+                    submitted += 1
+
+                if not in_flight:
+                    break
+
+                last_id, row_count, future = in_flight.popleft()
+                updates, failed = future.result()
+                self._commit_chunk(updates, failed, last_id, row_count)
+
+                stats['chunks'] += 1
+                stats['processed'] += row_count
+                stats['updated'] += len(updates)
+                stats['failed'] += len(failed)
+
+            if exhausted and not in_flight:
+                stats['completed'] = True
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.execute('UPDATE lab_reanalysis_progress SET completed_at = ? WHERE rule_version = ?',
+                                 (datetime.now().isoformat(), self.rule_version))
+                    conn.commit()
+
+        except Exception as e:
+            print(f"Error in lab re-analysis: {e}")
+            stats['error'] = str(e)
+
+        finally:
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        self.last_run = stats
+        return stats
+
+    def start_background(self) -> threading.Thread:
+        """Run the job on a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop after the chunks already in flight are written"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def reset_checkpoint(self):
+        """Forget progress for the current rule version (e.g. to retry failed rows)"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM lab_reanalysis_progress WHERE rule_version = ?', (self.rule_version,))
+            conn.commit()
+
+def start_lab_reanalysis(db_path: str = "Healthcare/Database/healthcare.db",
+                         max_workers: Optional[int] = None) -> LabReanalysisJob:
+    """Start bringing stored lab results up to the current rules in the background"""
+    job = LabReanalysisJob(db_path, max_workers=max_workers)
+    if job.pending_count(job.get_progress()['last_id']):
+        job.start_background()
+    return job
@@ -0,0 +1,406 @@
+"""
+J.A.R.V.I.S. Lab Rule Engine
+Declarative pregnancy lab ranges and condition rules compiled to vectorized predicates
+"""
+
+import os
+import re
+import json
+from typing import Dict, List, Any, Optional, Sequence, Union
+
+import numpy as np
+
+DEFAULT_LAB_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Data', 'lab_rules.json'
+)
+
+# Range tables are resolved per gestational week, 0 through MAX_GESTATIONAL_WEEK
+MAX_GESTATIONAL_WEEK = 45
+
+RANGE_BOUNDS = ('min', 'max', 'critical_low', 'critical_high')
+
+# Risk levels by code, as returned by evaluate_population
+RISK_LEVELS = ('normal', 'low', 'moderate', 'high')
+
+# Structured array layout accepted by evaluate_population_records
+LAB_ROW_DTYPE = np.dtype([('patient_id', np.int64), ('test', 'U32'), ('value', np.float64), ('week', np.int16)])
+
+INDICATOR_PATTERN = re.compile(r'^\s*([a-z_][a-z0-9_]*)\s*(<=|>=|==|<|>)\s*(-?\d+(?:\.\d+)?)\s*$')
+
+# NaN (a missing value) compares False under all of these, so absent tests never fire
+COMPARATORS = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal, '==': np.equal
+}
+
+def _format_number(value: float) -> str:
+    return f"{value:g}"
+
+def summarize_flags(flagged_values: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """One-line descriptions of flagged values, as stored by MedicalOCR.parse_lab_results"""
+    summary = {}
+    for test, test_analysis in flagged_values.items():
+        value, limit, unit = test_analysis['value'], test_analysis['limit'], test_analysis['unit']
+        if test_analysis['status'] == 'low':
+            summary[test] = f"Below normal range ({value:g} < {limit:g} {unit})"
+        else:
+            summary[test] = f"Above normal range ({value:g} > {limit:g} {unit})"
+    return summary
+
+def lab_urgency(analysis: Dict[str, Any]) -> str:
+    """
+    "critical" when a condition fired or a value is past its critical limit;
+    values just outside the normal range alone don't make a panel critical
+    """
+    severe = any(test_analysis.get('severity') == 'severe'
+                 for test_analysis in analysis['flagged_values'].values())
+    return 'critical' if analysis['critical_alerts'] or severe else 'normal'
+
+class LabRuleEngine:
+    """
+    Pregnancy lab ranges and condition rules loaded from a data file.
+
+    Ranges are expanded into one row per gestational week (default values,
+    overridden by trimester, overridden by explicit week spans), so the
+    thresholds for a whole batch are a single fancy-indexing lookup.
+    Condition indicators such as ``"hemoglobin < 9.0"`` are compiled once
+    into column/comparator/threshold arrays and evaluated for every panel
+    in the batch at the same time.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None,
+                 rules_path: str = DEFAULT_LAB_RULES_PATH):
+        if rules is None:
+            with open(rules_path, 'r', encoding='utf-8') as file:
+                rules = json.load(file)
+
+        self.version = str(rules.get('version', 'unversioned'))
+        self.trimesters = {
+            int(number): (span['from_week'], span['to_week'])
+            for number, span in rules.get('trimesters', {}).items()
+        }
+        self.units: Dict[str, str] = {}
+        self.conditions: Dict[str, Dict[str, Any]] = {}
+
+        ranges = rules.get('ranges', {})
+        conditions = rules.get('conditions', {})
+        # Conditions may use tests that have no reference range
+        extra_fields = []
+        for spec in conditions.values():
+            for indicator in spec.get('indicators', []):
+                parsed = INDICATOR_PATTERN.match(indicator)
+                if parsed and parsed.group(1) not in ranges and parsed.group(1) not in extra_fields:
+                    extra_fields.append(parsed.group(1))
+
+        self._compile_ranges(ranges, extra_fields)
+        self._compile_conditions(conditions)
+        self.trajectories = self._load_trajectories(rules.get('trajectories', {}))
+
+    def _compile_ranges(self, ranges: Dict[str, Any], extra_fields: List[str]):
+        """Expand range definitions into per-week threshold tables"""
+        self.fields: List[str] = list(ranges) + extra_fields
+        weeks = MAX_GESTATIONAL_WEEK + 1
+        self.thresholds = {bound: np.full((len(self.fields), weeks), np.nan) for bound in RANGE_BOUNDS}
+
+        for index, field in enumerate(self.fields):
+            spec = ranges.get(field, {})
+            self.units[field] = spec.get('unit', '')
+
+            layers = [((0, MAX_GESTATIONAL_WEEK), spec.get('default', {}))]
+            for number, overrides in spec.get('trimesters', {}).items():
+                if int(number) not in self.trimesters:
+                    raise ValueError(f"Unknown trimester {number} in range for '{field}'")
+                layers.append((self.trimesters[int(number)], overrides))
+            for overrides in spec.get('weeks', []):
+                layers.append(((overrides['from_week'], overrides['to_week']), overrides))
+
+            # Later layers are more specific and win
+            for (from_week, to_week), overrides in layers:
+                for bound in RANGE_BOUNDS:
+                    if bound in overrides:
+                        self.thresholds[bound][index, from_week:to_week + 1] = overrides[bound]
+
+        self.field_index = {field: index for index, field in enumerate(self.fields)}
+
+    def _compile_conditions(self, conditions: Dict[str, Any]):
+        """Compile indicator strings into vectorized clause arrays"""
+        clause_fields, clause_ops, clause_thresholds = [], [], []
+
+        for name, spec in conditions.items():
+            match = spec.get('match', 'all')
+            if match not in ('all', 'any'):
+                raise ValueError(f"Condition '{name}' has unknown match mode '{match}'")
+
+            start = len(clause_fields)
+            for indicator in spec.get('indicators', []):
+                parsed = INDICATOR_PATTERN.match(indicator)
+                if not parsed:
+                    raise ValueError(f"Cannot parse indicator '{indicator}' in condition '{name}'")
+                field, op, threshold = parsed.groups()
+                clause_fields.append(self.field_index[field])
+                clause_ops.append(op)
+                clause_thresholds.append(float(threshold))
+
+            if len(clause_fields) == start:
+                raise ValueError(f"Condition '{name}' has no indicators")
+
+            self.conditions[name] = {
+                'match': match,
+                'indicators': list(spec['indicators']),
+                'message': spec.get('message', f"{name.replace('_', ' ').title()} detected."),
+                'urgency': spec.get('urgency', 'urgent'),
+                'min_week': spec.get('min_week', 0),
+                'max_week': spec.get('max_week', MAX_GESTATIONAL_WEEK),
+                'clauses': slice(start, len(clause_fields))
+            }
+
+        self._clause_fields = np.array(clause_fields, dtype=np.intp)
+        self._clause_thresholds = np.array(clause_thresholds, dtype=float)
+        self._clause_ops = clause_ops
+        # Group clause columns by comparator so each comparator runs once per batch
+        self._op_columns = {
+            op: np.array([i for i, clause_op in enumerate(clause_ops) if clause_op == op], dtype=np.intp)
+            for op in set(clause_ops)
+        }
+
+    def _load_trajectories(self, trajectories: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Validate trend rules (change of at least `change` within `within_days`)"""
+        loaded = {}
+        for name, spec in trajectories.items():
+            if spec.get('direction') not in ('rise', 'fall'):
+                raise ValueError(f"Trajectory '{name}' must have direction 'rise' or 'fall'")
+            if 'test' not in spec or float(spec.get('change', 0)) <= 0 or float(spec.get('within_days', 0)) <= 0:
+                raise ValueError(f"Trajectory '{name}' needs a test, a positive change and within_days")
+            loaded[name] = {
+                'test': spec['test'],
+                'direction': spec['direction'],
+                'change': float(spec['change']),
+                'within_days': float(spec['within_days']),
+                'message': spec.get('message', f"{name.replace('_', ' ').title()} detected."),
+                'urgency': spec.get('urgency', 'urgent')
+            }
+        return loaded
+
+    def trimester_for_week(self, gestational_week: int) -> Optional[int]:
+        """Return the trimester number containing gestational_week"""
+        for number, (from_week, to_week) in sorted(self.trimesters.items()):
+            if from_week <= gestational_week <= to_week:
+                return number
+        return None
+
+    def ranges_for_week(self, gestational_week: int) -> Dict[str, Dict[str, Any]]:
+        """Reference ranges in effect at gestational_week, keyed by test name"""
+        week = int(np.clip(gestational_week, 0, MAX_GESTATIONAL_WEEK))
+        ranges = {}
+        for field, index in self.field_index.items():
+            if np.isnan(self.thresholds['min'][index, week]) and np.isnan(self.thresholds['max'][index, week]):
+                continue
+            ranges[field] = {'unit': self.units.get(field, '')}
+            for bound in RANGE_BOUNDS:
+                value = self.thresholds[bound][index, week]
+                if not np.isnan(value):
+                    ranges[field][bound] = float(value)
+        return ranges
+
+    def to_matrix(self, panels: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Convert lab panels to an (n_panels, n_fields) float matrix, NaN where missing"""
+        values = np.full((len(panels), len(self.fields)), np.nan)
+        for row, panel in enumerate(panels):
+            for field, value in panel.items():
+                column = self.field_index.get(field)
+                if column is not None and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values[row, column] = value
+        return values
+
+    def evaluate_matrix(self, values: np.ndarray,
+                        gestational_weeks: Union[int, Sequence[int], np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Evaluate every range and condition for a batch of panels at once.
+
+        Returns boolean arrays: ``low``/``high``/``severe`` (n_panels, n_fields),
+        ``clauses`` (n_panels, n_indicators) and ``conditions``
+        (n_panels, n_conditions, in self.conditions order), plus the per-row
+        thresholds that were applied.
+        """
+        values = np.asarray(values, dtype=float)
+        weeks = np.broadcast_to(np.asarray(gestational_weeks, dtype=np.intp), (values.shape[0],))
+        week_index = np.clip(weeks, 0, MAX_GESTATIONAL_WEEK)
+
+        # Per-row thresholds: (n_fields, n_panels) lookup, transposed to match values
+        applied = {bound: table[:, week_index].T for bound, table in self.thresholds.items()}
+
+        with np.errstate(invalid='ignore'):
+            low = values < applied['min']
+            high = values > applied['max']
+            severe = (values < applied['critical_low']) | (values > applied['critical_high'])
+
+            clauses = np.zeros((values.shape[0], len(self._clause_ops)), dtype=bool)
+            clause_values = values[:, self._clause_fields]
+            for op, columns in self._op_columns.items():
+                clauses[:, columns] = COMPARATORS[op](clause_values[:, columns], self._clause_thresholds[columns])
+
+        conditions = np.zeros((values.shape[0], len(self.conditions)), dtype=bool)
+        for column, condition in enumerate(self.conditions.values()):
+            hits = clauses[:, condition['clauses']]
+            matched = hits.all(axis=1) if condition['match'] == 'all' else hits.any(axis=1)
+            in_window = (weeks >= condition['min_week']) & (weeks <= condition['max_week'])
+            conditions[:, column] = matched & in_window
+
+        return {
+            'low': low, 'high': high, 'severe': severe & (low | high),
+            'clauses': clauses, 'conditions': conditions, 'thresholds': applied
+        }
+
+    def evaluate_batch(self, panels: Sequence[Dict[str, Any]],
+                       gestational_weeks: Union[int, Sequence[int]] = 20) -> List[Dict[str, Any]]:
+        """
+        Analyze a batch of lab panels, returning per-panel flags and condition
+        alerts with an explanation of which indicators fired
+        """
+        values = self.to_matrix(panels)
+        result = self.evaluate_matrix(values, gestational_weeks)
+        weeks = np.broadcast_to(np.asarray(gestational_weeks), (len(panels),))
+        condition_names = list(self.conditions)
+
+        analyses = []
+        for row in range(len(panels)):
+            week = int(weeks[row])
+            analysis = {'normal_values': {}, 'flagged_values': {}, 'critical_alerts': [],
+                        'gestational_week': week, 'trimester': self.trimester_for_week(week),
+                        'rule_version': self.version}
+
+            for column in np.flatnonzero(~np.isnan(values[row])):
+                field = self.fields[column]
+                low_limit = result['thresholds']['min'][row, column]
+                high_limit = result['thresholds']['max'][row, column]
+                if np.isnan(low_limit) and np.isnan(high_limit):
+                    continue
+
+                value = float(values[row, column])
+                unit = self.units.get(field, '')
+                test_analysis = {
+                    'value': value, 'unit': unit,
+                    'normal_range': f"{_format_number(low_limit)}-{_format_number(high_limit)} {unit}",
+                    'status': 'normal'
+                }
+
+                if result['low'][row, column] or result['high'][row, column]:
+                    is_low = bool(result['low'][row, column])
+                    limit = low_limit if is_low else high_limit
+                    test_analysis['status'] = 'low' if is_low else 'high'
+                    test_analysis['severity'] = 'severe' if result['severe'][row, column] else 'mild'
+                    test_analysis['limit'] = float(limit)
+                    test_analysis['explanation'] = (
+                        f"{field} {_format_number(value)} {'<' if is_low else '>'} "
+                        f"{_format_number(limit)} {unit} (week {week} range)"
+                    )
+                    analysis['flagged_values'][field] = test_analysis
+                else:
+                    analysis['normal_values'][field] = test_analysis
+
+            for column in np.flatnonzero(result['conditions'][row]):
+                name = condition_names[column]
+                condition = self.conditions[name]
+                fired = result['clauses'][row, condition['clauses']]
+                explanation = []
+                for indicator, hit, field_column in zip(condition['indicators'], fired,
+                                                        self._clause_fields[condition['clauses']]):
+                    if hit:
+                        explanation.append(f"{indicator} (measured {_format_number(values[row, field_column])})")
+                analysis['critical_alerts'].append({
+                    'condition': name,
+                    'message': condition['message'],
+                    'urgency': condition['urgency'],
+                    'explanation': explanation
+                })
+
+            analyses.append(analysis)
+
+        return analyses
+
+    def test_codes(self, tests: np.ndarray) -> np.ndarray:
+        """Map an array of test names to column codes (-1 for tests without rules)"""
+        tests = np.asarray(tests)
+        if np.issubdtype(tests.dtype, np.integer):
+            return tests.astype(np.intp)
+        # One vectorized comparison per known test is far cheaper than sorting strings
+        codes = np.full(tests.shape, -1, dtype=np.intp)
+        for field, column in self.field_index.items():
+            codes[tests == field] = column
+        return codes
+
+    def evaluate_population(self, patient_ids: np.ndarray, tests: np.ndarray, values: np.ndarray,
+                            gestational_weeks: np.ndarray) -> Dict[str, Any]:
+        """
+        Screen a whole population from long-format lab rows.
+
+        Each row is one (patient_id, test, value, week) observation; tests may
+        be names or column codes from ``field_index``. Rows are pivoted into
+        one panel per patient (the last row wins when a test repeats, and the
+        panel is judged at the patient's latest week), then flagged and risk
+        scored without any per-row Python.
+
+        Returns compact arrays aligned with the sorted unique ``patient_ids``:
+        ``low``/``high``/``severe`` (n_patients, n_fields) masks, the
+        ``conditions`` mask, ``flagged_count`` and ``risk_code`` (index into
+        RISK_LEVELS).
+        """
+        patient_ids = np.asarray(patient_ids)
+        values = np.asarray(values, dtype=float)
+        weeks = np.asarray(gestational_weeks, dtype=np.int16)
+        codes = self.test_codes(tests)
+
+        known = (codes >= 0) & ~np.isnan(values)
+        unique_patients, patient_index = np.unique(patient_ids, return_inverse=True)
+        patient_index = patient_index.reshape(-1)
+        n_patients, n_fields = len(unique_patients), len(self.fields)
+
+        # Latest week per patient, over all of their rows
+        panel_weeks = np.zeros(n_patients, dtype=np.int16)
+        np.maximum.at(panel_weeks, patient_index, weeks)
+
+        # Keep the last row for each (patient, test) cell
+        cells = patient_index[known] * n_fields + codes[known]
+        cell_values = values[known]
+        reversed_cells = cells[::-1]
+        unique_cells, first_in_reversed = np.unique(reversed_cells, return_index=True)
+        matrix = np.full(n_patients * n_fields, np.nan)
+        matrix[unique_cells] = cell_values[::-1][first_in_reversed]
+        matrix = matrix.reshape(n_patients, n_fields)
+
+        result = self.evaluate_matrix(matrix, panel_weeks)
+        flagged_count = (result['low'] | result['high']).sum(axis=1).astype(np.int16)
+
+        risk_code = np.zeros(n_patients, dtype=np.int8)
+        risk_code[flagged_count > 0] = 1
+        risk_code[flagged_count >= 2] = 2
+        risk_code[result['conditions'].any(axis=1)] = 3
+
+        return {
+            'patient_ids': unique_patients,
+            'gestational_weeks': panel_weeks,
+            'fields': list(self.fields),
+            'condition_names': list(self.conditions),
+            'values': matrix,
+            'low': result['low'],
+            'high': result['high'],
+            'severe': result['severe'],
+            'conditions': result['conditions'],
+            'flagged_count': flagged_count,
+            'risk_code': risk_code,
+            'rule_version': self.version
+        }
+
+    def evaluate_population_records(self, records: np.ndarray) -> Dict[str, Any]:
+        """evaluate_population for a structured array shaped like LAB_ROW_DTYPE"""
+        return self.evaluate_population(records['patient_id'], records['test'],
+                                        records['value'], records['week'])
+
+# Shared engine, loaded on first use
+_default_engine = None
+
+def get_lab_rule_engine() -> LabRuleEngine:
+    """Return the shared engine built from the bundled rules file"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = LabRuleEngine()
+    return _default_engine
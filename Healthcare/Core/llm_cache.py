@@ -0,0 +1,223 @@
+"""
+J.A.R.V.I.S. LLM Parse Cache
+Persistent, encrypted cache for LLM prescription parses with in-flight request coalescing
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from Healthcare.Database.encryption import HealthcareEncryption
+
+class LLMParseCache:
+    """
+    Cache of parsed LLM responses keyed by normalized OCR text, model and prompt version.
+
+    Entries are encrypted at rest, expire after ``ttl_seconds`` and the least
+    recently used entries are evicted beyond ``max_entries``. Concurrent
+    callers asking for the same key while a request is in flight wait for
+    that request instead of issuing their own.
+    """
+
+    def __init__(self, db_path: str = "Healthcare/Database/llm_cache.db",
+                 encryption: Optional[HealthcareEncryption] = None,
+                 ttl_seconds: float = 30 * 24 * 3600, max_entries: int = 1000):
+        self.db_path = db_path
+        self.encryption = encryption or HealthcareEncryption()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self.metrics = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0, 'expired': 0}
+
+        self._ensure_cache_exists()
+
+    def _ensure_cache_exists(self):
+        """Create cache table if it doesn't exist"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS llm_parse_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    payload TEXT,
+                    created_at REAL,
+                    last_access REAL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_llm_parse_cache_access
+                ON llm_parse_cache (last_access)
+            ''')
+            conn.commit()
+
+    @staticmethod
+    def normalize_text(ocr_text: str) -> str:
+        """Normalize OCR text so trivially different scans share a key"""
+        text = ocr_text.lower()
+        text = re.sub(r'[^a-z0-9./%\n]+', ' ', text)
+        lines = [re.sub(r'\s+', ' ', line).strip() for line in text.split('\n')]
+        return '\n'.join(line for line in lines if line)
+
+    def make_key(self, ocr_text: str, model: str, prompt_version: str) -> str:
+        """Build the cache key for a parse request"""
+        material = f"{model}\x00{prompt_version}\x00{self.normalize_text(ocr_text)}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached parse, or None when missing or expired"""
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT payload, created_at FROM llm_parse_cache WHERE cache_key = ?',
+                           (cache_key,))
+            row = cursor.fetchone()
+
+            if not row:
+                return None
+
+            if now - row[1] > self.ttl_seconds:
+                cursor.execute('DELETE FROM llm_parse_cache WHERE cache_key = ?', (cache_key,))
+                conn.commit()
+                with self._lock:
+                    self.metrics['expired'] += 1
+                return None
+
+            cursor.execute('UPDATE llm_parse_cache SET last_access = ? WHERE cache_key = ?',
+                           (now, cache_key))
+            conn.commit()
+
+        try:
+            return self.encryption.decrypt_json(row[0])
+        except Exception as e:
+            print(f"Warning: Could not decrypt cached parse: {e}")
+            return None
+
+    def put(self, cache_key: str, value: Dict[str, Any]):
+        """Store a parse and evict least recently used entries beyond the limit"""
+        now = time.time()
+        payload = self.encryption.encrypt_json(value)
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO llm_parse_cache (cache_key, payload, created_at, last_access)
+                VALUES (?, ?, ?, ?)
+            ''', (cache_key, payload, now, now))
+
+            cursor.execute('SELECT COUNT(*) FROM llm_parse_cache')
+            overflow = cursor.fetchone()[0] - self.max_entries
+            if overflow > 0:
+                cursor.execute('''
+                    DELETE FROM llm_parse_cache WHERE cache_key IN (
+                        SELECT cache_key FROM llm_parse_cache ORDER BY last_access ASC LIMIT ?
+                    )
+                ''', (overflow,))
+                with self._lock:
+                    self.metrics['evictions'] += overflow
+
+            conn.commit()
+
+    def get_or_compute(self, cache_key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached value for cache_key, computing it at most once across threads
+        """
+        cached = self.get(cache_key)
+        if cached is not None:
+            with self._lock:
+                self.metrics['hits'] += 1
+            return cached
+
+        inflight, leader = self.claim(cache_key)
+        if not leader:
+            return self.wait(inflight)
+
+        try:
+            result = compute()
+        except Exception as e:
+            self.resolve(cache_key, inflight, error=e)
+            raise
+        self.resolve(cache_key, inflight, result=result)
+        return result
+
+    def claim(self, cache_key: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Register interest in an uncached key.
+
+        Returns (inflight, True) to the one caller that must compute the
+        value and later resolve() it, and (inflight, False) to everyone
+        asking while that computation is pending, who should wait() on it.
+        """
+        with self._lock:
+            inflight = self._inflight.get(cache_key)
+            if inflight is None:
+                inflight = {'event': threading.Event(), 'result': None, 'error': None}
+                self._inflight[cache_key] = inflight
+                self.metrics['misses'] += 1
+                return inflight, True
+            self.metrics['coalesced'] += 1
+            return inflight, False
+
+    def wait(self, inflight: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until a claimed computation is resolved and return (or raise) its outcome"""
+        if not inflight['event'].wait(timeout):
+            raise TimeoutError("Timed out waiting for an in-flight parse")
+        if inflight['error'] is not None:
+            raise inflight['error']
+        return inflight['result']
+
+    def resolve(self, cache_key: str, inflight: Dict[str, Any], result: Optional[Dict[str, Any]] = None,
+                error: Optional[BaseException] = None):
+        """Finish a claimed computation: store the result (unless it failed) and wake the waiters"""
+        try:
+            if error is None:
+                self.put(cache_key, result)
+                inflight['result'] = result
+            else:
+                inflight['error'] = error
+        except Exception as e:
+            inflight['error'] = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(cache_key) is inflight:
+                    del self._inflight[cache_key]
+            inflight['event'].set()
+
+    def record(self, metric: str, count: int = 1):
+        """Count a lookup resolved outside get_or_compute (e.g. batched parses)"""
+        with self._lock:
+            self.metrics[metric] += count
+
+    def clear(self):
+        """Remove all cached entries"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM llm_parse_cache')
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit-rate metrics"""
+        with self._lock:
+            stats = dict(self.metrics)
+
+        with sqlite3.connect(self.db_path) as conn:
+            stats['entries'] = conn.execute('SELECT COUNT(*) FROM llm_parse_cache').fetchone()[0]
+
+        lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+        # Coalesced callers were served without their own LLM call
+        stats['hit_rate'] = (stats['hits'] + stats['coalesced']) / lookups if lookups else 0.0
+        return stats
+
+def cached_result_copy(value: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep copy a cached parse so callers can mutate it freely"""
+    return json.loads(json.dumps(value))
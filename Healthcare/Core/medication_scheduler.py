@@ -13,8 +13,8 @@ import json
 
 # Import existing J.A.R.V.I.S. components
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from Backend.TextToSpeech import TextToSpeech
-from Frontend.GUI import ShowTextToScreen, SetAssistantStatus
+from Healthcare.Core.assistant_io import TextToSpeech, ShowTextToScreen, SetAssistantStatus
+from Backend.OutputBus import PRIORITY_REMINDER
 from Healthcare.Database.models import HealthcareDatabase
 
 class MedicationScheduler:
@@ -145,8 +145,8 @@ class MedicationScheduler:
     def _speak_reminder(self, message: str):
         """Use J.A.R.V.I.S. text-to-speech for medication reminders"""
         try:
-            # Use existing J.A.R.V.I.S. TTS system
-            TextToSpeech(message)
+            # Use existing J.A.R.V.I.S. TTS system; reminders yield only to emergencies
+            TextToSpeech(message, priority=PRIORITY_REMINDER)
         except Exception as e:
             print(f"Error with medication reminder TTS: {e}")
             # Fallback to GUI only
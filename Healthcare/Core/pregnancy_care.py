@@ -12,8 +12,7 @@ import json
 
 # Import existing J.A.R.V.I.S. components
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from Backend.TextToSpeech import TextToSpeech
-from Frontend.GUI import ShowTextToScreen, SetAssistantStatus
+from Healthcare.Core.assistant_io import TextToSpeech, ShowTextToScreen, SetAssistantStatus
 from Healthcare.Database.models import HealthcareDatabase
 
 class PregnancyCareModule:
@@ -361,5 +360,18 @@ class PregnancyCareModule:
             print(f"Error with TTS: {e}")
             ShowTextToScreen(f"Healthcare Assistant: {message}")
 
-# Global instance for integration with Main.py
-pregnancy_care = PregnancyCareModule()
\ No newline at end of file
+# Shared instance for integration with Main.py, created on first use
+_pregnancy_care = None
+
+def get_pregnancy_care() -> PregnancyCareModule:
+    """Return the shared pregnancy care module"""
+    global _pregnancy_care
+    if _pregnancy_care is None:
+        _pregnancy_care = PregnancyCareModule()
+    return _pregnancy_care
+
+def __getattr__(name):
+    # `from Healthcare.Core.pregnancy_care import pregnancy_care` keeps working
+    if name == 'pregnancy_care':
+        return get_pregnancy_care()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,8 +10,25 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 from typing import Union, Any
+from functools import lru_cache
 from dotenv import dotenv_values
 
+@lru_cache(maxsize=8)
+def _derive_key(password: str) -> bytes:
+    """
+    Derive the Fernet key from a password. PBKDF2 is deliberately slow, so
+    the key is derived once per password and shared by every instance.
+    """
+    password_bytes = password.encode()
+    salt = b'jarvis_healthcare_salt_2025'  # In production, use random salt
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password_bytes))
+
 class HealthcareEncryption:
     """
     Encryption utility for healthcare data with AES-256 encryption
@@ -23,17 +40,7 @@ class HealthcareEncryption:
             env_vars = dotenv_values('.env')
             password = env_vars.get('HEALTHCARE_MASTER_KEY', 'jarvis-healthcare-2025')
         
-        # Generate key from password
-        password_bytes = password.encode()
-        salt = b'jarvis_healthcare_salt_2025'  # In production, use random salt
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
-        self.cipher = Fernet(key)
+        self.cipher = Fernet(_derive_key(password))
     
     def encrypt_data(self, sensitive_data: Union[str, dict]) -> str:
         """Encrypt sensitive healthcare data"""
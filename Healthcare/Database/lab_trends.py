@@ -0,0 +1,291 @@
+"""
+Healthcare Lab Trend Store
+Normalized, indexed per-test lab values for longitudinal queries and trend statistics
+"""
+
+import sqlite3
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Union
+from Healthcare.Database.encryption import HealthcareEncryption
+
+SECONDS_PER_DAY = 86400.0
+
+def _to_datetime(value: Union[str, datetime]) -> datetime:
+    """Accept ISO dates/datetimes (as stored in lab_results.test_date) or datetimes"""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+class RollingWindow:
+    """
+    Time-bounded window over (time, value) points with O(1) amortized updates.
+
+    Running sums give the mean and least-squares slope without revisiting
+    old points, and monotonic deques track the window minimum and maximum.
+    Points must be added in time order.
+    """
+
+    def __init__(self, window_days: float):
+        self.window_days = window_days
+        self.points = deque()
+        self._min = deque()
+        self._max = deque()
+        self._origin = None
+        self._n = 0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+
+    def add(self, measured_at: Union[str, datetime], value: float):
+        """Add a point and evict points older than the window"""
+        when = _to_datetime(measured_at)
+        if self._origin is None:
+            self._origin = when
+        t = (when - self._origin).total_seconds() / SECONDS_PER_DAY
+
+        self.points.append((t, value, when))
+        self._n += 1
+        self._sum_t += t
+        self._sum_v += value
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((t, value, when))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((t, value, when))
+
+        while self.points and self.points[0][0] < t - self.window_days:
+            old_t, old_value, _ = self.points.popleft()
+            self._n -= 1
+            self._sum_t -= old_t
+            self._sum_v -= old_value
+            self._sum_tt -= old_t * old_t
+            self._sum_tv -= old_t * old_value
+            if self._min and self._min[0][0] <= old_t:
+                self._min.popleft()
+            if self._max and self._max[0][0] <= old_t:
+                self._max.popleft()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def mean(self) -> Optional[float]:
+        return self._sum_v / self._n if self._n else None
+
+    def slope_per_day(self) -> Optional[float]:
+        """Least-squares slope over the window (None with fewer than two distinct times)"""
+        denominator = self._n * self._sum_tt - self._sum_t ** 2
+        if self._n < 2 or abs(denominator) < 1e-12:
+            return None
+        return (self._n * self._sum_tv - self._sum_t * self._sum_v) / denominator
+
+    def minimum(self) -> Optional[Dict[str, Any]]:
+        return {'value': self._min[0][1], 'measured_at': self._min[0][2]} if self._min else None
+
+    def maximum(self) -> Optional[Dict[str, Any]]:
+        return {'value': self._max[0][1], 'measured_at': self._max[0][2]} if self._max else None
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return {'value': self.points[-1][1], 'measured_at': self.points[-1][2]} if self.points else None
+
+class LabTrendStore:
+    """
+    Time-series side store for lab values.
+
+    Each test value is one row in ``lab_values`` (value encrypted, time and
+    test name in the clear) behind a (patient_id, test_name, measured_at)
+    index, so a series or time range is an O(log n) index seek instead of
+    decrypting every lab_results blob. Whole-series running sums are kept
+    per (patient, test) in ``lab_value_stats`` and updated on insert.
+    """
+
+    def __init__(self, db_path: str = "Healthcare/Database/healthcare.db",
+                 encryption: Optional[HealthcareEncryption] = None):
+        self.db_path = db_path
+        self.encryption = encryption or HealthcareEncryption()
+        self._ensure_tables_exist()
+
+    def _ensure_tables_exist(self):
+        """Create trend tables if they don't exist"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS lab_values (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    patient_id INTEGER,
+                    test_name TEXT,
+                    measured_at TEXT,
+                    gestational_week INTEGER,
+                    value TEXT,
+                    lab_result_id INTEGER
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_lab_values_series
+                ON lab_values (patient_id, test_name, measured_at)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_lab_values_result
+                ON lab_values (lab_result_id)
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS lab_value_stats (
+                    patient_id INTEGER,
+                    test_name TEXT,
+                    payload TEXT,
+                    PRIMARY KEY (patient_id, test_name)
+                )
+            ''')
+            conn.commit()
+
+    def record_panel(self, patient_id: int, values: Dict[str, Any], measured_at: Union[str, datetime],
+                     gestational_week: Optional[int] = None, lab_result_id: Optional[int] = None) -> int:
+        """Store every numeric value of a lab panel; returns the number of values stored"""
+        when = _to_datetime(measured_at).isoformat(sep=' ')
+        numeric = {test: float(value) for test, value in values.items()
+                   if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            for test_name, value in numeric.items():
+                cursor.execute('''
+                    INSERT INTO lab_values (patient_id, test_name, measured_at, gestational_week,
+                                            value, lab_result_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (patient_id, test_name, when, gestational_week,
+                      self.encryption.encrypt_data(repr(value)), lab_result_id))
+                self._update_stats(cursor, patient_id, test_name, when, value)
+            conn.commit()
+
+        return len(numeric)
+
+    def record_value(self, patient_id: int, test_name: str, value: float,
+                     measured_at: Union[str, datetime], gestational_week: Optional[int] = None) -> int:
+        """Store a single test value"""
+        return self.record_panel(patient_id, {test_name: value}, measured_at, gestational_week)
+
+    def _update_stats(self, cursor, patient_id: int, test_name: str, measured_at: str, value: float):
+        """Fold one value into the running sums for its series"""
+        cursor.execute('SELECT payload FROM lab_value_stats WHERE patient_id = ? AND test_name = ?',
+                       (patient_id, test_name))
+        row = cursor.fetchone()
+        stats = self.encryption.decrypt_json(row[0]) if row else {
+            'origin': measured_at, 'n': 0, 'sum_t': 0.0, 'sum_v': 0.0, 'sum_tt': 0.0, 'sum_tv': 0.0,
+            'first_at': measured_at, 'last_at': measured_at
+        }
+
+        t = (_to_datetime(measured_at) - _to_datetime(stats['origin'])).total_seconds() / SECONDS_PER_DAY
+        stats['n'] += 1
+        stats['sum_t'] += t
+        stats['sum_v'] += value
+        stats['sum_tt'] += t * t
+        stats['sum_tv'] += t * value
+        stats['first_at'] = min(stats['first_at'], measured_at)
+        stats['last_at'] = max(stats['last_at'], measured_at)
+
+        cursor.execute('''
+            INSERT OR REPLACE INTO lab_value_stats (patient_id, test_name, payload) VALUES (?, ?, ?)
+        ''', (patient_id, test_name, self.encryption.encrypt_json(stats)))
+
+    def get_series(self, patient_id: int, test_name: str, start: Union[str, datetime, None] = None,
+                   end: Union[str, datetime, None] = None) -> List[Dict[str, Any]]:
+        """Values of one test between start and end (inclusive), oldest first"""
+        query = 'SELECT measured_at, value, gestational_week FROM lab_values WHERE patient_id = ? AND test_name = ?'
+        params: List[Any] = [patient_id, test_name]
+        if start is not None:
+            query += ' AND measured_at >= ?'
+            params.append(_to_datetime(start).isoformat(sep=' '))
+        if end is not None:
+            query += ' AND measured_at <= ?'
+            params.append(_to_datetime(end).isoformat(sep=' '))
+        query += ' ORDER BY measured_at, id'
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [{
+            'measured_at': row[0],
+            'value': float(self.encryption.decrypt_data(row[1])),
+            'gestational_week': row[2]
+        } for row in rows]
+
+    def get_latest(self, patient_id: int, test_name: str) -> Optional[Dict[str, Any]]:
+        """Most recent value of one test"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''
+                SELECT measured_at, value, gestational_week FROM lab_values
+                WHERE patient_id = ? AND test_name = ?
+                ORDER BY measured_at DESC, id DESC LIMIT 1
+            ''', (patient_id, test_name)).fetchone()
+
+        if not row:
+            return None
+        return {'measured_at': row[0], 'value': float(self.encryption.decrypt_data(row[1])),
+                'gestational_week': row[2]}
+
+    def get_tests(self, patient_id: int) -> List[str]:
+        """Names of all tests with stored values for a patient"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('SELECT test_name FROM lab_value_stats WHERE patient_id = ? ORDER BY test_name',
+                                (patient_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get_series_stats(self, patient_id: int, test_name: str) -> Optional[Dict[str, Any]]:
+        """Whole-series count, mean and slope from the running sums (no series scan)"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('SELECT payload FROM lab_value_stats WHERE patient_id = ? AND test_name = ?',
+                               (patient_id, test_name)).fetchone()
+        if not row:
+            return None
+
+        stats = self.encryption.decrypt_json(row[0])
+        n = stats['n']
+        denominator = n * stats['sum_tt'] - stats['sum_t'] ** 2
+        slope = None
+        if n >= 2 and abs(denominator) > 1e-12:
+            slope = (n * stats['sum_tv'] - stats['sum_t'] * stats['sum_v']) / denominator
+
+        return {
+            'count': n,
+            'mean': stats['sum_v'] / n if n else None,
+            'slope_per_week': slope * 7 if slope is not None else None,
+            'first_at': stats['first_at'],
+            'last_at': stats['last_at']
+        }
+
+    def get_window(self, patient_id: int, test_name: str, days: float,
+                   end: Union[str, datetime, None] = None) -> RollingWindow:
+        """RollingWindow over the last `days` days ending at end (default: latest value)"""
+        if end is None:
+            latest = self.get_latest(patient_id, test_name)
+            end = latest['measured_at'] if latest else datetime.now()
+        end = _to_datetime(end)
+
+        window = RollingWindow(days)
+        for point in self.get_series(patient_id, test_name, end - timedelta(days=days), end):
+            window.add(point['measured_at'], point['value'])
+        return window
+
+    def backfill_from_lab_results(self) -> int:
+        """
+        Copy values from existing lab_results blobs not yet in the trend store.
+
+        Decrypts each missing panel once; returns the number of panels copied.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('''
+                SELECT id, patient_id, test_date, results FROM lab_results
+                WHERE id NOT IN (SELECT DISTINCT lab_result_id FROM lab_values WHERE lab_result_id IS NOT NULL)
+                ORDER BY test_date, id
+            ''').fetchall()
+
+        copied = 0
+        for result_id, patient_id, test_date, results in rows:
+            try:
+                self.record_panel(patient_id, self.encryption.decrypt_json(results), test_date,
+                                  lab_result_id=result_id)
+                copied += 1
+            except Exception as e:
+                print(f"Warning: Could not backfill lab result {result_id}: {e}")
+
+        return copied
@@ -9,6 +9,32 @@ import os
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 from Healthcare.Database.encryption import HealthcareEncryption, HealthcareAuditLogger
+from Healthcare.Database.lab_trends import LabTrendStore
+
+# Lab dates accepted besides ISO 8601; all are stored as ISO dates
+LAB_DATE_FORMATS = ["%m/%d/%Y", "%Y/%m/%d", "%d-%m-%Y", "%d.%m.%Y", "%B %d, %Y", "%b %d, %Y",
+                    "%d %B %Y", "%d %b %Y"]
+
+def normalize_lab_date(test_date: Any) -> str:
+    """ISO form of a lab test date, or ValueError if it isn't a date"""
+    if isinstance(test_date, datetime):
+        return test_date.isoformat(sep=' ')
+    if isinstance(test_date, date):
+        return test_date.isoformat()
+    
+    text = str(test_date or '').strip()
+    for parse in (date.fromisoformat, datetime.fromisoformat):
+        try:
+            parsed = parse(text)
+            return parsed.isoformat(sep=' ') if isinstance(parsed, datetime) else parsed.isoformat()
+        except ValueError:
+            continue
+    for date_format in LAB_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized lab test date: {test_date!r}")
 
 class HealthcareDatabase:
     """
@@ -20,6 +46,12 @@ class HealthcareDatabase:
         self.encryption = HealthcareEncryption()
         self.audit_logger = HealthcareAuditLogger(self.encryption)
         self._ensure_database_exists()
+        # Per-test lab values for trend queries, kept alongside the encrypted panels
+        self.lab_trends = LabTrendStore(self.db_path, self.encryption)
+        if self._backfill_lab_trends:
+            copied = self.lab_trends.backfill_from_lab_results()
+            if copied:
+                print(f"✅ Copied {copied} stored lab panels into the trend store")
     
     def _ensure_database_exists(self):
         """Create database and tables if they don't exist"""
@@ -90,6 +122,19 @@ class HealthcareDatabase:
                 )
             ''')
             
+            # Columns added after the first release; older databases get them here
+            self._add_missing_columns(cursor, 'lab_results', {
+                'rule_version': 'TEXT',
+                'gestational_week': 'INTEGER'
+            })
+            # Panels stored before the trend tables existed are copied into them once
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'lab_values'")
+            self._backfill_lab_trends = cursor.fetchone() is None
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_lab_results_rule_version
+                ON lab_results (rule_version, id)
+            ''')
+            
             # Create voice commands log table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS healthcare_voice_commands (
@@ -104,6 +149,14 @@ class HealthcareDatabase:
             
             conn.commit()
 
+    def _add_missing_columns(self, cursor, table: str, columns: Dict[str, str]):
+        """Add columns that an older database file doesn't have yet"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        existing = {row[1] for row in cursor.fetchall()}
+        for column, column_type in columns.items():
+            if column not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
     def create_patient(self, name: str, dob: str, expected_due_date: str, 
                       gestational_week: int, allergies: str = "", 
                       emergency_contact: str = "") -> int:
@@ -255,9 +308,13 @@ class HealthcareDatabase:
 
     def add_lab_result(self, patient_id: int, test_date: str, test_type: str,
                       results: Dict[str, Any], flagged_values: Dict[str, Any] = None,
-                      urgency_level: str = "normal") -> int:
+                      urgency_level: str = "normal", gestational_week: Optional[int] = None,
+                      rule_version: Optional[str] = None) -> int:
         """Add lab result with encryption"""
         
+        # Validated up front, so a bad date can't leave a half-written result
+        test_date = normalize_lab_date(test_date)
+        
         # Encrypt sensitive data
         encrypted_results = self.encryption.encrypt_json(results)
         encrypted_flagged = self.encryption.encrypt_json(flagged_values) if flagged_values else ""
@@ -265,15 +322,22 @@ class HealthcareDatabase:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                INSERT INTO lab_results (patient_id, test_date, test_type, results, 
-                                       flagged_values, urgency_level)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (patient_id, test_date, test_type, encrypted_results, 
-                  encrypted_flagged, urgency_level))
+                INSERT INTO lab_results (patient_id, test_date, test_type, results,
+                                       flagged_values, urgency_level, gestational_week,
+                                       rule_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (patient_id, test_date, test_type, encrypted_results,
+                  encrypted_flagged, urgency_level, gestational_week, rule_version))
             
             result_id = cursor.lastrowid
             conn.commit()
             
+            # Index individual values for trend queries; the stored result stands even if this fails
+            try:
+                self.lab_trends.record_panel(patient_id, results, test_date, gestational_week, result_id)
+            except Exception as e:
+                print(f"Warning: Could not index lab result {result_id} for trends: {e}")
+            
             # Log audit trail
             self.audit_logger.log_medical_interaction(
                 "ADD_LAB_RESULT", str(patient_id),
@@ -18,7 +18,7 @@ from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSignal
 
 # Import existing J.A.R.V.I.S. GUI utilities
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from Frontend.GUI import GraphicsDirectoryPath, TempDirectoryPath
+from Frontend.GUI import GraphicsDirectoryPath, TempDirectoryPath, ShowTextToScreen
 from Healthcare.Database.models import HealthcareDatabase
 from Healthcare.Core.pregnancy_care import PregnancyCareModule
 
@@ -207,24 +207,21 @@ class HealthcareStatusWidget(QWidget):
     def trigger_prescription_upload(self):
         """Trigger prescription upload via voice command simulation"""
         try:
-            with open(TempDirectoryPath('Responses.data'), 'w', encoding='utf-8') as file:
-                file.write("Healthcare: Please show your prescription to the camera or upload the image file.")
+            ShowTextToScreen("Healthcare: Please show your prescription to the camera or upload the image file.")
         except Exception as e:
             print(f"Error triggering prescription upload: {e}")
     
     def trigger_symptom_log(self):
         """Trigger symptom logging"""
         try:
-            with open(TempDirectoryPath('Responses.data'), 'w', encoding='utf-8') as file:
-                file.write("Healthcare: Please describe your symptom, and I'll log it for you.")
+            ShowTextToScreen("Healthcare: Please describe your symptom, and I'll log it for you.")
         except Exception as e:
             print(f"Error triggering symptom log: {e}")
     
     def trigger_emergency(self):
         """Trigger emergency protocol"""
         try:
-            with open(TempDirectoryPath('Responses.data'), 'w', encoding='utf-8') as file:
-                file.write("Healthcare: Emergency protocol activated. Contacting your healthcare provider immediately.")
+            ShowTextToScreen("Healthcare: Emergency protocol activated. Contacting your healthcare provider immediately.")
         except Exception as e:
             print(f"Error triggering emergency: {e}")
 
@@ -357,8 +354,7 @@ class MedicationReminderWidget(QWidget):
     def add_medication_reminder(self):
         """Add a new medication reminder"""
         try:
-            with open(TempDirectoryPath('Responses.data'), 'w', encoding='utf-8') as file:
-                file.write("Healthcare: Say 'remind me to take [medication name]' to set up a new medication reminder.")
+            ShowTextToScreen("Healthcare: Say 'remind me to take [medication name]' to set up a new medication reminder.")
         except Exception as e:
             print(f"Error adding medication reminder: {e}")
 
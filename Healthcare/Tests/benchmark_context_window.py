@@ -0,0 +1,71 @@
+"""
+J.A.R.V.I.S. Chat Context Window Benchmark
+Per-turn cost of building the Groq context as the chat log grows to 10k turns
+
+Run with: python -m Healthcare.Tests.benchmark_context_window [turns]
+"""
+
+import sys
+import os
+import time
+import random
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.ContextWindow import ContextWindowBuilder
+from Backend.ConversationBuffer import message_tokens
+
+TOPICS = ["python", "cricket", "weather", "pregnancy", "iron tablets", "bhagat singh", "stock market",
+          "recipes", "space", "history", "music", "blood pressure", "sleep", "travel", "physics"]
+
+def make_turn(rng: random.Random, i: int) -> list:
+    topic = rng.choice(TOPICS)
+    question = f"tell me something about {topic}, question {i}"
+    answer = f"Here is what I know about {topic}. " * rng.randint(3, 20)
+    return [{"role": "user", "content": question}, {"role": "assistant", "content": answer}]
+
+def run_benchmark(turns: int = 10000, checkpoints=(100, 1000, 10000), samples: int = 50,
+                  retrieval: bool = True) -> dict:
+    """
+    Grow a chat log turn by turn, building the context before each reply as
+    ChatBot does. Build time is sampled at each checkpoint history size, and
+    compared with sending the whole log.
+    """
+    rng = random.Random(42)
+    builder = ContextWindowBuilder(retrieval=retrieval)
+    history = []
+    results = {}
+
+    for i in range(turns):
+        turn = make_turn(rng, i)
+        history.append(turn[0])
+
+        if i + 1 in checkpoints:
+            timings = []
+            for _ in range(samples):
+                start = time.perf_counter()
+                context = builder.build(history)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            results[i + 1] = {
+                'p50_ms': timings[len(timings) // 2],
+                'max_ms': timings[-1],
+                'context_tokens': sum(message_tokens(m) for m in context),
+                'full_log_tokens': sum(message_tokens(m) for m in history),
+            }
+        else:
+            builder.build(history)
+
+        history.append(turn[1])
+
+    return {'checkpoints': results, 'stats': builder.get_stats()}
+
+if __name__ == '__main__':
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    checkpoints = tuple(n for n in (100, 1000, 10000, 100000) if n <= turns)
+    result = run_benchmark(turns, checkpoints)
+    for size, stats in result['checkpoints'].items():
+        print(f"{size:>6} turns  p50: {stats['p50_ms'] * 1000:.0f}us  max: {stats['max_ms'] * 1000:.0f}us  "
+              f"context: {stats['context_tokens']} tokens  (whole log: {stats['full_log_tokens']} tokens)")
+    print(f"Builder: {result['stats']}")
@@ -0,0 +1,89 @@
+"""
+J.A.R.V.I.S. Emergency Matcher Benchmark
+Per-utterance latency of the compiled emergency phrase matcher against the recall corpus
+
+Run with: python -m Healthcare.Tests.benchmark_emergency_matcher [rounds]
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Core.emergency_matcher import EmergencyPhraseMatcher
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'emergency_recall_corpus.json')
+
+def load_corpus(path: str = CORPUS_PATH) -> list:
+    """(utterance, expected emergency type or None) pairs"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return [tuple(item) for item in json.load(file)['utterances']]
+
+def measure_recall(matcher: EmergencyPhraseMatcher, corpus: list) -> dict:
+    """Recall on emergency utterances and false positives on the rest"""
+    hits, misses, false_positives = 0, [], []
+    for text, expected in corpus:
+        match = matcher.detect(text)
+        detected = match['type'] if match else None
+        if expected is None:
+            if detected is not None:
+                false_positives.append(text)
+        elif detected == expected:
+            hits += 1
+        else:
+            misses.append(text)
+
+    positives = sum(1 for _, expected in corpus if expected is not None)
+    return {
+        'recall': hits / positives if positives else 1.0,
+        'misses': misses,
+        'false_positives': false_positives
+    }
+
+def run_benchmark(rounds: int = 200, matcher: EmergencyPhraseMatcher = None) -> dict:
+    """Time every corpus utterance `rounds` times on a freshly compiled matcher"""
+    start = time.perf_counter()
+    matcher = matcher or EmergencyPhraseMatcher()
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    corpus = load_corpus()
+    # Warm the spelling-correction cache the way a running session would
+    for text, _ in corpus:
+        matcher.match(text)
+
+    timings = []
+    for _ in range(rounds):
+        for text, _ in corpus:
+            start = time.perf_counter()
+            matcher.match(text)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    # Cold path: long, never-seen input with misspellings in every word
+    cold_text = ' '.join(f"wrd{i}x blding hevily" for i in range(40))
+    start = time.perf_counter()
+    matcher.match(cold_text)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    timings.sort()
+    return {
+        'utterances': len(timings),
+        'compile_ms': compile_ms,
+        'p50_ms': timings[len(timings) // 2],
+        'p99_ms': timings[int(len(timings) * 0.99)],
+        'max_ms': timings[-1],
+        'cold_long_input_ms': cold_ms,
+        'budget_ms': matcher.budget_ms,
+        **measure_recall(matcher, corpus)
+    }
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    stats = run_benchmark(rounds)
+    print(f"Utterances timed: {stats['utterances']:,}  Compile: {stats['compile_ms']:.1f}ms")
+    print(f"p50: {stats['p50_ms'] * 1000:.0f}us  p99: {stats['p99_ms'] * 1000:.0f}us  "
+          f"max: {stats['max_ms'] * 1000:.0f}us  (budget {stats['budget_ms']:.1f}ms)")
+    print(f"Cold 120-word input: {stats['cold_long_input_ms']:.2f}ms")
+    print(f"Recall: {stats['recall']:.1%}  Misses: {stats['misses']}  False positives: {stats['false_positives']}")
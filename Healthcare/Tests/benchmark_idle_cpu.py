@@ -0,0 +1,103 @@
+"""
+J.A.R.V.I.S. Idle CPU Benchmark
+CPU used while the assistant sits idle: the old file polling between Main.py and
+the GUI against the in-process event bus
+
+Run with: python -m Healthcare.Tests.benchmark_idle_cpu [seconds]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Frontend.EventBus import EventBus, TOPIC_STATUS, TOPIC_MIC, TOPIC_RESPONSE
+
+GUI_TIMER_SECONDS = 0.005  # QTimer.start(5) in the old ChatSection and InitialScreen
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read().strip()
+
+def _measure(seconds, start_threads):
+    stop = threading.Event()
+    counters = {"file_reads": 0}
+    threads = start_threads(stop, counters)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    stop.set()
+    for thread in threads:
+        thread.join(1)
+    return {"cpu_percent": cpu / wall * 100, "file_reads_per_second": counters["file_reads"] / wall}
+
+def measure_file_polling(seconds=3.0):
+    """The old loop: three 5 ms GUI timers reading files, plus FirstThread polling Mic.data"""
+    directory = tempfile.mkdtemp()
+    paths = {}
+    for name, value in [("Status.data", "Available..."), ("Mic.data", "False"), ("Responses.data", "")]:
+        paths[name] = os.path.join(directory, name)
+        with open(paths[name], 'w', encoding='utf-8') as file:
+            file.write(value)
+
+    def start_threads(stop, counters):
+        def gui_timer(names):
+            while not stop.is_set():
+                for name in names:
+                    _read(paths[name])
+                    counters["file_reads"] += 1
+                time.sleep(GUI_TIMER_SECONDS)
+
+        def first_thread():
+            while not stop.is_set():
+                if _read(paths["Mic.data"]) == "True":
+                    continue
+                if "Available..." in _read(paths["Status.data"]):
+                    time.sleep(0.1)
+                counters["file_reads"] += 2
+
+        threads = [
+            threading.Thread(target=gui_timer, args=(["Responses.data", "Status.data"],), daemon=True),  # ChatSection
+            threading.Thread(target=gui_timer, args=(["Status.data"],), daemon=True),  # InitialScreen
+            threading.Thread(target=first_thread, daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    return _measure(seconds, start_threads)
+
+def measure_event_bus(seconds=3.0):
+    """The new loop: widgets subscribed to the bus, FirstThread blocked until the mic turns on"""
+    bus = EventBus()
+    bus.publish(TOPIC_STATUS, "Available...")
+    bus.publish(TOPIC_MIC, "False")
+    bus.publish(TOPIC_RESPONSE, "")
+
+    def start_threads(stop, counters):
+        for topic in (TOPIC_STATUS, TOPIC_RESPONSE, TOPIC_STATUS):
+            bus.subscribe(topic, lambda value: None)
+
+        def first_thread():
+            while not stop.is_set():
+                bus.wait_for(TOPIC_MIC, "True", timeout=0.5)
+
+        thread = threading.Thread(target=first_thread, daemon=True)
+        thread.start()
+        return [thread]
+
+    return _measure(seconds, start_threads)
+
+def run_benchmark(seconds=3.0):
+    return {"file_polling": measure_file_polling(seconds), "event_bus": measure_event_bus(seconds)}
+
+if __name__ == '__main__':
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    for mode, stats in run_benchmark(seconds).items():
+        print(f"{mode:<14} idle CPU: {stats['cpu_percent']:5.2f}%  "
+              f"file reads/s: {stats['file_reads_per_second']:.0f}")
@@ -0,0 +1,85 @@
+"""
+J.A.R.V.I.S. Intent Classifier Benchmark
+Accuracy, coverage and per-query latency of the local intent fast path on a labelled query set
+
+Run with: python -m Healthcare.Tests.benchmark_intent_classifier [rounds]
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.IntentClassifier import IntentClassifier
+
+QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intent_benchmark_queries.json')
+# Never used to tune the classifier thresholds
+HELDOUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intent_heldout_queries.json')
+
+def load_queries(path: str = QUERIES_PATH) -> list:
+    """(query, expected decision list, or None where only the LLM can decide) pairs"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return [tuple(item) for item in json.load(file)['queries']]
+
+def _normalize(decision):
+    return [item.strip().rstrip('?.!').strip() for item in decision]
+
+def measure_accuracy(classifier: IntentClassifier, queries: list) -> dict:
+    """Precision of local decisions, and how many queries were decided locally"""
+    decided, correct, wrong, deferred = 0, 0, [], []
+    for query, expected in queries:
+        decision = classifier.classify(query)
+        if decision is None:
+            deferred.append(query)
+            continue
+        decided += 1
+        if expected is not None and _normalize(decision) == _normalize(expected):
+            correct += 1
+        else:
+            wrong.append((query, decision, expected))
+
+    return {
+        'coverage': decided / len(queries) if queries else 0.0,
+        'precision': correct / decided if decided else 1.0,
+        'wrong': wrong,
+        'deferred': deferred
+    }
+
+def run_benchmark(rounds: int = 200, classifier: IntentClassifier = None) -> dict:
+    """Time every labelled query `rounds` times"""
+    start = time.perf_counter()
+    classifier = classifier or IntentClassifier()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    queries = load_queries()
+    timings = []
+    for _ in range(rounds):
+        for query, _ in queries:
+            start = time.perf_counter()
+            classifier.classify(query)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        'queries': len(queries),
+        'build_ms': build_ms,
+        'p50_ms': timings[len(timings) // 2],
+        'p99_ms': timings[int(len(timings) * 0.99)],
+        'max_ms': timings[-1],
+        **measure_accuracy(classifier, queries)
+    }
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    stats = run_benchmark(rounds)
+    print(f"Labelled queries: {stats['queries']}  Build: {stats['build_ms']:.1f}ms")
+    print(f"p50: {stats['p50_ms'] * 1000:.0f}us  p99: {stats['p99_ms'] * 1000:.0f}us  max: {stats['max_ms'] * 1000:.0f}us")
+    print(f"Decided locally: {stats['coverage']:.1%}  Precision: {stats['precision']:.1%}")
+    print(f"Wrong: {stats['wrong']}")
+    print(f"Deferred to LLM: {stats['deferred']}")
+    heldout = measure_accuracy(IntentClassifier(), load_queries(HELDOUT_PATH))
+    print(f"Held-out: decided locally {heldout['coverage']:.1%}  Precision: {heldout['precision']:.1%}")
+    print(f"Held-out wrong: {heldout['wrong']}")
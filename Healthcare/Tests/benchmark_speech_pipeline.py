@@ -0,0 +1,115 @@
+"""
+J.A.R.V.I.S. Speech Pipeline Benchmark
+Time to first audio and silence between sentences when speaking a long
+message: synthesizing it whole before playing (the old TTS), sentence by
+sentence without prefetch, and with the next sentence synthesized while the
+current one plays, using local fake synthesis and playback backends. Also
+time to first audio of an emergency while answer sentences are prepared
+
+Run with: python -m Healthcare.Tests.benchmark_speech_pipeline [scale]
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.SpeechPipeline import SpeechPipeline
+
+MESSAGE = ("Good morning. It is time for your prenatal vitamin and your iron tablet. "
+           "Please take them with a glass of water or orange juice, not with tea or milk. "
+           "Your next appointment with the doctor is on Thursday at ten in the morning. "
+           "Remember to bring your latest blood report and your list of questions. "
+           "If you feel dizzy or very tired today, sit down and call me.")
+
+class FakeSynthesizer:
+    """A fixed round trip plus time per character; the audio is just the text"""
+
+    def __init__(self, base_delay=0.25, char_delay=0.002):
+        self.base_delay = base_delay
+        self.char_delay = char_delay
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append((text, time.perf_counter()))
+        time.sleep(self.base_delay + self.char_delay * len(text))
+        return text.encode("utf-8")
+
+class FakePlayer:
+    """Plays for a time per word of the audio's text, like pygame.mixer.music"""
+
+    def __init__(self, word_delay=0.08):
+        self.word_delay = word_delay
+        self.played = []
+        self.stopped = 0
+        self._ends_at = 0.0
+
+    def play(self, audio):
+        now = time.perf_counter()
+        self.played.append((audio.decode("utf-8"), now))
+        self._ends_at = now + self.word_delay * len(audio.split())
+
+    def busy(self):
+        return time.perf_counter() < self._ends_at
+
+    def stop(self):
+        self._ends_at = 0.0
+        self.stopped += 1
+
+def batch_first_audio(synth: FakeSynthesizer, player: FakePlayer) -> float:
+    """Seconds to first audio the old way: synthesize everything, then play"""
+    start = time.perf_counter()
+    player.play(synth(MESSAGE))
+    return player.played[0][1] - start
+
+def pipeline_speech(synth: FakeSynthesizer, player: FakePlayer, prefetch: int) -> dict:
+    pipeline = SpeechPipeline(synthesize=synth, player=player, prefetch=prefetch, poll_interval=0.005)
+    pipeline.speak(MESSAGE)
+    stats = pipeline.get_stats()
+    pipeline.close()
+    return stats
+
+def emergency_first_audio(synth: FakeSynthesizer, player: FakePlayer, urgent: bool) -> float:
+    """Seconds to first audio of an alert spoken while the answer's sentences are being prepared"""
+    pipeline = SpeechPipeline(synthesize=synth, player=player, poll_interval=0.005)
+    pipeline.prepare(MESSAGE)
+    if urgent:
+        pipeline.cancel_prepared()
+    pipeline.speak("Medical emergency detected.", urgent=urgent)
+    stats = pipeline.get_stats()
+    pipeline.close()
+    return stats["last_first_audio_ms"] / 1000
+
+def run_benchmark(scale: float = 1.0) -> dict:
+    def backends():
+        return (FakeSynthesizer(base_delay=0.25 * scale, char_delay=0.002 * scale),
+                FakePlayer(word_delay=0.08 * scale))
+
+    serial = pipeline_speech(*backends(), prefetch=0)
+    pipelined = pipeline_speech(*backends(), prefetch=1)
+    return {
+        "batch_first_audio_ms": batch_first_audio(*backends()) * 1000,
+        "serial_first_audio_ms": serial["last_first_audio_ms"],
+        "serial_avg_gap_ms": serial["avg_gap_ms"],
+        "pipelined_first_audio_ms": pipelined["last_first_audio_ms"],
+        "pipelined_avg_gap_ms": pipelined["avg_gap_ms"],
+        "pipelined_max_gap_ms": pipelined["max_gap_ms"],
+        "sentences": pipelined["sentences"],
+        "emergency_shared_first_audio_ms": emergency_first_audio(*backends(), urgent=False) * 1000,
+        "emergency_urgent_first_audio_ms": emergency_first_audio(*backends(), urgent=True) * 1000,
+    }
+
+if __name__ == "__main__":
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    stats = run_benchmark(scale)
+    print(f"Speaking a {stats['sentences']}-sentence message")
+    print(f"  whole message, then play:     first audio {stats['batch_first_audio_ms']:7.0f}ms")
+    print(f"  per sentence, no prefetch:    first audio {stats['serial_first_audio_ms']:7.0f}ms, "
+          f"avg gap {stats['serial_avg_gap_ms']:5.0f}ms")
+    print(f"  per sentence, with prefetch:  first audio {stats['pipelined_first_audio_ms']:7.0f}ms, "
+          f"avg gap {stats['pipelined_avg_gap_ms']:5.0f}ms (max {stats['pipelined_max_gap_ms']:.0f}ms)")
+    print("Emergency while the answer's sentences are prepared")
+    print(f"  behind the prepared sentences: first audio {stats['emergency_shared_first_audio_ms']:7.0f}ms")
+    print(f"  on the urgent worker:          first audio {stats['emergency_urgent_first_audio_ms']:7.0f}ms")
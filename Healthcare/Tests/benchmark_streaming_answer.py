@@ -0,0 +1,106 @@
+"""
+J.A.R.V.I.S. Streaming Answer Benchmark
+Time to first audio for a spoken answer: waiting for the whole reply and
+synthesizing it at once, against streaming sentences to the speaker, using
+local fake LLM and TTS backends with realistic relative timings
+
+Run with: python -m Healthcare.Tests.benchmark_streaming_answer [scale]
+"""
+
+import sys
+import os
+import re
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.AnswerStream import AnswerStream
+
+ANSWER = ("Iron is important during pregnancy because it helps make extra blood for you and the baby. "
+          "Most doctors recommend around 27 milligrams a day from food and a prenatal vitamin. "
+          "Good sources include lean red meat, beans, lentils, spinach and fortified cereals. "
+          "Taking iron with vitamin C, like orange juice, helps your body absorb it. "
+          "Avoid taking it with tea, coffee or calcium supplements, which reduce absorption. "
+          "If you feel very tired or dizzy, ask your doctor to check your iron levels.")
+
+class FakeLLM:
+    """Streams an answer word by word at a fixed token rate"""
+
+    def __init__(self, answer=ANSWER, token_delay=0.02):
+        self.answer = answer
+        self.token_delay = token_delay
+
+    def tokens(self):
+        for token in re.findall(r"\S+\s*", self.answer):
+            time.sleep(self.token_delay)
+            yield token
+
+class FakeTTS:
+    """
+    Synthesis costs a fixed round trip plus time per character, then
+    playback takes time per word. Records when each clip starts playing.
+    """
+
+    def __init__(self, base_delay=0.15, char_delay=0.002, word_delay=0.05):
+        self.base_delay = base_delay
+        self.char_delay = char_delay
+        self.word_delay = word_delay
+        self.play_started = []
+
+    def synthesize(self, text):
+        time.sleep(self.base_delay + self.char_delay * len(text))
+
+    def speak(self, text):
+        self.synthesize(text)
+        self.play_started.append(time.perf_counter())
+        time.sleep(self.word_delay * len(text.split()))
+
+def batch_first_audio(llm: FakeLLM, tts: FakeTTS) -> float:
+    """Seconds to first audio the old way: whole reply, then one synthesis"""
+    start = time.perf_counter()
+    answer = "".join(llm.tokens())
+    tts.synthesize(answer)
+    return time.perf_counter() - start
+
+def streaming_first_audio(llm: FakeLLM, tts: FakeTTS) -> dict:
+    """Seconds to first audio when sentences are spoken as they complete"""
+    tts.play_started = []
+    stream = AnswerStream(speak=tts.speak)
+    for token in llm.tokens():
+        stream.feed(token)
+    generated = time.perf_counter() - stream.started_at
+    stream.finish()
+    return {
+        'first_audio': tts.play_started[0] - stream.started_at,
+        'generation': generated,
+        'first_sentence': stream.metrics['first_sentence_ms'] / 1000,
+        'sentences': stream.metrics['sentences'],
+    }
+
+def run_benchmark(scale: float = 1.0) -> dict:
+    """scale < 1 speeds every fake delay up, for tests"""
+    llm = FakeLLM(token_delay=0.02 * scale)
+    tts = FakeTTS(base_delay=0.15 * scale, char_delay=0.002 * scale, word_delay=0.05 * scale)
+
+    batch = batch_first_audio(llm, tts)
+    streamed = streaming_first_audio(llm, tts)
+    first_sentence = ANSWER[:ANSWER.index(". ") + 1]
+
+    return {
+        'batch_first_audio_ms': batch * 1000,
+        'stream_first_audio_ms': streamed['first_audio'] * 1000,
+        # Ideal: generate the first sentence, then synthesize only it
+        'one_sentence_ms': (streamed['first_sentence']
+                            + tts.base_delay + tts.char_delay * len(first_sentence)) * 1000,
+        'generation_ms': streamed['generation'] * 1000,
+        'sentences': streamed['sentences'],
+    }
+
+if __name__ == '__main__':
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    stats = run_benchmark(scale)
+    print(f"Whole reply then synthesis: first audio after {stats['batch_first_audio_ms']:.0f}ms")
+    print(f"Streaming sentences:        first audio after {stats['stream_first_audio_ms']:.0f}ms "
+          f"(one sentence: {stats['one_sentence_ms']:.0f}ms)")
+    print(f"Generation took {stats['generation_ms']:.0f}ms for {stats['sentences']} sentences")
@@ -0,0 +1,95 @@
+"""
+J.A.R.V.I.S. Fake LLM Server
+Local OpenAI-compatible chat completions server for healthcare tests
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Any, Optional
+
+def default_responder(messages: List[Dict[str, str]]) -> str:
+    """Answer every prompt with a single prenatal vitamin medication"""
+    return json.dumps({
+        "medications": [{
+            "name": "Prenatal Vitamins", "strength": "1 tablet", "form": "tablet",
+            "frequency": "once daily", "duration": "30 days",
+            "instructions": "Take with food", "quantity": "30", "refills": "0"
+        }],
+        "prescriber": "Not specified", "date": "Not specified", "patient": "Not specified"
+    })
+
+class FakeLLMServer:
+    """
+    Threaded HTTP server answering POST /chat/completions.
+
+    ``responder`` maps the request messages to the assistant content and
+    ``delay`` (seconds) simulates model latency. Every request body is kept
+    in ``requests`` for assertions.
+    """
+
+    def __init__(self, responder: Optional[Callable[[List[Dict[str, str]]], str]] = None,
+                 delay: float = 0.0):
+        self.responder = responder or default_responder
+        self.delay = delay
+        self.requests: List[Dict[str, Any]] = []
+        self.fail_next = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def request_count(self) -> int:
+        with self._lock:
+            return len(self.requests)
+
+    def start(self) -> 'FakeLLMServer':
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                with fake._lock:
+                    fake.requests.append(body)
+                    failing = fake.fail_next > 0
+                    if failing:
+                        fake.fail_next -= 1
+
+                if fake.delay:
+                    time.sleep(fake.delay)
+
+                if failing:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+
+                content = fake.responder(body.get('messages', []))
+                payload = json.dumps({
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]
+                }).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
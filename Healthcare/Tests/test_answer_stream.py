@@ -0,0 +1,222 @@
+"""
+J.A.R.V.I.S. Streaming Answer Tests
+Sentence splitting of streamed tokens, incremental GUI text and sentence-by-sentence speech
+"""
+
+import unittest
+import sys
+import os
+import re
+import time
+import importlib
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.AnswerStream import SentenceSplitter, AnswerStream
+from Healthcare.Tests.benchmark_streaming_answer import run_benchmark
+
+def tokens(text):
+    return re.findall(r"\S+\s*", text)
+
+def split_all(text, **kwargs):
+    splitter = SentenceSplitter(**kwargs)
+    sentences = []
+    for token in tokens(text):
+        sentences.extend(splitter.feed(token))
+    rest = splitter.flush()
+    return sentences + ([rest] if rest else [])
+
+class TestSentenceSplitter(unittest.TestCase):
+    """Test incremental sentence boundaries"""
+
+    def test_sentences(self):
+        """Test sentences are emitted as soon as they end"""
+        splitter = SentenceSplitter(min_chars=0)
+        self.assertEqual(splitter.feed("Hello there. How"), ["Hello there."])
+        self.assertEqual(splitter.feed(" are you? Fine"), ["How are you?"])
+        self.assertEqual(splitter.flush(), "Fine")
+
+    def test_no_false_boundaries(self):
+        """Test abbreviations, initials, decimals and domains don't split"""
+        text = "Dr. Rao said take 2.5 mg daily. J. K. Rowling wrote it. Visit example.com today."
+        self.assertEqual(split_all(text, min_chars=0),
+                         ["Dr. Rao said take 2.5 mg daily.", "J. K. Rowling wrote it.", "Visit example.com today."])
+
+    def test_short_sentences_joined(self):
+        """Test very short sentences are joined to the next"""
+        self.assertEqual(split_all("Sure. Iron helps carry oxygen in the blood. Yes."),
+                         ["Sure. Iron helps carry oxygen in the blood.", "Yes."])
+
+    def test_line_breaks(self):
+        """Test list items on separate lines are separate sentences"""
+        self.assertEqual(split_all("1) Drink plenty of water\n2) Rest when you feel tired\n", min_chars=0),
+                         ["1) Drink plenty of water", "2) Rest when you feel tired"])
+
+class TestAnswerStream(unittest.TestCase):
+    """Test the streamed answer pipeline"""
+
+    def test_sentences_spoken_in_order(self):
+        """Test each sentence is spoken once, in order, and the full text is returned"""
+        spoken = []
+        stream = AnswerStream(speak=spoken.append)
+        text = "Iron helps carry oxygen in your blood. Vitamin C helps you absorb it. Tea reduces absorption."
+        for token in tokens(text):
+            stream.feed(token)
+
+        self.assertEqual(stream.finish(timeout=5), text)
+        self.assertEqual(spoken, ["Iron helps carry oxygen in your blood.", "Vitamin C helps you absorb it.",
+                                  "Tea reduces absorption."])
+
+    def test_speech_starts_before_answer_ends(self):
+        """Test the first sentence reaches the speaker while tokens are still arriving"""
+        spoken = []
+        stream = AnswerStream(speak=spoken.append)
+        for token in tokens("The first sentence is complete now. The second one is still"):
+            stream.feed(token)
+        time.sleep(0.1)
+
+        self.assertEqual(spoken, ["The first sentence is complete now."])
+        stream.finish(timeout=5)
+        self.assertEqual(len(spoken), 2)
+
+    def test_gui_updates(self):
+        """Test the GUI gets growing text, throttled, and always the final answer"""
+        shown = []
+        stream = AnswerStream(on_text=shown.append, min_interval=0)
+        for token in tokens("One two three."):
+            stream.feed(token)
+        self.assertEqual(shown, ["One ", "One two ", "One two three."])
+
+        shown.clear()
+        stream = AnswerStream(on_text=shown.append, min_interval=60)
+        for token in tokens("One two three."):
+            stream.feed(token)
+        stream.finish()
+        self.assertEqual(shown, ["One ", "One two three."])
+
+    def test_no_updates_after_first_finish(self):
+        """Test waiting for speech after finish(wait=False) shows nothing more, so a final message stays last"""
+        shown, spoken = [], []
+        stream = AnswerStream(on_text=shown.append, speak=lambda s: (time.sleep(0.05), spoken.append(s)),
+                              min_interval=0)
+        for token in tokens("Iron helps carry oxygen in the blood. Take it with vitamin C."):
+            stream.feed(token)
+        stream.finish(wait=False)
+        updates = len(shown)
+        stream.finish()
+
+        self.assertEqual(len(shown), updates)
+        self.assertEqual(len(spoken), 2)
+
+    def test_long_answer_shortened(self):
+        """Test a long answer speaks its first sentences and then the notice"""
+        spoken = []
+        stream = AnswerStream(speak=spoken.append, speak_first=2, notice=lambda: "The rest is on the screen.")
+        for i in range(6):
+            stream.feed(f"This is sentence number {i} of a long answer about iron. ")
+        stream.finish(timeout=5)
+
+        self.assertEqual(spoken, ["This is sentence number 0 of a long answer about iron.",
+                                  "This is sentence number 1 of a long answer about iron.",
+                                  "The rest is on the screen."])
+
+    def test_sentences_prepared_before_speaking(self):
+        """Test each sentence is handed to prepare as soon as it is queued"""
+        prepared, spoken = [], []
+        stream = AnswerStream(speak=lambda s: spoken.append((s, list(prepared))), prepare=prepared.append)
+        for token in tokens("Iron helps carry oxygen in your blood. Vitamin C helps you absorb it."):
+            stream.feed(token)
+        stream.finish(timeout=5)
+
+        self.assertEqual(prepared, ["Iron helps carry oxygen in your blood.", "Vitamin C helps you absorb it."])
+        self.assertIn(spoken[0][0], spoken[0][1])
+
+    def test_short_answer_spoken_fully(self):
+        """Test held sentences are still spoken when the answer stays short"""
+        spoken = []
+        stream = AnswerStream(speak=spoken.append, speak_first=2, notice=lambda: "notice")
+        for sentence in ["Drink some water now. ", "Sit down for a while. ", "Call me if it gets worse."]:
+            stream.feed(sentence)
+        stream.finish(timeout=5)
+
+        self.assertEqual(len(spoken), 3)
+        self.assertNotIn("notice", spoken)
+
+    def test_end_marker_and_speaker_errors(self):
+        """Test </s> is dropped and a failing speaker doesn't stop the stream"""
+        def speak(sentence):
+            if "first" in sentence:
+                raise RuntimeError("audio device busy")
+
+        stream = AnswerStream(speak=speak)
+        stream.feed("The first sentence fails to play. ")
+        stream.feed("The second sentence plays fine.</s>")
+
+        self.assertEqual(stream.finish(timeout=5), "The first sentence fails to play. The second sentence plays fine.")
+        self.assertEqual(stream.get_stats()['spoken'], 1)
+
+def fake_completion(pieces, fail=False):
+    for piece in pieces:
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+    if fail:
+        raise ConnectionError("stream dropped")
+
+class TestChatBotRetry(unittest.TestCase):
+    """Test the ChatBot retry against a fake client"""
+
+    @classmethod
+    def setUpClass(cls):
+        with patch('groq.Groq'), patch('Backend.ChatStore.GetChatStore'):
+            sys.modules.pop('Backend.Chatbot', None)
+            cls.chatbot = importlib.import_module('Backend.Chatbot')
+        sys.modules.pop('Backend.Chatbot', None)
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.store = MagicMock()
+        self.store.tail.return_value = []
+        self.store.offset = 0
+        for name, value in [('client', self.client), ('chat_store', self.store)]:
+            patcher = patch.object(self.chatbot, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_no_retry_after_tokens_streamed(self):
+        """Test a reply that fails part-way is kept instead of retried, so speech and screen agree"""
+        self.client.chat.completions.create.side_effect = [
+            fake_completion(["Iron helps ", "carry oxygen."], fail=True),
+            fake_completion(["A different answer."])]
+        streamed = []
+
+        answer = self.chatbot.ChatBot("why iron", on_token=streamed.append)
+
+        self.assertEqual(answer, "Iron helps carry oxygen.")
+        self.assertEqual("".join(streamed), answer)
+        self.assertEqual(self.client.chat.completions.create.call_count, 1)
+
+    def test_retry_keeps_streaming(self):
+        """Test a request that fails before any token is retried with on_token passed on"""
+        self.client.chat.completions.create.side_effect = [
+            ConnectionError("refused"), fake_completion(["Second ", "try."])]
+        streamed = []
+
+        answer = self.chatbot.ChatBot("hello", on_token=streamed.append)
+
+        self.assertEqual(answer, "Second try.")
+        self.assertEqual(streamed, ["Second ", "try."])
+
+class TestStreamingBenchmark(unittest.TestCase):
+    """Test time to first audio with fake LLM and TTS backends"""
+
+    def test_first_audio_after_one_sentence(self):
+        """Test speech starts after about one sentence instead of the whole answer"""
+        stats = run_benchmark(scale=0.2)
+
+        self.assertLess(stats['stream_first_audio_ms'], stats['batch_first_audio_ms'] / 2)
+        self.assertLess(stats['stream_first_audio_ms'], stats['one_sentence_ms'] * 1.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+"""
+J.A.R.V.I.S. Async LLM Client Tests
+Deadlines, retries, concurrency limiting and the latency circuit breaker, against a local fake LLM
+"""
+
+import unittest
+import sys
+import os
+import time
+import asyncio
+import tempfile
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Database.encryption import HealthcareEncryption
+from Healthcare.Core.llm_cache import LLMParseCache
+from Healthcare.Core.async_llm_client import AsyncLLMClient, LatencyCircuitBreaker, LLMUnavailableError
+from Healthcare.Core.ai_prescription_parser import AIPrescriptionParser
+from Healthcare.Tests.fake_llm_server import FakeLLMServer
+
+MESSAGES = [{"role": "user", "content": "Prenatal Vitamins once daily"}]
+
+class TestLatencyCircuitBreaker(unittest.TestCase):
+    """Test the breaker state machine"""
+
+    def test_trips_on_slow_p95(self):
+        """Test the breaker opens once p95 latency crosses the threshold"""
+        breaker = LatencyCircuitBreaker(p95_threshold=1.0, min_samples=5)
+        for latency in [0.2, 0.3, 0.2, 0.4]:
+            breaker.record(latency)
+        self.assertTrue(breaker.allow())
+
+        breaker.record(2.5)
+        self.assertEqual(breaker.state, 'open')
+        self.assertFalse(breaker.allow())
+
+    def test_half_open_probe(self):
+        """Test one probe is allowed after cooldown and a fast probe closes the breaker"""
+        breaker = LatencyCircuitBreaker(p95_threshold=1.0, min_samples=1, cooldown=0.05)
+        breaker.record(3.0)
+        time.sleep(0.06)
+
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # Second caller waits for the probe
+        breaker.record(0.1)
+        self.assertEqual(breaker.state, 'closed')
+        self.assertTrue(breaker.allow())
+
+class TestAsyncLLMClient(unittest.TestCase):
+    """Test AsyncLLMClient against a local fake LLM server"""
+
+    def setUp(self):
+        self.server = FakeLLMServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_client(self, client, coroutine_factory):
+        async def runner():
+            try:
+                return await coroutine_factory()
+            finally:
+                await client.aclose()
+        return asyncio.run(runner())
+
+    def test_chat_returns_content(self):
+        """Test a plain call returns the assistant content over a reused connection"""
+        client = AsyncLLMClient(self.server.base_url, "test-key")
+
+        async def two_calls():
+            first = await client.chat(MESSAGES)
+            pooled = client._client
+            await client.chat(MESSAGES)
+            self.assertIs(client._client, pooled)
+            return first
+
+        self.assertIn("Prenatal Vitamins", self.run_client(client, two_calls))
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_retries_transient_errors(self):
+        """Test 5xx responses are retried with backoff"""
+        self.server.fail_next = 2
+        client = AsyncLLMClient(self.server.base_url, "test-key", max_retries=2, backoff_base=0.01)
+
+        content = self.run_client(client, lambda: client.chat(MESSAGES))
+
+        self.assertIn("Prenatal Vitamins", content)
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(client.get_stats()['retries'], 2)
+
+    def test_deadline_bounds_slow_calls(self):
+        """Test a stalled server fails the call at its deadline, not the server's pace"""
+        self.server.delay = 1.0
+        client = AsyncLLMClient(self.server.base_url, "test-key", max_retries=3, backoff_base=0.01)
+
+        start = time.perf_counter()
+        with self.assertRaises(LLMUnavailableError):
+            self.run_client(client, lambda: client.chat(MESSAGES, deadline=0.3))
+        self.assertLess(time.perf_counter() - start, 0.8)
+
+    def test_concurrency_limit(self):
+        """Test no more than max_concurrency requests are in flight"""
+        self.server.delay = 0.2
+        client = AsyncLLMClient(self.server.base_url, "test-key", max_concurrency=2)
+
+        async def six_calls():
+            return await asyncio.gather(*[client.chat(MESSAGES) for _ in range(6)])
+
+        start = time.perf_counter()
+        results = self.run_client(client, six_calls)
+
+        self.assertEqual(len(results), 6)
+        # Three waves of two requests each
+        self.assertGreaterEqual(time.perf_counter() - start, 0.6)
+
+    def test_open_breaker_rejects_without_calling(self):
+        """Test calls are rejected immediately while the breaker is open"""
+        self.server.delay = 0.1
+        breaker = LatencyCircuitBreaker(p95_threshold=0.05, min_samples=2, cooldown=60)
+        client = AsyncLLMClient(self.server.base_url, "test-key", breaker=breaker)
+
+        async def calls():
+            await client.chat(MESSAGES)
+            await client.chat(MESSAGES)
+            with self.assertRaises(LLMUnavailableError):
+                await client.chat(MESSAGES)
+
+        self.run_client(client, calls)
+        self.assertEqual(self.server.request_count, 2)
+        self.assertEqual(client.get_stats()['rejected'], 1)
+
+    def test_cancelled_probe_reopens_breaker(self):
+        """Test a half-open probe cancelled mid-request leaves the breaker open, not stuck half-open"""
+        self.server.delay = 1.0
+        breaker = LatencyCircuitBreaker(p95_threshold=1.0, min_samples=1, cooldown=0.05)
+        breaker.record(3.0)
+        time.sleep(0.06)
+        client = AsyncLLMClient(self.server.base_url, "test-key", breaker=breaker)
+
+        async def cancelled_probe():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.chat(MESSAGES), timeout=0.1)
+
+        self.run_client(client, cancelled_probe)
+        self.assertEqual(breaker.state, 'open')
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())  # The next cooldown lets a new probe through
+
+    def test_client_closed_when_loop_changes(self):
+        """Test a new event loop gets a new client and the previous one is closed"""
+        client = AsyncLLMClient(self.server.base_url, "test-key")
+        asyncio.run(client.chat(MESSAGES))
+        first = client._client
+
+        self.run_client(client, lambda: client.chat(MESSAGES))
+
+        self.assertTrue(first.is_closed)
+        self.assertEqual(client.get_stats()['clients_closed'], 1)
+
+class TestAsyncParserPath(unittest.TestCase):
+    """Test AIPrescriptionParser's async parse path"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.server = FakeLLMServer().start()
+
+        with patch('Healthcare.Core.ai_prescription_parser.HealthcareDatabase'), \
+             patch('Healthcare.Core.ai_prescription_parser.MedicalOCR'):
+            self.parser = AIPrescriptionParser()
+
+        self.parser.llm_base_url = self.server.base_url
+        self.parser.parse_cache = LLMParseCache(
+            os.path.join(self.temp_dir.name, 'cache.db'), HealthcareEncryption("test_cache_key")
+        )
+
+    def tearDown(self):
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def test_async_parse_uses_llm_and_cache(self):
+        """Test the async path parses through the LLM and caches the result"""
+        async def parse_twice():
+            first = await self.parser._parse_with_openai_async("Prenatal Vitamins once daily")
+            second = await self.parser._parse_with_openai_async("prenatal vitamins ONCE daily")
+            await self.parser.get_async_llm_client().aclose()
+            return first, second
+
+        first, second = asyncio.run(parse_twice())
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_concurrent_identical_parses_coalesced(self):
+        """Test identical async parses in flight together share one LLM call"""
+        self.server.delay = 0.2
+
+        async def parse_together():
+            results = await asyncio.gather(*[
+                self.parser._parse_with_openai_async("Prenatal Vitamins once daily") for _ in range(5)
+            ])
+            await self.parser.get_async_llm_client().aclose()
+            return results
+
+        results = asyncio.run(parse_together())
+
+        self.assertEqual(self.server.request_count, 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(self.parser.parse_cache.get_stats()['coalesced'], 4)
+        self.assertEqual(self.parser._async_parses, {})
+
+    def test_open_breaker_falls_back_to_rules(self):
+        """Test the async path degrades to rule-based parsing when the breaker is open"""
+        client = self.parser.get_async_llm_client()
+        client.breaker = LatencyCircuitBreaker(min_samples=1)
+        client.breaker.record(60.0)
+
+        result = asyncio.run(self.parser._parse_with_openai_async("Amoxicillin 500mg twice daily"))
+
+        self.assertEqual(result['medications'][0]['name'], "Amoxicillin")
+        self.assertEqual(self.server.request_count, 0)
+
+if __name__ == '__main__':
+    unittest.main()
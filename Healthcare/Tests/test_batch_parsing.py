@@ -0,0 +1,197 @@
+"""
+J.A.R.V.I.S. Batched Prescription Parsing Tests
+Packing several prescriptions into one LLM request, against a local fake LLM
+"""
+
+import unittest
+import sys
+import os
+import re
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Database.encryption import HealthcareEncryption
+from Healthcare.Core.llm_cache import LLMParseCache
+from Healthcare.Core.ai_prescription_parser import AIPrescriptionParser
+from Healthcare.Tests.fake_llm_server import FakeLLMServer
+
+def echo_documents(drop_ids=()):
+    """Responder naming each document's medication after the first word of its text"""
+    def responder(messages):
+        prompt = messages[-1]['content']
+        documents = []
+        for doc_id, text in re.findall(r'### DOCUMENT (\S+)\n(.*?)\n### END', prompt, re.S):
+            if doc_id in drop_ids:
+                continue
+            documents.append({
+                "id": doc_id,
+                "medications": [{"name": text.split()[0], "strength": "Not specified",
+                                 "form": "tablet", "frequency": "once daily"}],
+                "prescriber": "Not specified", "date": "Not specified", "patient": "Not specified"
+            })
+        return json.dumps({"documents": documents})
+    return responder
+
+OCR_TEXTS = {
+    "rx1.jpg": "Labetalol 100mg twice daily",
+    "rx2.jpg": "Nifedipine 30mg once daily",
+    "rx3.jpg": "Amoxicillin 500mg three times daily",
+}
+
+class TestBatchParsing(unittest.TestCase):
+    """Test AIPrescriptionParser.parse_prescriptions_batch"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.server = FakeLLMServer(responder=echo_documents()).start()
+
+        with patch('Healthcare.Core.ai_prescription_parser.HealthcareDatabase'), \
+             patch('Healthcare.Core.ai_prescription_parser.MedicalOCR'):
+            self.parser = AIPrescriptionParser()
+
+        self.parser.llm_base_url = self.server.base_url
+        self.parser.parse_cache = LLMParseCache(
+            os.path.join(self.temp_dir.name, 'cache.db'), HealthcareEncryption("test_cache_key")
+        )
+        self.parser.medical_ocr.extract_text_from_image.side_effect = lambda path: OCR_TEXTS.get(path, "")
+        self.parser.healthcare_db.add_prescription.return_value = 1
+
+        patcher = patch('Healthcare.Core.ai_prescription_parser.OPENAI_AVAILABLE', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def test_one_request_for_small_batch(self):
+        """Test three prescriptions go out in a single LLM request, in order"""
+        results = self.parser.parse_prescriptions_batch(list(OCR_TEXTS))
+
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual([r['parsed_data']['medications'][0]['name'] for r in results],
+                         ["Labetalol", "Nifedipine", "Amoxicillin"])
+        self.assertTrue(all(r['success'] for r in results))
+
+    def test_token_budget_splits_batches(self):
+        """Test a tight token budget spreads documents over several requests"""
+        batches = self.parser._pack_batches(
+            {f"rx-{i}": "x" * 400 for i in range(1, 7)}, token_budget=650
+        )
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 2])
+
+        self.parser.parse_prescriptions_batch(list(OCR_TEXTS), token_budget=1)
+        self.assertEqual(self.server.request_count, 3)
+
+    def test_dropped_document_falls_back_to_rules(self):
+        """Test a document missing from the response is parsed by rules"""
+        self.server.responder = echo_documents(drop_ids=("rx-2",))
+
+        results = self.parser.parse_prescriptions_batch(list(OCR_TEXTS))
+
+        self.assertEqual(results[1]['parsed_data']['medications'][0]['name'], "Nifedipine")
+        self.assertIn('name_confidence', results[1]['parsed_data']['medications'][0])
+        # Rule-based fallbacks are not cached as LLM parses
+        self.assertEqual(self.parser.parse_cache.get_stats()['entries'], 2)
+
+    def test_failed_batch_falls_back_to_rules(self):
+        """Test a batch is retried like a single parse, then degrades every document to rules"""
+        self.server.fail_next = 3
+
+        results = self.parser.parse_prescriptions_batch(list(OCR_TEXTS))
+
+        self.assertEqual(self.server.request_count, 3)
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertEqual(self.parser.parse_cache.get_stats()['entries'], 0)
+        self.assertEqual(results[2]['parsed_data']['medications'][0]['name'], "Amoxicillin")
+
+    def test_called_from_event_loop(self):
+        """Test a batch parse inside a running event loop still reaches the LLM"""
+        async def parse_in_loop():
+            return self.parser.parse_prescriptions_batch(list(OCR_TEXTS))
+
+        results = asyncio.run(parse_in_loop())
+
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual([r['parsed_data']['medications'][0]['name'] for r in results],
+                         ["Labetalol", "Nifedipine", "Amoxicillin"])
+        self.assertEqual(self.parser.parse_cache.get_stats()['entries'], 3)
+
+    def test_cached_documents_skip_llm(self):
+        """Test documents parsed before are served from the cache"""
+        self.parser.parse_prescriptions_batch(list(OCR_TEXTS))
+        self.parser.parse_prescriptions_batch(list(OCR_TEXTS))
+
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(self.parser.parse_cache.get_stats()['hits'], 3)
+
+    def test_concurrency_limit(self):
+        """Test no more than max_concurrency batches are in flight at once"""
+        active = {'now': 0, 'peak': 0}
+        lock = threading.Lock()
+        original = self.parser._request_batch_parse_async
+
+        async def tracked(client, batch):
+            with lock:
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+            await asyncio.sleep(0.05)
+            try:
+                return await original(client, batch)
+            finally:
+                with lock:
+                    active['now'] -= 1
+
+        self.parser._request_batch_parse_async = tracked
+        paths = [f"rx{i}.jpg" for i in range(8)]
+        self.parser.medical_ocr.extract_text_from_image.side_effect = \
+            lambda path: f"Labetalol {path} 100mg twice daily"
+
+        results = self.parser.parse_prescriptions_batch(paths, max_concurrency=2, token_budget=1)
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(self.server.request_count, 8)
+        self.assertLessEqual(active['peak'], 2)
+
+    def test_coalesced_with_single_parse(self):
+        """Test a single parse of a document already in a pending batch waits for that batch"""
+        self.server.delay = 0.3
+        batch = threading.Thread(target=self.parser.parse_prescriptions_batch, args=(list(OCR_TEXTS),))
+        batch.start()
+        while self.server.request_count == 0:
+            time.sleep(0.01)
+
+        single = self.parser._parse_with_openai(OCR_TEXTS["rx2.jpg"])
+        batch.join()
+
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(single['medications'][0]['name'], "Nifedipine")
+        self.assertEqual(self.parser.parse_cache.get_stats()['coalesced'], 1)
+
+    def test_breaker_shared_with_single_parses(self):
+        """Test batches are skipped while the parse circuit breaker is open"""
+        breaker = self.parser.get_async_llm_client().breaker
+        for _ in range(breaker.min_samples):
+            breaker.record(breaker.p95_threshold + 1)
+
+        results = self.parser.parse_prescriptions_batch(list(OCR_TEXTS))
+
+        self.assertEqual(self.server.request_count, 0)
+        self.assertTrue(all(r['success'] for r in results))
+
+    def test_unreadable_image_reported(self):
+        """Test unreadable scans fail individually without sinking the batch"""
+        results = self.parser.parse_prescriptions_batch(["rx1.jpg", "blank.jpg"])
+
+        self.assertTrue(results[0]['success'])
+        self.assertFalse(results[1]['success'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+J.A.R.V.I.S. Chat Store Tests
+Append-only JSONL chat log: migration, crash recovery, tail cache and compaction
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.ChatStore import ChatStore
+from Backend.ContextWindow import ContextWindowBuilder
+
+def turn(i):
+    return [{"role": "user", "content": f"question {i}"}, {"role": "assistant", "content": f"answer {i}"}]
+
+class TestChatStore(unittest.TestCase):
+    """Test the JSONL chat store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'ChatLog.jsonl')
+        self.legacy_path = os.path.join(self.temp_dir.name, 'ChatLog.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open_store(self, **kwargs):
+        return ChatStore(path=self.path, legacy_path=self.legacy_path, **kwargs)
+
+    def test_append_and_reopen(self):
+        """Test appended messages survive reopening the store"""
+        store = self.open_store()
+        store.extend(turn(1))
+        store.append({"role": "user", "content": "नमस्ते"})
+
+        reopened = self.open_store()
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual(reopened.tail(1), [{"role": "user", "content": "नमस्ते"}])
+
+    def test_append_only_writes(self):
+        """Test an append adds one line instead of rewriting the file"""
+        store = self.open_store()
+        store.extend(turn(0) * 500)
+        size = os.path.getsize(self.path)
+
+        store.append({"role": "user", "content": "hi"})
+        line = json.dumps({"role": "user", "content": "hi"}) + "\n"
+        self.assertEqual(os.path.getsize(self.path), size + len(line))
+
+    def test_tail_cache(self):
+        """Test only the newest messages are kept in memory, with their offset in the log"""
+        store = self.open_store(tail_size=10)
+        for i in range(20):
+            store.extend(turn(i))
+
+        self.assertEqual(len(store), 40)
+        self.assertEqual(store.offset, 30)
+        self.assertEqual(store.tail()[0]["content"], "question 15")
+        self.assertEqual(store.tail(2), turn(19))
+
+        tail = store.tail()
+        tail.append({"role": "user", "content": "not saved"})
+        self.assertEqual(len(store.tail()), 10)
+        self.assertEqual(store.snapshot(), (store.tail(), 30))
+
+    def test_migrates_legacy_json(self):
+        """Test an old ChatLog.json is converted and kept as a backup"""
+        with open(self.legacy_path, 'w', encoding='utf-8') as file:
+            json.dump(turn(1) + turn(2), file, indent=4)
+
+        store = self.open_store()
+        self.assertEqual(store.tail(), turn(1) + turn(2))
+        self.assertEqual(store.get_stats()['migrated'], 4)
+        self.assertFalse(os.path.exists(self.legacy_path))
+        self.assertTrue(os.path.exists(self.legacy_path + ".migrated"))
+
+        # Only once
+        self.assertEqual(self.open_store().get_stats()['migrated'], 0)
+
+    def test_torn_write_dropped(self):
+        """Test a line cut off by a crash is dropped and later appends stay readable"""
+        store = self.open_store()
+        store.extend(turn(1))
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write('{"role": "user", "content": "half wri')
+
+        recovered = self.open_store()
+        self.assertEqual(recovered.tail(), turn(1))
+        self.assertEqual(recovered.get_stats()['dropped_lines'], 1)
+
+        recovered.extend(turn(2))
+        self.assertEqual(self.open_store().tail(), turn(1) + turn(2))
+
+    def test_compaction(self):
+        """Test the log is compacted to the newest messages once it grows past its limit"""
+        store = self.open_store(max_messages=10)
+        for i in range(8):
+            store.extend(turn(i))
+
+        self.assertLessEqual(store.get_stats()['messages'], 15)
+        self.assertGreaterEqual(store.get_stats()['compactions'], 1)
+        self.assertEqual(store.tail(2), turn(7))
+        self.assertEqual(len(store), 16)
+        self.assertEqual(len(self.open_store()), len(store))
+
+        store.compact(keep_last=2)
+        self.assertEqual(self.open_store().tail(), turn(7))
+
+    def test_compaction_archives(self):
+        """Test compacted messages move to the archive instead of being deleted"""
+        store = self.open_store(max_messages=10)
+        sent = []
+        for i in range(20):
+            store.extend(turn(i))
+            sent += turn(i)
+
+        with open(store.archive_path, 'rb') as file:
+            archived = [ChatStore._parse(line) for line in file]
+        self.assertEqual(archived + store.read_all(), sent)
+        self.assertEqual(store.get_stats()['archived'], len(archived))
+
+    def test_compaction_off(self):
+        """Test max_messages=None keeps the whole log"""
+        store = self.open_store(max_messages=None)
+        for i in range(20):
+            store.extend(turn(i))
+
+        self.assertEqual(len(store), 40)
+        self.assertEqual(store.get_stats()['compactions'], 0)
+
+    def test_clear(self):
+        """Test clearing empties the log on disk and in memory"""
+        store = self.open_store()
+        store.extend(turn(1))
+        store.clear()
+
+        self.assertEqual((len(store), store.tail()), (0, []))
+        self.assertEqual(len(self.open_store()), 0)
+
+    def test_context_from_tail(self):
+        """Test the context window keeps summarizing as the tail slides"""
+        store = self.open_store(tail_size=20)
+        builder = ContextWindowBuilder(max_tokens=60)
+        for i in range(50):
+            history = store.tail() + [turn(i)[0]]
+            context = builder.build(history, offset=store.offset)
+            store.extend(turn(i))
+
+        self.assertEqual(context[-1]["content"], "question 49")
+        self.assertIn("question 40", context[0]["content"])
+        self.assertEqual(builder.get_stats()['resets'], 0)
+
+    def test_positions_survive_compaction(self):
+        """Test offset and len() keep counting archived messages, so the context window is not reset"""
+        store = self.open_store(tail_size=20, max_messages=10)
+        builder = ContextWindowBuilder(max_tokens=60)
+        offsets = []
+        for i in range(30):
+            history = store.tail() + [turn(i)[0]]
+            builder.build(history, offset=store.offset)
+            store.extend(turn(i))
+            offsets.append(store.offset)
+
+        self.assertGreaterEqual(store.get_stats()['compactions'], 1)
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertEqual(len(store), 60)
+        self.assertEqual(builder.get_stats()['resets'], 0)
+        self.assertEqual(self.open_store(tail_size=20).snapshot(), store.snapshot())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+J.A.R.V.I.S. Chat Context Window Tests
+Token-budgeted recent turns, rolling summary and keyword retrieval for ChatBot history
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.ContextWindow import ContextWindowBuilder, summarize_topics
+from Backend.ConversationBuffer import message_tokens
+from Healthcare.Tests.benchmark_context_window import run_benchmark
+
+def chat(*pairs):
+    history = []
+    for question, answer in pairs:
+        history.append({"role": "user", "content": question})
+        if answer is not None:
+            history.append({"role": "assistant", "content": answer})
+    return history
+
+class TestContextWindowBuilder(unittest.TestCase):
+    """Test which history is sent to the model"""
+
+    def test_short_history_unchanged(self):
+        """Test a history within budget is sent as is, without a summary"""
+        history = chat(("hi", "hello"), ("how are you", None))
+        self.assertEqual(ContextWindowBuilder(max_tokens=1000).build(history), history)
+
+    def test_recent_turns_within_budget(self):
+        """Test only the newest turns that fit the budget are kept"""
+        history = chat(*[(f"question {i}", "answer " * 40) for i in range(50)], ("latest question", None))
+        context = ContextWindowBuilder(max_tokens=300, summarizer=None).build(history)
+
+        self.assertLessEqual(sum(message_tokens(m) for m in context), 300)
+        self.assertEqual(context[-1]["content"], "latest question")
+        self.assertEqual(context[0]["role"], "user")
+
+    def test_rolling_summary(self):
+        """Test older turns are summarized once each, newest topics kept"""
+        calls = []
+
+        def summarizer(messages, summary):
+            calls.append(len(messages))
+            return summarize_topics(messages, summary)
+
+        builder = ContextWindowBuilder(max_tokens=200, summarizer=summarizer)
+        history = []
+        for i in range(30):
+            history.extend(chat((f"topic number {i}", "reply " * 30)))
+            builder.build(history)
+
+        context = builder.build(history)
+        self.assertEqual(context[0]["role"], "system")
+        self.assertIn("topic number 2", context[0]["content"])
+        self.assertEqual(builder.get_stats()['folded'], sum(calls))
+        self.assertLess(builder.get_stats()['folded'], len(history))
+
+    def test_summary_capped(self):
+        """Test the summary stays within its token budget"""
+        builder = ContextWindowBuilder(max_tokens=50, summary_tokens=40)
+        history = chat(*[(f"a fairly long question about subject {i}", "ok") for i in range(500)])
+        builder.build(history)
+        self.assertLessEqual(builder.get_stats()['summary_tokens'], 41)
+
+    def test_retrieval_of_older_turn(self):
+        """Test an older relevant exchange is brought back for the query"""
+        history = chat(("what is my blood group", "Your blood group is O positive."),
+                       *[(f"tell me a joke {i}", "a joke " * 30) for i in range(40)],
+                       ("remind me what blood group I have", None))
+
+        plain = ContextWindowBuilder(max_tokens=300).build(history)
+        retrieved = ContextWindowBuilder(max_tokens=300, retrieval=True).build(history)
+
+        self.assertFalse(any("O positive" in m["content"] for m in plain))
+        self.assertTrue(any("O positive" in m["content"] for m in retrieved))
+
+    def test_log_reset(self):
+        """Test clearing the chat log clears the summary"""
+        builder = ContextWindowBuilder(max_tokens=50)
+        builder.build(chat(*[(f"question {i}", "answer " * 20) for i in range(20)]))
+        self.assertIsNotNone(builder.summary)
+
+        self.assertEqual(builder.build(chat(("fresh start", None))), chat(("fresh start", None)))
+        self.assertEqual(builder.get_stats()['resets'], 1)
+
+class TestContextWindowBenchmark(unittest.TestCase):
+    """Test build cost does not grow with the chat log"""
+
+    def test_latency_flat(self):
+        """Test building from a 10k-turn log costs about the same as from 100 turns"""
+        result = run_benchmark(turns=10000, checkpoints=(100, 10000), samples=20)
+        small, large = result['checkpoints'][100], result['checkpoints'][10000]
+
+        self.assertLess(large['p50_ms'], max(small['p50_ms'] * 3, 1.0))
+        self.assertLess(large['context_tokens'], large['full_log_tokens'] / 100)
+
+if __name__ == '__main__':
+    unittest.main()
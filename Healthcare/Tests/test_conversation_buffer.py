@@ -0,0 +1,99 @@
+"""
+J.A.R.V.I.S. Conversation Buffer Tests
+Ring-buffer eviction, token budget and summarization hooks for bounded LLM history
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.ConversationBuffer import ConversationBuffer, estimate_tokens
+
+def user(text):
+    return {"role": "user", "content": text}
+
+class TestConversationBuffer(unittest.TestCase):
+    """Test the bounded conversation buffer"""
+
+    def test_ring_eviction(self):
+        """Test the oldest messages go first once max_messages is reached"""
+        buffer = ConversationBuffer(max_messages=3, max_tokens=10000)
+        for i in range(5):
+            buffer.append(user(f"query {i}"))
+
+        self.assertEqual([m["content"] for m in buffer.to_list()], ["query 2", "query 3", "query 4"])
+        self.assertEqual(buffer.get_stats()['evicted'], 2)
+
+    def test_token_budget(self):
+        """Test old messages are evicted to stay within the token budget"""
+        buffer = ConversationBuffer(max_messages=100, max_tokens=100)
+        for _ in range(10):
+            buffer.append(user("x" * 120))
+
+        self.assertLessEqual(buffer.token_count, 100)
+        self.assertEqual(len(buffer), 2)
+
+    def test_oversized_message_kept(self):
+        """Test the newest message survives even when it alone is over budget"""
+        buffer = ConversationBuffer(max_messages=10, max_tokens=50)
+        buffer.append(user("short"))
+        buffer.append({"role": "assistant", "content": "y" * 1000})
+
+        self.assertEqual(len(buffer), 1)
+        self.assertEqual(buffer.to_list()[0]["role"], "assistant")
+
+    def test_memory_stays_flat(self):
+        """Test a long session keeps a constant number of messages and tokens"""
+        buffer = ConversationBuffer(max_messages=20, max_tokens=2000)
+        for i in range(5000):
+            buffer.append(user(f"message number {i} " * 5))
+
+        stats = buffer.get_stats()
+        self.assertEqual(stats['appended'], 5000)
+        self.assertLessEqual(stats['messages'], 20)
+        self.assertLessEqual(stats['tokens'], 2000)
+
+    def test_summarizer_hook(self):
+        """Test evicted messages are handed to the summarizer and its summary is sent first"""
+        calls = []
+
+        def summarize(evicted, summary):
+            calls.append([m["content"] for m in evicted])
+            return ((summary or "") + " " + " ".join(m["content"] for m in evicted)).strip()
+
+        buffer = ConversationBuffer(max_messages=2, summarizer=summarize)
+        for word in ["alpha", "beta", "gamma", "delta"]:
+            buffer.append(user(word))
+
+        self.assertEqual(calls, [["alpha"], ["beta"]])
+        messages = buffer.to_list()
+        self.assertEqual(messages[0]["role"], "system")
+        self.assertIn("alpha beta", messages[0]["content"])
+        self.assertEqual([m["content"] for m in messages[1:]], ["gamma", "delta"])
+
+    def test_summary_capped(self):
+        """Test a runaway summarizer cannot grow the summary without limit"""
+        buffer = ConversationBuffer(max_messages=1, max_summary_tokens=10,
+                                    summarizer=lambda evicted, summary: (summary or "") + "z" * 100)
+        for i in range(20):
+            buffer.append(user(str(i)))
+
+        self.assertLessEqual(estimate_tokens(buffer.summary), 11)
+
+    def test_summarizer_failure(self):
+        """Test a failing summarizer only drops the evicted messages"""
+        def broken(evicted, summary):
+            raise RuntimeError("llm down")
+
+        buffer = ConversationBuffer(max_messages=1, summarizer=broken)
+        buffer.append(user("one"))
+        buffer.append(user("two"))
+
+        self.assertEqual(buffer.to_list(), [user("two")])
+        self.assertEqual(buffer.get_stats()['summarizer_errors'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
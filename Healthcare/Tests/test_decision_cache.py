@@ -0,0 +1,94 @@
+"""
+J.A.R.V.I.S. Decision Cache Tests
+Normalized keys, prompt-fingerprint invalidation, TTL/LRU limits and hit counters
+for cached FirstLayerDMM decisions
+"""
+
+import unittest
+import sys
+import os
+import time
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.DecisionCache import DecisionCache
+
+class TestDecisionCache(unittest.TestCase):
+    """Test the decision cache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'decisions.db')
+        self.fingerprint = DecisionCache.make_fingerprint("command-r-plus", "preamble v1", ["open", "general"])
+        self.cache = DecisionCache(self.fingerprint, self.db_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_normalized_queries_share_entry(self):
+        """Test case, punctuation and filler words don't change the key"""
+        self.cache.put("open chrome", ["open chrome"], llm_ms=900)
+
+        self.assertEqual(self.cache.get("Open Chrome."), ["open chrome"])
+        self.assertEqual(self.cache.get("Jarvis, can you please open the chrome?"), ["open chrome"])
+        self.assertIsNone(self.cache.get("open firefox"))
+
+    def test_prompt_change_invalidates(self):
+        """Test entries from a different preamble or funcs are purged"""
+        self.cache.put("what's the weather", ["weather"])
+        self.assertEqual(DecisionCache(self.fingerprint, self.db_path).get("what's the weather"), ["weather"])
+
+        changed = DecisionCache.make_fingerprint("command-r-plus", "preamble v2", ["open", "general"])
+        self.assertNotEqual(changed, self.fingerprint)
+        reopened = DecisionCache(changed, self.db_path)
+        self.assertIsNone(reopened.get("what's the weather"))
+        self.assertEqual(reopened.get_stats()['invalidated'], 1)
+
+    def test_ttl_expiry(self):
+        """Test expired decisions are dropped"""
+        self.cache.ttl_seconds = 0.05
+        self.cache.put("took my iron tablet", ["take medication iron tablet"])
+        time.sleep(0.1)
+
+        self.assertIsNone(self.cache.get("took my iron tablet"))
+        self.assertEqual(self.cache.get_stats()['expired'], 1)
+
+    def test_lru_eviction(self):
+        """Test the least recently used decision is evicted first"""
+        self.cache.max_entries = 2
+        self.cache.put("open chrome", ["open chrome"])
+        time.sleep(0.01)
+        self.cache.put("open notepad", ["open notepad"])
+        time.sleep(0.01)
+        self.cache.get("open chrome")
+        time.sleep(0.01)
+        self.cache.put("open paint", ["open paint"])
+
+        self.assertIsNone(self.cache.get("open notepad"))
+        self.assertEqual(self.cache.get("open chrome"), ["open chrome"])
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+
+    def test_empty_decision_not_cached(self):
+        """Test an LLM reply with no valid tasks is not cached"""
+        self.cache.put("asdf qwer", [], llm_ms=800)
+        self.assertIsNone(self.cache.get("asdf qwer"))
+
+    def test_hit_rate_and_saved_latency(self):
+        """Test hits are counted with the LLM time they saved"""
+        self.cache.get("open chrome")
+        self.cache.put("open chrome", ["open chrome"], llm_ms=1000)
+        self.cache.put("open notepad", ["open notepad"], llm_ms=600)
+        for _ in range(3):
+            self.cache.get("open chrome")
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (3, 1))
+        self.assertEqual(stats['hit_rate'], 0.75)
+        self.assertEqual(stats['avg_llm_ms'], 800)
+        self.assertEqual(stats['saved_ms'], 2400)
+        self.assertEqual(stats['entries'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+J.A.R.V.I.S. Drug Lexicon Tests
+Fuzzy drug-name lookup used to correct OCR'd prescriptions
+"""
+
+import unittest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Core.drug_lexicon import DrugLexicon, get_drug_lexicon
+from Healthcare.Core.medical_ocr import MedicalOCR
+from Healthcare.Core.ai_prescription_parser import AIPrescriptionParser
+
+class TestDrugLexicon(unittest.TestCase):
+    """Test the deletion-index lookup"""
+
+    def setUp(self):
+        self.lexicon = get_drug_lexicon()
+
+    def test_bundled_lexicon_loaded(self):
+        """Test the bundled lexicon contains common pregnancy medications"""
+        self.assertGreater(len(self.lexicon), 100)
+        for name in ["Folic Acid", "Labetalol", "Amoxicillin", "Prenatal Vitamins"]:
+            self.assertIn(name, self.lexicon)
+
+    def test_snaps_noisy_tokens(self):
+        """Test OCR-garbled names snap to the right drug"""
+        test_cases = [
+            ("Amoxici11in", "Amoxicillin"),
+            ("Paracetam0l", "Paracetamol"),
+            ("Metformn", "Metformin"),
+            ("Ibuprofin", "Ibuprofen"),
+            ("Omeprazol", "Omeprazole"),
+        ]
+
+        for token, expected in test_cases:
+            match = self.lexicon.correct(token)
+            self.assertIsNotNone(match, token)
+            self.assertEqual(match['name'], expected)
+            self.assertGreater(match['confidence'], 0.75)
+
+    def test_exact_match_has_full_confidence(self):
+        """Test exact names score 1.0"""
+        match = self.lexicon.correct("Labetalol")
+        self.assertEqual(match['distance'], 0)
+        self.assertEqual(match['confidence'], 1.0)
+
+    def test_common_words_not_snapped(self):
+        """Test ordinary prescription words are left alone"""
+        for word in ["daily", "Tablet", "Take", "with", "food", "evening"]:
+            self.assertIsNone(self.lexicon.correct(word), word)
+
+    def test_multi_word_names_in_text(self):
+        """Test multi-word names are preferred over their first word"""
+        match = self.lexicon.find_in_text("Folic Acld 5mg once daily")
+        self.assertEqual(match['name'], "Folic Acid")
+
+    def test_candidates_are_ranked(self):
+        """Test candidates come back best first with confidences"""
+        candidates = self.lexicon.lookup("Amoxicilin")
+        self.assertEqual(candidates[0]['name'], "Amoxicillin")
+        confidences = [c['confidence'] for c in candidates]
+        self.assertEqual(confidences, sorted(confidences, reverse=True))
+
+    def test_custom_lexicon(self):
+        """Test a lexicon built from an explicit name list"""
+        lexicon = DrugLexicon(names=["Nifedipine"], max_edit_distance=1)
+        self.assertEqual(lexicon.correct("Nifedipne")['name'], "Nifedipine")
+        self.assertIsNone(lexicon.correct("Nfedipne"))
+
+    def test_lookup_latency(self):
+        """Test single-token lookups stay under a millisecond"""
+        tokens = ["Amoxici11in", "Paracetam0l", "Metformn", "Labetal0l", "Nifedipne"]
+        iterations = 200
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for token in tokens:
+                self.lexicon.lookup(token)
+        per_lookup = (time.perf_counter() - start) / (iterations * len(tokens))
+
+        self.assertLess(per_lookup, 0.001)
+
+class TestOCRNameCorrection(unittest.TestCase):
+    """Test lexicon correction wired into the OCR pipeline"""
+
+    def setUp(self):
+        with patch('Healthcare.Core.medical_ocr.HealthcareDatabase'):
+            self.ocr = MedicalOCR()
+
+    def test_clean_text_fixes_dosages(self):
+        """Test letter/digit swaps are fixed inside dosage amounts"""
+        cleaned = self.ocr._clean_ocr_text("Amoxicillin 5OOmg\nIron l0 mg daily")
+        self.assertIn("500mg", cleaned)
+        self.assertIn("10 mg", cleaned)
+        self.assertEqual(len(cleaned.split('\n')), 2)
+
+    def test_extracted_medication_has_confidence(self):
+        """Test extracted medications carry snapped names and confidences"""
+        medications = self.ocr._extract_medications_from_text("Amoxici11in 500mg twice daily")
+
+        self.assertEqual(len(medications), 1)
+        self.assertEqual(medications[0]['name'], "Amoxicillin")
+        self.assertIn('name_confidence', medications[0])
+        self.assertGreater(len(medications[0]['name_candidates']), 0)
+
+class TestLLMNameSnapping(unittest.TestCase):
+    """Test lexicon correction of medication names returned by the LLM"""
+
+    def setUp(self):
+        with patch('Healthcare.Core.ai_prescription_parser.HealthcareDatabase'), \
+             patch('Healthcare.Core.ai_prescription_parser.MedicalOCR'):
+            self.parser = AIPrescriptionParser()
+
+    def snap(self, name):
+        return self.parser._snap_medication_names({'medications': [{'name': name}]})['medications'][0]
+
+    def test_whole_name_misspelling_replaced(self):
+        """Test a close misspelling of a whole known name is corrected"""
+        medication = self.snap("Nifedipin")
+        self.assertEqual(medication['name'], "Nifedipine")
+        self.assertEqual(medication['ocr_name'], "Nifedipin")
+        self.assertGreaterEqual(medication['name_confidence'], 0.85)
+
+    def test_partial_match_keeps_llm_name(self):
+        """Test a known drug inside a longer name is only offered as a candidate"""
+        medication = self.snap("Metformin Extended Release")
+        self.assertEqual(medication['name'], "Metformin Extended Release")
+        self.assertEqual(medication['name_confidence'], 0.0)
+        self.assertEqual(medication['name_candidates'][0]['name'], "Metformin")
+
+    def test_exact_and_unknown_names_kept(self):
+        """Test exact names and names not in the lexicon are left alone"""
+        self.assertEqual(self.snap("labetalol")['name'], "labetalol")
+        self.assertEqual(self.snap("labetalol")['name_confidence'], 1.0)
+        self.assertEqual(self.snap("Zyxoprolan")['name'], "Zyxoprolan")
+
+if __name__ == '__main__':
+    unittest.main()
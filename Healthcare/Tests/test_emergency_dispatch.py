@@ -0,0 +1,161 @@
+"""
+J.A.R.V.I.S. Emergency Dispatch Tests
+Priority output bus preemption and alert latency measured against a fake audio sink
+"""
+
+import unittest
+import sys
+import os
+import time
+import threading
+from unittest.mock import patch, MagicMock
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.OutputBus import PriorityOutputBus, PRIORITY_EMERGENCY, PRIORITY_REMINDER, PRIORITY_ANSWER
+from Healthcare.Core.lab_analyzer_emergency import EmergencyDetectionSystem
+
+SYNTH_SECONDS = 0.02
+TICK_SECONDS = 0.01
+# Worst case for an alert: the current message finishes synthesizing, notices
+# the alert on its next poll, then the alert itself is synthesized
+ALERT_LATENCY_BOUND = 2 * SYNTH_SECONDS + 2 * TICK_SECONDS + 0.1
+
+class FakeAudioSink:
+    """Stands in for TTS(): 'synthesizes', then plays while polling func like pygame does"""
+
+    def __init__(self, seconds_per_char=0.01):
+        self.seconds_per_char = seconds_per_char
+        self.played = []
+        self.audible = {}
+        self.playing = threading.Event()
+
+    def speak(self, text, func):
+        time.sleep(SYNTH_SECONDS)
+        if func() == False:
+            func(False)
+            return False
+
+        audible_at = time.perf_counter()
+        self.audible.setdefault(text, audible_at)
+        self.playing.set()
+        completed = True
+        while time.perf_counter() - audible_at < len(text) * self.seconds_per_char:
+            if func() == False:
+                completed = False
+                break
+            time.sleep(TICK_SECONDS)
+        func(False)
+        self.playing.clear()
+        self.played.append((text, completed))
+        return completed
+
+class TestPriorityOutputBus(unittest.TestCase):
+    """Test ordering and preemption on the output bus"""
+
+    def setUp(self):
+        self.sink = FakeAudioSink()
+        self.bus = PriorityOutputBus(speak=self.sink.speak)
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    def test_emergency_interrupts_answer_within_bound(self):
+        """Test an alert cuts off a playing answer and is audible within the bound"""
+        answer = self.bus.submit("A long chat answer " * 8, PRIORITY_ANSWER)
+        self.assertTrue(self.sink.playing.wait(2))
+
+        submitted_at = time.perf_counter()
+        alert = self.bus.submit("MEDICAL EMERGENCY", PRIORITY_EMERGENCY)
+        self.assertTrue(alert.wait(2))
+
+        latency = self.sink.audible["MEDICAL EMERGENCY"] - submitted_at
+        self.assertLess(latency, ALERT_LATENCY_BOUND)
+
+        # The interrupted answer is replayed afterwards
+        self.assertTrue(answer.wait(10))
+        self.assertEqual([completed for _, completed in self.sink.played], [False, True, True])
+        self.assertEqual(self.sink.played[1][0], "MEDICAL EMERGENCY")
+        self.assertEqual(answer.interruptions, 1)
+
+    def test_urgent_speaker_and_interrupt_hook(self):
+        """Test urgent messages use speak_urgent and a cut-off answer calls on_interrupt"""
+        urgent_sink = FakeAudioSink()
+        interrupts = []
+        bus = PriorityOutputBus(speak=self.sink.speak, speak_urgent=urgent_sink.speak,
+                                on_interrupt=lambda: interrupts.append(time.perf_counter()))
+        answer = bus.submit("A long chat answer " * 8, PRIORITY_ANSWER)
+        self.assertTrue(self.sink.playing.wait(2))
+        self.assertTrue(bus.submit("MEDICAL EMERGENCY", PRIORITY_EMERGENCY).wait(2))
+        self.assertTrue(answer.wait(10))
+        bus.shutdown()
+
+        self.assertEqual([text for text, _ in urgent_sink.played], ["MEDICAL EMERGENCY"])
+        self.assertNotIn("MEDICAL EMERGENCY", [text for text, _ in self.sink.played])
+        self.assertEqual(len(interrupts), 1)
+
+    def test_queued_messages_by_priority(self):
+        """Test waiting messages play most urgent first, then in arrival order"""
+        self.bus.submit("first answer", PRIORITY_ANSWER)
+        self.assertTrue(self.sink.playing.wait(2))
+        self.bus.submit("second answer", PRIORITY_ANSWER)
+        last = self.bus.submit("reminder", PRIORITY_REMINDER)
+        last.wait(5)
+        self.bus.say("third answer", PRIORITY_ANSWER, timeout=5)
+
+        self.assertEqual([text for text, _ in self.sink.played],
+                         ["first answer", "reminder", "first answer", "second answer", "third answer"])
+
+    def test_equal_priority_does_not_interrupt(self):
+        """Test a message of the same priority waits its turn"""
+        self.bus.submit("answer one", PRIORITY_ANSWER)
+        self.assertTrue(self.sink.playing.wait(2))
+        self.bus.say("answer two", PRIORITY_ANSWER, timeout=5)
+
+        self.assertEqual(self.sink.played, [("answer one", True), ("answer two", True)])
+
+class TestEmergencyHandlerLatency(unittest.TestCase):
+    """Test _handle_emergency neither waits for playback nor for the database"""
+
+    def setUp(self):
+        self.sink = FakeAudioSink()
+        self.bus = PriorityOutputBus(speak=self.sink.speak)
+        self.logged = threading.Event()
+
+        def slow_log(**kwargs):
+            time.sleep(0.5)
+            self.logged.set()
+
+        with patch('Healthcare.Core.lab_analyzer_emergency.HealthcareDatabase') as database, \
+             patch('Healthcare.Core.lab_analyzer_emergency.LabResultsAnalyzer'):
+            database.return_value.log_voice_command = MagicMock(side_effect=slow_log)
+            self.detector = EmergencyDetectionSystem()
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    @patch('Healthcare.Core.lab_analyzer_emergency.ShowTextToScreen')
+    def test_alert_audible_while_answer_playing(self, mock_screen):
+        """Test the spoken alert preempts speech and logging happens in the background"""
+        with patch('Backend.TextToSpeech._output_bus', self.bus):
+            self.bus.submit("A long chat answer " * 8, PRIORITY_ANSWER)
+            self.assertTrue(self.sink.playing.wait(2))
+
+            started = time.perf_counter()
+            result = self.detector._handle_emergency(
+                {'type': 'severe_bleeding', 'urgency': 'immediate'}, "heavy bleeding")
+            returned_in = time.perf_counter() - started
+
+            self.assertTrue(result['emergency_detected'])
+            self.assertLess(returned_in, 0.1)
+            self.assertFalse(self.logged.is_set())
+
+            deadline = time.perf_counter() + 2
+            while result['message'] not in self.sink.audible and time.perf_counter() < deadline:
+                time.sleep(0.005)
+            self.assertLess(self.sink.audible[result['message']] - started, ALERT_LATENCY_BOUND)
+            self.assertTrue(self.logged.wait(2))
+
+if __name__ == '__main__':
+    unittest.main()
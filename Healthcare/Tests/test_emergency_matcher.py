@@ -0,0 +1,120 @@
+"""
+J.A.R.V.I.S. Emergency Matcher Tests
+Compiled phrase automaton, fuzzy matching, recall corpus and latency budget
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Core.emergency_matcher import EmergencyPhraseMatcher, get_emergency_matcher
+from Healthcare.Core.lab_analyzer_emergency import EmergencyDetectionSystem
+from Healthcare.Tests.benchmark_emergency_matcher import load_corpus, measure_recall, run_benchmark
+
+class TestEmergencyPhraseMatcher(unittest.TestCase):
+    """Test matching behaviour on a small lexicon"""
+
+    def setUp(self):
+        self.matcher = EmergencyPhraseMatcher({
+            'emergencies': {
+                'severe_bleeding': {'urgency': 'immediate', 'action': 'call_emergency_services',
+                                    'phrases': ['heavy bleeding', 'hemorrhage', "bleeding won't stop"]},
+                'decreased_movement': {'urgency': 'urgent', 'action': 'call_healthcare_provider',
+                                       'phrases': ['baby not moving']}
+            }
+        })
+
+    def test_exact_phrase(self):
+        """Test a contiguous phrase matches with full confidence"""
+        match = self.matcher.detect("There is heavy bleeding")
+        self.assertEqual(match['type'], 'severe_bleeding')
+        self.assertEqual(match['confidence'], 1.0)
+
+    def test_inflection_and_negation_variants(self):
+        """Test contractions and inflections reduce to the lexicon phrase"""
+        for text in ["Baby hasn't moved all day", "the baby isn't moving", "baby has not moved"]:
+            self.assertEqual(self.matcher.detect(text)['type'], 'decreased_movement', text)
+
+    def test_extra_word_inside_phrase(self):
+        """Test a longer phrase with one extra word inside, in phrase order"""
+        match = self.matcher.detect("bleeding and it won't stop")
+        self.assertEqual(match['type'], 'severe_bleeding')
+        self.assertLess(match['confidence'], 1.0)
+
+    def test_phrase_order_kept(self):
+        """Test reordered words and extra words inside two-word phrases do not match"""
+        self.assertIsNone(self.matcher.detect("I'm bleeding really heavily"))
+        self.assertIsNone(self.matcher.detect("heavy nose bleeding"))
+        self.assertIsNone(self.matcher.detect("won't stop bleeding"))
+
+    def test_negated_phrase_ignored(self):
+        """Test a negation inside or just before the phrase suppresses the match"""
+        for text in ["I am not having heavy bleeding", "no heavy bleeding"]:
+            self.assertIsNone(self.matcher.detect(text), text)
+        # The phrase's own negation still matches
+        self.assertEqual(self.matcher.detect("baby isn't moving")['type'], 'decreased_movement')
+
+    def test_negation_scoped_to_clause(self):
+        """Test a negation in an earlier clause does not suppress the phrase"""
+        for text in ["No, I am having heavy bleeding", "no I have heavy bleeding", "Help! No no, heavy bleeding"]:
+            self.assertEqual(self.matcher.detect(text)['type'], 'severe_bleeding', text)
+        self.assertIsNone(self.matcher.detect("I am no longer having heavy bleeding"))
+
+    def test_real_word_not_corrected(self):
+        """Test a real word differing in its first letters is not snapped to the lexicon"""
+        self.assertIsNone(self.matcher.detect("heavy breeding"))
+
+    def test_misspelling_snapped(self):
+        """Test misspelled words are corrected against the lexicon vocabulary"""
+        match = self.matcher.detect("hemorage")
+        self.assertEqual(match['type'], 'severe_bleeding')
+        self.assertLessEqual(match['confidence'], 0.85)
+
+    def test_far_apart_words_ignored(self):
+        """Test phrase words spread across a long sentence do not match"""
+        self.assertIsNone(self.matcher.detect("heavy rain today so I stayed in and my nose was bleeding"))
+
+    def test_immediate_ranked_first(self):
+        """Test the most urgent emergency comes first"""
+        matches = self.matcher.match("baby not moving and heavy bleeding")
+        self.assertEqual([m['type'] for m in matches], ['severe_bleeding', 'decreased_movement'])
+
+class TestRecallAndLatency(unittest.TestCase):
+    """Test the bundled lexicon against the labelled corpus"""
+
+    def test_recall_corpus(self):
+        """Test recall on STT-style variants with no false alarms"""
+        result = measure_recall(get_emergency_matcher(), load_corpus())
+        self.assertGreaterEqual(result['recall'], 0.95, result['misses'])
+        self.assertEqual(result['false_positives'], [])
+
+    def test_latency_budget(self):
+        """Test p99 per-utterance latency stays under the budget"""
+        stats = run_benchmark(rounds=20)
+        self.assertLess(stats['p99_ms'], stats['budget_ms'])
+
+class TestEmergencyDetectionIntegration(unittest.TestCase):
+    """Test EmergencyDetectionSystem uses the compiled matcher"""
+
+    def setUp(self):
+        with patch('Healthcare.Core.lab_analyzer_emergency.HealthcareDatabase'), \
+             patch('Healthcare.Core.lab_analyzer_emergency.LabResultsAnalyzer'):
+            self.detector = EmergencyDetectionSystem()
+
+    @patch('Healthcare.Core.lab_analyzer_emergency.ShowTextToScreen')
+    @patch('Healthcare.Core.lab_analyzer_emergency.TextToSpeech')
+    def test_stt_variant_detected(self, mock_tts, mock_screen):
+        """Test a reworded report triggers the emergency protocol"""
+        result = self.detector.analyze_emergency_situation("I'm bleeding really heavily")
+
+        self.assertTrue(result['emergency_detected'])
+        self.assertEqual(result['emergency_type'], 'severe_bleeding')
+        self.assertEqual(result['matched_phrase'], 'bleeding heavily')
+        mock_tts.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
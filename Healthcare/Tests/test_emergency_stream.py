@@ -0,0 +1,122 @@
+"""
+J.A.R.V.I.S. Streaming Emergency Monitor Tests
+Incremental scanning of partial speech transcripts and time-to-alert instrumentation
+"""
+
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Core.emergency_stream import EmergencyStreamMonitor
+from Healthcare.Core.emergency_matcher import get_emergency_matcher
+
+def partials(sentence):
+    """Growing prefixes of a sentence, the way interim STT results arrive"""
+    words = sentence.split()
+    return [' '.join(words[:i]) for i in range(1, len(words) + 1)]
+
+class TestEmergencyStreamMonitor(unittest.TestCase):
+    """Test alerts raised from partial transcripts"""
+
+    def setUp(self):
+        self.alerts = []
+        self.alerted = threading.Event()
+
+        def on_alert(match, transcript):
+            self.alerts.append((match['type'], transcript))
+            self.alerted.set()
+
+        self.monitor = EmergencyStreamMonitor(on_alert=on_alert)
+
+    def test_alert_before_end_of_speech(self):
+        """Test an emergency alerts on the partial that completes the phrase"""
+        self.monitor.begin_utterance()
+        raised_on = None
+        for text in partials("please help I am bleeding really heavily and I feel dizzy"):
+            if self.monitor.feed(text) and raised_on is None:
+                raised_on = text
+
+        self.assertEqual(raised_on, "please help I am bleeding really heavily")
+        self.assertTrue(self.alerted.wait(5))
+
+        result = self.monitor.end_of_speech("Please help I am bleeding really heavily and I feel dizzy.")
+        self.assertEqual(result['type'], 'severe_bleeding')
+        self.assertEqual(result['detected_on'], 'partial')
+        self.assertLess(result['time_to_alert_ms'], 0)
+        self.assertTrue(result['confirmed'])
+        self.assertEqual(self.alerts, [('severe_bleeding', raised_on)])
+
+    def test_revised_partials(self):
+        """Test STT revising earlier words is rescanned correctly"""
+        self.monitor.begin_utterance()
+        self.monitor.feed("my daughter")
+        self.monitor.feed("my water")
+        self.assertEqual(self.monitor.feed("my water broke")[0]['type'], 'severe_contractions')
+
+    def test_only_new_words_rescanned(self):
+        """Test each partial scans from the first changed word minus the lookback"""
+        matcher = get_emergency_matcher()
+        self.monitor.begin_utterance()
+        sentence = "so I was telling my sister about the nursery colours and the cot we ordered and then"
+        for text in partials(sentence):
+            self.monitor.feed(text)
+
+        with patch.object(matcher, 'match_tokens', wraps=matcher.match_tokens) as spy:
+            self.monitor.feed(sentence + " heavy bleeding")
+        start = spy.call_args[0][2]
+        self.assertEqual(start, len(matcher.normalize_words(sentence)) - matcher.lookback)
+        self.assertTrue(self.monitor.has_alerted())
+
+    def test_final_text_without_partials(self):
+        """Test STT backends without partials still alert from the final text"""
+        self.monitor.begin_utterance()
+        result = self.monitor.end_of_speech("Baby hasn't moved all day")
+
+        self.assertEqual(result['detected_on'], 'final')
+        self.assertGreaterEqual(result['time_to_alert_ms'], 0)
+        self.assertTrue(self.alerted.wait(5))
+
+    def test_weak_match_not_confirmed(self):
+        """Test a corrected or windowed match still alerts but is not confirmed"""
+        for text in ["bleding heavly", "the bleeding won't ever stop"]:
+            self.monitor.begin_utterance()
+            result = self.monitor.end_of_speech(text)
+            self.assertEqual(result['type'], 'severe_bleeding', text)
+            self.assertFalse(result['confirmed'], text)
+        self.assertTrue(self.alerted.wait(5))
+
+    def test_revised_away_not_confirmed(self):
+        """Test an alert from a partial the final text no longer contains is not confirmed"""
+        self.monitor.begin_utterance()
+        self.monitor.feed("heavy bleeding")
+        result = self.monitor.end_of_speech("heavy breathing after the stairs")
+        self.assertEqual(result['detected_on'], 'partial')
+        self.assertFalse(result['confirmed'])
+
+    def test_one_response_per_utterance(self):
+        """Test repeated and additional emergencies do not re-trigger the response"""
+        self.monitor.begin_utterance()
+        self.monitor.feed("heavy bleeding")
+        self.monitor.feed("heavy bleeding heavy bleeding and my water broke")
+        self.monitor.end_of_speech("Heavy bleeding heavy bleeding and my water broke.")
+        self.alerted.wait(5)
+
+        self.assertEqual(len(self.alerts), 1)
+        self.assertEqual(self.monitor.get_stats()['alerts'], 2)
+
+    def test_no_emergency(self):
+        """Test ordinary speech raises nothing and the next utterance starts clean"""
+        self.monitor.begin_utterance()
+        for text in partials("remind me to take my vitamins"):
+            self.assertEqual(self.monitor.feed(text), [])
+        self.assertIsNone(self.monitor.end_of_speech("Remind me to take my vitamins."))
+        self.assertFalse(self.monitor.has_alerted())
+        self.assertNotIn('time_to_alert_p50_ms', self.monitor.get_stats())
+
+if __name__ == '__main__':
+    unittest.main()
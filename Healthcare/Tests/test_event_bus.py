@@ -0,0 +1,108 @@
+"""
+J.A.R.V.I.S. Event Bus Tests
+Status, mic and response delivery between Main.py and the GUI without file polling
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Frontend.EventBus import EventBus, GetEventBus, TOPIC_STATUS, TOPIC_MIC, TOPIC_RESPONSE
+from Healthcare.Tests.benchmark_idle_cpu import measure_event_bus
+
+class TestEventBus(unittest.TestCase):
+    """Test publish/subscribe and waiting on the event bus"""
+
+    def setUp(self):
+        self.bus = EventBus()
+
+    def test_subscribers_get_changes_only(self):
+        """Test repeated values are not redelivered"""
+        received = []
+        self.bus.subscribe(TOPIC_STATUS, received.append)
+
+        self.assertTrue(self.bus.publish(TOPIC_STATUS, "Thinking..."))
+        self.assertFalse(self.bus.publish(TOPIC_STATUS, "Thinking..."))
+        self.bus.publish(TOPIC_STATUS, "Answering...")
+
+        self.assertEqual(received, ["Thinking...", "Answering..."])
+        self.assertEqual(self.bus.get(TOPIC_STATUS), "Answering...")
+        self.assertEqual(self.bus.stats["unchanged"], 1)
+
+    def test_topics_are_independent(self):
+        """Test a subscriber only sees its own topic"""
+        responses = []
+        self.bus.subscribe(TOPIC_RESPONSE, responses.append)
+        self.bus.publish(TOPIC_STATUS, "Searching...")
+        self.bus.publish(TOPIC_RESPONSE, "Jarvis : Hello")
+
+        self.assertEqual(responses, ["Jarvis : Hello"])
+        self.assertFalse(self.bus.has(TOPIC_MIC))
+        self.assertEqual(self.bus.get(TOPIC_MIC, "False"), "False")
+
+    def test_unsubscribe(self):
+        """Test an unsubscribed callback stops receiving"""
+        received = []
+        unsubscribe = self.bus.subscribe(TOPIC_MIC, received.append)
+        self.bus.publish(TOPIC_MIC, "True")
+        unsubscribe()
+        self.bus.publish(TOPIC_MIC, "False")
+
+        self.assertEqual(received, ["True"])
+
+    def test_failing_subscriber_isolated(self):
+        """Test one broken subscriber does not block the others"""
+        received = []
+
+        def broken(value):
+            raise RuntimeError("widget gone")
+
+        self.bus.subscribe(TOPIC_STATUS, broken)
+        self.bus.subscribe(TOPIC_STATUS, received.append)
+        self.bus.publish(TOPIC_STATUS, "Available...")
+
+        self.assertEqual(received, ["Available..."])
+
+    def test_wait_for_wakes_on_publish(self):
+        """Test a waiting thread wakes as soon as the mic turns on"""
+        self.bus.publish(TOPIC_MIC, "False")
+        woke = []
+
+        def first_thread():
+            self.bus.wait_for(TOPIC_MIC, "True", timeout=5)
+            woke.append(time.perf_counter())
+
+        thread = threading.Thread(target=first_thread)
+        thread.start()
+        time.sleep(0.05)
+        published = time.perf_counter()
+        self.bus.publish(TOPIC_MIC, "True")
+        thread.join(5)
+
+        self.assertLess(woke[0] - published, 0.05)
+
+    def test_wait_for_timeout(self):
+        """Test wait_for gives up after the timeout"""
+        self.assertFalse(self.bus.wait_for(TOPIC_MIC, "True", timeout=0.05))
+
+    def test_shared_bus(self):
+        """Test the accessor returns one bus per process"""
+        self.assertIs(GetEventBus(), GetEventBus())
+
+class TestIdleCpu(unittest.TestCase):
+    """Test the idle loop no longer spins"""
+
+    def test_event_bus_idle_cpu(self):
+        """Test an idle assistant on the bus uses next to no CPU and no file reads"""
+        stats = measure_event_bus(seconds=0.5)
+
+        self.assertEqual(stats["file_reads_per_second"], 0)
+        self.assertLess(stats["cpu_percent"], 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+J.A.R.V.I.S. Import Time Tests
+Cold import of the Healthcare package stays cheap: no heavy libraries, no singletons
+"""
+
+import unittest
+import sys
+import os
+import subprocess
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+HEALTHCARE_MODULES = [
+    'Healthcare.Core.pregnancy_care',
+    'Healthcare.Core.lab_analyzer_emergency',
+    'Healthcare.Core.ai_prescription_parser',
+    'Healthcare.Core.medical_ocr',
+    'Healthcare.Core.medication_scheduler',
+]
+
+# Libraries that belong to first use, not to import
+DEFERRED_MODULES = ['cv2', 'pytesseract', 'PyQt5', 'pygame', 'edge_tts', 'httpx', 'requests']
+
+# Cold import measured at ~0.2s here (was ~1.3s with eager singletons and
+# heavy imports); the cap leaves room for slower machines and CI
+IMPORT_TIME_CAP_SECONDS = 1.0
+
+def cold_import(modules):
+    """Import modules in a fresh interpreter under -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + ', '.join(modules)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise AssertionError(f"Import failed:\n{result.stderr[-2000:]}")
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        timings[fields[2].strip()] = int(fields[1]) / 1_000_000
+    return timings, result.stdout
+
+class TestColdImport(unittest.TestCase):
+    """Test importing Healthcare modules does no first-use work"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.timings, cls.stdout = cold_import(HEALTHCARE_MODULES)
+
+    def test_heavy_libraries_deferred(self):
+        """Test OCR, GUI, audio and HTTP libraries are not imported"""
+        loaded = [name for name in DEFERRED_MODULES if name in self.timings]
+        self.assertEqual(loaded, [])
+
+    def test_no_singletons_created(self):
+        """Test no component is constructed at import"""
+        self.assertNotIn('initialized', self.stdout)
+
+    def test_cold_import_under_cap(self):
+        """Test the top-level Healthcare imports finish under the cap"""
+        total = sum(self.timings[name] for name in HEALTHCARE_MODULES if name in self.timings)
+        self.assertLess(total, IMPORT_TIME_CAP_SECONDS)
+
+class TestLazyAccessors(unittest.TestCase):
+    """Test the shared instances behind the accessors"""
+
+    def test_accessor_returns_shared_instance(self):
+        """Test accessors build once and legacy module attributes still resolve"""
+        from Healthcare.Core import pregnancy_care
+
+        module = pregnancy_care.get_pregnancy_care()
+        self.assertIs(pregnancy_care.get_pregnancy_care(), module)
+        self.assertIs(pregnancy_care.pregnancy_care, module)
+
+    def test_unknown_attribute(self):
+        """Test the module __getattr__ only serves known names"""
+        from Healthcare.Core import medical_ocr
+
+        with self.assertRaises(AttributeError):
+            medical_ocr.no_such_name
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+J.A.R.V.I.S. Intent Classifier Tests
+Local fast path ahead of FirstLayerDMM: command trie, TF-IDF model and LLM deferral
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.IntentClassifier import IntentClassifier, CommandTrie, TfidfCentroidModel, GetIntentClassifier
+from Healthcare.Tests.benchmark_intent_classifier import run_benchmark, measure_accuracy, load_queries, HELDOUT_PATH
+
+class TestCommandTrie(unittest.TestCase):
+    """Test longest-prefix matching of command phrases"""
+
+    def test_longest_prefix_wins(self):
+        """Test the longest phrase a query starts with is chosen"""
+        trie = CommandTrie()
+        trie.add("generate image", "short")
+        trie.add("generate image of", "long")
+
+        self.assertEqual(trie.longest_prefix("generate image of a cat".split()), ("long", 3))
+        self.assertEqual(trie.longest_prefix("generate image cat".split()), ("short", 2))
+        self.assertEqual(trie.longest_prefix("generate a cat".split()), (None, 0))
+
+class TestIntentClassifier(unittest.TestCase):
+    """Test decisions match the FirstLayerDMM format"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = IntentClassifier()
+
+    def test_commands(self):
+        """Test command phrasings become decision strings"""
+        self.assertEqual(self.classifier.classify("Open Chrome."), ["open chrome"])
+        self.assertEqual(self.classifier.classify("generate image of a red fox"), ["generate image a red fox"])
+        self.assertEqual(self.classifier.classify("play"), ["system play"])
+        self.assertEqual(self.classifier.classify("remind me to take my iron tablets"),
+                         ["medication reminder my iron tablets"])
+
+    def test_fillers_stripped(self):
+        """Test wake words and politeness before the command are ignored"""
+        self.assertEqual(self.classifier.classify("hey jarvis, could you please take a screenshot"), ["screenshot"])
+        self.assertEqual(self.classifier.classify("can you open notepad for me"), ["open notepad"])
+
+    def test_multiple_tasks_deferred(self):
+        """Test queries asking for several tasks go to the LLM"""
+        self.assertIsNone(self.classifier.classify("open edge and tell me about bhagat singh"))
+        self.assertIsNone(self.classifier.classify("open facebook, telegram and close whatsapp"))
+
+    def test_conjunction_in_question(self):
+        """Test 'and' inside an ordinary question does not block the model"""
+        self.assertEqual(self.classifier.classify("what is the difference between tcp and udp"),
+                         ["general what is the difference between tcp and udp"])
+
+    def test_general_and_realtime(self):
+        """Test confident questions are labelled general or realtime"""
+        self.assertEqual(self.classifier.classify("how are you doing today"), ["general how are you doing today"])
+        self.assertEqual(self.classifier.classify("who is the prime minister of india"),
+                         ["realtime who is the prime minister of india"])
+
+    def test_low_confidence_deferred(self):
+        """Test queries the model is unsure about go to the LLM"""
+        self.assertIsNone(self.classifier.classify("explain quantum computing"))
+        self.assertIsNone(self.classifier.classify("   "))
+
+    def test_bare_prefixes_anchored(self):
+        """Test short command prefixes only count when the rest of the query fits them"""
+        self.assertEqual(self.classifier.classify("google python tutorials"), ["google search python tutorials"])
+        self.assertEqual(self.classifier.classify("i took my prenatal vitamins"),
+                         ["take medication prenatal vitamins"])
+        self.assertIsNone(self.classifier.classify("google is a company right?"))
+        self.assertIsNone(self.classifier.classify("i took my time"))
+
+    def test_out_of_domain_deferred(self):
+        """Test queries sharing only function words with the training examples go to the LLM"""
+        for query in ["set a reminder at 9pm for my meeting", "remind me to call mom at 5pm",
+                      "exit the program", "turn off the lights"]:
+            self.assertIsNone(self.classifier.classify(query), query)
+
+    def test_stats(self):
+        """Test decided and deferred queries are counted"""
+        classifier = IntentClassifier()
+        classifier.classify("open chrome")
+        classifier.classify("open chrome and close edge")
+
+        stats = classifier.get_stats()
+        self.assertEqual((stats['decided'], stats['deferred']), (1, 1))
+        self.assertEqual(stats['coverage'], 0.5)
+
+    def test_shared_instance(self):
+        """Test the accessor builds the classifier once"""
+        self.assertIs(GetIntentClassifier(), GetIntentClassifier())
+
+class TestTfidfCentroidModel(unittest.TestCase):
+    """Test the linear TF-IDF model"""
+
+    def test_scores_ranked(self):
+        """Test the closest label scores highest and unknown words score zero"""
+        model = TfidfCentroidModel().fit([
+            ("what is the weather", "weather"), ("weather tomorrow", "weather"),
+            ("tell me a joke", "joke"), ("something funny", "joke"),
+        ])
+
+        self.assertEqual(model.scores("weather in paris")[0][0], "weather")
+        self.assertEqual(model.scores("a funny joke")[0][0], "joke")
+        self.assertEqual([score for _, score in model.scores("xyzzy")], [0.0, 0.0])
+
+class TestIntentBenchmark(unittest.TestCase):
+    """Test accuracy and latency on the labelled query set"""
+
+    def test_benchmark(self):
+        """Test local decisions are all correct, cover most queries and take well under 1 ms"""
+        stats = run_benchmark(rounds=20)
+
+        self.assertEqual(stats['wrong'], [])
+        self.assertGreaterEqual(stats['coverage'], 0.75)
+        self.assertLess(stats['p99_ms'], 1.0)
+
+    def test_heldout_precision(self):
+        """Test local decisions stay correct on queries the thresholds were not tuned on"""
+        result = measure_accuracy(IntentClassifier(), load_queries(HELDOUT_PATH))
+        self.assertEqual(result['wrong'], [])
+        self.assertGreaterEqual(result['coverage'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+J.A.R.V.I.S. IPC Channel Tests
+Image generation jobs, status updates and completions over the local IPC channel
+"""
+
+import unittest
+import sys
+import os
+import time
+import threading
+import tempfile
+import subprocess
+import multiprocessing
+from multiprocessing.connection import Client
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.IPC import (ImageJobServer, ImageJobClient, make_message, is_valid_message, LaunchImageGenerator,
+                         IPC_AUTHKEY, IPC_AUTHKEY_ENV)
+
+AUTHKEY = b"test-ipc"
+
+def free_address():
+    if sys.platform == "win32":
+        return rf"\\.\pipe\jarvis-test-{os.getpid()}-{time.perf_counter_ns()}"
+    return os.path.join(tempfile.mkdtemp(), "jobs.sock")
+
+def fake_generate(prompt):
+    if prompt == "fail":
+        raise RuntimeError("quota exceeded")
+    return [f"Data/generated_images/{prompt.replace(' ', '_')}1.png"]
+
+def serve_in_child(address, ready):
+    server = ImageJobServer(handler=fake_generate, address=address, authkey=AUTHKEY)
+    ready.set()
+    server.serve_forever()
+
+class TestMessages(unittest.TestCase):
+    """Test typed message construction"""
+
+    def test_required_fields(self):
+        """Test messages must carry the fields for their kind"""
+        message = make_message("image_job", job_id="1", prompt="a cat")
+        self.assertTrue(is_valid_message(message))
+
+        with self.assertRaises(ValueError):
+            make_message("image_job", job_id="1")
+        with self.assertRaises(ValueError):
+            make_message("launch_missiles", job_id="1")
+        self.assertFalse(is_valid_message("a cat,true"))
+
+class TestImageJobChannel(unittest.TestCase):
+    """Test jobs between a client and a server in this process"""
+
+    def setUp(self):
+        self.server = ImageJobServer(handler=fake_generate, address=free_address(), authkey=AUTHKEY)
+        self.server.start()
+        self.messages = []
+        self.client = ImageJobClient(address=self.server.address, authkey=AUTHKEY,
+                                     on_message=self.messages.append)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def test_job_round_trip(self):
+        """Test a job reports queued, started and completed with its paths"""
+        job_id = self.client.submit("sunset over mountains")
+        job = self.client.wait(job_id, timeout=5)
+
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(job["paths"], ["Data/generated_images/sunset_over_mountains1.png"])
+        kinds = [(m["kind"], m.get("status")) for m in self.messages]
+        self.assertEqual(kinds, [("status", "queued"), ("status", "started"), ("completed", None)])
+
+    def test_job_starts_in_milliseconds(self):
+        """Test a job reaches the generator far faster than the old 1 s poll"""
+        jobs = [self.client.wait(self.client.submit("a cat"), timeout=5) for _ in range(20)]
+        latencies = sorted(job["started_ms"] for job in jobs)
+        self.assertLess(latencies[len(latencies) // 2], 10)
+
+    def test_failure_reported(self):
+        """Test a generator error comes back as a failed completion"""
+        job = self.client.wait(self.client.submit("fail"), timeout=5)
+
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], "quota exceeded")
+        self.assertEqual(self.server.stats["failed"], 1)
+
+    def test_jobs_run_in_order(self):
+        """Test queued jobs complete in submission order"""
+        job_ids = [self.client.submit(f"image {i}") for i in range(5)]
+        for job_id in job_ids:
+            self.assertIsNotNone(self.client.wait(job_id, timeout=5))
+
+        completed = [m["job_id"] for m in self.messages if m["kind"] == "completed"]
+        self.assertEqual(completed, job_ids)
+
+    def test_wrong_authkey_rejected(self):
+        """Test a client without the shared key cannot connect"""
+        with self.assertRaises(Exception):
+            Client(self.server.address, authkey=b"wrong")
+
+    def test_invalid_message_ignored(self):
+        """Test malformed messages do not reach the generator"""
+        conn = Client(self.server.address, authkey=AUTHKEY)
+        conn.send_bytes(b"sunset,true")
+        # A pickle is never unpickled, only rejected
+        conn.send(make_message("image_job", job_id="1", prompt="a cat"))
+        conn.close()
+
+        job = self.client.wait(self.client.submit("a dog"), timeout=5)
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(self.server.stats["rejected"], 2)
+        self.assertEqual(self.server.stats["jobs"], 1)
+
+    @unittest.skipIf(sys.platform == "win32", "Unix domain sockets only")
+    def test_socket_owner_only(self):
+        """Test the socket file is readable and writable by its owner only"""
+        self.assertEqual(os.stat(self.server.address).st_mode & 0o777, 0o600)
+
+class TestSessionKey(unittest.TestCase):
+    """Test the per-session key shared with the launched image process"""
+
+    def test_key_is_random(self):
+        """Test there is no fixed default key"""
+        self.assertNotEqual(IPC_AUTHKEY, b"jarvis-ipc-2025")
+        self.assertGreaterEqual(len(IPC_AUTHKEY), 16)
+
+    @patch('Backend.IPC.subprocess.Popen')
+    def test_key_passed_to_child(self, mock_popen):
+        """Test the launched image process gets the key through its environment"""
+        LaunchImageGenerator()
+        env = mock_popen.call_args.kwargs["env"]
+        self.assertEqual(bytes.fromhex(env[IPC_AUTHKEY_ENV]), IPC_AUTHKEY)
+
+    def test_child_reads_key(self):
+        """Test a process started with the variable uses the key it was given"""
+        key = "00ff" * 8
+        env = dict(os.environ, **{IPC_AUTHKEY_ENV: key})
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.run([sys.executable, "-c", "from Backend.IPC import IPC_AUTHKEY; print(IPC_AUTHKEY.hex())"],
+                                cwd=root, env=env, capture_output=True, text=True, timeout=30)
+        self.assertEqual(output.stdout.strip(), key)
+
+    @unittest.skipIf(sys.platform == "win32", "Unix domain sockets only")
+    def test_stale_socket_replaced(self):
+        """Test a socket file left by a crashed process does not block startup"""
+        import socket
+        address = free_address()
+        leftover = socket.socket(socket.AF_UNIX)
+        leftover.bind(address)
+        leftover.close()
+
+        server = ImageJobServer(handler=fake_generate, address=address, authkey=AUTHKEY)
+        server.start()
+        client = ImageJobClient(address=address, authkey=AUTHKEY)
+        try:
+            job = client.wait(client.submit("a fox"), timeout=5)
+            self.assertEqual(job["status"], "completed")
+        finally:
+            client.close()
+            server.close()
+
+class TestCrossProcess(unittest.TestCase):
+    """Test the channel between two processes"""
+
+    def test_job_in_other_process(self):
+        """Test a job submitted here runs in a separate image process"""
+        address = free_address()
+        ready = multiprocessing.Event()
+        process = multiprocessing.Process(target=serve_in_child, args=(address, ready), daemon=True)
+        process.start()
+        try:
+            self.assertTrue(ready.wait(10))
+            client = ImageJobClient(address=address, authkey=AUTHKEY)
+            job = client.wait(client.submit("a lighthouse"), timeout=10)
+            client.close()
+
+            self.assertEqual(job["status"], "completed")
+            self.assertLess(job["started_ms"], 20)
+        finally:
+            process.terminate()
+            process.join(5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+J.A.R.V.I.S. Lab Re-analysis Tests
+Versioned lab rules and the resumable background re-evaluation job
+"""
+
+import unittest
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Database.models import HealthcareDatabase
+from Healthcare.Core.lab_rules import DEFAULT_LAB_RULES_PATH, get_lab_rule_engine
+from Healthcare.Core.lab_reanalysis import LabReanalysisJob, OCR_TEST_TYPE
+
+class TestLabReanalysisJob(unittest.TestCase):
+    """Test re-evaluation of results stored under older rules"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'healthcare.db')
+        self.db = HealthcareDatabase(self.db_path)
+
+        # New rules: hemoglobin below 12.0 is now low
+        with open(DEFAULT_LAB_RULES_PATH, 'r', encoding='utf-8') as file:
+            rules = json.load(file)
+        rules['version'] = 'test-v2'
+        rules['ranges']['hemoglobin']['default']['min'] = 12.0
+        rules['ranges']['hemoglobin'].pop('trimesters', None)
+        self.rules_path = os.path.join(self.temp_dir.name, 'lab_rules.json')
+        with open(self.rules_path, 'w', encoding='utf-8') as file:
+            json.dump(rules, file)
+
+        self.old_version = get_lab_rule_engine().version
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def add_result(self, hemoglobin, rule_version, test_type='Lab Analysis'):
+        return self.db.add_lab_result(
+            patient_id=1, test_date='2026-05-01', test_type=test_type,
+            results={'hemoglobin': hemoglobin}, urgency_level='normal',
+            gestational_week=24, rule_version=rule_version
+        )
+
+    def read_row(self, row_id):
+        with sqlite3.connect(self.db_path) as conn:
+            flagged, urgency, version = conn.execute(
+                'SELECT flagged_values, urgency_level, rule_version FROM lab_results WHERE id = ?', (row_id,)
+            ).fetchone()
+        return (self.db.encryption.decrypt_json(flagged) if flagged else {}), urgency, version
+
+    def job(self, **kwargs):
+        kwargs.setdefault('chunk_size', 2)
+        kwargs.setdefault('max_workers', 2)
+        return LabReanalysisJob(self.db_path, rules_path=self.rules_path, **kwargs)
+
+    def test_stale_rows_reanalyzed_in_process_pool(self):
+        """Test outdated rows get new flags and version; current rows are left alone"""
+        stale = [self.add_result(11.5, self.old_version) for _ in range(5)]
+        legacy = self.add_result(11.5, None)
+        ocr_row = self.add_result(11.5, self.old_version, test_type=OCR_TEST_TYPE)
+        severe_ocr_row = self.add_result(8.5, self.old_version, test_type=OCR_TEST_TYPE)
+        current = self.add_result(11.5, 'test-v2')
+
+        stats = self.job().run()
+
+        self.assertTrue(stats['completed'])
+        self.assertEqual(stats['processed'], 8)
+        for row_id in stale + [legacy]:
+            flagged, urgency, version = self.read_row(row_id)
+            self.assertEqual(flagged['hemoglobin']['status'], 'low')
+            self.assertEqual(version, 'test-v2')
+
+        flagged, urgency, _ = self.read_row(ocr_row)
+        self.assertEqual(flagged['hemoglobin'], "Below normal range (11.5 < 12 g/dL)")
+        # Just below the normal range: flagged, but not critical
+        self.assertEqual(urgency, 'normal')
+        self.assertEqual(self.read_row(severe_ocr_row)[1], 'critical')
+
+        self.assertEqual(self.read_row(current)[0], {})
+
+    def test_resumes_after_interruption(self):
+        """Test a stopped job picks up after its last committed chunk"""
+        for _ in range(7):
+            self.add_result(11.5, self.old_version)
+
+        first = self.job(max_workers=0).run(max_chunks=2)
+        self.assertEqual(first['processed'], 4)
+        self.assertFalse(first['completed'])
+
+        job = self.job(max_workers=0)
+        self.assertEqual(job.get_progress()['pending'], 3)
+        second = job.run()
+
+        self.assertEqual(second['processed'], 3)
+        self.assertTrue(second['completed'])
+        progress = job.get_progress()
+        self.assertEqual(progress['processed'], 7)
+        self.assertIsNotNone(progress['completed_at'])
+
+    def test_nothing_to_do_when_current(self):
+        """Test a job over up-to-date rows reads nothing"""
+        self.add_result(12.5, 'test-v2')
+
+        stats = self.job().run()
+        self.assertEqual(stats['processed'], 0)
+        self.assertTrue(stats['completed'])
+
+    def test_unreadable_rows_skipped(self):
+        """Test rows that fail to decrypt are counted and do not stall the job"""
+        good = self.add_result(11.5, self.old_version)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO lab_results (patient_id, results, rule_version) VALUES (1, 'garbage', 'old')")
+            conn.commit()
+
+        stats = self.job(max_workers=0).run()
+
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(self.read_row(good)[2], 'test-v2')
+
+    def test_background_run(self):
+        """Test the job runs on a background thread"""
+        for _ in range(3):
+            self.add_result(11.5, self.old_version)
+
+        job = self.job(max_workers=0)
+        job.start_background().join(30)
+
+        self.assertTrue(job.last_run['completed'])
+        self.assertEqual(job.get_progress()['pending'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+J.A.R.V.I.S. Lab Rule Engine Tests
+Declarative, gestational-week aware lab ranges and vectorized condition rules
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Core.lab_rules import LabRuleEngine, get_lab_rule_engine, lab_urgency, RISK_LEVELS, LAB_ROW_DTYPE
+from Healthcare.Core.lab_analyzer_emergency import LabResultsAnalyzer, get_health_risk_assessment
+from Healthcare.Tests.benchmark_lab_population import generate_lab_rows, run_benchmark
+
+class TestLabRuleEngine(unittest.TestCase):
+    """Test the bundled rules and the compiled predicates"""
+
+    def setUp(self):
+        self.engine = get_lab_rule_engine()
+
+    def test_trimester_specific_ranges(self):
+        """Test hemoglobin 10.7 is low in the first trimester but normal in the second"""
+        first, second = self.engine.evaluate_batch([{'hemoglobin': 10.7}] * 2, [10, 20])
+
+        self.assertEqual(first['flagged_values']['hemoglobin']['status'], 'low')
+        self.assertIn('hemoglobin', second['normal_values'])
+        self.assertEqual(first['trimester'], 1)
+        self.assertEqual(second['trimester'], 2)
+
+    def test_condition_explanations(self):
+        """Test alerts explain which indicators fired and with what values"""
+        analysis = self.engine.evaluate_batch([{
+            'blood_pressure_systolic': 150, 'blood_pressure_diastolic': 95, 'protein_urine': 350
+        }])[0]
+
+        alert = next(a for a in analysis['critical_alerts'] if a['condition'] == 'preeclampsia')
+        self.assertEqual(alert['urgency'], 'immediate')
+        self.assertEqual(len(alert['explanation']), 3)
+        self.assertIn('(measured 150)', alert['explanation'][0])
+
+    def test_urgency_from_severe_flags_only(self):
+        """Test a mildly high blood pressure is flagged but not critical; a critical value is"""
+        mild, severe, condition = self.engine.evaluate_batch([
+            {'blood_pressure_systolic': 130, 'blood_pressure_diastolic': 85},
+            {'blood_pressure_systolic': 150},
+            {'hemoglobin': 8.5},
+        ])
+
+        self.assertIn('blood_pressure_systolic', mild['flagged_values'])
+        self.assertEqual(lab_urgency(mild), 'normal')
+        self.assertEqual(lab_urgency(severe), 'critical')
+        self.assertEqual(lab_urgency(condition), 'critical')
+
+    def test_all_indicators_required(self):
+        """Test an 'all' condition does not fire on a partial match or missing values"""
+        analysis = self.engine.evaluate_batch([{'blood_pressure_systolic': 150}])[0]
+        self.assertEqual(analysis['critical_alerts'], [])
+
+    def test_batch_matches_single_panel_evaluation(self):
+        """Test one vectorized batch gives the same answers as panel-by-panel evaluation"""
+        rng = np.random.default_rng(7)
+        panels = [{
+            'hemoglobin': float(rng.uniform(7, 15)),
+            'glucose_fasting': float(rng.uniform(60, 140)),
+            'blood_pressure_systolic': float(rng.uniform(90, 170)),
+            'blood_pressure_diastolic': float(rng.uniform(55, 110)),
+            'protein_urine': float(rng.uniform(0, 500)),
+        } for _ in range(200)]
+        weeks = [int(w) for w in rng.integers(4, 41, size=200)]
+
+        batch = self.engine.evaluate_batch(panels, weeks)
+        for panel, week, analysis in zip(panels, weeks, batch):
+            self.assertEqual(analysis, self.engine.evaluate_batch([panel], week)[0])
+
+    def test_week_overrides_and_any_rules(self):
+        """Test explicit week spans override trimesters and 'any' conditions"""
+        engine = LabRuleEngine(rules={
+            'trimesters': {'1': {'from_week': 0, 'to_week': 13}, '2': {'from_week': 14, 'to_week': 27}},
+            'ranges': {'platelets': {
+                'unit': 'x10^3/uL', 'default': {'min': 150, 'max': 400},
+                'trimesters': {'2': {'min': 140}},
+                'weeks': [{'from_week': 26, 'to_week': 27, 'min': 120}]
+            }},
+            'conditions': {'severe_hypertension': {
+                'match': 'any', 'indicators': ['sbp >= 160', 'dbp >= 110'], 'min_week': 20
+            }}
+        })
+
+        self.assertEqual(engine.ranges_for_week(5)['platelets']['min'], 150)
+        self.assertEqual(engine.ranges_for_week(20)['platelets']['min'], 140)
+        self.assertEqual(engine.ranges_for_week(27)['platelets']['min'], 120)
+
+        early, late = engine.evaluate_batch([{'dbp': 112}] * 2, [12, 30])
+        self.assertEqual(early['critical_alerts'], [])
+        self.assertEqual(late['critical_alerts'][0]['explanation'], ['dbp >= 110 (measured 112)'])
+
+    def test_invalid_rules_rejected(self):
+        """Test malformed indicators fail loudly at load time"""
+        with self.assertRaises(ValueError):
+            LabRuleEngine(rules={'conditions': {'bad': {'indicators': ['hemoglobin is low']}}})
+
+class TestAnalyzerUsesRules(unittest.TestCase):
+    """Test LabResultsAnalyzer delegates to the rule engine"""
+
+    def setUp(self):
+        with patch('Healthcare.Core.lab_analyzer_emergency.HealthcareDatabase'):
+            with patch('Healthcare.Core.lab_analyzer_emergency.MedicalOCR'):
+                self.analyzer = LabResultsAnalyzer()
+
+    def test_gestational_week_used(self):
+        """Test analyze_lab_results passes the gestational week to the ranges"""
+        self.analyzer.medical_ocr.parse_lab_results.return_value = {
+            'success': True, 'results': {'hemoglobin': 10.7}
+        }
+
+        first_trimester = self.analyzer.analyze_lab_results('lab.jpg', gestational_week=8)
+        second_trimester = self.analyzer.analyze_lab_results('lab.jpg', gestational_week=22)
+
+        self.assertIn('hemoglobin', first_trimester['analysis']['flagged_values'])
+        self.assertIn('hemoglobin', second_trimester['analysis']['normal_values'])
+
+    def test_analyze_lab_panels(self):
+        """Test batch analysis returns alerts and recommendations per panel"""
+        results = self.analyzer.analyze_lab_panels(
+            [{'hemoglobin': 8.5}, {'hemoglobin': 12.5, 'glucose_fasting': 85}], [30, 30]
+        )
+
+        self.assertTrue(results[0]['requires_immediate_attention'])
+        self.assertEqual(results[0]['critical_alerts'][0]['condition'], 'severe_anemia')
+        self.assertFalse(results[1]['requires_immediate_attention'])
+        self.assertIn("Continue current prenatal care routine.", results[1]['recommendations'])
+
+class TestPopulationScreening(unittest.TestCase):
+    """Test columnar screening from long-format lab rows"""
+
+    def setUp(self):
+        self.engine = get_lab_rule_engine()
+
+    def test_matches_single_patient_assessment(self):
+        """Test vectorized risk levels agree with get_health_risk_assessment"""
+        records = generate_lab_rows(1500, seed=3)
+        result = self.engine.evaluate_population_records(records)
+
+        panels = {}
+        for row in records:
+            panels.setdefault(int(row['patient_id']), {})[str(row['test'])] = float(row['value'])
+
+        for index, patient_id in enumerate(result['patient_ids']):
+            week = int(result['gestational_weeks'][index])
+            expected = get_health_risk_assessment(panels[int(patient_id)], week)
+            self.assertEqual(RISK_LEVELS[result['risk_code'][index]], expected['risk_level'])
+            self.assertEqual(result['flagged_count'][index], expected['flagged_count'])
+
+    def test_last_row_wins_and_latest_week(self):
+        """Test repeated tests keep the last value and panels use the latest week"""
+        result = self.engine.evaluate_population(
+            patient_ids=[7, 7, 7, 9],
+            tests=['hemoglobin', 'hemoglobin', 'unknown_test', 'glucose_fasting'],
+            values=[8.0, 10.7, 1.0, 99.0],
+            gestational_weeks=[8, 22, 22, 30]
+        )
+
+        hemoglobin = result['fields'].index('hemoglobin')
+        self.assertEqual(list(result['patient_ids']), [7, 9])
+        self.assertEqual(result['values'][0, hemoglobin], 10.7)
+        self.assertEqual(result['gestational_weeks'][0], 22)
+        self.assertFalse(result['low'][0, hemoglobin])  # 10.7 is normal in the second trimester
+        self.assertEqual(RISK_LEVELS[result['risk_code'][1]], 'high')  # glucose > 92
+
+    def test_structured_records(self):
+        """Test the structured-array entry point"""
+        records = np.array([(1, 'hemoglobin', 8.5, 30)], dtype=LAB_ROW_DTYPE)
+        result = self.engine.evaluate_population_records(records)
+
+        severe_anemia = result['condition_names'].index('severe_anemia')
+        self.assertTrue(result['conditions'][0, severe_anemia])
+        self.assertTrue(result['severe'][0, result['fields'].index('hemoglobin')])
+
+    def test_benchmark_throughput(self):
+        """Test the columnar path outpaces per-panel evaluation"""
+        stats = run_benchmark(100_000, sample_panels=500)
+        self.assertEqual(stats['rows'], 100_000)
+        self.assertGreater(stats['speedup'], 5)
+
+if __name__ == '__main__':
+    unittest.main()
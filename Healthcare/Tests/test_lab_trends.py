@@ -0,0 +1,213 @@
+"""
+J.A.R.V.I.S. Lab Trend Store Tests
+Indexed per-test lab values, rolling trend statistics and trajectory alerts
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Database.models import HealthcareDatabase
+from Healthcare.Database.lab_trends import RollingWindow
+from Healthcare.Core.lab_analyzer_emergency import LabResultsAnalyzer
+from Healthcare.Core.medical_ocr import MedicalOCR
+
+START = datetime(2026, 3, 2, 9, 0)
+
+class TestRollingWindow(unittest.TestCase):
+    """Test the incremental window statistics"""
+
+    def test_slope_mean_and_extremes(self):
+        """Test running sums and monotonic deques match a direct computation"""
+        window = RollingWindow(window_days=14)
+        for day, value in enumerate([100, 104, 102, 108, 110]):
+            window.add(START + timedelta(days=day), value)
+
+        self.assertEqual(len(window), 5)
+        self.assertAlmostEqual(window.mean(), 104.8)
+        self.assertAlmostEqual(window.slope_per_day(), 2.4)
+        self.assertEqual(window.minimum()['value'], 100)
+        self.assertEqual(window.maximum()['value'], 110)
+
+    def test_old_points_evicted(self):
+        """Test points older than the window drop out of every statistic"""
+        window = RollingWindow(window_days=7)
+        window.add(START, 150)
+        window.add(START + timedelta(days=10), 110)
+        window.add(START + timedelta(days=12), 114)
+
+        self.assertEqual(len(window), 2)
+        self.assertEqual(window.maximum()['value'], 114)
+        self.assertAlmostEqual(window.slope_per_day(), 2.0)
+
+class TestLabTrendStore(unittest.TestCase):
+    """Test the lab_values side store behind HealthcareDatabase"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = HealthcareDatabase(os.path.join(self.temp_dir.name, 'healthcare.db'))
+        self.trends = self.db.lab_trends
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def add_week(self, week, **values):
+        return self.db.add_lab_result(
+            patient_id=1, test_date=(START + timedelta(weeks=week)).strftime('%Y-%m-%d'),
+            test_type='Lab Analysis', results=values, gestational_week=20 + week
+        )
+
+    def test_add_lab_result_indexes_values(self):
+        """Test numeric values of a stored panel land in the trend store"""
+        self.add_week(0, hemoglobin=11.8, blood_pressure='120/80', blood_pressure_systolic=120)
+
+        self.assertEqual(self.trends.get_tests(1), ['blood_pressure_systolic', 'hemoglobin'])
+        latest = self.trends.get_latest(1, 'hemoglobin')
+        self.assertEqual(latest['value'], 11.8)
+        self.assertEqual(latest['gestational_week'], 20)
+
+    def test_values_encrypted_at_rest(self):
+        """Test stored values are not readable without the key"""
+        self.add_week(0, hemoglobin=11.8)
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            stored = conn.execute('SELECT value FROM lab_values').fetchone()[0]
+        self.assertNotIn('11.8', stored)
+
+    def test_range_query_uses_index(self):
+        """Test series range queries are index seeks, not table scans"""
+        for week in range(6):
+            self.add_week(week, hemoglobin=12.0 - week * 0.1)
+
+        series = self.trends.get_series(1, 'hemoglobin', '2026-03-16', '2026-03-30')
+        self.assertEqual([round(p['value'], 1) for p in series], [11.8, 11.7, 11.6])
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            plan = ' '.join(str(row) for row in conn.execute('''
+                EXPLAIN QUERY PLAN SELECT measured_at, value FROM lab_values
+                WHERE patient_id = 1 AND test_name = 'hemoglobin' AND measured_at >= '2026-03-16'
+            '''))
+        self.assertIn('idx_lab_values_series', plan)
+
+    def test_series_stats_are_incremental(self):
+        """Test whole-series slope comes from running sums"""
+        for week in range(4):
+            self.add_week(week, blood_pressure_systolic=110 + 3 * week)
+
+        stats = self.trends.get_series_stats(1, 'blood_pressure_systolic')
+        self.assertEqual(stats['count'], 4)
+        self.assertAlmostEqual(stats['slope_per_week'], 3.0)
+        self.assertAlmostEqual(stats['mean'], 114.5)
+
+    def test_backfill_from_existing_results(self):
+        """Test panels stored before the trend store existed can be copied in once"""
+        self.add_week(0, hemoglobin=11.8)
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.execute('DELETE FROM lab_values')
+            conn.execute('DELETE FROM lab_value_stats')
+
+        self.assertEqual(self.trends.backfill_from_lab_results(), 1)
+        self.assertEqual(self.trends.backfill_from_lab_results(), 0)
+        self.assertEqual(self.trends.get_latest(1, 'hemoglobin')['value'], 11.8)
+
+    def test_older_database_backfilled_on_open(self):
+        """Test opening a database from before the trend store copies its panels in"""
+        self.add_week(0, hemoglobin=11.8)
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.execute('DROP TABLE lab_values')
+            conn.execute('DROP TABLE lab_value_stats')
+
+        reopened = HealthcareDatabase(self.db.db_path)
+        self.assertEqual(reopened.lab_trends.get_latest(1, 'hemoglobin')['value'], 11.8)
+
+    def test_lab_dates_normalized(self):
+        """Test common date formats are stored as ISO and junk is rejected before writing"""
+        result_id = self.db.add_lab_result(patient_id=1, test_date='03/15/2026', test_type='Lab Analysis',
+                                           results={'hemoglobin': 11.8})
+        with sqlite3.connect(self.db.db_path) as conn:
+            stored = conn.execute('SELECT test_date FROM lab_results WHERE id = ?', (result_id,)).fetchone()[0]
+        self.assertEqual(stored, '2026-03-15')
+        self.assertEqual(self.trends.get_latest(1, 'hemoglobin')['measured_at'][:10], '2026-03-15')
+
+        with self.assertRaises(ValueError):
+            self.db.add_lab_result(patient_id=1, test_date='last tuesday', test_type='Lab Analysis',
+                                   results={'hemoglobin': 11.0})
+        with sqlite3.connect(self.db.db_path) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM lab_results').fetchone()[0], 1)
+
+    def test_trend_failure_keeps_result(self):
+        """Test a trend store error is logged without failing the insert"""
+        with patch.object(self.trends, 'record_panel', side_effect=RuntimeError("disk full")):
+            result_id = self.add_week(0, hemoglobin=11.8)
+
+        self.assertIsNotNone(result_id)
+        self.assertEqual(self.trends.get_tests(1), [])
+        # The next backfill picks the panel up
+        self.assertEqual(self.trends.backfill_from_lab_results(), 1)
+
+class TestTrajectoryAlerts(unittest.TestCase):
+    """Test LabResultsAnalyzer trajectory rules over the trend store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        # Nothing may open the tracked Healthcare/Database/healthcare.db
+        with patch('Healthcare.Core.lab_analyzer_emergency.HealthcareDatabase'), \
+             patch('Healthcare.Core.lab_analyzer_emergency.MedicalOCR'):
+            self.analyzer = LabResultsAnalyzer()
+        self.analyzer.healthcare_db = HealthcareDatabase(os.path.join(self.temp_dir.name, 'healthcare.db'))
+        self.trends = self.analyzer.healthcare_db.lab_trends
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rising_systolic_flagged(self):
+        """Test systolic up 15 mmHg in 3 weeks raises a trajectory alert"""
+        for week, systolic in enumerate([118, 121, 127, 133]):
+            self.trends.record_value(1, 'blood_pressure_systolic', systolic, START + timedelta(weeks=week))
+
+        alerts = self.analyzer.check_lab_trajectories(1)
+
+        self.assertEqual([a['condition'] for a in alerts], ['rising_systolic'])
+        self.assertIn('up 15 mmHg in 21 days', alerts[0]['explanation'])
+        self.assertGreater(alerts[0]['slope_per_week'], 0)
+
+    def test_analyzed_panel_stored_once(self):
+        """Test analyzing a lab image stores one result and one trend point per value"""
+        with patch('Healthcare.Core.medical_ocr.HealthcareDatabase'):
+            self.analyzer.medical_ocr = MedicalOCR()
+        self.analyzer.medical_ocr.healthcare_db = self.analyzer.healthcare_db
+        text = "Hemoglobin: 12.5 g/dl\nBlood Pressure: 120/80\nGlucose: 95 mg/dl"
+
+        with patch.object(self.analyzer.medical_ocr, 'extract_text_from_image', return_value=text):
+            result = self.analyzer.analyze_lab_results('labs.jpg')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(len(self.trends.get_series(1, 'blood_pressure_systolic')), 1)
+        with sqlite3.connect(self.analyzer.healthcare_db.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM lab_results").fetchone()[0], 1)
+
+    def test_slow_or_old_changes_ignored(self):
+        """Test changes spread beyond the window do not alert"""
+        for week, systolic in enumerate([110, 114, 118, 122, 126, 130]):
+            self.trends.record_value(1, 'blood_pressure_systolic', systolic, START + timedelta(weeks=week))
+
+        self.assertEqual(self.analyzer.check_lab_trajectories(1), [])
+
+    def test_falling_hemoglobin(self):
+        """Test a falling rule fires on drops, not rises"""
+        for week, hemoglobin in enumerate([12.6, 12.0, 11.0]):
+            self.trends.record_value(1, 'hemoglobin', hemoglobin, START + timedelta(weeks=2 * week))
+
+        alerts = self.analyzer.check_lab_trajectories(1)
+        self.assertEqual(alerts[0]['condition'], 'falling_hemoglobin')
+        self.assertIn('down 1.6 g/dL', alerts[0]['explanation'])
+
+if __name__ == '__main__':
+    unittest.main()
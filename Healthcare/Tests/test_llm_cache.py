@@ -0,0 +1,158 @@
+"""
+J.A.R.V.I.S. LLM Parse Cache Tests
+Cache hits, coalescing and eviction for AI prescription parsing, against a local fake LLM
+"""
+
+import unittest
+import sys
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Healthcare.Database.encryption import HealthcareEncryption
+from Healthcare.Core.llm_cache import LLMParseCache
+from Healthcare.Core.ai_prescription_parser import AIPrescriptionParser
+from Healthcare.Tests.fake_llm_server import FakeLLMServer
+
+class TestLLMParseCache(unittest.TestCase):
+    """Test the cache on its own"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.encryption = HealthcareEncryption("test_cache_key")
+        self.cache = LLMParseCache(os.path.join(self.temp_dir.name, 'cache.db'), self.encryption)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_near_identical_text_shares_key(self):
+        """Test whitespace, case and OCR noise characters don't change the key"""
+        key1 = self.cache.make_key("Amoxicillin 500mg\nTwice daily", "gpt", "v1")
+        key2 = self.cache.make_key("  amoxicillin   500mg |\n\ntwice DAILY ", "gpt", "v1")
+        self.assertEqual(key1, key2)
+
+    def test_model_and_prompt_version_in_key(self):
+        """Test changing the model or prompt version misses the cache"""
+        key = self.cache.make_key("Iron 65mg", "gpt", "v1")
+        self.assertNotEqual(key, self.cache.make_key("Iron 65mg", "gpt-4", "v1"))
+        self.assertNotEqual(key, self.cache.make_key("Iron 65mg", "gpt", "v2"))
+
+    def test_entries_encrypted_at_rest(self):
+        """Test cached payloads are not stored in plaintext"""
+        self.cache.put("key", {"medications": [{"name": "Labetalol"}]})
+
+        with sqlite3.connect(self.cache.db_path) as conn:
+            payload = conn.execute('SELECT payload FROM llm_parse_cache').fetchone()[0]
+
+        self.assertNotIn("Labetalol", payload)
+        self.assertEqual(self.cache.get("key")['medications'][0]['name'], "Labetalol")
+
+    def test_ttl_expiry(self):
+        """Test expired entries are dropped"""
+        self.cache.ttl_seconds = 0.05
+        self.cache.put("key", {"medications": []})
+        time.sleep(0.1)
+
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(self.cache.get_stats()['expired'], 1)
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted beyond max_entries"""
+        self.cache.max_entries = 2
+        self.cache.put("a", {"v": 1})
+        time.sleep(0.01)
+        self.cache.put("b", {"v": 2})
+        time.sleep(0.01)
+        self.cache.get("a")  # "b" is now least recently used
+        time.sleep(0.01)
+        self.cache.put("c", {"v": 3})
+
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+
+    def test_errors_are_not_cached(self):
+        """Test a failed computation is retried on the next call"""
+        def failing():
+            raise RuntimeError("LLM unavailable")
+
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_compute("key", failing)
+
+        self.assertEqual(self.cache.get_or_compute("key", lambda: {"ok": True}), {"ok": True})
+
+class TestParserCaching(unittest.TestCase):
+    """Test AIPrescriptionParser against a local fake LLM server"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.server = FakeLLMServer(delay=0.2).start()
+
+        with patch('Healthcare.Core.ai_prescription_parser.HealthcareDatabase'), \
+             patch('Healthcare.Core.ai_prescription_parser.MedicalOCR'):
+            self.parser = AIPrescriptionParser()
+
+        self.parser.llm_base_url = self.server.base_url
+        self.parser.parse_cache = LLMParseCache(
+            os.path.join(self.temp_dir.name, 'cache.db'), HealthcareEncryption("test_cache_key")
+        )
+
+    def tearDown(self):
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def test_reparse_served_from_cache(self):
+        """Test re-parsing the same prescription does not call the LLM again"""
+        first = self.parser._parse_with_openai("Prenatal Vitamins\n1 tablet once daily")
+        second = self.parser._parse_with_openai("prenatal  vitamins\n1 tablet ONCE daily")
+
+        self.assertEqual(first, second)
+        self.assertEqual(first['medications'][0]['name'], "Prenatal Vitamins")
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(self.parser.parse_cache.get_stats()['hits'], 1)
+
+    def test_concurrent_requests_coalesce(self):
+        """Test concurrent identical parses share one LLM call"""
+        results = []
+
+        def parse():
+            results.append(self.parser._parse_with_openai("Iron Supplement 65mg every evening"))
+
+        threads = [threading.Thread(target=parse) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(self.server.request_count, 1)
+        stats = self.parser.parse_cache.get_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'] + stats['coalesced'], 4)
+        self.assertEqual(stats['hit_rate'], 0.8)
+
+    def test_results_are_independent_copies(self):
+        """Test callers can mutate results without corrupting the cache"""
+        first = self.parser._parse_with_openai("Folic Acid 5mg once daily")
+        first['medications'][0]['name'] = "Changed"
+
+        second = self.parser._parse_with_openai("Folic Acid 5mg once daily")
+        self.assertEqual(second['medications'][0]['name'], "Prenatal Vitamins")
+
+    def test_llm_failure_falls_back_to_rules(self):
+        """Test server errors fall back to rule-based parsing and are not cached"""
+        self.server.fail_next = 1
+
+        result = self.parser._parse_with_openai("Amoxicillin 500mg twice daily")
+        self.assertEqual(result['medications'][0]['name'], "Amoxicillin")
+        self.assertEqual(self.parser.parse_cache.get_stats()['entries'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+J.A.R.V.I.S. Realtime Search Concurrency Tests
+Parallel realtime queries against a fake Groq client: each prompt carries only
+its own search results, and a failed query leaves nothing behind
+"""
+
+import unittest
+import sys
+import os
+import copy
+import time
+import tempfile
+import threading
+from types import SimpleNamespace
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import Backend.ChatStore
+import Backend.ContextWindow
+import Backend.RealtimeSearchEngine as engine
+from Backend.ChatStore import ChatStore
+from Backend.ContextWindow import ContextWindowBuilder
+
+RESULT_PREFIX = "The search results are: "
+
+def fake_search(query):
+    time.sleep(0.005)
+    return f"{RESULT_PREFIX}<{query}>"
+
+class FakeGroqClient:
+    """
+    Stands in for groq.Groq: streams back the search results it was given,
+    a few characters per chunk, so concurrent answers interleave.
+    """
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.prompts = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, stream=False, **kwargs):
+        with self._lock:
+            self.prompts.append(copy.deepcopy(messages))
+        results = [m["content"][len(RESULT_PREFIX):] for m in messages
+                   if m["role"] == "system" and m["content"].startswith(RESULT_PREFIX)]
+        return self._stream("Found " + " ".join(results) + ".</s>")
+
+    def _stream(self, answer):
+        for i in range(0, len(answer), 4):
+            if self.fail_on and self.fail_on in answer and i > 8:
+                raise ConnectionError("stream dropped")
+            time.sleep(0.001)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=answer[i:i + 4]))])
+
+class TestRealtimeConcurrency(unittest.TestCase):
+    """Test RealtimeSearchEngine called from many threads"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ChatStore(path=os.path.join(self.temp_dir.name, 'ChatLog.jsonl'), legacy_path=None)
+        self.client = FakeGroqClient()
+        self.system_before = copy.deepcopy(engine.SystemChatBot)
+
+        for patcher in [mock.patch.object(Backend.ChatStore, '_chat_store', self.store),
+                        mock.patch.object(Backend.ContextWindow, '_context_window', ContextWindowBuilder()),
+                        mock.patch.object(engine, '_client', self.client),
+                        mock.patch.object(engine, 'GoogleSearch', fake_search)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_parallel(self, queries, workers=16):
+        def ask(query):
+            try:
+                return engine.RealtimeSearchEngine(query)
+            except ConnectionError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(queries, pool.map(ask, queries)))
+
+    def test_parallel_queries_isolated(self):
+        """Test every answer and prompt holds its own search result and no other"""
+        queries = [f"query {i}" for i in range(64)]
+        answers = self.run_parallel(queries)
+
+        for query, answer in answers.items():
+            self.assertEqual(answer, f"Found <{query}>.")
+        self.assertEqual(len(self.client.prompts), 64)
+        for prompt in self.client.prompts:
+            results = [m for m in prompt if m["content"].startswith(RESULT_PREFIX)]
+            self.assertEqual(len(results), 1)
+        self.assertEqual(engine.SystemChatBot, self.system_before)
+
+    def test_turns_logged_in_pairs(self):
+        """Test each question is logged right before its own answer"""
+        self.run_parallel([f"query {i}" for i in range(32)])
+
+        log = self.store.read_all()
+        self.assertEqual(len(log), 64)
+        for question, answer in zip(log[::2], log[1::2]):
+            self.assertEqual((question["role"], answer["role"]), ("user", "assistant"))
+            self.assertEqual(answer["content"], f"Found <{question['content']}>.")
+
+    def test_failed_query_leaks_nothing(self):
+        """Test a query failing mid-stream leaves no trace in later prompts or the log"""
+        self.client.fail_on = "broken"
+        queries = ["broken query"] + [f"query {i}" for i in range(15)]
+        answers = self.run_parallel(queries)
+        self.assertIsInstance(answers["broken query"], ConnectionError)
+
+        self.client.fail_on = None
+        self.client.prompts.clear()
+        self.assertEqual(engine.RealtimeSearchEngine("after"), "Found <after>.")
+
+        self.assertEqual(engine.SystemChatBot, self.system_before)
+        self.assertNotIn("broken", str(self.client.prompts[0][:-1]))
+        self.assertNotIn("broken query", [m["content"] for m in self.store.read_all()])
+
+    def test_no_results(self):
+        """Test an empty search returns a notice without calling the model"""
+        with mock.patch.object(engine, 'GoogleSearch', lambda query: "No results found."):
+            answer = engine.RealtimeSearchEngine("asdf qwer")
+
+        self.assertIn("couldn't find", answer)
+        self.assertEqual(self.client.prompts, [])
+        self.assertEqual(len(self.store), 0)
+
+if __name__ == '__main__':
+    unittest.main()
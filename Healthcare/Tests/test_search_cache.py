@@ -0,0 +1,157 @@
+"""
+J.A.R.V.I.S. Search Cache Tests
+Freshness tiers, stale-while-revalidate refresh, LRU eviction and hit counters for
+cached realtime search results
+"""
+
+import unittest
+import sys
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.SearchCache import SearchCache, classify_query
+
+class FakeSearch:
+    """Counts searches and returns a numbered result each time"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, query):
+        self.release.wait(5)
+        time.sleep(self.delay)
+        self.calls.append(query)
+        return f"results for {query} #{len(self.calls)}"
+
+class TestClassifyQuery(unittest.TestCase):
+    """Test freshness tiers"""
+
+    def test_tiers(self):
+        """Test fast-changing questions get short-lived tiers"""
+        self.assertEqual(classify_query("india vs australia cricket score"), "live")
+        self.assertEqual(classify_query("what's the weather in pune"), "live")
+        self.assertEqual(classify_query("latest news about chandrayaan"), "news")
+        self.assertEqual(classify_query("who was bhagat singh"), "encyclopedic")
+        self.assertEqual(classify_query("history of the mughal empire"), "encyclopedic")
+        self.assertEqual(classify_query("who is the ceo of tesla"), "general")
+
+    def test_prices_and_office_holders(self):
+        """Test bare prices and rates are live and current office holders are news"""
+        for query in ["what is the bitcoin price", "gold rate in mumbai", "usd to inr exchange rate",
+                      "price of petrol", "cost of an iphone 16"]:
+            self.assertEqual(classify_query(query), "live", query)
+        for query in ["who is the president of the US", "who is the current prime minister of uk",
+                      "who is the current captain of the indian team", "governor of maharashtra"]:
+            self.assertEqual(classify_query(query), "news", query)
+
+class TestSearchCache(unittest.TestCase):
+    """Test the search cache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = SearchCache(db_path=os.path.join(self.temp_dir.name, 'search.db'))
+        self.search = FakeSearch()
+
+    def tearDown(self):
+        self.cache.wait_for_refreshes()
+        self.temp_dir.cleanup()
+
+    def age_entries(self, seconds):
+        """Pretend every entry was fetched `seconds` earlier"""
+        with sqlite3.connect(self.cache.db_path) as conn:
+            conn.execute('UPDATE search_cache SET fetched_at = fetched_at - ?', (seconds,))
+            conn.commit()
+
+    def test_repeat_query_served_locally(self):
+        """Test an identical or trivially different query doesn't search again"""
+        first = self.cache.get_or_fetch("Who is the CEO of Tesla?", self.search)
+        second = self.cache.get_or_fetch("who is ceo of tesla", self.search)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.search.calls), 1)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_stale_served_while_revalidating(self):
+        """Test a stale result is returned at once and refreshed in the background"""
+        self.cache.get_or_fetch("latest news about isro", self.search)
+        self.age_entries(20 * 60)  # past the 15 minute news freshness
+
+        self.search.release.clear()
+        start = time.perf_counter()
+        result = self.cache.get_or_fetch("latest news about isro", self.search)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(result, "results for latest news about isro #1")
+
+        # A second stale read doesn't start another refresh
+        self.cache.get_or_fetch("latest news about isro", self.search)
+        self.search.release.set()
+        self.assertTrue(self.cache.wait_for_refreshes())
+
+        self.assertEqual(len(self.search.calls), 2)
+        self.assertEqual(self.cache.get_or_fetch("latest news about isro", self.search),
+                         "results for latest news about isro #2")
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['stale_hits'], stats['refreshes']), (2, 1))
+
+    def test_tier_lifetimes(self):
+        """Test the same age is fresh for encyclopedic queries but expired for live ones"""
+        self.cache.get_or_fetch("who was bhagat singh", self.search)
+        self.cache.get_or_fetch("cricket score", self.search)
+        self.age_entries(3600)
+
+        self.assertEqual(self.cache.lookup("who was bhagat singh")[1], "fresh")
+        self.assertEqual(self.cache.lookup("cricket score"), (None, None))
+        self.assertEqual(self.cache.get_stats()['expired'], 1)
+
+    def test_failed_search_not_cached(self):
+        """Test results rejected by should_cache are fetched again next time"""
+        def no_results(query):
+            return "No results found."
+
+        for _ in range(2):
+            self.cache.get_or_fetch("asdf qwer", no_results, should_cache=lambda r: "No results" not in r)
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['misses'], stats['not_cached'], stats['entries']), (2, 2, 0))
+
+    def test_refresh_failure(self):
+        """Test a failing background refresh keeps the stale copy"""
+        self.cache.get_or_fetch("today's headlines", self.search)
+        self.age_entries(20 * 60)
+
+        def broken(query):
+            raise ConnectionError("offline")
+
+        self.assertEqual(self.cache.get_or_fetch("today's headlines", broken), "results for today's headlines #1")
+        self.assertTrue(self.cache.wait_for_refreshes())
+        self.assertEqual(self.cache.lookup("today's headlines")[1], "stale")
+        self.assertEqual(self.cache.get_stats()['refresh_failed'], 1)
+
+    def test_lru_eviction(self):
+        """Test the least recently used result is evicted first"""
+        self.cache.max_entries = 2
+        self.cache.get_or_fetch("who was akbar", self.search)
+        time.sleep(0.01)
+        self.cache.get_or_fetch("who was ashoka", self.search)
+        time.sleep(0.01)
+        self.cache.get_or_fetch("who was akbar", self.search)
+        time.sleep(0.01)
+        self.cache.get_or_fetch("who was shivaji", self.search)
+
+        self.assertEqual(self.cache.lookup("who was ashoka"), (None, None))
+        self.assertEqual(self.cache.lookup("who was akbar")[1], "fresh")
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
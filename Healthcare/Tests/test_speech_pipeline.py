@@ -0,0 +1,116 @@
+"""
+J.A.R.V.I.S. Speech Pipeline Tests
+Sentence-level synthesis with prefetch, interruption through func, prepared
+sentences and first-audio/gap metrics, using fake synthesis and playback
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.SpeechPipeline import SpeechPipeline, split_sentences
+from Healthcare.Tests.benchmark_speech_pipeline import FakeSynthesizer, FakePlayer, MESSAGE, run_benchmark
+
+class TestSpeechPipeline(unittest.TestCase):
+    """Test speaking through the pipeline"""
+
+    def setUp(self):
+        self.synth = FakeSynthesizer(base_delay=0.03, char_delay=0)
+        self.player = FakePlayer(word_delay=0.01)
+        self.pipeline = SpeechPipeline(synthesize=self.synth, player=self.player, poll_interval=0.005)
+
+    def tearDown(self):
+        self.pipeline.close()
+
+    def test_next_sentence_synthesized_while_playing(self):
+        """Test sentences play in order and each is synthesized before the previous one ends"""
+        self.assertTrue(self.pipeline.speak(MESSAGE))
+
+        sentences = split_sentences(MESSAGE)
+        self.assertEqual([text for text, _ in self.player.played], sentences)
+        for (_, synth_started), (text, play_started) in zip(self.synth.calls[1:], self.player.played):
+            play_ends = play_started + self.player.word_delay * len(text.split())
+            self.assertLess(synth_started, play_ends)
+
+        stats = self.pipeline.get_stats()
+        self.assertEqual((stats['utterances'], stats['sentences']), (1, len(sentences)))
+        self.assertIn('last_first_audio_ms', stats)
+        self.assertLess(stats['max_gap_ms'], 25)
+
+    def test_interrupted_by_func(self):
+        """Test func returning False stops playback and later sentences are not played"""
+        calls = []
+
+        def func(r=None):
+            calls.append(r)
+            return r is not None or len(self.player.played) < 2
+
+        self.assertFalse(self.pipeline.speak(MESSAGE, func))
+        self.assertEqual(len(self.player.played), 2)
+        self.assertEqual(self.player.stopped, 1)
+        self.assertEqual(calls[-1], False)
+        self.assertEqual(self.pipeline.get_stats()['interrupted'], 1)
+
+    def test_prepared_sentence_reused(self):
+        """Test a prepared sentence is synthesized once, ahead of being spoken"""
+        sentence = "Please take your iron tablet with some orange juice."
+        self.pipeline.prepare(sentence)
+        self.pipeline.prepare(sentence)
+        self.assertTrue(self.pipeline.speak(sentence))
+
+        self.assertEqual(len(self.synth.calls), 1)
+        self.assertEqual(self.pipeline.get_stats()['prepared_hits'], 1)
+
+    def test_urgent_not_behind_prepared(self):
+        """Test urgent speech is synthesized on its own worker, not after the prepared sentences"""
+        synth = FakeSynthesizer(base_delay=0.1, char_delay=0)
+        pipeline = SpeechPipeline(synthesize=synth, player=self.player, poll_interval=0.005)
+        pipeline.prepare(MESSAGE)
+        self.assertTrue(pipeline.speak("Medical emergency detected.", urgent=True))
+        pipeline.close()
+
+        self.assertLess(pipeline.get_stats()['last_first_audio_ms'], 200)
+
+    def test_cancel_prepared(self):
+        """Test cancelling drops prepared sentences that have not started synthesizing"""
+        synth = FakeSynthesizer(base_delay=0.1, char_delay=0)
+        pipeline = SpeechPipeline(synthesize=synth, player=self.player, poll_interval=0.005)
+        pipeline.prepare(MESSAGE)
+        pipeline.cancel_prepared()
+        time.sleep(0.3)
+        pipeline.close()
+
+        self.assertLessEqual(len(synth.calls), 1)
+        self.assertGreaterEqual(pipeline.get_stats()['prepared_cancelled'], len(split_sentences(MESSAGE)) - 1)
+
+    def test_synthesis_failure(self):
+        """Test a failed synthesis ends the utterance but still signals the end to func"""
+        def broken(text):
+            raise ConnectionError("edge tts unreachable")
+
+        pipeline = SpeechPipeline(synthesize=broken, player=self.player, poll_interval=0.005)
+        calls = []
+        self.assertFalse(pipeline.speak("This sentence never gets synthesized.", lambda r=None: calls.append(r)))
+        pipeline.close()
+
+        self.assertEqual(calls[-1], False)
+        self.assertEqual(pipeline.get_stats()['failed'], 1)
+        self.assertEqual(self.player.played, [])
+
+class TestSpeechPipelineBenchmark(unittest.TestCase):
+    """Test first audio and sentence gaps with fake backends"""
+
+    def test_prefetch_removes_gaps(self):
+        """Test speech starts after one sentence and prefetch hides synthesis between sentences"""
+        stats = run_benchmark(scale=0.2)
+
+        self.assertLess(stats['pipelined_first_audio_ms'], stats['batch_first_audio_ms'] / 2)
+        self.assertLess(stats['pipelined_avg_gap_ms'], stats['serial_avg_gap_ms'] / 4)
+        self.assertLess(stats['emergency_urgent_first_audio_ms'], stats['emergency_shared_first_audio_ms'] / 2)
+
+if __name__ == '__main__':
+    unittest.main()
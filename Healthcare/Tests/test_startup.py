@@ -0,0 +1,104 @@
+"""
+J.A.R.V.I.S. Startup Warm-up Tests
+Concurrent background initialization, readiness flags and the startup profile
+"""
+
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.Startup import StartupProfiler, WarmUp
+
+class TestWarmUp(unittest.TestCase):
+    """Test warm-up tasks and their readiness flags"""
+
+    def setUp(self):
+        self.warmup = WarmUp()
+
+    def test_tasks_run_concurrently(self):
+        """Test slow tasks overlap instead of adding up"""
+        started = time.perf_counter()
+        for name in ["stt driver", "llm clients", "healthcare", "tts engine"]:
+            self.warmup.start(name, lambda: time.sleep(0.2))
+
+        self.assertTrue(self.warmup.wait_all(timeout=5))
+        self.assertLess(time.perf_counter() - started, 0.6)
+
+    def test_readiness_flags(self):
+        """Test a task is ready only after it finishes"""
+        release = threading.Event()
+        self.warmup.start("tts engine", lambda: release.wait(5) and "bus")
+
+        self.assertFalse(self.warmup.is_ready("tts engine"))
+        self.assertEqual(self.warmup.pending(), ["tts engine"])
+        release.set()
+
+        self.assertTrue(self.warmup.wait("tts engine", timeout=5))
+        self.assertTrue(self.warmup.is_ready("tts engine"))
+        self.assertEqual(self.warmup.result("tts engine"), "bus")
+        self.assertEqual(self.warmup.status(), {"tts engine": "ready"})
+
+    def test_failed_task_does_not_hang(self):
+        """Test a task that raises is finished but not ready"""
+        def broken():
+            raise RuntimeError("no driver")
+
+        self.warmup.start("stt driver", broken)
+
+        self.assertFalse(self.warmup.wait("stt driver", timeout=5))
+        self.assertFalse(self.warmup.is_ready("stt driver"))
+        self.assertIsInstance(self.warmup.error("stt driver"), RuntimeError)
+        self.assertEqual(self.warmup.status(), {"stt driver": "failed"})
+
+    def test_task_started_once(self):
+        """Test starting the same name twice runs it once"""
+        calls = []
+        self.warmup.start("healthcare", lambda: calls.append(1))
+        self.warmup.start("healthcare", lambda: calls.append(2))
+        self.warmup.wait_all(timeout=5)
+
+        self.assertEqual(calls, [1])
+
+    def test_unknown_task(self):
+        """Test waiting on a task never started returns immediately"""
+        self.assertFalse(self.warmup.wait("missing", timeout=5))
+        self.assertFalse(self.warmup.is_ready("missing"))
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test the per-phase timing breakdown"""
+
+    def test_report_lists_phases(self):
+        """Test phases are reported with thread and status"""
+        profiler = StartupProfiler()
+        with profiler.phase("gui imports"):
+            time.sleep(0.01)
+        warmup = WarmUp(profiler)
+        warmup.start("llm clients", lambda: time.sleep(0.01))
+        warmup.wait_all(timeout=5)
+        profiler.mark("gui launched")
+
+        report = profiler.report()
+        self.assertIn("gui imports", report)
+        self.assertIn("warmup-llm clients", report)
+        self.assertIn("mark", report)
+
+        phases = {p["name"]: p for p in profiler.phases}
+        self.assertGreaterEqual(phases["gui imports"]["duration"], 0.01)
+        self.assertEqual(phases["gui imports"]["thread"], threading.current_thread().name)
+
+    def test_failed_phase_recorded(self):
+        """Test a phase that raises is recorded as failed and re-raised"""
+        profiler = StartupProfiler()
+        with self.assertRaises(ValueError):
+            with profiler.phase("healthcare"):
+                raise ValueError("bad db")
+
+        self.assertEqual(profiler.phases[0]["status"], "failed")
+
+if __name__ == '__main__':
+    unittest.main()
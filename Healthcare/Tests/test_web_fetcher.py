@@ -0,0 +1,183 @@
+"""
+J.A.R.V.I.S. Web Fetcher Tests
+Concurrent search-result fetching and streaming paragraph extraction against a
+local HTTP server serving canned pages
+"""
+
+import unittest
+import sys
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.WebFetcher import ParagraphExtractor, ConcurrentFetcher
+
+ARTICLE = """<html><head><title>Iron in Pregnancy &amp; You</title>
+<script>var p = "<p>not a paragraph at all, this is script text</p>";</script></head>
+<body><p>Short intro.</p>
+<p>Iron helps your body make the extra <b>blood</b> that you and your baby need.</p>
+<p>A second paragraph that the fetcher should never need to read.</p></body></html>"""
+
+NO_PARAGRAPH = "<html><head><title>Menu</title></head><body><div>Home | About</div></body></html>"
+
+# Well past what loopback socket buffers can absorb before the server blocks
+BIG_TOTAL = 32 * 1024 * 1024
+
+class CannedPages(BaseHTTPRequestHandler):
+    sent = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _page(self, body, content_type="text/html; charset=utf-8", status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path.startswith("/article"):
+            self._page(ARTICLE.replace("Iron in", f"{path} Iron in"))
+        elif path.startswith("/delay"):
+            time.sleep(float(path.split("/")[-1]))
+            self._page(ARTICLE)
+        elif path == "/missing":
+            self._page("not found", status=404)
+        elif path == "/json":
+            self._page('{"p": "Iron helps your body make the extra blood you need"}', "application/json")
+        elif path == "/menu":
+            self._page(NO_PARAGRAPH)
+        elif path == "/big":
+            self._big_page()
+
+    def _big_page(self):
+        head = ARTICLE.encode("utf-8")
+        filler = b"<div>" + b"x" * 16379 + b"</div>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(head) + BIG_TOTAL))
+        self.end_headers()
+        sent = 0
+        try:
+            self.wfile.write(head)
+            while sent < BIG_TOTAL:
+                self.wfile.write(filler)
+                sent += len(filler)
+        except OSError:
+            pass  # The client stopped reading
+        CannedPages.sent["/big"] = sent
+
+class TestParagraphExtractor(unittest.TestCase):
+    """Test streaming extraction"""
+
+    def test_title_and_first_paragraph(self):
+        """Test script text and short paragraphs are skipped"""
+        extractor = ParagraphExtractor()
+        extractor.feed(ARTICLE)
+        extractor.finish()
+
+        self.assertEqual(extractor.title, "Iron in Pregnancy & You")
+        self.assertEqual(extractor.paragraphs,
+                         ["Iron helps your body make the extra blood that you and your baby need."])
+
+    def test_fed_in_small_chunks(self):
+        """Test splitting the page anywhere gives the same result, and stops early"""
+        extractor = ParagraphExtractor()
+        for i in range(0, len(ARTICLE), 7):
+            extractor.feed(ARTICLE[i:i + 7])
+            if extractor.done:
+                break
+
+        self.assertTrue(extractor.done)
+        self.assertEqual(len(extractor.paragraphs), 1)
+        self.assertIn("blood", extractor.paragraphs[0])
+
+    def test_cut_off_paragraph_kept(self):
+        """Test a paragraph cut off by the byte limit still counts"""
+        extractor = ParagraphExtractor()
+        extractor.feed("<p>Iron helps your body make extra blood for the")
+        extractor.finish()
+        self.assertEqual(extractor.paragraphs, ["Iron helps your body make extra blood for the"])
+
+class TestConcurrentFetcher(unittest.TestCase):
+    """Test fetching against the local server"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), CannedPages)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.fetcher = ConcurrentFetcher(max_workers=8, deadline=3.0)
+
+    def tearDown(self):
+        self.fetcher.close()
+
+    def url(self, path):
+        return self.base + path
+
+    def test_good_pages_in_search_order(self):
+        """Test failed, non-HTML and paragraph-less pages are skipped"""
+        urls = [self.url(p) for p in ["/missing", "/article/1", "/json", "/menu", "/article/2"]]
+        results = self.fetcher.fetch(urls, max_results=5)
+
+        self.assertEqual([r["url"] for r in results], [self.url("/article/1"), self.url("/article/2")])
+        self.assertEqual(results[0]["title"], "/article/1 Iron in Pregnancy & You")
+        self.assertIn("blood", results[0]["snippet"])
+
+    def test_pages_fetched_concurrently(self):
+        """Test slow pages download in parallel, not one after another"""
+        urls = [self.url(f"/delay/0.4?{i}") for i in range(5)]
+        start = time.monotonic()
+        results = self.fetcher.fetch(urls, max_results=5)
+
+        self.assertEqual(len(results), 5)
+        self.assertLess(time.monotonic() - start, 1.2)
+
+    def test_returns_first_n(self):
+        """Test the fetch returns once enough pages are in, without waiting for slow ones"""
+        urls = [self.url("/delay/2"), self.url("/article/1"), self.url("/article/2")]
+        start = time.monotonic()
+        results = self.fetcher.fetch(urls, max_results=2)
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual([r["url"] for r in results], [self.url("/article/1"), self.url("/article/2")])
+
+    def test_global_deadline(self):
+        """Test the fetch gives up at its deadline with what it has"""
+        urls = [self.url("/article/1"), self.url("/delay/3"), self.url("/delay/3")]
+        start = time.monotonic()
+        results = self.fetcher.fetch(urls, max_results=3, deadline=0.5)
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(self.fetcher.get_stats()['abandoned'], 2)
+
+    def test_stops_reading_after_paragraph(self):
+        """Test a huge page is abandoned once its first paragraph is found"""
+        results = self.fetcher.fetch([self.url("/big")], max_results=1)
+        self.assertEqual(len(results), 1)
+
+        self.assertLess(self.fetcher.get_stats()['bytes'], 64 * 1024)
+        for _ in range(50):
+            if "/big" in CannedPages.sent:
+                break
+            time.sleep(0.05)
+        self.assertLess(CannedPages.sent.get("/big", 0), BIG_TOTAL / 2)
+
+if __name__ == '__main__':
+    unittest.main()
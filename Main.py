@@ -1,61 +1,154 @@
-from Frontend.GUI import (GraphicalUserInerface, SetAssistantStatus,
-                          ShowTextToScreen, TempDirectoryPath, 
-                          SetMicrophoneStatus, AnswerModifier,
-                          QueryModifier, GetAssistantStatus, GetMicrophoneStatus)
-
-from Backend.Model import FirstLayerDMM
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
-from Backend.Automation import Automation
-from Backend.Chatbot import ChatBot
-from Backend.TextToSpeech import TextToSpeech
-# Try to import SpeechRecognition, fallback to simple version if SSL issues
-try:
-    from Backend.SpeechToText import SpeechRecognition
-except Exception as e:
-    print(f"Warning: Could not import SpeechToText due to SSL issues: {e}")
-    print("Using simple speech recognition fallback...")
-    from Backend.SimpleSpeechToText import SpeechRecognition
-
-# Healthcare Module Integration
-try:
-    from Healthcare.Core.pregnancy_care import pregnancy_care
-    from Healthcare.Database.models import HealthcareDatabase
-    from Healthcare.Core.medication_scheduler import initialize_medication_system
-    
-    # Initialize healthcare system
-    healthcare_db = HealthcareDatabase()
-    medication_scheduler, voice_medication_interface = initialize_medication_system(healthcare_db)
-    
-    print("✅ J.A.R.V.I.S. Healthcare Module loaded successfully")
-    HEALTHCARE_ENABLED = True
-except Exception as e:
-    print(f"⚠️ Warning: Healthcare module could not be loaded: {e}")
-    print("J.A.R.V.I.S. will run without healthcare features.")
-    HEALTHCARE_ENABLED = False
-
-# Enhanced Features Integration
-try:
-    from Backend.EnhancedFeatures import (
-        WeatherService, NewsService, StockService, EmailService, 
-        JokeService, WikipediaService, LocationService, CricketService
-    )
-    from Backend.Automation import HandleEnhancedFeatures
-    
-    print("✅ J.A.R.V.I.S. Enhanced Features loaded successfully")
-    ENHANCED_FEATURES_ENABLED = True
-except Exception as e:
-    print(f"⚠️ Warning: Enhanced features could not be loaded: {e}")
-    print("J.A.R.V.I.S. will run without enhanced features.")
-    ENHANCED_FEATURES_ENABLED = False
+from Backend.Startup import StartupProfiler, WarmUp
+import sys
+
+# Startup is phased: the GUI module loads first and the GUI is shown while the
+# slow backends (STT browser, LLM clients, healthcare DB, TTS engine) warm up
+# on background threads. Run with --profile-startup for a timing breakdown.
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+startup_profiler = StartupProfiler()
+warmup = WarmUp(startup_profiler)
+
+with startup_profiler.phase("gui imports"):
+    from Frontend.GUI import (GraphicalUserInerface, SetAssistantStatus,
+                              ShowTextToScreen, ShowStreamingText, TempDirectoryPath, 
+                              SetMicrophoneStatus, AnswerModifier,
+                              QueryModifier, GetAssistantStatus, GetMicrophoneStatus,
+                              WaitForMicrophoneStatus)
+
+# Set by the warm-up tasks below
+HEALTHCARE_ENABLED = False
+ENHANCED_FEATURES_ENABLED = False
+
+def WarmUpSpeechRecognition():
+    global SpeechRecognition
+    # Try to import SpeechRecognition, fallback to simple version if SSL issues
+    try:
+        from Backend.SpeechToText import SpeechRecognition, GetDriver
+        GetDriver()
+    except Exception as e:
+        print(f"Warning: Could not import SpeechToText due to SSL issues: {e}")
+        print("Using simple speech recognition fallback...")
+        from Backend.SimpleSpeechToText import SpeechRecognition
+
+def WarmUpLLMClients():
+    global FirstLayerDMM, RealtimeSearchEngine, ChatBot
+    from Backend.Model import FirstLayerDMM
+    from Backend.RealtimeSearchEngine import RealtimeSearchEngine
+    from Backend.Chatbot import ChatBot
+
+def WarmUpAutomation():
+    global Automation, HandleEnhancedFeatures, ENHANCED_FEATURES_ENABLED
+    from Backend.Automation import Automation
+
+    # Enhanced Features Integration
+    try:
+        from Backend.EnhancedFeatures import (
+            WeatherService, NewsService, StockService, EmailService, 
+            JokeService, WikipediaService, LocationService, CricketService
+        )
+        from Backend.Automation import HandleEnhancedFeatures
+        
+        print("✅ J.A.R.V.I.S. Enhanced Features loaded successfully")
+        ENHANCED_FEATURES_ENABLED = True
+    except Exception as e:
+        print(f"⚠️ Warning: Enhanced features could not be loaded: {e}")
+        print("J.A.R.V.I.S. will run without enhanced features.")
+        ENHANCED_FEATURES_ENABLED = False
+
+def WarmUpHealthcare():
+    global pregnancy_care, healthcare_db, medication_scheduler, voice_medication_interface
+    global emergency_monitor, HEALTHCARE_ENABLED
+    # Healthcare Module Integration
+    try:
+        from Healthcare.Core.pregnancy_care import get_pregnancy_care
+        from Healthcare.Database.models import HealthcareDatabase
+        from Healthcare.Core.medication_scheduler import initialize_medication_system
+        from Healthcare.Core.lab_analyzer_emergency import create_emergency_stream_monitor
+        from Healthcare.Core.lab_reanalysis import start_lab_reanalysis
+        
+        # Initialize healthcare system
+        pregnancy_care = get_pregnancy_care()
+        healthcare_db = HealthcareDatabase()
+        medication_scheduler, voice_medication_interface = initialize_medication_system(healthcare_db)
+        
+        # Bring stored lab results up to the current rules on a background thread.
+        # No process pool: its workers would re-import this module on Windows.
+        start_lab_reanalysis(healthcare_db.db_path, max_workers=0)
+        
+        # Emergency fast path: scans speech while it is still arriving
+        emergency_monitor = create_emergency_stream_monitor()
+        
+        print("✅ J.A.R.V.I.S. Healthcare Module loaded successfully")
+        HEALTHCARE_ENABLED = True
+    except Exception as e:
+        print(f"⚠️ Warning: Healthcare module could not be loaded: {e}")
+        print("J.A.R.V.I.S. will run without healthcare features.")
+        HEALTHCARE_ENABLED = False
+
+def WarmUpTextToSpeech():
+    global TextToSpeech, SpeakSentence, ScreenNotice, PrepareSpeech
+    from Backend.TextToSpeech import (TextToSpeech, SpeakSentence, ScreenNotice, PrepareSpeech, GetOutputBus,
+                                      GetSpeechPipeline)
+    GetOutputBus()
+    # The mixer stays open from here on, instead of starting up for every message
+    GetSpeechPipeline().player.open()
+
+def StartWarmUp():
+    warmup.start("stt driver", WarmUpSpeechRecognition)
+    warmup.start("llm clients", WarmUpLLMClients)
+    warmup.start("automation", WarmUpAutomation)
+    warmup.start("healthcare", WarmUpHealthcare)
+    warmup.start("tts engine", WarmUpTextToSpeech)
+
+def WaitForWarmUp():
+    # The first query may arrive before everything is up; hold it until then
+    if warmup.pending():
+        SetAssistantStatus("Warming up...")
+        warmup.wait_all()
+
+# Tasks the loop can't run without; a failure is shown instead of listening
+REQUIRED_WARMUP = {"stt driver": "Speech recognition", "llm clients": "The language models"}
+
+def TextOnlySpeech(Text, func=lambda r=None: True, **kwargs):
+    # Answers are still shown on screen while the TTS engine is down
+    return None
+
+async def AutomationUnavailable(commands):
+    ShowTextToScreen(f"{Assistantname} : Sorry, I can't run tasks on this computer right now.")
+    return False
+
+def CheckWarmUp():
+    """
+    Binds fallbacks for optional warm-up tasks that failed, and returns an
+    error message if a required one did (None when the loop can run)
+    """
+    global TextToSpeech, SpeakSentence, ScreenNotice, PrepareSpeech, Automation
+    if warmup.error("tts engine") is not None:
+        TextToSpeech, SpeakSentence, ScreenNotice, PrepareSpeech = TextOnlySpeech, None, None, None
+    if warmup.error("automation") is not None:
+        Automation = AutomationUnavailable
+
+    for name, feature in REQUIRED_WARMUP.items():
+        error = warmup.error(name)
+        if error is not None:
+            return f"{feature} failed to start ({error}). Please check the setup and restart."
+    return None
+
+def ReportStartup():
+    warmup.wait_all()
+    print(startup_profiler.report())
+
+StartWarmUp()
 #----------------------------------------------------------------------------------
 # Other Requirements
 from dotenv import dotenv_values
 from asyncio import run
-from time import sleep
 import subprocess
 import threading
-import json
+import traceback
 import os
+from Backend.ChatStore import GetChatStore
+from Backend.AnswerStream import AnswerStream
 
 env_vars = dotenv_values('.env')
 Username = env_vars.get('Username')
@@ -82,23 +175,20 @@ enhanced_functions = [
     'cricket score', 'cricket', 'send email', 'email', 'current temperature'
 ]
 
-def ShowDefaultChat(): # This is Helpful when the ChatLog.json is Empty and New Chat is started.
-    file = open(r'Data\ChatLog.json', 'r', encoding='utf-8')
-    if len(file.read())<5:
+def ShowDefaultChat(): # This is Helpful when the chat log is Empty and New Chat is started.
+    if len(GetChatStore()) == 0:
         with open(TempDirectoryPath('Database.data'), 'w', encoding='utf-8') as file:
             file.write("")
         with open(TempDirectoryPath('Database.data'), 'w', encoding='utf-8') as file:
             file.write(DefaultMessage)
-    file.close()
-def ReadChatLogJson():
-    with open(r'Data\ChatLog.json', 'r', encoding='utf-8') as file:
-        chat_data = json.load(file)
-    return chat_data
+def ReadChatLogTail():
+    # Only the recent messages the store keeps in memory; the GUI shows no more than that
+    return GetChatStore().tail()
 
 def ChatLogIntegration():
-    json_data = ReadChatLogJson()
+    chat_data = ReadChatLogTail()
     formatted_chatlog = ""
-    for entry in json_data:
+    for entry in chat_data:
         if entry['role'] == 'user':
             formatted_chatlog += f"User: {entry['content']}\n"
         elif entry['role'] == 'assistant':
@@ -113,12 +203,11 @@ def ChatLogIntegration():
 def ShowChatsOnGUI():
     file = open(TempDirectoryPath("Database.data"), 'r', encoding='utf-8')
     data = file.read()
+    file.close()
     if len(str(data)) > 0:
         lines = data.split('\n')
         result = '\n'.join(lines)
-        file.close()
-        file = open(TempDirectoryPath('Responses.data'), 'w', encoding='utf-8')
-        file.write(result); file.close()
+        ShowTextToScreen(result)
 
 def InitialExecution():
     SetMicrophoneStatus('False')
@@ -128,7 +217,8 @@ def InitialExecution():
     ShowChatsOnGUI()
 
 
-InitialExecution()
+with startup_profiler.phase("initial chat"):
+    InitialExecution()
 
 def process_healthcare_command(command_query: str, original_query: str) -> str:
     """
@@ -186,15 +276,60 @@ def process_healthcare_command(command_query: str, original_query: str) -> str:
         print(f"Error processing healthcare command: {e}")
         return "I had trouble processing that healthcare request. Please try again."
 
+def StreamAnswer():
+    # The answer appears on screen token by token and speech starts after its
+    # first sentence; long answers are cut short the same way TextToSpeech does
+    return AnswerStream(on_text=lambda text: ShowStreamingText(f"{Assistantname} : {AnswerModifier(text)}"),
+                        speak=SpeakSentence, speak_first=2, notice=ScreenNotice, prepare=PrepareSpeech)
+
+def AnswerStreaming(Responder, Query):
+    stream = StreamAnswer()
+    try:
+        Answer = Responder(Query, on_token=stream.feed)
+    except Exception:
+        # Leave what streamed on screen, but don't let the next message replace it
+        ShowStreamingText("")
+        raise
+    if not stream.text:
+        # Nothing streamed (e.g. the responder gave up and apologised)
+        stream.feed(Answer)
+    SetAssistantStatus("Answering...")
+    # Flushes the last streamed text and queues the rest of the speech; the
+    # finished message then replaces the streamed one, formatted the same way
+    stream.finish(wait=False)
+    ShowTextToScreen(f"{Assistantname} : {AnswerModifier(Answer)}")
+    stream.finish()
+    return Answer
+
 def MainExecution():
     TaskExecution = False
+    WaitForWarmUp()
+    Problem = CheckWarmUp()
+    if Problem:
+        # Wait for the mic button again instead of retrying in a loop
+        ShowTextToScreen(f"{Assistantname} : {Problem}")
+        SetMicrophoneStatus("False")
+        return False
     SetAssistantStatus("Ready to Perform...")
     try:
-        Query = SpeechRecognition()
+        if HEALTHCARE_ENABLED:
+            emergency_monitor.begin_utterance()
+            Query = SpeechRecognition(on_partial=emergency_monitor.feed)
+        else:
+            Query = SpeechRecognition()
         ShowTextToScreen(f"{Username} : {Query}")
         if not Query or not Query.strip():
             ShowTextToScreen(f"{Assistantname} : Sorry, I didn't catch that. Please try again.")
             return False
+        
+        # The emergency response already started when the alert fired. Only an
+        # exact phrase in the final text skips the classifier; weaker matches
+        # still get the query handled normally.
+        if HEALTHCARE_ENABLED:
+            alert = emergency_monitor.end_of_speech(Query)
+            if alert and alert['confirmed']:
+                return True
+        
         SetAssistantStatus("Thinking...")
         Decision = FirstLayerDMM(Query)
 
@@ -235,10 +370,7 @@ def MainExecution():
             
         if G and R or R:
             SetAssistantStatus("Searching...")
-            Answer = RealtimeSearchEngine(QueryModifier(mearged_query))
-            ShowTextToScreen(f"{Assistantname} : {Answer}")
-            SetAssistantStatus("...Answering...")
-            TextToSpeech(Answer)
+            AnswerStreaming(RealtimeSearchEngine, QueryModifier(mearged_query))
             return True
 
         else:
@@ -246,19 +378,13 @@ def MainExecution():
                 if 'general' in Queries:
                     SetAssistantStatus("Thinking...")
                     QueryFinal = Queries.replace("general ", "")
-                    Answer = ChatBot(QueryModifier(QueryFinal))
-                    ShowTextToScreen(f'{Assistantname} : {Answer}')
-                    SetAssistantStatus("Answering...")
-                    TextToSpeech(Answer)
+                    AnswerStreaming(ChatBot, QueryModifier(QueryFinal))
                     return True
                 
                 elif 'realtime' in Queries:
                     SetAssistantStatus("Searching...")
                     QueryFinal = Queries.replace("realtime ", "")
-                    Answer = ChatBot(QueryModifier(QueryFinal))
-                    ShowTextToScreen(f'{Assistantname} : {Answer}')
-                    SetAssistantStatus("Answering...")
-                    TextToSpeech(Answer)
+                    AnswerStreaming(ChatBot, QueryModifier(QueryFinal))
                     return True
                 
                 elif ('terminate' in Queries) or ('exit' in Queries):
@@ -276,20 +402,29 @@ def FirstThread():
     while True:
         CurrentStatus = GetMicrophoneStatus()
         if CurrentStatus == "True":
-            MainExecution()
+            try:
+                MainExecution()
+            except Exception as e:
+                # This thread is a daemon: an uncaught error would end it silently
+                print(f"Error handling query: {e}")
+                traceback.print_exc()
+                ShowTextToScreen(f"{Assistantname} : Sorry, something went wrong. Please try again.")
+                SetMicrophoneStatus("False")
         
         else:
             AIStatus = GetAssistantStatus()
-            if "Available..." in AIStatus:
-                sleep(0.1)
-
-            else:
+            if "Available..." not in AIStatus:
                 SetAssistantStatus("Available...")
+            # Sleep until the mic button is pressed instead of polling
+            WaitForMicrophoneStatus("True")
 
 def SecondThread():
+    startup_profiler.mark("gui launched")
     GraphicalUserInerface()
 
 if __name__ == "__main__":
+    if PROFILE_STARTUP:
+        threading.Thread(target=ReportStartup, daemon=True).start()
     thread2 = threading.Thread(target=FirstThread, daemon=True)
     thread2.start()
     SecondThread()